@@ -20,6 +20,8 @@ from .audio_reference import AudioReference
 from .finder import Source, Finder
 from .framesync import FrameSync
 from .metadata_frame import *
+from .pacing import PacingClock
+from .timing import StageTimer
 from .receiver import Receiver
 from .sender import Sender
 from .video_frame import *
@@ -5,12 +5,18 @@ from cython cimport view
 from libc.stdint cimport *
 from libcpp.deque cimport deque as cpp_deque
 from libcpp.set cimport set as cpp_set
+from libcpp.vector cimport vector
 cimport numpy as cnp
 
 from .wrapper cimport *
 from .buffertypes cimport *
 from .locks cimport RLock, Condition
 from .send_frame_status cimport *
+from .timing cimport StageTimer, RecvFrameStage, SendFrameStage
+from .tracing cimport (
+    TraceEventType, TraceFrameInfo_s, trace_is_enabled, trace_begin,
+    trace_event, trace_next_frame_id,
+)
 from .audio_reference cimport AudioReference, AudioReferenceConverter
 from .framesync_helper cimport FrameSyncAudioInstance_s
 
@@ -40,6 +46,7 @@ cdef class AudioFrame:
 
 
 cdef class AudioRecvFrame(AudioFrame):
+    cdef readonly StageTimer stage_timer
     cdef readonly size_t max_buffers
     cdef cpp_deque[size_t] read_indices
     cdef cpp_set[size_t] read_indices_set
@@ -59,7 +66,15 @@ cdef class AudioRecvFrame(AudioFrame):
     cdef size_t[2] bfr_strides
     cdef size_t[2] empty_bfr_shape
     cdef readonly size_t view_count
+    cdef uint32_t trace_source_id
+    cdef vector[TraceFrameInfo_s] trace_slots
 
+    cdef void _trace_slot(
+        self,
+        TraceEventType event_type,
+        size_t bfr_idx,
+        int64_t start_ns,
+    ) noexcept nogil
     cpdef size_t get_buffer_depth(self)
     cpdef (size_t, size_t) get_read_shape(self)
     cpdef size_t get_read_length(self)
@@ -100,6 +115,7 @@ cdef class AudioFrameSync(AudioFrame):
 
 
 cdef class AudioSendFrame(AudioFrame):
+    cdef readonly StageTimer stage_timer
     cdef AudioSendFrame_status_s send_status
     cdef AudioSendFrame_item_s* buffer_write_item
     cdef readonly size_t max_num_samples
@@ -114,6 +130,12 @@ cdef class AudioSendFrame(AudioFrame):
     ) except -1 nogil
     cdef AudioSendFrame_item_s* _prepare_buffer_write(self) except NULL nogil
     cdef void _set_buffer_write_complete(self, AudioSendFrame_item_s* item) noexcept nogil
+    cdef void _set_send_ready(self, AudioSendFrame_item_s* item) noexcept nogil
+    cdef int _write_converted(
+        self,
+        AudioSendFrame_item_s* item,
+        cnp.float32_t[:,:] data,
+    ) except -1 nogil
     cdef AudioSendFrame_item_s* _prepare_memview_write(self) except NULL nogil
     cdef void _write_data_to_memview(
         self,
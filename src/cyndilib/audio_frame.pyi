@@ -6,6 +6,7 @@ import numpy as np
 
 from . import locks
 from .audio_reference import AudioReference
+from .timing import StageTimer
 
 
 _FloatArray = npt.NDArray[np.float32]
@@ -62,6 +63,7 @@ class AudioRecvFrame(AudioFrame, ReadOnlyBuffer):
     current_timestamp: int
     max_buffers: int
     read_lock: locks.RLock
+    stage_timer: StageTimer
     read_ready: locks.Condition
     view_count: int
     write_lock: locks.RLock
@@ -82,6 +84,7 @@ class AudioRecvFrame(AudioFrame, ReadOnlyBuffer):
 class AudioSendFrame(AudioFrame, WriteableBuffer):
     # __pyx_vtable__: ClassVar[PyCapsule] = ...
     max_num_samples: int
+    stage_timer: StageTimer
     def __init__(self, max_num_samples: int=..., *args, **kwargs) -> None: ...
     @property
     def attached_to_sender(self) -> bool: ...
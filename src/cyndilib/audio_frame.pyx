@@ -190,8 +190,13 @@ cdef class AudioRecvFrame(AudioFrame):
     this way, the view will contain the same information as the :meth:`get_read_data`
     method.
 
+    Attributes:
+        stage_timer (StageTimer): Timing for the ``process``, ``lock_wait``
+            and ``read`` stages
+
     """
     def __cinit__(self, *args, **kwargs):
+        self.stage_timer = StageTimer(('process', 'lock_wait', 'read'))
         self.audio_bfrs = audio_frame_bfr_create(self.audio_bfrs)
         if self.audio_bfrs is NULL:
             raise MemoryError()
@@ -199,10 +204,12 @@ cdef class AudioRecvFrame(AudioFrame):
         self.write_bfr = audio_frame_bfr_create(self.read_bfr)
         self.current_timecode = 0
         self.current_timestamp = 0
+        self.trace_source_id = 0
 
     def __init__(self, size_t max_buffers=8, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.max_buffers = max_buffers
+        self.trace_slots.resize(self.max_buffers)
         self.read_lock = RLock()
         self.write_lock = RLock()
         self.read_ready = Condition(self.read_lock)
@@ -225,6 +232,21 @@ cdef class AudioRecvFrame(AudioFrame):
     #     """
     #     return self.get_buffer_depth()
 
+    cdef void _trace_slot(
+        self,
+        TraceEventType event_type,
+        size_t bfr_idx,
+        int64_t start_ns,
+    ) noexcept nogil:
+        cdef TraceFrameInfo_s* info
+        if bfr_idx >= self.trace_slots.size():
+            return
+        info = &self.trace_slots[bfr_idx]
+        trace_event(
+            event_type, self.trace_source_id, info.frame_id, info.timestamp,
+            start_ns, bfr_idx,
+        )
+
     cpdef size_t get_buffer_depth(self):
         """The current number of frames available in the read buffer
         """
@@ -272,7 +294,9 @@ cdef class AudioRecvFrame(AudioFrame):
         cdef cnp.float32_t[:,:] result_view
         cdef cnp.int64_t[:] timestamp_view
         cdef cnp.float32_t[:,:,:] all_frame_data
+        cdef int64_t start_ns = self.stage_timer._start()
         self.read_lock._acquire(True, -1)
+        self.stage_timer._stop(RecvFrameStage.frame_lock_wait, start_ns)
         try:
             bfr_len = self.read_indices.size()
             if not bfr_len:
@@ -290,9 +314,11 @@ cdef class AudioRecvFrame(AudioFrame):
         cdef size_t nbfrs_filled, ncols_filled
 
         with nogil:
+            start_ns = self.stage_timer._start()
             nbfrs_filled, ncols_filled = self._fill_all_read_data(
                 all_frame_data, result_view, timestamp_view, bfr_len,
             )
+            self.stage_timer._stop(RecvFrameStage.frame_read, start_ns)
 
         if ncols_filled != ncols:
             result = result[:,:ncols_filled]
@@ -337,6 +363,7 @@ cdef class AudioRecvFrame(AudioFrame):
             self.frame_timestamps.pop_front()
             result[:, col_idx:col_idx+nbfr_cols] = all_frame_data[bfr_idx,:,:]
             col_idx += nbfr_cols
+            self._trace_slot(TraceEventType.trace_read, bfr_idx, 0)
         return nbfrs, col_idx
 
     cpdef get_read_data(self):
@@ -355,7 +382,9 @@ cdef class AudioRecvFrame(AudioFrame):
         if not bfr_len:
             return None
 
+        cdef int64_t start_ns = self.stage_timer._start()
         self.read_lock._acquire(True, -1)
+        self.stage_timer._stop(RecvFrameStage.frame_lock_wait, start_ns)
         try:
             bfr_idx = self.read_indices.front()
             if self.view_count == 0:
@@ -366,9 +395,11 @@ cdef class AudioRecvFrame(AudioFrame):
             self.read_lock._release()
 
         with nogil:
+            start_ns = self.stage_timer._start()
             timestamp = self._fill_read_data(
                 all_frame_data, arr, bfr_idx, advance=advance
             )
+            self.stage_timer._stop(RecvFrameStage.frame_read, start_ns)
         return self.current_frame_data, timestamp
 
     def fill_read_data(self, cnp.float32_t[:,:] dest):
@@ -384,7 +415,9 @@ cdef class AudioRecvFrame(AudioFrame):
         cdef size_t ncols, nrows, bfr_idx
         cdef int64_t timestamp
         cdef bint advance = True
+        cdef int64_t start_ns = self.stage_timer._start()
         self.read_lock._acquire(True, -1)
+        self.stage_timer._stop(RecvFrameStage.frame_lock_wait, start_ns)
         try:
             ncols, nrows = self.get_read_shape()
             bfr_idx = self.read_indices.front()
@@ -395,7 +428,9 @@ cdef class AudioRecvFrame(AudioFrame):
             raise IndexError('Array shape does not match')
 
         with nogil:
+            start_ns = self.stage_timer._start()
             timestamp = self._fill_read_data(all_frame_data, dest, bfr_idx, advance=True)
+            self.stage_timer._stop(RecvFrameStage.frame_read, start_ns)
         return timestamp
 
     def fill_all_read_data(self, cnp.float32_t[:,:] dest, cnp.int64_t[:] timestamps):
@@ -415,16 +450,20 @@ cdef class AudioRecvFrame(AudioFrame):
         """
         cdef cnp.float32_t[:,:,:] all_frame_data = self.all_frame_data
         cdef size_t bfr_len, nbfrs_filled, col_idx
+        cdef int64_t start_ns = self.stage_timer._start()
         self.read_lock._acquire(True, -1)
+        self.stage_timer._stop(RecvFrameStage.frame_lock_wait, start_ns)
         try:
             bfr_len = self.read_indices.size()
         finally:
             self.read_lock._release()
 
         with nogil:
+            start_ns = self.stage_timer._start()
             nbfrs_filled, col_idx = self._fill_all_read_data(
                 all_frame_data, dest, timestamps, bfr_len,
             )
+            self.stage_timer._stop(RecvFrameStage.frame_read, start_ns)
         return nbfrs_filled, col_idx
 
     @cython.boundscheck(False)
@@ -453,6 +492,7 @@ cdef class AudioRecvFrame(AudioFrame):
         bint advance
     ) except? -1 nogil:
         cdef int64_t ts
+        cdef int64_t trace_start = trace_begin()
         ts = self.frame_timestamps.front()
         if advance:
             self.read_indices.pop_front()
@@ -460,6 +500,7 @@ cdef class AudioRecvFrame(AudioFrame):
             self.read_indices_set.erase(bfr_idx)
 
             dest[...] = all_frame_data[bfr_idx,...]
+            self._trace_slot(TraceEventType.trace_read, bfr_idx, trace_start)
         return ts
 
     def __getbuffer__(self, Py_buffer *buffer, int flags):
@@ -467,7 +508,9 @@ cdef class AudioRecvFrame(AudioFrame):
         cdef size_t bfr_len, bfr_idx
         cdef bint is_empty
         cdef cnp.ndarray[cnp.float32_t, ndim=2] frame_data = self.current_frame_data
+        cdef int64_t start_ns = self.stage_timer._start()
         self.read_lock._acquire(True, -1)
+        self.stage_timer._stop(RecvFrameStage.frame_lock_wait, start_ns)
         try:
             bfr_len = self.read_indices.size()
             is_empty = bfr_len == 0
@@ -557,6 +600,7 @@ cdef class AudioRecvFrame(AudioFrame):
                 self.current_frame_data = np.zeros((nrows, ncols), dtype=np.float32)
         finally:
             self.read_lock._release()
+        trace_event(TraceEventType.trace_resize, self.trace_source_id, 0, 0, 0, ncols)
         return 0
 
     cdef int _prepare_incoming(self, NDIlib_recv_instance_t recv_ptr) except -1:
@@ -570,6 +614,7 @@ cdef class AudioRecvFrame(AudioFrame):
                     self.read_indices.pop_front()
                     self.read_indices_set.erase(bfr_idx)
                     self.frame_timestamps.pop_front()
+                    self._trace_slot(TraceEventType.trace_evict, bfr_idx, 0)
             finally:
                 self.read_lock._release()
         return 0
@@ -582,8 +627,12 @@ cdef class AudioRecvFrame(AudioFrame):
         cdef size_t buffer_index = self._get_next_write_index()
         cdef cnp.float32_t[:,:,:] all_frame_data = self.all_frame_data
         cdef cnp.float32_t[:,:] write_view = all_frame_data[buffer_index]
+        cdef int64_t start_ns, trace_start
+        cdef TraceFrameInfo_s* trace_info
 
         with nogil:
+            start_ns = self.stage_timer._start()
+            trace_start = trace_begin()
             write_bfr.sample_rate = p.sample_rate
             write_bfr.num_channels = p.no_channels
             write_bfr.num_samples = p.no_samples
@@ -604,6 +653,12 @@ cdef class AudioRecvFrame(AudioFrame):
 
             if recv_ptr is not NULL:
                 NDIlib_recv_free_audio_v3(recv_ptr, self.ptr)
+            self.stage_timer._stop(RecvFrameStage.frame_process, start_ns)
+            if trace_start != 0 and buffer_index < self.trace_slots.size():
+                trace_info = &self.trace_slots[buffer_index]
+                trace_info.frame_id = trace_next_frame_id()
+                trace_info.timestamp = write_bfr.timestamp
+                self._trace_slot(TraceEventType.trace_capture, buffer_index, trace_start)
         return 0
 
 
@@ -704,9 +759,12 @@ cdef class AudioSendFrame(AudioFrame):
     Attributes:
         max_num_samples (int, readonly): The maximum :attr:`~AudioFrame.num_samples`
             to be used.
+        stage_timer (StageTimer): Timing for the ``in_flight`` stage (from when
+            a buffer is written until the sender releases it)
 
     """
     def __cinit__(self, *args, **kwargs):
+        self.stage_timer = StageTimer(('in_flight',))
         self.max_num_samples = 1602
         frame_status_init(&(self.send_status))
         self.send_status.data.ndim = 2
@@ -843,9 +901,33 @@ cdef class AudioSendFrame(AudioFrame):
             self.buffer_write_item = NULL
         if cur_item is not NULL:
             self.reference_converter._to_ndi_frame_in_place(item.frame_ptr)
+        self._set_send_ready(item)
+
+    cdef void _set_send_ready(self, AudioSendFrame_item_s* item) noexcept nogil:
+        # Shared by every write path once the item data is complete
         self.send_status.data.read_index = item.data.idx
+        item.data.ready_ns = self.stage_timer._start()
+        item.data.frame_id = trace_next_frame_id() if trace_is_enabled() else 0
         frame_status_set_send_ready(&(self.send_status))
 
+    cdef int _write_converted(
+        self,
+        AudioSendFrame_item_s* item,
+        cnp.float32_t[:,:] data,
+    ) except -1 nogil:
+        """Copy *data* into the item buffer, converting it to |NDI| levels in
+        the same pass and mark the item ready to send
+
+        The item data is packed with a channel stride of ``data.shape[1]``
+        """
+        self._set_shape_from_memview(item, data)
+        self.reference_converter._to_ndi_float_ptr(data, <float*>item.frame_ptr.p_data)
+        item.frame_ptr.channel_stride_in_bytes = item.data.strides[0]
+        if self.buffer_write_item is item:
+            self.buffer_write_item = NULL
+        self._set_send_ready(item)
+        return 0
+
     def write_data(self, cnp.float32_t[:,:] data):
         """Write audio data to the internal buffer
 
@@ -911,6 +993,8 @@ cdef class AudioSendFrame(AudioFrame):
         return &(self.send_status.items[idx])
 
     cdef void _on_sender_write(self, AudioSendFrame_item_s* s_ptr) noexcept nogil:
+        self.stage_timer._stop(SendFrameStage.send_frame_in_flight, s_ptr.data.ready_ns)
+        s_ptr.data.ready_ns = 0
         frame_status_set_send_complete(&(self.send_status), s_ptr.data.idx)
 
     cdef int _set_sender_status(self, bint attached) except -1 nogil:
@@ -0,0 +1,70 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from libc.stdint cimport *
+from libcpp.vector cimport vector
+cimport numpy as cnp
+
+from .wrapper cimport *
+from .locks cimport RLock
+from .sender cimport Sender
+from .audio_frame cimport AudioRecvFrame, AudioSendFrame
+from .framesync cimport AudioPullSource, AudioPull_s, audio_pull
+from .send_frame_status cimport AudioSendFrame_item_s
+from .pacing cimport (
+    PacingClock_s, pacing_clock_init, pacing_clock_set_rate,
+    pacing_clock_reset, pacing_clock_wait,
+)
+
+
+cdef class AudioMixerInput:
+    cdef readonly AudioPullSource pull_source
+    cdef readonly AudioRecvFrame recv_frame
+    cdef readonly Py_ssize_t index
+    cdef readonly size_t num_channels, num_outputs, sample_rate
+    cdef readonly size_t num_underruns, samples_padded
+    cdef RLock lock
+    cdef double level_scale
+    cdef double gain_value
+    cdef bint is_muted
+    cdef vector[float] routing_matrix
+    cdef vector[float] coeff_current
+    cdef vector[float] coeff_target
+    cdef vector[float] coeff_step
+    cdef size_t ramp_length
+    cdef size_t ramp_remaining
+    cdef size_t read_offset
+    cdef AudioMixerInput next
+
+    cdef int _update_target(self, bint ramp) except -1
+    cdef int _mix_into(self, float* dest, size_t block_size, float* scratch) except -1 nogil
+    cdef size_t _pull(self, float* dest, size_t block_size) except? -1 nogil
+    cdef size_t _pull_recv(self, float* dest, size_t block_size) except? -1 nogil
+
+
+cdef class AudioMixer:
+    cdef readonly Sender sender
+    cdef readonly tuple inputs
+    cdef readonly size_t num_channels, sample_rate, block_size
+    cdef readonly size_t num_blocks, num_audio_sent
+    cdef readonly RLock lock
+    cdef AudioMixerInput first_input
+    cdef double output_scale
+    cdef cnp.ndarray output_data
+    cdef cnp.ndarray scratch_data
+    cdef float* output_ptr
+    cdef float* scratch_ptr
+    cdef size_t scratch_channels
+    cdef vector[float] bus_peak
+    cdef vector[float] bus_rms
+    cdef AudioSendFrame_item_s* write_item
+    cdef PacingClock_s clock
+    cdef object thread
+    cdef bint stopping
+
+    cdef int _run(self) except -1 nogil
+    cdef int _tick(self) except -1 nogil
+    cdef float* _begin_block(self) except NULL nogil
+    cdef int _mix(self, float* dest) except -1 nogil
+    cdef int _update_meters(self, const float* data) noexcept nogil
+    cdef bint _send_block(self, float* data) noexcept nogil
@@ -0,0 +1,69 @@
+from __future__ import annotations
+from typing import Iterable
+
+import numpy as np
+import numpy.typing as npt
+
+from .sender import Sender
+from .audio_frame import AudioRecvFrame
+from .framesync import AudioPullSource
+from .locks import RLock
+
+
+class AudioMixerInput:
+    pull_source: AudioPullSource|None
+    recv_frame: AudioRecvFrame|None
+    index: int
+    num_channels: int
+    num_outputs: int
+    sample_rate: int
+    num_underruns: int
+    samples_padded: int
+    gain: float
+    muted: bool
+    def __init__(
+        self,
+        source: AudioPullSource|AudioRecvFrame,
+        index: int,
+        num_outputs: int,
+        sample_rate: int,
+        lock: RLock,
+        ramp_length: int = ...,
+        output_scale: float = ...,
+    ) -> None: ...
+    @property
+    def source(self) -> AudioPullSource|AudioRecvFrame: ...
+    @property
+    def routing(self) -> npt.NDArray[np.float32]: ...
+    @routing.setter
+    def routing(self, value: npt.ArrayLike) -> None: ...
+
+
+class AudioMixer:
+    sender: Sender|None
+    inputs: tuple[AudioMixerInput, ...]
+    num_channels: int
+    sample_rate: int
+    block_size: int
+    lock: RLock
+    num_blocks: int
+    num_audio_sent: int
+    def __init__(
+        self,
+        sender: Sender|None,
+        inputs: Iterable[AudioPullSource|AudioRecvFrame],
+        num_channels: int|None = ...,
+        sample_rate: int|None = ...,
+        block_size: int|None = ...,
+        ramp_time: float = ...,
+    ) -> None: ...
+    def __enter__(self) -> AudioMixer: ...
+    def __exit__(self, *args) -> None: ...
+    def __len__(self) -> int: ...
+    @property
+    def sources(self) -> tuple[AudioPullSource|AudioRecvFrame, ...]: ...
+    @property
+    def is_running(self) -> bool: ...
+    def get_meters(self, db: bool = ...) -> dict[str, npt.NDArray[np.float64]]: ...
+    def start(self) -> None: ...
+    def stop(self) -> None: ...
@@ -0,0 +1,603 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+Mixing the audio of several sources into a :class:`~.sender.Sender`
+
+:class:`AudioMixer` pulls fixed-size blocks of samples from each of its
+inputs, applies their gain and channel routing and writes the sum directly
+into the buffers of the sender's :attr:`~.sender.Sender.audio_frame`::
+
+    sources = [AudioPullSource(rx.frame_sync) for rx in receivers]
+    ...
+    with Sender('Program') as sender:
+        sender.set_audio_frame(AudioSendFrame())
+        sender.audio_frame.sample_rate = 48000
+        sender.audio_frame.num_channels = 2
+        with AudioMixer(sender, sources) as mixer:
+            mixer.inputs[1].gain = .5
+            mixer.inputs[2].muted = True
+            ...
+            meters = mixer.get_meters(db=True)
+
+.. versionadded:: 0.0.10
+
+"""
+
+cimport cython
+from libc.math cimport sqrt, fabs
+from libc.string cimport memcpy, memset
+
+import threading
+
+import numpy as np
+
+__all__ = ('AudioMixer', 'AudioMixerInput')
+
+
+cdef class AudioMixerInput:
+    """An input of an :class:`AudioMixer`
+
+    Created by the mixer for each of its sources.
+
+    Each input channel is routed to the mixer's output channels (buses)
+    through the :attr:`routing` matrix, scaled by :attr:`gain`. Changes to
+    :attr:`gain`, :attr:`muted` and :attr:`routing` are ramped linearly over
+    the mixer's ``ramp_time`` to avoid clicks.
+
+    The :attr:`~.framesync.AudioPullSource.sample_rate` of an
+    :class:`~.framesync.AudioPullSource` is set to the mixer's so it is
+    resampled to match. Frames of an :class:`~.audio_frame.AudioRecvFrame`
+    received at any other sample rate are discarded.
+
+    Attributes:
+        pull_source (AudioPullSource): The input source (if it is a
+            :class:`~.framesync.AudioPullSource`)
+        recv_frame (AudioRecvFrame): The input source (if it is an
+            :class:`~.audio_frame.AudioRecvFrame`)
+        index (int): Index of the input in :attr:`AudioMixer.inputs`
+        num_channels (int): Number of input channels
+        num_outputs (int): Number of output channels of the mixer
+        sample_rate (int): Sample rate of the mixer
+        num_underruns (int): Number of blocks padded with silence because not
+            enough samples (at the mixer's sample rate) were buffered (only for
+            :class:`~.audio_frame.AudioRecvFrame` inputs. See
+            :meth:`.framesync.AudioPullSource.get_stats` for the others)
+        samples_padded (int): Number of silent samples inserted for
+            :attr:`num_underruns`
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.num_underruns = 0
+        self.samples_padded = 0
+        self.gain_value = 1
+        self.is_muted = False
+        self.level_scale = 1
+        self.ramp_length = 0
+        self.ramp_remaining = 0
+        self.read_offset = 0
+
+    def __init__(
+        self,
+        object source not None,
+        Py_ssize_t index,
+        size_t num_outputs,
+        size_t sample_rate,
+        RLock lock not None,
+        size_t ramp_length=0,
+        double output_scale=1,
+    ):
+        cdef size_t num_channels, c
+        if isinstance(source, AudioPullSource):
+            self.pull_source = source
+            # The frame sync resamples its source to the rate pulled at
+            self.pull_source.sample_rate = sample_rate
+            num_channels = num_outputs
+            # Pulled samples are in the source frame's reference level
+            self.level_scale = 1 / self.pull_source._get_state().scale
+        elif isinstance(source, AudioRecvFrame):
+            self.recv_frame = source
+            if (
+                self.recv_frame.read_indices.size() and
+                self.recv_frame._get_sample_rate() != <int>sample_rate
+            ):
+                raise ValueError(
+                    f'sample rate of {source!r} does not match the mixer ({sample_rate})'
+                )
+            num_channels = self.recv_frame._get_num_channels()
+            if num_channels == 0:
+                num_channels = num_outputs
+            # Buffered samples are in the frame's reference level
+            self.level_scale = self.recv_frame.reference_converter.ptr.multiplier
+        else:
+            raise TypeError('inputs must be AudioPullSource or AudioRecvFrame instances')
+        self.level_scale *= output_scale
+        self.index = index
+        self.num_channels = num_channels
+        self.num_outputs = num_outputs
+        self.sample_rate = sample_rate
+        self.lock = lock
+        self.ramp_length = ramp_length
+        self.routing_matrix.resize(num_outputs * num_channels, 0)
+        self.coeff_current.resize(num_outputs * num_channels, 0)
+        self.coeff_target.resize(num_outputs * num_channels, 0)
+        self.coeff_step.resize(num_outputs * num_channels, 0)
+        # Channel n goes to output n (or a mono input to all outputs)
+        for c in range(num_outputs):
+            if num_channels == 1:
+                self.routing_matrix[c] = 1
+            elif c < num_channels:
+                self.routing_matrix[c * num_channels + c] = 1
+        self._update_target(False)
+
+    def __repr__(self):
+        return f'<AudioMixerInput {self.index}: {self.source!r}>'
+
+    @property
+    def source(self):
+        """The input :class:`~.framesync.AudioPullSource` or
+        :class:`~.audio_frame.AudioRecvFrame`
+        """
+        if self.pull_source is not None:
+            return self.pull_source
+        return self.recv_frame
+
+    @property
+    def gain(self) -> float:
+        """The (linear) gain applied to the input
+        """
+        return self.gain_value
+    @gain.setter
+    def gain(self, double value):
+        if value < 0:
+            raise ValueError('gain cannot be negative')
+        self.lock._acquire(True, -1)
+        try:
+            self.gain_value = value
+            self._update_target(True)
+        finally:
+            self.lock._release()
+
+    @property
+    def muted(self) -> bool:
+        """Whether the input is muted
+        """
+        return self.is_muted
+    @muted.setter
+    def muted(self, bint value):
+        self.lock._acquire(True, -1)
+        try:
+            self.is_muted = value
+            self._update_target(True)
+        finally:
+            self.lock._release()
+
+    @property
+    def routing(self) -> np.ndarray:
+        """The routing matrix as a float32 array with shape
+        ``(num_outputs, num_channels)``
+
+        Each element is the gain from an input channel (column) to an output
+        channel (row). A copy is returned, so changes must be made by
+        assigning the whole matrix.
+        """
+        cdef size_t i
+        result = np.empty((self.num_outputs, self.num_channels), dtype=np.float32)
+        cdef cnp.float32_t[:,:] view = result
+        for i in range(self.num_outputs * self.num_channels):
+            view[i // self.num_channels, i % self.num_channels] = self.routing_matrix[i]
+        return result
+    @routing.setter
+    def routing(self, value):
+        cdef size_t o, c
+        arr = np.asarray(value, dtype=np.float32)
+        if arr.shape != (self.num_outputs, self.num_channels):
+            raise ValueError(
+                f'routing must have shape {(self.num_outputs, self.num_channels)}'
+            )
+        cdef cnp.float32_t[:,:] view = arr
+        self.lock._acquire(True, -1)
+        try:
+            for o in range(self.num_outputs):
+                for c in range(self.num_channels):
+                    self.routing_matrix[o * self.num_channels + c] = view[o, c]
+            self._update_target(True)
+        finally:
+            self.lock._release()
+
+    @cython.cdivision(True)
+    cdef int _update_target(self, bint ramp) except -1:
+        cdef size_t k, n = self.routing_matrix.size()
+        cdef double g = 0 if self.is_muted else self.gain_value * self.level_scale
+        for k in range(n):
+            self.coeff_target[k] = self.routing_matrix[k] * g
+        if not ramp or self.ramp_length == 0:
+            for k in range(n):
+                self.coeff_current[k] = self.coeff_target[k]
+            self.ramp_remaining = 0
+            return 0
+        # Ramp from wherever the previous ramp got to
+        for k in range(n):
+            self.coeff_step[k] = (self.coeff_target[k] - self.coeff_current[k]) / self.ramp_length
+        self.ramp_remaining = self.ramp_length
+        return 0
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef int _mix_into(self, float* dest, size_t block_size, float* scratch) except -1 nogil:
+        # Called on the first input and passed along the chain. The caller
+        # holds the lock.
+        cdef size_t nc = self.num_channels, o, c, j, k, start
+        cdef size_t ramp = self.ramp_remaining
+        cdef float cur, step
+        cdef const float* src
+        cdef float* dst
+
+        if ramp > block_size:
+            ramp = block_size
+        self._pull(scratch, block_size)
+        for o in range(self.num_outputs):
+            dst = dest + o * block_size
+            for c in range(nc):
+                k = o * nc + c
+                src = scratch + c * block_size
+                cur = self.coeff_current[k]
+                start = 0
+                if ramp > 0 and cur != self.coeff_target[k]:
+                    step = self.coeff_step[k]
+                    for j in range(ramp):
+                        cur += step
+                        dst[j] += src[j] * cur
+                    if ramp == self.ramp_remaining:
+                        cur = self.coeff_target[k]
+                    start = ramp
+                if cur != 0:
+                    for j in range(start, block_size):
+                        dst[j] += src[j] * cur
+                self.coeff_current[k] = cur
+        self.ramp_remaining -= ramp
+        if self.next is not None:
+            self.next._mix_into(dest, block_size, scratch)
+        return 0
+
+    cdef size_t _pull(self, float* dest, size_t block_size) except? -1 nogil:
+        if self.pull_source is not None:
+            return audio_pull(
+                self.pull_source._get_state(), dest, self.num_channels, block_size, block_size,
+            )
+        return self._pull_recv(dest, block_size)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef size_t _pull_recv(self, float* dest, size_t block_size) except? -1 nogil:
+        # Read block_size samples from the buffered frames, continuing
+        # within a frame from where the last block ended
+        cdef size_t nc = self.num_channels, c, n, idx, filled = 0
+        cdef size_t frame_channels, frame_samples
+        cdef float* frame_data
+
+        self.recv_frame.read_lock._acquire(True, -1)
+        try:
+            frame_channels = self.recv_frame.all_frame_data.shape[1]
+            frame_samples = self.recv_frame.all_frame_data.shape[2]
+            if self.read_offset >= frame_samples:
+                self.read_offset = 0
+            if self.recv_frame._get_sample_rate() != <int>self.sample_rate:
+                # Would be mixed at the wrong speed
+                while self.recv_frame.read_indices.size():
+                    idx = self.recv_frame.read_indices.front()
+                    self.recv_frame.read_indices.pop_front()
+                    self.recv_frame.read_indices_set.erase(idx)
+                    self.recv_frame.frame_timestamps.pop_front()
+                self.read_offset = 0
+            while filled < block_size and self.recv_frame.read_indices.size() and frame_samples > 0:
+                idx = self.recv_frame.read_indices.front()
+                frame_data = (
+                    <float*>self.recv_frame.all_frame_data.data +
+                    idx * frame_channels * frame_samples
+                )
+                n = frame_samples - self.read_offset
+                if n > block_size - filled:
+                    n = block_size - filled
+                for c in range(nc):
+                    if c < frame_channels:
+                        memcpy(
+                            dest + c * block_size + filled,
+                            frame_data + c * frame_samples + self.read_offset,
+                            n * sizeof(float),
+                        )
+                    else:
+                        memset(dest + c * block_size + filled, 0, n * sizeof(float))
+                filled += n
+                self.read_offset += n
+                if self.read_offset >= frame_samples:
+                    self.recv_frame.read_indices.pop_front()
+                    self.recv_frame.read_indices_set.erase(idx)
+                    self.recv_frame.frame_timestamps.pop_front()
+                    self.read_offset = 0
+        finally:
+            self.recv_frame.read_lock._release()
+
+        if filled < block_size:
+            for c in range(nc):
+                memset(dest + c * block_size + filled, 0, (block_size - filled) * sizeof(float))
+            self.num_underruns += 1
+            self.samples_padded += block_size - filled
+        return filled
+
+
+cdef class AudioMixer:
+    """Mixes the audio of several inputs and sends it through a
+    :class:`~.sender.Sender` from a background thread
+
+    On each tick of the mixer's clock (every :attr:`block_size` samples at
+    :attr:`sample_rate`), a block of samples is pulled from each input. The
+    inputs are routed, scaled and summed in a single pass without the
+    :term:`GIL` and the result is written directly into a buffer of the
+    sender's :attr:`~.sender.Sender.audio_frame` and sent.
+
+    Inputs may be :class:`~.framesync.AudioPullSource` objects (recommended)
+    or :class:`~.audio_frame.AudioRecvFrame` objects. The
+    :attr:`~.framesync.AudioPullSource.sample_rate` of each
+    :class:`~.framesync.AudioPullSource` is set to the mixer's, so the |NDI|
+    frame sync behind it resamples its source to the mixer's clock and
+    inputs stay aligned. An :class:`~.audio_frame.AudioRecvFrame` is read
+    as-is (it must be driven by something else, such as a
+    :class:`~.receiver.RecvThread`). Its sample rate must match the mixer's:
+    a :class:`ValueError` is raised if frames at another rate are already
+    buffered and any received later are discarded. Its number of channels
+    is taken when the mixer is created. Gaps are filled with silence (see
+    :attr:`AudioMixerInput.num_underruns`).
+
+    Inputs are scaled to |NDI| levels before mixing and the output is written
+    at the reference level of the sender's audio frame.
+
+    Peak and RMS levels of each output channel (bus) are measured on every
+    block (see :meth:`get_meters`).
+
+    The sender must be open before calling :meth:`start`. While running,
+    no other audio should be sent through it.
+
+    Arguments:
+        sender (Sender): The sender to use. Its
+            :attr:`~.sender.Sender.audio_frame` must be set
+        inputs: A sequence of :class:`~.framesync.AudioPullSource` or
+            :class:`~.audio_frame.AudioRecvFrame` objects
+        num_channels (int, optional): Number of output channels. Defaults
+            to the number of channels of the sender's audio frame (if set)
+            or ``2``
+        sample_rate (int, optional): The output sample rate. Defaults to the
+            sample rate of the sender's audio frame (if set) or ``48000``
+        block_size (int, optional): Number of samples per block. Defaults to
+            20 milliseconds
+        ramp_time (float, optional): Duration (in seconds) of the ramps
+            applied to gain and routing changes
+
+    This class supports use as a :term:`context manager`, calling
+    :meth:`start` and :meth:`stop`.
+
+    Attributes:
+        inputs (tuple): The :class:`AudioMixerInput` for each source
+        num_channels (int): Number of output channels
+        sample_rate (int): The output sample rate
+        block_size (int): Number of samples per block
+        lock (RLock): Held while mixing a block and while input settings
+            change
+        num_blocks (int): Number of blocks mixed
+        num_audio_sent (int): Number of blocks sent
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.num_blocks = 0
+        self.num_audio_sent = 0
+        self.output_scale = 1
+        self.output_ptr = NULL
+        self.scratch_ptr = NULL
+        self.write_item = NULL
+        self.stopping = False
+        self.lock = RLock()
+        pacing_clock_init(&self.clock)
+
+    def __init__(
+        self,
+        Sender sender,
+        object inputs,
+        object num_channels=None,
+        object sample_rate=None,
+        object block_size=None,
+        double ramp_time=.01,
+    ):
+        cdef AudioMixerInput inp, prev = None
+        cdef list mixer_inputs = []
+        cdef AudioSendFrame af = None
+        cdef size_t ramp_length
+
+        if sender is not None:
+            if not sender.has_audio_frame:
+                raise ValueError('sender must have an audio_frame')
+            af = sender.audio_frame
+            if num_channels is None and af.num_channels > 0:
+                num_channels = af.num_channels
+            if sample_rate is None and af.sample_rate > 0:
+                sample_rate = af.sample_rate
+        if num_channels is None:
+            num_channels = 2
+        if sample_rate is None:
+            sample_rate = 48000
+        if block_size is None:
+            block_size = sample_rate // 50
+        if num_channels <= 0:
+            raise ValueError('num_channels must be positive')
+        if sample_rate <= 0 or block_size <= 0:
+            raise ValueError('sample_rate and block_size must be positive')
+        if ramp_time < 0:
+            raise ValueError('ramp_time cannot be negative')
+        if af is not None:
+            if af.num_channels != num_channels or af.sample_rate != sample_rate:
+                raise ValueError('the audio_frame format does not match')
+            if block_size > af.max_num_samples:
+                raise ValueError('block_size exceeds the max_num_samples of the audio_frame')
+            self.output_scale = af.reference_converter.ptr.divisor
+        self.sender = sender
+        self.num_channels = num_channels
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        pacing_clock_set_rate(&self.clock, sample_rate, block_size)
+
+        ramp_length = <size_t>(ramp_time * sample_rate)
+        for source in inputs:
+            inp = AudioMixerInput(
+                source, len(mixer_inputs), num_channels, sample_rate, self.lock,
+                ramp_length, self.output_scale,
+            )
+            if prev is None:
+                self.first_input = inp
+            else:
+                prev.next = inp
+            mixer_inputs.append(inp)
+            prev = inp
+        if not len(mixer_inputs):
+            raise ValueError('at least one input is required')
+        self.inputs = tuple(mixer_inputs)
+
+        self.scratch_channels = max(inp.num_channels for inp in mixer_inputs)
+        self.output_data = np.zeros((num_channels, block_size), dtype=np.float32)
+        self.scratch_data = np.zeros((self.scratch_channels, block_size), dtype=np.float32)
+        self.output_ptr = <float*>cnp.PyArray_DATA(self.output_data)
+        self.scratch_ptr = <float*>cnp.PyArray_DATA(self.scratch_data)
+        self.bus_peak.resize(num_channels, 0)
+        self.bus_rms.resize(num_channels, 0)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def __len__(self):
+        return len(self.inputs)
+
+    @property
+    def sources(self) -> tuple:
+        """The input sources
+        """
+        return tuple(inp.source for inp in self.inputs)
+
+    @property
+    def is_running(self) -> bool:
+        """``True`` while the mixing thread is running
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    def get_meters(self, bint db=False) -> dict:
+        """Get the levels of each output channel (bus) in the most recent
+        block
+
+        Levels are linear, at the reference level of the sender's audio
+        frame (or |NDI| levels without a sender).
+
+        Arguments:
+            db (bool, optional): If ``True``, return the levels in decibels
+                (``-inf`` for silence)
+
+        Returns a :class:`dict` with the keys:
+
+        - ``"peak"``: The peak absolute sample value of each bus
+        - ``"rms"``: The RMS level of each bus
+        """
+        peak = np.array(self.bus_peak, dtype=np.float64)
+        rms = np.array(self.bus_rms, dtype=np.float64)
+        if db:
+            with np.errstate(divide='ignore'):
+                peak = 20 * np.log10(peak)
+                rms = 20 * np.log10(rms)
+        return {'peak': peak, 'rms': rms}
+
+    def start(self):
+        """Start the mixing thread
+        """
+        if self.is_running:
+            return
+        self.stopping = False
+        self.thread = threading.Thread(target=self._thread_func, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the mixing thread and wait for it to exit
+        """
+        if self.thread is None:
+            return
+        self.stopping = True
+        self.thread.join()
+        self.thread = None
+
+    def _thread_func(self):
+        with nogil:
+            self._run()
+
+    cdef int _run(self) except -1 nogil:
+        pacing_clock_reset(&self.clock)
+        while not self.stopping:
+            pacing_clock_wait(&self.clock)
+            if self.stopping:
+                break
+            self._tick()
+        return 0
+
+    cdef int _tick(self) except -1 nogil:
+        cdef float* data = self._begin_block()
+        memset(data, 0, self.num_channels * self.block_size * sizeof(float))
+        self.lock._acquire(True, -1)
+        try:
+            self._mix(data)
+        finally:
+            self.lock._release()
+        self._update_meters(data)
+        self.num_blocks += 1
+        if self._send_block(data):
+            self.num_audio_sent += 1
+        return 0
+
+    cdef float* _begin_block(self) except NULL nogil:
+        # Mix straight into the sender's buffer when it can be sent
+        cdef AudioSendFrame_item_s* item
+        if self.sender is None or not self.sender._check_running_noexcept():
+            return self.output_ptr
+        item = self.sender.audio_frame._prepare_buffer_write()
+        item.data.shape[1] = self.block_size
+        item.data.strides[0] = sizeof(float) * self.block_size
+        item.frame_ptr.no_samples = self.block_size
+        item.frame_ptr.channel_stride_in_bytes = item.data.strides[0]
+        self.write_item = item
+        return <float*>item.frame_ptr.p_data
+
+    cdef int _mix(self, float* dest) except -1 nogil:
+        return self.first_input._mix_into(dest, self.block_size, self.scratch_ptr)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef int _update_meters(self, const float* data) noexcept nogil:
+        cdef size_t o, j, n = self.block_size
+        cdef float peak, value
+        cdef double total
+        cdef const float* row
+        for o in range(self.num_channels):
+            row = data + o * n
+            peak = 0
+            total = 0
+            for j in range(n):
+                value = fabs(row[j])
+                if value > peak:
+                    peak = value
+                total += row[j] * row[j]
+            self.bus_peak[o] = peak
+            self.bus_rms[o] = sqrt(total / n)
+        return 0
+
+    cdef bint _send_block(self, float* data) noexcept nogil:
+        cdef AudioSendFrame_item_s* item = self.write_item
+        if item is NULL:
+            return False
+        self.write_item = NULL
+        # Converts to NDI levels in place (if needed) and marks it ready
+        self.sender.audio_frame._set_buffer_write_complete(item)
+        return self.sender._send_audio()
@@ -0,0 +1,507 @@
+"""Loopback benchmark for sizing hosts
+
+Creates a number of :class:`~cyndilib.sender.Sender` /
+:class:`~cyndilib.receiver.Receiver` pairs on the local machine, pushes
+synthetic video through them and reports the achieved frame rate,
+send-to-receive latency, dropped frames and CPU usage as JSON.
+
+The streams can either run as threads within a single process or be spread
+across several worker processes::
+
+    python -m cyndilib.bench --streams 8 --processes 4 --duration 30 -o out.json
+
+Latency is measured from the NDI timestamp stamped on each frame by the
+sender to the (posix) time the frame is returned by
+:meth:`Receiver.receive <cyndilib.receiver.Receiver.receive>`. Since all
+streams share a single clock, the measurement includes encoding, transport
+and decoding (everything but capture and display).
+
+.. versionadded:: 0.0.10
+"""
+from __future__ import annotations
+
+from typing import NamedTuple, Sequence, Any
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import threading
+import time
+from fractions import Fraction
+
+import numpy as np
+
+from .wrapper import FourCC, ndi_version
+from .wrapper.ndi_recv import RecvColorFormat, RecvBandwidth
+from .finder import Finder, Source
+from .receiver import Receiver, ReceiveFrameType
+from .sender import Sender
+from .video_frame import VideoSendFrame, VideoRecvFrame
+
+
+__all__ = (
+    'BenchConfig', 'StreamResult', 'run_streams', 'run_benchmark',
+    'summarize_latencies', 'performance_delta', 'main',
+)
+
+
+RECV_COLOR_FORMATS = {
+    FourCC.UYVY: RecvColorFormat.UYVY_BGRA,
+    FourCC.BGRA: RecvColorFormat.BGRX_BGRA,
+    FourCC.BGRX: RecvColorFormat.BGRX_BGRA,
+    FourCC.RGBA: RecvColorFormat.RGBX_RGBA,
+    FourCC.RGBX: RecvColorFormat.RGBX_RGBA,
+}
+"""Receive color formats used for each sent :class:`~.wrapper.ndi_structs.FourCC`
+(falls back to :attr:`~.wrapper.ndi_recv.RecvColorFormat.fastest`)
+"""
+
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+"""Percentiles included in :func:`summarize_latencies`"""
+
+
+class BenchConfig(NamedTuple):
+    """Benchmark options
+    """
+    num_streams: int = 1
+    """Number of sender / receiver pairs"""
+
+    num_processes: int = 0
+    """Number of worker processes. If zero, all streams run as threads
+    within the calling process
+    """
+
+    xres: int = 1920
+    """Horizontal resolution"""
+
+    yres: int = 1080
+    """Vertical resolution"""
+
+    frame_rate: Fraction = Fraction(60, 1)
+    """Frame rate to send"""
+
+    fourcc: FourCC = FourCC.UYVY
+    """Pixel format to send"""
+
+    duration: float = 10.
+    """Measurement duration (in seconds)"""
+
+    warmup: float = 2.
+    """Time (in seconds) after connecting before measurements are taken"""
+
+    connect_timeout: float = 10.
+    """Maximum time (in seconds) to wait for the receivers to connect"""
+
+    name_prefix: str = 'cyndilib-bench'
+    """Prefix for the |NDI| source names"""
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> BenchConfig:
+        """Create an instance from parsed command line arguments
+        """
+        xres, yres = [int(v) for v in args.resolution.lower().split('x')]
+        return cls(
+            num_streams=args.streams,
+            num_processes=args.processes,
+            xres=xres,
+            yres=yres,
+            frame_rate=Fraction(args.frame_rate).limit_denominator(1001),
+            fourcc=FourCC[args.fourcc],
+            duration=args.duration,
+            warmup=args.warmup,
+            connect_timeout=args.connect_timeout,
+            name_prefix=args.name_prefix,
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        d = self._asdict()
+        d['frame_rate'] = [self.frame_rate.numerator, self.frame_rate.denominator]
+        d['fourcc'] = self.fourcc.name
+        return d
+
+
+class StreamResult(NamedTuple):
+    """Measurements for a single stream
+    """
+    name: str
+    """The sender name"""
+
+    connected: bool
+    """Whether the receiver connected within the timeout"""
+
+    frames_sent: int
+    """Number of frames sent during the measurement"""
+
+    frames_received: int
+    """Number of frames received during the measurement"""
+
+    elapsed: float
+    """Duration of the measurement (in seconds)"""
+
+    latencies: list[float]
+    """Send-to-receive latency of each frame received (in seconds)"""
+
+    performance: dict[str, dict[str, float]]
+    """Receiver performance during the measurement (see
+    :func:`performance_delta`)
+    """
+
+    def to_json(self) -> dict[str, Any]:
+        elapsed = self.elapsed if self.elapsed > 0 else float('nan')
+        return {
+            'name': self.name,
+            'connected': self.connected,
+            'frames_sent': self.frames_sent,
+            'frames_received': self.frames_received,
+            'send_fps': self.frames_sent / elapsed,
+            'recv_fps': self.frames_received / elapsed,
+            'latency': summarize_latencies(self.latencies),
+            'performance': self.performance,
+        }
+
+
+def summarize_latencies(latencies: Sequence[float]) -> dict[str, float|None]:
+    """Compute summary statistics of latency values
+
+    Arguments:
+        latencies: Latency values (in seconds)
+
+    Returns:
+        dict: The ``count``, ``min``, ``mean``, ``max`` and percentiles
+        (``p50``, ``p90``, etc) of the values in milliseconds. All values other
+        than ``count`` will be ``None`` if *latencies* is empty.
+    """
+    result: dict[str, float|None] = {'count': len(latencies)}
+    keys = ['min', 'mean', 'max'] + [f'p{p}' for p in LATENCY_PERCENTILES]
+    if not len(latencies):
+        result.update({key: None for key in keys})
+        return result
+    arr = np.asarray(latencies, dtype=np.float64) * 1000
+    result['min'] = float(arr.min())
+    result['mean'] = float(arr.mean())
+    result['max'] = float(arr.max())
+    for p, value in zip(LATENCY_PERCENTILES, np.percentile(arr, LATENCY_PERCENTILES)):
+        result[f'p{p}'] = float(value)
+    return result
+
+
+def performance_delta(
+    start: dict[str, dict[str, float]],
+    end: dict[str, dict[str, float]],
+) -> dict[str, dict[str, float]]:
+    """Compute the receiver performance between two results of
+    :meth:`Receiver.get_performance_data
+    <cyndilib.receiver.Receiver.get_performance_data>`
+
+    Returns:
+        dict: The ``frames_total`` and ``frames_dropped`` received between
+        *start* and *end* (and the ``dropped_percent`` of those) for each
+        media type in *end*
+    """
+    result: dict[str, dict[str, float]] = {}
+    for key, stats in end.items():
+        base = start.get(key, {})
+        total = stats['frames_total'] - base.get('frames_total', 0)
+        dropped = stats['frames_dropped'] - base.get('frames_dropped', 0)
+        result[key] = {
+            'frames_total': total,
+            'frames_dropped': dropped,
+            'dropped_percent': dropped / total * 100 if total else 0,
+        }
+    return result
+
+
+def _frame_send_time(vf: VideoRecvFrame, now: float) -> float:
+    # Prefer the timestamp stamped by the sending SDK. Fall back to the
+    # timecode (which the sender paces in realtime) if it wasn't provided.
+    ts = vf.get_timestamp_posix()
+    if 0 < ts <= now + 60:
+        return ts
+    return vf.get_timecode_posix()
+
+
+class _Stream:
+    """A sender / receiver pair and the threads driving them
+    """
+    def __init__(self, config: BenchConfig, name: str) -> None:
+        self.config = config
+        self.name = name
+        # The sender's clock paces the frames, so the SDK must not clock
+        # them as well
+        self.sender = Sender(name, pace_video=True, clock_video=False)
+        vf = VideoSendFrame()
+        vf.set_resolution(config.xres, config.yres)
+        vf.set_fourcc(config.fourcc)
+        vf.set_frame_rate(config.frame_rate)
+        self.sender.set_video_frame(vf)
+        self.send_data = np.zeros(vf.get_buffer_size(), dtype=np.uint8)
+        self.receiver = Receiver(
+            color_format=RECV_COLOR_FORMATS.get(config.fourcc, RecvColorFormat.fastest),
+            bandwidth=RecvBandwidth.highest,
+        )
+        self.recv_frame = VideoRecvFrame()
+        self.receiver.set_video_frame(self.recv_frame)
+        self.running = threading.Event()
+        self.measuring = threading.Event()
+        self.frames_sent = 0
+        self.frames_received = 0
+        self.latencies: list[float] = []
+        self.performance_start: dict[str, dict[str, float]] = {}
+        self.send_thread = threading.Thread(target=self._send_loop)
+        self.recv_thread = threading.Thread(target=self._recv_loop)
+
+    def open(self) -> None:
+        self.sender.open()
+        self.running.set()
+        self.send_thread.start()
+
+    def connect(self, source: Source) -> None:
+        self.receiver.set_source(source)
+        self.recv_thread.start()
+
+    def stop(self) -> None:
+        self.running.clear()
+        for t in [self.send_thread, self.recv_thread]:
+            if t.is_alive():
+                t.join()
+        self.receiver.disconnect()
+        self.sender.close()
+
+    def start_measuring(self) -> None:
+        self.frames_sent = 0
+        self.frames_received = 0
+        self.latencies.clear()
+        self.performance_start = self._get_performance()
+        self.measuring.set()
+
+    def stop_measuring(self) -> None:
+        self.measuring.clear()
+
+    def _send_loop(self) -> None:
+        sender, data = self.sender, self.send_data
+        while self.running.is_set():
+            # Pacing is handled by the sender's clock
+            sender.write_video_async(data)
+            if self.measuring.is_set():
+                self.frames_sent += 1
+
+    def _recv_loop(self) -> None:
+        receiver, vf = self.receiver, self.recv_frame
+        dest = np.zeros(0, dtype=np.uint8)
+        while self.running.is_set():
+            ft = receiver.receive(ReceiveFrameType.recv_video, 100)
+            if not ft & ReceiveFrameType.recv_video:
+                continue
+            now = time.time()
+            if self.measuring.is_set():
+                self.latencies.append(now - _frame_send_time(vf, now))
+                self.frames_received += 1
+            # Consume the frame the way an application would
+            size = vf.get_buffer_size()
+            if dest.size != size:
+                dest = np.zeros(size, dtype=np.uint8)
+            while vf.get_buffer_depth():
+                vf.fill_p_data(dest)
+
+    def _get_performance(self) -> dict[str, dict[str, float]]:
+        return {
+            key: dict(value) for key, value in
+            self.receiver.get_performance_data().items()
+        }
+
+    def get_result(self, connected: bool, elapsed: float) -> StreamResult:
+        # Frames from the warm-up period are excluded
+        perf = performance_delta(self.performance_start, self._get_performance())
+        return StreamResult(
+            name=self.name,
+            connected=connected,
+            frames_sent=self.frames_sent,
+            frames_received=self.frames_received,
+            elapsed=elapsed,
+            latencies=list(self.latencies),
+            performance=perf,
+        )
+
+
+def _find_sources(names: Sequence[str], timeout: float) -> dict[str, Source]:
+    result: dict[str, Source] = {}
+    finder = Finder()
+    finder.open()
+    end_time = time.monotonic() + timeout
+    while len(result) < len(names):
+        remaining = end_time - time.monotonic()
+        if remaining <= 0:
+            break
+        finder.wait_for_sources(min(remaining, 1))
+        for source in finder:
+            if source.stream_name in names:
+                result[source.stream_name] = source
+    finder.close()
+    return result
+
+
+def run_streams(config: BenchConfig, stream_indices: Sequence[int]) -> dict[str, Any]:
+    """Run the given streams within the current process
+
+    Arguments:
+        config: The benchmark configuration
+        stream_indices: Indices of the streams to run (used in the source names)
+
+    Returns:
+        dict: The results for this process including the ``streams`` (each one
+        from :meth:`StreamResult.to_json`) and ``cpu_percent`` (where ``100``
+        is equivalent to one fully used core)
+    """
+    pid = os.getpid()
+    streams = [
+        _Stream(config, f'{config.name_prefix}-{pid}-{i}') for i in stream_indices
+    ]
+    try:
+        for stream in streams:
+            stream.open()
+        sources = _find_sources([s.name for s in streams], config.connect_timeout)
+        for stream in streams:
+            source = sources.get(stream.name)
+            if source is not None:
+                stream.connect(source)
+        end_time = time.monotonic() + config.connect_timeout
+        connected = {}
+        for stream in streams:
+            if stream.name not in sources:
+                connected[stream.name] = False
+                continue
+            while not stream.receiver.is_connected() and time.monotonic() < end_time:
+                time.sleep(.1)
+            connected[stream.name] = stream.receiver.is_connected()
+
+        time.sleep(config.warmup)
+
+        cpu_start = time.process_time()
+        start_ts = time.monotonic()
+        for stream in streams:
+            stream.start_measuring()
+        time.sleep(config.duration)
+        for stream in streams:
+            stream.stop_measuring()
+        elapsed = time.monotonic() - start_ts
+        cpu_elapsed = time.process_time() - cpu_start
+
+        results = [s.get_result(connected[s.name], elapsed) for s in streams]
+    finally:
+        for stream in streams:
+            stream.stop()
+    return {
+        'pid': pid,
+        'elapsed': elapsed,
+        'cpu_percent': cpu_elapsed / elapsed * 100,
+        'streams': [r.to_json() for r in results],
+        'latencies': [lat for r in results for lat in r.latencies],
+    }
+
+
+def _run_worker(args: tuple[BenchConfig, list[int]]) -> dict[str, Any]:
+    config, stream_indices = args
+    return run_streams(config, stream_indices)
+
+
+def run_benchmark(config: BenchConfig) -> dict[str, Any]:
+    """Run the benchmark described by *config* and return the report
+
+    The report contains the ``config``, ``host`` information, per-process
+    results (see :func:`run_streams`) and ``totals`` aggregated across all
+    streams.
+    """
+    indices = list(range(config.num_streams))
+    if config.num_processes <= 0:
+        proc_results = [run_streams(config, indices)]
+    else:
+        num_procs = min(config.num_processes, config.num_streams)
+        chunks = [indices[i::num_procs] for i in range(num_procs)]
+        ctx = mp.get_context('spawn')
+        with ctx.Pool(num_procs) as pool:
+            proc_results = pool.map(_run_worker, [(config, c) for c in chunks])
+
+    all_latencies = []
+    streams = []
+    for proc_result in proc_results:
+        all_latencies.extend(proc_result.pop('latencies'))
+        streams.extend(proc_result['streams'])
+
+    dropped = sum(s['performance']['video']['frames_dropped'] for s in streams)
+    total = sum(s['performance']['video']['frames_total'] for s in streams)
+    totals = {
+        'streams': len(streams),
+        'connected': sum(1 for s in streams if s['connected']),
+        'send_fps': sum(s['send_fps'] for s in streams),
+        'recv_fps': sum(s['recv_fps'] for s in streams),
+        'min_stream_recv_fps': min((s['recv_fps'] for s in streams), default=0),
+        'frames_dropped': dropped,
+        'frames_total': total,
+        'dropped_percent': dropped / total * 100 if total else 0,
+        'cpu_percent': sum(p['cpu_percent'] for p in proc_results),
+        'latency': summarize_latencies(all_latencies),
+    }
+    return {
+        'config': config.to_json(),
+        'host': {
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version(),
+            'ndi_version': ndi_version,
+        },
+        'timestamp': time.time(),
+        'processes': proc_results,
+        'totals': totals,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the :class:`argparse.ArgumentParser` used by :func:`main`
+    """
+    p = argparse.ArgumentParser(
+        prog='python -m cyndilib.bench',
+        description='Measure NDI send/receive throughput and latency on localhost',
+    )
+    p.add_argument('-n', '--streams', type=int, default=1,
+        help='Number of sender/receiver pairs (default: %(default)s)')
+    p.add_argument('-p', '--processes', type=int, default=0,
+        help='Number of worker processes, 0 to run all streams in this process (default: %(default)s)')
+    p.add_argument('-r', '--resolution', default='1920x1080',
+        help='Video resolution as WIDTHxHEIGHT (default: %(default)s)')
+    p.add_argument('-f', '--frame-rate', default='60',
+        help='Frame rate as a number or fraction such as "60000/1001" (default: %(default)s)')
+    p.add_argument('--fourcc', default='UYVY', choices=[m.name for m in FourCC],
+        help='Pixel format to send (default: %(default)s)')
+    p.add_argument('-d', '--duration', type=float, default=10.,
+        help='Measurement duration in seconds (default: %(default)s)')
+    p.add_argument('--warmup', type=float, default=2.,
+        help='Seconds to run before measuring (default: %(default)s)')
+    p.add_argument('--connect-timeout', type=float, default=10.,
+        help='Seconds to wait for receivers to connect (default: %(default)s)')
+    p.add_argument('--name-prefix', default='cyndilib-bench',
+        help='Prefix for the NDI source names (default: %(default)s)')
+    p.add_argument('-o', '--output', default='-',
+        help='File to write the JSON report to, "-" for stdout (default: %(default)s)')
+    return p
+
+
+def main(argv: Sequence[str]|None = None) -> int:
+    """Command line entry point
+    """
+    args = build_parser().parse_args(argv)
+    config = BenchConfig.from_args(args)
+    report = run_benchmark(config)
+    s = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(s)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(s)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
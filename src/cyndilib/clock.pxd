@@ -1,6 +1,8 @@
 # cython: language_level=3
 # distutils: language = c++
 
+from libc.stdint cimport int64_t
+
 
 cdef extern from * nogil:
     """
@@ -29,9 +31,71 @@ cdef extern from * nogil:
     cdef void sleep_for_microseconds(double seconds) noexcept nogil
 
 
+cdef extern from * nogil:
+    """
+    #include <chrono>
+    #include <thread>
+    #include <stdint.h>
+    #if defined(__linux__) || defined(__FreeBSD__)
+    #include <errno.h>
+    #include <time.h>
+    #define CYNDILIB_HAVE_CLOCK_NANOSLEEP 1
+    #endif
+
+    static inline int64_t get_monotonic_ns() {
+    #ifdef CYNDILIB_HAVE_CLOCK_NANOSLEEP
+        struct timespec ts;
+        clock_gettime(CLOCK_MONOTONIC, &ts);
+        return (int64_t)ts.tv_sec * 1000000000LL + (int64_t)ts.tv_nsec;
+    #else
+        using namespace std::chrono;
+        auto d = steady_clock::now().time_since_epoch();
+        return (int64_t)duration_cast<nanoseconds>(d).count();
+    #endif
+    }
+
+    static inline int64_t get_realtime_ns() {
+        using namespace std::chrono;
+        auto d = system_clock::now().time_since_epoch();
+        return (int64_t)duration_cast<nanoseconds>(d).count();
+    }
+
+    static inline void sleep_until_monotonic_ns(int64_t deadline_ns, int64_t spin_ns) {
+        int64_t sleep_target = deadline_ns - spin_ns;
+        if (get_monotonic_ns() < sleep_target) {
+    #ifdef CYNDILIB_HAVE_CLOCK_NANOSLEEP
+            struct timespec ts;
+            ts.tv_sec = (time_t)(sleep_target / 1000000000LL);
+            ts.tv_nsec = (long)(sleep_target % 1000000000LL);
+            while (clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &ts, NULL) == EINTR) {}
+    #else
+            using namespace std::chrono;
+            auto offset = nanoseconds(sleep_target - get_monotonic_ns());
+            std::this_thread::sleep_until(steady_clock::now() + offset);
+    #endif
+        }
+        while (get_monotonic_ns() < deadline_ns) {
+            std::this_thread::yield();
+        }
+    }
+    """
+    cdef int64_t get_monotonic_ns() noexcept nogil
+    cdef int64_t get_realtime_ns() noexcept nogil
+    cdef void sleep_until_monotonic_ns(int64_t deadline_ns, int64_t spin_ns) noexcept nogil
+
+
 cdef inline double time() noexcept nogil:
     return get_cpp_time()
 
 cdef inline void sleep(double seconds) noexcept nogil:
     with nogil:
         sleep_for_microseconds(seconds)
+
+cdef inline int64_t monotonic_ns() noexcept nogil:
+    return get_monotonic_ns()
+
+cdef inline void sleep_until_ns(int64_t deadline_ns, int64_t spin_ns) noexcept nogil:
+    sleep_until_monotonic_ns(deadline_ns, spin_ns)
+
+cdef inline int64_t realtime_ns() noexcept nogil:
+    return get_realtime_ns()
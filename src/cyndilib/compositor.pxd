@@ -0,0 +1,94 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from libc.stdint cimport *
+cimport numpy as cnp
+
+from .wrapper cimport *
+from .locks cimport Condition
+from .sender cimport Sender
+from .video_frame cimport VideoRecvFrame, VideoFrameSync
+from .pacing cimport (
+    PacingClock_s, pacing_clock_init, pacing_clock_set_rate,
+    pacing_clock_reset, pacing_clock_wait,
+)
+
+
+cpdef enum ScaleFilter:
+    scale_box = 1
+    scale_bilinear = 2
+
+
+cdef struct Image_s:
+    uint8_t* data
+    size_t xres
+    size_t yres
+    size_t line_stride
+
+
+cdef struct Canvas_s:
+    uint8_t* data[2]
+    size_t xres
+    size_t yres
+    size_t line_stride
+    size_t bytes_per_pixel
+    FourCC fourcc
+    ScaleFilter scale_filter
+    size_t current
+
+
+cdef bint fourcc_compatible(FourCC a, FourCC b) noexcept nogil
+cdef int scale_image(
+    const Image_s* src,
+    Image_s* dest,
+    FourCC fourcc,
+    ScaleFilter scale_filter,
+) except -1 nogil
+
+
+cdef class CompositorTile:
+    cdef readonly VideoRecvFrame recv_frame
+    cdef readonly VideoFrameSync sync_frame
+    cdef readonly Py_ssize_t index
+    cdef readonly size_t x, y, width, height
+    cdef readonly size_t num_updates, num_skipped, num_mismatched
+    cdef size_t version
+    cdef size_t canvas_versions[2]
+    cdef bint has_frame
+    cdef int64_t last_timestamp
+    cdef size_t last_front
+    cdef CompositorTile next
+
+    cdef int _compose(self, Canvas_s* canvas, size_t worker, size_t num_workers) except -1 nogil
+    cdef bint _render(self, Canvas_s* canvas) except -1 nogil
+    cdef bint _render_recv(self, Canvas_s* canvas) except -1 nogil
+    cdef bint _render_sync(self, Canvas_s* canvas) except -1 nogil
+    cdef void _get_dest(self, Canvas_s* canvas, size_t canvas_index, Image_s* dest) noexcept nogil
+    cdef void _copy_tile(self, Canvas_s* canvas, size_t src_index, size_t dest_index) noexcept nogil
+
+
+cdef class Compositor:
+    cdef readonly Sender sender
+    cdef readonly tuple tiles
+    cdef readonly size_t xres, yres, columns, rows, num_threads
+    cdef readonly FourCC fourcc
+    cdef readonly ScaleFilter scale_filter
+    cdef readonly size_t num_video_sent
+    cdef CompositorTile first_tile
+    cdef Canvas_s canvas
+    cdef cnp.ndarray canvas_data
+    cdef size_t front
+    cdef PacingClock_s clock
+    cdef object thread
+    cdef list workers
+    cdef Condition work_cond
+    cdef size_t job_number, num_done
+    cdef bint stopping, workers_running, workers_stopping
+    cdef NDIlib_video_frame_v2_t video_frame_s
+
+    cdef int _run(self) except -1 nogil
+    cdef int _run_worker(self, size_t worker) except -1 nogil
+    cdef int _tick(self) except -1 nogil
+    cdef int _compose(self) except -1 nogil
+    cdef bint _send_video(self, NDIlib_video_frame_v2_t* p) noexcept nogil
+    cdef void _flush_video(self) noexcept nogil
@@ -0,0 +1,94 @@
+from __future__ import annotations
+import enum
+from fractions import Fraction
+from typing import Iterable
+
+import numpy as np
+import numpy.typing as npt
+
+from .sender import Sender
+from .video_frame import VideoRecvFrame, VideoFrameSync
+from .wrapper.ndi_structs import FourCC
+
+
+class ScaleFilter(enum.IntEnum):
+    scale_box = 1
+    scale_bilinear = 2
+
+
+def scale_frame(
+    src: npt.NDArray[np.uint8],
+    src_xres: int,
+    src_yres: int,
+    dest: npt.NDArray[np.uint8],
+    dest_xres: int,
+    dest_yres: int,
+    fourcc: FourCC = ...,
+    scale_filter: ScaleFilter = ...,
+) -> None: ...
+
+
+class CompositorTile:
+    recv_frame: VideoRecvFrame|None
+    sync_frame: VideoFrameSync|None
+    index: int
+    x: int
+    y: int
+    width: int
+    height: int
+    num_updates: int
+    num_skipped: int
+    num_mismatched: int
+    def __init__(
+        self,
+        source: VideoRecvFrame|VideoFrameSync,
+        index: int,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+    ) -> None: ...
+    @property
+    def source(self) -> VideoRecvFrame|VideoFrameSync: ...
+
+
+class Compositor:
+    sender: Sender|None
+    tiles: tuple[CompositorTile, ...]
+    xres: int
+    yres: int
+    columns: int
+    rows: int
+    num_threads: int
+    fourcc: FourCC
+    scale_filter: ScaleFilter
+    num_video_sent: int
+    def __init__(
+        self,
+        sender: Sender|None,
+        inputs: Iterable[VideoRecvFrame|VideoFrameSync],
+        xres: int|None = ...,
+        yres: int|None = ...,
+        fourcc: FourCC|None = ...,
+        frame_rate: Fraction|None = ...,
+        columns: int|None = ...,
+        rows: int|None = ...,
+        scale_filter: ScaleFilter = ...,
+        num_threads: int = ...,
+    ) -> None: ...
+    def __enter__(self) -> Compositor: ...
+    def __exit__(self, *args) -> None: ...
+    def __len__(self) -> int: ...
+    @property
+    def inputs(self) -> tuple[VideoRecvFrame|VideoFrameSync, ...]: ...
+    @property
+    def is_running(self) -> bool: ...
+    @property
+    def frame_rate(self) -> Fraction: ...
+    @property
+    def num_tiles_drawn(self) -> int: ...
+    @property
+    def num_tiles_skipped(self) -> int: ...
+    def get_frame(self) -> npt.NDArray[np.uint8]: ...
+    def start(self) -> None: ...
+    def stop(self) -> None: ...
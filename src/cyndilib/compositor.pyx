@@ -0,0 +1,814 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+Native multiviewer tiling of several video sources into a :class:`~.sender.Sender`
+
+:class:`Compositor` scales the most recent frame of each of its inputs into
+a tile of a single output frame and sends it on its own output clock::
+
+    receivers = []
+    for src in sources:
+        rx = Receiver()
+        rx.set_video_frame(VideoRecvFrame())
+        rx.set_source(src)
+        receivers.append(rx)
+    threads = [RecvThread(rx, 100) for rx in receivers]
+    frames = [rx.video_frame for rx in receivers]
+    ...
+    with Sender('Multiview') as sender:
+        with Compositor(sender, frames, xres=1920, yres=1080, num_threads=4):
+            ...
+
+.. versionadded:: 0.0.10
+
+"""
+
+cimport cython
+from libc.math cimport floor
+from libc.string cimport memcpy
+from libcpp.vector cimport vector
+cimport numpy as cnp
+
+from fractions import Fraction
+import math
+import threading
+
+import numpy as np
+
+__all__ = ('Compositor', 'CompositorTile', 'ScaleFilter', 'scale_frame')
+
+
+cdef size_t _bytes_per_pixel(FourCC fourcc) noexcept nogil:
+    if fourcc == FourCC.UYVY:
+        return 2
+    if fourcc in (FourCC.BGRA, FourCC.BGRX, FourCC.RGBA, FourCC.RGBX):
+        return 4
+    return 0
+
+
+cdef bint fourcc_compatible(FourCC a, FourCC b) noexcept nogil:
+    """Whether frames in format *a* can be scaled into format *b* (their
+    pixels have the same layout)
+    """
+    if a == b:
+        return True
+    if a in (FourCC.BGRA, FourCC.BGRX):
+        return b in (FourCC.BGRA, FourCC.BGRX)
+    if a in (FourCC.RGBA, FourCC.RGBX):
+        return b in (FourCC.RGBA, FourCC.RGBX)
+    return False
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef int _scale_plane_box(
+    const uint8_t* src, size_t src_stride, size_t src_w, size_t src_h, size_t src_step,
+    uint8_t* dest, size_t dest_stride, size_t dest_w, size_t dest_h, size_t dest_step,
+) except -1 nogil:
+    # Each destination sample is the average of the source samples it
+    # covers (or the nearest one when upscaling)
+    cdef vector[size_t] x_start, x_end
+    cdef vector[uint32_t] acc
+    cdef size_t x, y, sx, sy, xs, xe, ys, ye, count
+    cdef const uint8_t* row
+    cdef uint8_t* dest_row
+
+    x_start.resize(dest_w)
+    x_end.resize(dest_w)
+    acc.resize(dest_w)
+    for x in range(dest_w):
+        xs = x * src_w // dest_w
+        xe = (x + 1) * src_w // dest_w
+        if xe <= xs:
+            xe = xs + 1
+        x_start[x] = xs
+        x_end[x] = xe
+    for y in range(dest_h):
+        ys = y * src_h // dest_h
+        ye = (y + 1) * src_h // dest_h
+        if ye <= ys:
+            ye = ys + 1
+        for x in range(dest_w):
+            acc[x] = 0
+        for sy in range(ys, ye):
+            row = src + sy * src_stride
+            for x in range(dest_w):
+                for sx in range(x_start[x], x_end[x]):
+                    acc[x] += row[sx * src_step]
+        dest_row = dest + y * dest_stride
+        for x in range(dest_w):
+            count = (x_end[x] - x_start[x]) * (ye - ys)
+            dest_row[x * dest_step] = <uint8_t>((acc[x] + count // 2) // count)
+    return 0
+
+
+cdef inline void _bilinear_coord(
+    size_t i, size_t src_len, size_t dest_len, size_t* i0, size_t* i1, uint32_t* weight,
+) noexcept nogil:
+    # Sample centers are aligned and the weight is in 1/256ths
+    cdef double pos = (i + .5) * src_len / dest_len - .5
+    cdef size_t p0
+    if pos < 0:
+        pos = 0
+    p0 = <size_t>floor(pos)
+    if p0 >= src_len - 1:
+        i0[0] = src_len - 1
+        i1[0] = src_len - 1
+        weight[0] = 0
+        return
+    i0[0] = p0
+    i1[0] = p0 + 1
+    weight[0] = <uint32_t>((pos - p0) * 256 + .5)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int _scale_plane_bilinear(
+    const uint8_t* src, size_t src_stride, size_t src_w, size_t src_h, size_t src_step,
+    uint8_t* dest, size_t dest_stride, size_t dest_w, size_t dest_h, size_t dest_step,
+) except -1 nogil:
+    cdef vector[size_t] x0, x1
+    cdef vector[uint32_t] wx
+    cdef size_t x, y, y0, y1
+    cdef uint32_t wy, a, b
+    cdef const uint8_t* row0
+    cdef const uint8_t* row1
+    cdef uint8_t* dest_row
+
+    x0.resize(dest_w)
+    x1.resize(dest_w)
+    wx.resize(dest_w)
+    for x in range(dest_w):
+        _bilinear_coord(x, src_w, dest_w, &x0[x], &x1[x], &wx[x])
+        x0[x] *= src_step
+        x1[x] *= src_step
+    for y in range(dest_h):
+        _bilinear_coord(y, src_h, dest_h, &y0, &y1, &wy)
+        row0 = src + y0 * src_stride
+        row1 = src + y1 * src_stride
+        dest_row = dest + y * dest_stride
+        for x in range(dest_w):
+            a = row0[x0[x]] * (256 - wx[x]) + row0[x1[x]] * wx[x]
+            b = row1[x0[x]] * (256 - wx[x]) + row1[x1[x]] * wx[x]
+            dest_row[x * dest_step] = <uint8_t>((a * (256 - wy) + b * wy + 32768) >> 16)
+    return 0
+
+
+cdef int _scale_plane(
+    const uint8_t* src, size_t src_stride, size_t src_w, size_t src_h, size_t src_step,
+    uint8_t* dest, size_t dest_stride, size_t dest_w, size_t dest_h, size_t dest_step,
+    ScaleFilter scale_filter,
+) except -1 nogil:
+    if scale_filter == ScaleFilter.scale_box:
+        return _scale_plane_box(
+            src, src_stride, src_w, src_h, src_step,
+            dest, dest_stride, dest_w, dest_h, dest_step,
+        )
+    return _scale_plane_bilinear(
+        src, src_stride, src_w, src_h, src_step,
+        dest, dest_stride, dest_w, dest_h, dest_step,
+    )
+
+
+cdef int scale_image(
+    const Image_s* src,
+    Image_s* dest,
+    FourCC fourcc,
+    ScaleFilter scale_filter,
+) except -1 nogil:
+    """Scale *src* into *dest* (both in the pixel layout of *fourcc*)
+
+    Each component is scaled separately. For :attr:`~.wrapper.ndi_structs.FourCC.UYVY`
+    the chroma components are scaled at half the horizontal resolution.
+    """
+    cdef size_t bpp = _bytes_per_pixel(fourcc), y, c
+    cdef size_t src_w = src.xres, dest_w = dest.xres
+    if bpp == 0 or src_w == 0 or src.yres == 0 or dest_w == 0 or dest.yres == 0:
+        return 0
+    if src_w == dest_w and src.yres == dest.yres:
+        for y in range(dest.yres):
+            memcpy(
+                dest.data + y * dest.line_stride,
+                src.data + y * src.line_stride,
+                dest_w * bpp,
+            )
+        return 0
+    if fourcc == FourCC.UYVY:
+        # Luma at offset 1 of every 2 bytes, Cb and Cr at offsets 0 and 2
+        # of every 4 bytes
+        _scale_plane(
+            src.data + 1, src.line_stride, src_w, src.yres, 2,
+            dest.data + 1, dest.line_stride, dest_w, dest.yres, 2,
+            scale_filter,
+        )
+        src_w = src_w // 2
+        dest_w = dest_w // 2
+        if src_w == 0 or dest_w == 0:
+            return 0
+        for c in range(0, 4, 2):
+            _scale_plane(
+                src.data + c, src.line_stride, src_w, src.yres, 4,
+                dest.data + c, dest.line_stride, dest_w, dest.yres, 4,
+                scale_filter,
+            )
+        return 0
+    for c in range(4):
+        _scale_plane(
+            src.data + c, src.line_stride, src_w, src.yres, 4,
+            dest.data + c, dest.line_stride, dest_w, dest.yres, 4,
+            scale_filter,
+        )
+    return 0
+
+
+def scale_frame(
+    const uint8_t[::1] src,
+    size_t src_xres,
+    size_t src_yres,
+    uint8_t[::1] dest,
+    size_t dest_xres,
+    size_t dest_yres,
+    FourCC fourcc = FourCC.UYVY,
+    ScaleFilter scale_filter = ScaleFilter.scale_bilinear,
+):
+    """Scale the video frame data in *src* into *dest*
+
+    This uses the same filters as :class:`Compositor`. Both buffers must be
+    packed (without padding between lines).
+
+    Arguments:
+        src: The source frame data
+        src_xres (int): Width of the source frame
+        src_yres (int): Height of the source frame
+        dest: The buffer to write the scaled frame to
+        dest_xres (int): Width of the scaled frame
+        dest_yres (int): Height of the scaled frame
+        fourcc (FourCC, optional): The pixel format of both frames. One of
+            :attr:`~.wrapper.ndi_structs.FourCC.UYVY`,
+            :attr:`~.wrapper.ndi_structs.FourCC.BGRA`,
+            :attr:`~.wrapper.ndi_structs.FourCC.BGRX`,
+            :attr:`~.wrapper.ndi_structs.FourCC.RGBA` or
+            :attr:`~.wrapper.ndi_structs.FourCC.RGBX`
+        scale_filter (ScaleFilter, optional): The filter to use
+
+    Raises:
+        ValueError: If the format is not supported or either buffer is too
+            small
+    """
+    cdef size_t bpp = _bytes_per_pixel(fourcc)
+    cdef Image_s src_img, dest_img
+    if bpp == 0:
+        raise ValueError(f'Unsupported FourCC: {fourcc!r}')
+    if <size_t>src.shape[0] < src_xres * src_yres * bpp:
+        raise ValueError('src is too small')
+    if <size_t>dest.shape[0] < dest_xres * dest_yres * bpp:
+        raise ValueError('dest is too small')
+    if src_xres == 0 or src_yres == 0 or dest_xres == 0 or dest_yres == 0:
+        return
+    src_img.data = <uint8_t*>&src[0]
+    src_img.xres = src_xres
+    src_img.yres = src_yres
+    src_img.line_stride = src_xres * bpp
+    dest_img.data = &dest[0]
+    dest_img.xres = dest_xres
+    dest_img.yres = dest_yres
+    dest_img.line_stride = dest_xres * bpp
+    with nogil:
+        scale_image(&src_img, &dest_img, fourcc, scale_filter)
+
+
+cdef class CompositorTile:
+    """A tile of a :class:`Compositor`
+
+    Created by the compositor for each of its inputs.
+
+    Attributes:
+        recv_frame (VideoRecvFrame): The input frame (if it is a
+            :class:`~.video_frame.VideoRecvFrame`)
+        sync_frame (VideoFrameSync): The input frame (if it is a
+            :class:`~.video_frame.VideoFrameSync`)
+        index (int): Index of the tile in :attr:`Compositor.tiles`
+        x (int): Horizontal position of the tile in the output frame
+        y (int): Vertical position of the tile in the output frame
+        width (int): Width of the tile
+        height (int): Height of the tile
+        num_updates (int): Number of times a new input frame was drawn
+        num_skipped (int): Number of output frames where the input had not
+            changed
+        num_mismatched (int): Number of input frames not drawn because
+            their format did not match the output
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.num_updates = 0
+        self.num_skipped = 0
+        self.num_mismatched = 0
+        self.version = 0
+        self.canvas_versions[0] = 0
+        self.canvas_versions[1] = 0
+        self.has_frame = False
+        self.last_timestamp = 0
+        self.last_front = 0
+
+    def __init__(
+        self,
+        object source not None,
+        Py_ssize_t index,
+        size_t x,
+        size_t y,
+        size_t width,
+        size_t height,
+    ):
+        if isinstance(source, VideoRecvFrame):
+            self.recv_frame = source
+        elif isinstance(source, VideoFrameSync):
+            if not source.double_buffered:
+                raise ValueError('VideoFrameSync inputs must be double_buffered')
+            self.sync_frame = source
+        else:
+            raise TypeError('inputs must be VideoRecvFrame or VideoFrameSync instances')
+        self.index = index
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def __repr__(self):
+        return f'<CompositorTile {self.index}: {self.source!r}>'
+
+    @property
+    def source(self):
+        """The input :class:`~.video_frame.VideoRecvFrame` or
+        :class:`~.video_frame.VideoFrameSync`
+        """
+        if self.recv_frame is not None:
+            return self.recv_frame
+        return self.sync_frame
+
+    cdef int _compose(self, Canvas_s* canvas, size_t worker, size_t num_workers) except -1 nogil:
+        # Called on the first tile and passed along the chain
+        cdef size_t cur = canvas.current
+        if <size_t>self.index % num_workers == worker:
+            if self._render(canvas):
+                self.version += 1
+                self.num_updates += 1
+            else:
+                self.num_skipped += 1
+                # The other canvas (sent last) has the most recent contents
+                if self.canvas_versions[cur] != self.version:
+                    self._copy_tile(canvas, 1 - cur, cur)
+            self.canvas_versions[cur] = self.version
+        if self.next is not None:
+            self.next._compose(canvas, worker, num_workers)
+        return 0
+
+    cdef bint _render(self, Canvas_s* canvas) except -1 nogil:
+        if self.recv_frame is not None:
+            return self._render_recv(canvas)
+        return self._render_sync(canvas)
+
+    cdef bint _render_recv(self, Canvas_s* canvas) except -1 nogil:
+        cdef NDIlib_video_frame_v2_t* p = self.recv_frame.ptr
+        cdef size_t idx, size, num_dropped
+        cdef uint8_t* data
+        cdef bint rendered = False
+        cdef Image_s src, dest
+
+        # The receiver can keep writing to its other buffers while scaling
+        if not self.recv_frame._reserve_latest(&idx, &data, &size, &num_dropped):
+            return False
+        try:
+            if fourcc_compatible(fourcc_type_uncast(p.FourCC), canvas.fourcc):
+                src.data = data
+                src.xres = p.xres
+                src.yres = p.yres
+                src.line_stride = p.line_stride_in_bytes
+                if src.line_stride == 0:
+                    src.line_stride = src.xres * canvas.bytes_per_pixel
+                if src.line_stride * src.yres <= size:
+                    self._get_dest(canvas, canvas.current, &dest)
+                    scale_image(&src, &dest, canvas.fourcc, canvas.scale_filter)
+                    rendered = True
+            else:
+                self.num_mismatched += 1
+            return rendered
+        finally:
+            self.recv_frame._release_reserved(idx)
+
+    cdef bint _render_sync(self, Canvas_s* canvas) except -1 nogil:
+        cdef NDIlib_video_frame_v2_t* p = self.sync_frame.ptr
+        cdef size_t front, size
+        cdef int64_t timestamp = p.timestamp
+        cdef uint8_t* data
+        cdef bint rendered = False
+        cdef Image_s src, dest
+
+        # Keep the next capture from writing to this buffer
+        if not self.sync_frame._acquire_front(&front, &data, &size):
+            return False
+        try:
+            # The frame sync repeats the last frame (with its timestamp) when
+            # nothing new has been received
+            if self.has_frame and timestamp == self.last_timestamp:
+                if timestamp != NDIlib_recv_timestamp_undefined or front == self.last_front:
+                    return False
+            self.has_frame = True
+            self.last_timestamp = timestamp
+            self.last_front = front
+            if not fourcc_compatible(fourcc_type_uncast(p.FourCC), canvas.fourcc):
+                self.num_mismatched += 1
+                return False
+
+            src.data = data
+            src.xres = p.xres
+            src.yres = p.yres
+            src.line_stride = p.line_stride_in_bytes
+            if src.line_stride == 0:
+                src.line_stride = src.xres * canvas.bytes_per_pixel
+            if src.line_stride * src.yres <= size:
+                self._get_dest(canvas, canvas.current, &dest)
+                scale_image(&src, &dest, canvas.fourcc, canvas.scale_filter)
+                rendered = True
+        finally:
+            self.sync_frame._release_front(front)
+        return rendered
+
+    cdef void _get_dest(self, Canvas_s* canvas, size_t canvas_index, Image_s* dest) noexcept nogil:
+        dest.data = (
+            canvas.data[canvas_index] + self.y * canvas.line_stride +
+            self.x * canvas.bytes_per_pixel
+        )
+        dest.xres = self.width
+        dest.yres = self.height
+        dest.line_stride = canvas.line_stride
+
+    cdef void _copy_tile(self, Canvas_s* canvas, size_t src_index, size_t dest_index) noexcept nogil:
+        cdef Image_s src, dest
+        cdef size_t y, row_size = self.width * canvas.bytes_per_pixel
+        self._get_dest(canvas, src_index, &src)
+        self._get_dest(canvas, dest_index, &dest)
+        for y in range(self.height):
+            memcpy(dest.data + y * dest.line_stride, src.data + y * src.line_stride, row_size)
+
+
+cdef class Compositor:
+    """Tiles the most recent frames of several inputs into one output frame
+    and sends it through a :class:`~.sender.Sender` from a background thread
+
+    The output frame is divided into a grid of :attr:`columns` by
+    :attr:`rows` tiles, one for each input (in row-major order). On each
+    tick of the output clock, the most recent frame of each input is scaled
+    into its tile (older buffered frames are discarded). Tiles whose input
+    has no new frame are not redrawn.
+
+    Inputs may be :class:`~.video_frame.VideoRecvFrame` objects (driven by
+    something else, such as a :class:`~.receiver.RecvThread`) or
+    :class:`~.video_frame.VideoFrameSync` objects created with
+    ``double_buffered=True`` (captured by something else, such as a
+    :class:`~.framesync.FrameSyncWorker`). They must use a FourCC with the
+    same pixel layout as the output. No color conversion is done and frames
+    in other formats are not drawn (see
+    :attr:`CompositorTile.num_mismatched`). Inputs should not be read from
+    while the compositor is running.
+
+    The output frame is double-buffered and sent with
+    ``NDIlib_send_send_video_async_v2`` so the next frame is composed while
+    |NDI| encodes the previous one. Scaling and sending are done without
+    the :term:`GIL`. With more than one thread, the tiles are split between
+    the sending thread and ``num_threads - 1`` worker threads.
+
+    The sender must be open before calling :meth:`start`. While running,
+    no other video should be sent through it.
+
+    Arguments:
+        sender (Sender): The sender to use
+        inputs: A sequence of :class:`~.video_frame.VideoRecvFrame` or
+            :class:`~.video_frame.VideoFrameSync` objects
+        xres (int, optional): Width of the output frame. Defaults to the
+            width of the sender's :attr:`~.sender.Sender.video_frame` (if
+            set) or ``1920``
+        yres (int, optional): Height of the output frame. Defaults to the
+            height of the sender's :attr:`~.sender.Sender.video_frame` (if
+            set) or ``1080``
+        fourcc (FourCC, optional): Format of the output frame. Defaults to
+            the format of the sender's :attr:`~.sender.Sender.video_frame`
+            (if set) or :attr:`~.wrapper.ndi_structs.FourCC.UYVY`. See
+            :func:`scale_frame` for the supported formats
+        frame_rate (fractions.Fraction, optional): Rate of the output clock.
+            Defaults to the frame rate of the sender's
+            :attr:`~.sender.Sender.video_frame` (if set) or ``30000/1001``
+        columns (int, optional): Number of tile columns. Defaults to the
+            smallest square grid that fits all inputs
+        rows (int, optional): Number of tile rows. Defaults to the number
+            needed for all inputs
+        scale_filter (ScaleFilter, optional): The filter used to scale the
+            input frames
+        num_threads (int, optional): Number of threads to scale tiles with
+
+    This class supports use as a :term:`context manager`, calling
+    :meth:`start` and :meth:`stop`.
+
+    Attributes:
+        tiles (tuple): The :class:`CompositorTile` for each input
+        xres (int): Width of the output frame
+        yres (int): Height of the output frame
+        fourcc (FourCC): Format of the output frame
+        columns (int): Number of tile columns
+        rows (int): Number of tile rows
+        scale_filter (ScaleFilter): The scaling filter
+        num_threads (int): Number of threads used to scale tiles
+        num_video_sent (int): Number of output frames sent
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.num_video_sent = 0
+        self.front = 1
+        self.job_number = 0
+        self.num_done = 0
+        self.stopping = False
+        self.workers_running = False
+        self.workers_stopping = False
+        self.workers = []
+        self.work_cond = Condition()
+        pacing_clock_init(&self.clock)
+
+    def __init__(
+        self,
+        Sender sender,
+        object inputs,
+        object xres=None,
+        object yres=None,
+        object fourcc=None,
+        object frame_rate=None,
+        object columns=None,
+        object rows=None,
+        ScaleFilter scale_filter=ScaleFilter.scale_bilinear,
+        size_t num_threads=1,
+    ):
+        cdef CompositorTile tile, prev = None
+        cdef list tiles = []
+        cdef size_t bpp, num_inputs, tile_w, tile_h, i
+        cdef uint8_t* canvas_ptr
+        cdef FourCC _fourcc
+
+        inputs = list(inputs)
+        num_inputs = len(inputs)
+        if not num_inputs:
+            raise ValueError('at least one input is required')
+        if num_threads < 1:
+            raise ValueError('num_threads must be at least 1')
+        has_video_frame = sender is not None and sender.has_video_frame
+        if xres is None or yres is None:
+            if has_video_frame:
+                _xres, _yres = sender.video_frame.get_resolution()
+            else:
+                _xres, _yres = 1920, 1080
+            xres = _xres if xres is None else xres
+            yres = _yres if yres is None else yres
+        if fourcc is None:
+            fourcc = sender.video_frame.get_fourcc() if has_video_frame else FourCC.UYVY
+        if frame_rate is None:
+            if has_video_frame:
+                frame_rate = sender.video_frame.get_frame_rate()
+            else:
+                frame_rate = Fraction(30000, 1001)
+        frame_rate = Fraction(frame_rate)
+        _fourcc = fourcc
+        bpp = _bytes_per_pixel(_fourcc)
+        if bpp == 0:
+            raise ValueError(f'Unsupported FourCC: {_fourcc!r}')
+        if xres <= 0 or yres <= 0:
+            raise ValueError('Invalid resolution')
+        if _fourcc == FourCC.UYVY and xres % 2:
+            raise ValueError('xres must be even for UYVY')
+
+        if columns is None:
+            columns = math.ceil(math.sqrt(num_inputs)) if rows is None else math.ceil(num_inputs / rows)
+        if rows is None:
+            rows = math.ceil(num_inputs / columns)
+        if columns < 1 or rows < 1 or columns * rows < num_inputs:
+            raise ValueError(f'A {columns}x{rows} grid cannot fit {num_inputs} inputs')
+        tile_w = xres // columns
+        tile_h = yres // rows
+        if _fourcc == FourCC.UYVY:
+            # Tiles must start and end on a pixel pair
+            tile_w -= tile_w % 2
+        if tile_w == 0 or tile_h == 0:
+            raise ValueError('Too many tiles for the output resolution')
+
+        self.sender = sender
+        self.xres = xres
+        self.yres = yres
+        self.fourcc = _fourcc
+        self.columns = columns
+        self.rows = rows
+        self.scale_filter = scale_filter
+        self.num_threads = num_threads
+        pacing_clock_set_rate(&self.clock, frame_rate.numerator, frame_rate.denominator)
+
+        for i, source in enumerate(inputs):
+            tile = CompositorTile(
+                source, i, (i % columns) * tile_w, (i // columns) * tile_h, tile_w, tile_h,
+            )
+            if prev is None:
+                self.first_tile = tile
+            else:
+                prev.next = tile
+            tiles.append(tile)
+            prev = tile
+        self.tiles = tuple(tiles)
+
+        self.canvas_data = np.empty((2, yres * xres * bpp), dtype=np.uint8)
+        # Fill with black
+        if _fourcc == FourCC.UYVY:
+            self.canvas_data[:, 0::2] = 128
+            self.canvas_data[:, 1::2] = 16
+        else:
+            self.canvas_data[...] = 0
+            self.canvas_data[:, 3::4] = 255
+        canvas_ptr = <uint8_t*>cnp.PyArray_DATA(self.canvas_data)
+        for i in range(2):
+            self.canvas.data[i] = canvas_ptr + i * self.yres * self.xres * bpp
+        self.canvas.xres = xres
+        self.canvas.yres = yres
+        self.canvas.line_stride = xres * bpp
+        self.canvas.bytes_per_pixel = bpp
+        self.canvas.fourcc = _fourcc
+        self.canvas.scale_filter = scale_filter
+        self.canvas.current = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def __len__(self):
+        return len(self.tiles)
+
+    @property
+    def inputs(self) -> tuple:
+        """The input frames
+        """
+        return tuple(tile.source for tile in self.tiles)
+
+    @property
+    def is_running(self) -> bool:
+        """``True`` while the compositing thread is running
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    @property
+    def frame_rate(self) -> Fraction:
+        """Rate of the output clock
+        """
+        return Fraction(self.clock.numerator, self.clock.denominator)
+
+    @property
+    def num_tiles_drawn(self) -> int:
+        """Total number of input frames drawn into tiles
+        """
+        return sum(tile.num_updates for tile in self.tiles)
+
+    @property
+    def num_tiles_skipped(self) -> int:
+        """Total number of tiles not redrawn because their input had not
+        changed
+        """
+        return sum(tile.num_skipped for tile in self.tiles)
+
+    def get_frame(self):
+        """Get a copy of the most recently composed output frame as a 1-d
+        :class:`numpy.ndarray` of bytes
+        """
+        return self.canvas_data[self.front].copy()
+
+    def start(self):
+        """Start the compositing (and worker) threads
+        """
+        cdef size_t i
+        if self.is_running:
+            return
+        self.stopping = False
+        self.workers_stopping = False
+        self.job_number = 0
+        self.workers = []
+        for i in range(1, self.num_threads):
+            t = threading.Thread(target=self._worker_func, args=(i,), daemon=True)
+            self.workers.append(t)
+            t.start()
+        self.workers_running = self.num_threads > 1
+        self.thread = threading.Thread(target=self._thread_func, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the compositing (and worker) threads and wait for them to exit
+        """
+        if self.thread is None:
+            return
+        self.stopping = True
+        self.thread.join()
+        self.thread = None
+        with self.work_cond:
+            self.workers_stopping = True
+            self.workers_running = False
+            self.work_cond.notify_all()
+        for t in self.workers:
+            t.join()
+        self.workers = []
+
+    def _thread_func(self):
+        with nogil:
+            try:
+                self._run()
+            finally:
+                self._flush_video()
+
+    def _worker_func(self, size_t worker):
+        with nogil:
+            self._run_worker(worker)
+
+    cdef int _run(self) except -1 nogil:
+        pacing_clock_reset(&self.clock)
+        while not self.stopping:
+            pacing_clock_wait(&self.clock)
+            if self.stopping:
+                break
+            self._tick()
+        return 0
+
+    cdef int _run_worker(self, size_t worker) except -1 nogil:
+        cdef size_t job = 0
+        self.work_cond._acquire(True, -1)
+        try:
+            while True:
+                while self.job_number == job and not self.workers_stopping:
+                    self.work_cond._wait(True, -1)
+                if self.workers_stopping:
+                    break
+                job = self.job_number
+                self.work_cond._release()
+                try:
+                    self.first_tile._compose(&self.canvas, worker, self.num_threads)
+                finally:
+                    self.work_cond._acquire(True, -1)
+                    self.num_done += 1
+                    self.work_cond._notify_all()
+        finally:
+            self.work_cond._release()
+        return 0
+
+    cdef int _tick(self) except -1 nogil:
+        cdef NDIlib_video_frame_v2_t* p = &self.video_frame_s
+        cdef size_t cur = 1 - self.front
+        self.canvas.current = cur
+        self._compose()
+        self.front = cur
+
+        p.xres = self.canvas.xres
+        p.yres = self.canvas.yres
+        p.FourCC = fourcc_type_cast(self.canvas.fourcc)
+        p.frame_rate_N = self.clock.numerator
+        p.frame_rate_D = self.clock.denominator
+        p.picture_aspect_ratio = 0
+        p.frame_format_type = NDIlib_frame_format_type_progressive
+        p.timecode = NDIlib_send_timecode_synthesize
+        p.p_data = self.canvas.data[cur]
+        p.line_stride_in_bytes = self.canvas.line_stride
+        p.p_metadata = NULL
+        p.timestamp = 0
+        if self._send_video(p):
+            self.num_video_sent += 1
+        return 0
+
+    cdef int _compose(self) except -1 nogil:
+        if not self.workers_running:
+            self.first_tile._compose(&self.canvas, 0, 1)
+            return 0
+        self.work_cond._acquire(True, -1)
+        try:
+            self.num_done = 0
+            self.job_number += 1
+            self.work_cond._notify_all()
+        finally:
+            self.work_cond._release()
+        try:
+            self.first_tile._compose(&self.canvas, 0, self.num_threads)
+        finally:
+            self.work_cond._acquire(True, -1)
+            try:
+                while self.num_done < self.num_threads - 1:
+                    self.work_cond._wait(True, -1)
+            finally:
+                self.work_cond._release()
+        return 0
+
+    cdef bint _send_video(self, NDIlib_video_frame_v2_t* p) noexcept nogil:
+        if self.sender is None:
+            return False
+        # The canvas stays untouched until the next call (or _flush_video)
+        return self.sender._send_video_frame(p, True)
+
+    cdef void _flush_video(self) noexcept nogil:
+        if self.sender is not None:
+            self.sender._flush_video()
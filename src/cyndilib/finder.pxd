@@ -10,6 +10,7 @@ from libcpp.map cimport map as cpp_map
 from .wrapper cimport *
 from .locks cimport RLock, Condition, Event
 from .callback cimport Callback
+from .metrics cimport MetricsKind, MetricsRow_s, metrics_register, metrics_unregister
 
 ctypedef cpp_list[cpp_string] cpp_str_list
 ctypedef cpp_map[cpp_string, NDIlib_source_t*] source_ptr_map_t
@@ -8,6 +8,12 @@ from .clock cimport time, sleep
 __all__ = ('Source', 'Finder', 'FinderThreadWorker', 'FinderThread')
 
 
+cdef int _fill_finder_metrics(object obj, MetricsRow_s* row) except -1:
+    cdef Finder finder = obj
+    row.sources = finder.num_sources
+    return 0
+
+
 cdef class Source:
     """Represents an |NDI| source
 
@@ -158,8 +164,10 @@ cdef class Finder:
         self.finder_thread = None
         self.finder_thread_running = Event()
         self.change_callback = Callback()
+        metrics_register(self, MetricsKind.metrics_finder, _fill_finder_metrics)
 
     def __dealloc__(self):
+        metrics_unregister(self)
         cdef NDIlib_find_instance_t p = self.find_p
         if p != NULL:
             self.find_p = NULL
@@ -333,9 +341,11 @@ cdef class Finder:
         return self._wait_timed(timeout)
 
     cdef int _wait(self) except -1 nogil:
-        with gil:
-            with self.notify:
-                self.notify.wait()
+        self.notify._acquire(True, -1)
+        try:
+            self.notify._wait(True, -1)
+        finally:
+            self.notify._release()
         # cdef unique_lock[mutex]* lk = new unique_lock[mutex](self.lock)
         # self.notify.wait(dereference(lk))
         # # lk.unlock()
@@ -344,9 +354,11 @@ cdef class Finder:
 
     cdef bint _wait_timed(self, float timeout) except -1 nogil:
         cdef bint notified
-        with gil:
-            with self.notify:
-                notified = self.notify.wait(timeout)
+        self.notify._acquire(True, -1)
+        try:
+            notified = self.notify._wait(True, timeout)
+        finally:
+            self.notify._release()
         return notified
 
     def wait_for_sources(self, float timeout):
@@ -398,24 +410,20 @@ cdef class Finder:
         return 0
 
     cdef int __notify_acquire(self) except -1 nogil:
-        with gil:
-            self.notify.acquire()
+        self.notify._acquire(True, -1)
         return 0
 
     cdef int __notify_notify(self) except -1 nogil:
-        with gil:
-            self.notify.notify_all()
+        self.notify._notify_all()
         return 0
 
     cdef int __notify_notify_and_release(self) except -1 nogil:
-        with gil:
-            self.notify.notify_all()
-            self.notify.release()
+        self.notify._notify_all()
+        self.notify._release()
         return 0
 
     cdef int __notify_release(self) except -1 nogil:
-        with gil:
-            self.notify.release()
+        self.notify._release()
         return 0
 
 
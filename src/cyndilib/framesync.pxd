@@ -2,14 +2,72 @@
 # distutils: language = c++
 
 from libc.stdint cimport *
+from libcpp.vector cimport vector
 
 from .wrapper cimport *
 
-from .locks cimport Event
+from .locks cimport RLock, Event
 from .callback cimport Callback
+from .pacing cimport PacingClock, PacingClock_s
 from .receiver cimport Receiver, ReceiveFrameType
 from .video_frame cimport VideoFrameSync
 from .audio_frame cimport AudioFrameSync
+from .tracing cimport TraceEventType, trace_begin, trace_event, trace_next_frame_id
+from .metrics cimport MetricsKind, MetricsRow_s, metrics_register, metrics_unregister
+
+cdef size_t video_frame_copy_into(
+    NDIlib_video_frame_v2_t* p, uint8_t[::1] dest
+) except? -1 nogil
+cdef size_t audio_frame_copy_into(
+    NDIlib_audio_frame_v3_t* p, float[:, ::1] dest, double scale
+) except? -1 nogil
+
+
+ctypedef int (*audio_pull_depth_func)(
+    NDIlib_framesync_instance_t fs_ptr
+) noexcept nogil
+
+ctypedef void (*audio_pull_capture_func)(
+    NDIlib_framesync_instance_t fs_ptr,
+    NDIlib_audio_frame_v3_t* audio_ptr,
+    int sample_rate,
+    int no_channels,
+    int no_samples,
+) noexcept nogil
+
+ctypedef void (*audio_pull_free_func)(
+    NDIlib_framesync_instance_t fs_ptr,
+    NDIlib_audio_frame_v3_t* audio_ptr,
+) noexcept nogil
+
+
+cdef struct AudioPull_s:
+    NDIlib_framesync_instance_t fs_ptr
+    audio_pull_depth_func queue_depth
+    audio_pull_capture_func capture
+    audio_pull_free_func free_audio
+    int sample_rate
+    int64_t max_queue_samples
+    double scale
+    int64_t last_queue_depth
+    int64_t num_pulls
+    int64_t samples_pulled
+    int64_t num_padded
+    int64_t samples_padded
+    int64_t num_dropped
+    int64_t samples_dropped
+
+
+cdef void audio_pull_init(AudioPull_s* ptr, NDIlib_framesync_instance_t fs_ptr) noexcept nogil
+cdef void audio_pull_reset_stats(AudioPull_s* ptr) noexcept nogil
+cdef size_t audio_pull(
+    AudioPull_s* ptr,
+    float* dest,
+    size_t num_channels,
+    size_t num_samples,
+    size_t channel_stride,
+) noexcept nogil
+
 
 cdef class FrameSync:
     cdef NDIlib_framesync_instance_t ptr
@@ -22,9 +80,11 @@ cdef class FrameSync:
     cdef int _set_video_framesync_instance(self) except -1 nogil
     cdef int _set_audio_framesync_instance(self) except -1 nogil
     cdef int _audio_samples_available(self) noexcept nogil
-    cdef int _capture_video(self, FrameFormat fmt=*) except -1
-    cdef size_t _capture_available_audio(self) except? -1
-    cdef size_t _capture_audio(self, size_t no_samples, bint limit=*, bint truncate=*) except? -1
+    cdef int _capture_video(self, FrameFormat fmt=*) except -1 nogil
+    cdef size_t _capture_available_audio(self) except? -1 nogil
+    cdef size_t _capture_audio(self, size_t no_samples, bint limit=*, bint truncate=*) except? -1 nogil
+    cdef size_t _capture_video_into(self, uint8_t[::1] dest, FrameFormat fmt=*) except? -1 nogil
+    cdef size_t _capture_audio_into(self, float[:, ::1] dest, int sample_rate=*) except? -1 nogil
 
     cdef int _do_capture_video(
         self,
@@ -40,3 +100,80 @@ cdef class FrameSync:
 
     cdef void _free_video(self, NDIlib_video_frame_v2_t* video_ptr) noexcept nogil
     cdef void _free_audio(self, NDIlib_audio_frame_v3_t* audio_ptr) noexcept nogil
+
+
+cdef class FrameSyncWorker:
+    cdef FrameSync frame_sync
+    cdef Event wait_event
+    cdef bint running
+    cdef Callback callback
+    cdef double target_fps
+    cdef double target_interval
+    cdef frame_rate_t frame_rate
+    cdef frame_rate_t _output_rate
+    cdef bint has_output_rate
+    cdef readonly PacingClock pacing_clock
+    cdef readonly size_t num_captures, num_overruns
+
+    cdef int run(self) except -1
+    cdef int _run(self) except -1 nogil
+    cdef int trigger_callback(self) except -1
+    cdef void time_sleep(self, double timeout) noexcept nogil
+    cdef double now(self) noexcept nogil
+    cdef int wait_for_evt(self, double timeout) except -1 nogil
+    cdef bint _has_callback(self) noexcept nogil
+    cdef bint has_frame(self) except -1
+    cdef bint is_connected(self) except -1 nogil
+    cdef bint can_capture(self) noexcept nogil
+    cdef bint do_capture(self) except -1 nogil
+    cdef int get_source_rate(self, frame_rate_t* fr) except -1 nogil
+    cdef int update_fps(self) except -1 nogil
+    cdef int _set_frame_rate(self, int numerator, int denominator) except -1 nogil
+    cdef int stop(self) except -1
+
+
+cdef class VideoWorker(FrameSyncWorker):
+    cdef VideoFrameSync video_frame
+
+
+cdef class AudioWorker(FrameSyncWorker):
+    cdef AudioFrameSync audio_frame
+    cdef size_t target_nsamples
+
+    cdef size_t _get_tick_samples(self) noexcept nogil
+
+
+cdef struct FrameSyncGroupEntry_s:
+    NDIlib_framesync_instance_t fs_ptr
+    NDIlib_video_frame_v2_t* video_ptr
+    NDIlib_audio_frame_v3_t* audio_ptr
+    size_t num_samples
+
+
+cdef class FrameSyncGroup(FrameSyncWorker):
+    cdef vector[FrameSyncGroupEntry_s] entries
+    cdef list members
+    cdef list frames
+    cdef tuple results
+    cdef readonly bint capture_video, capture_audio
+    cdef readonly int64_t timestamp
+    cdef object group_callback
+    cdef object thread
+    cdef RLock lock
+
+    cdef int _add_entry(
+        self,
+        object member,
+        NDIlib_framesync_instance_t fs_ptr,
+        VideoFrameSync video_frame,
+        AudioFrameSync audio_frame,
+    ) except -1
+    cdef int _rebuild_results(self) except -1
+    cdef int _capture_entry(self, FrameSyncGroupEntry_s* entry) except -1 nogil
+
+
+cdef class AudioPullSource:
+    cdef AudioPull_s state
+    cdef readonly FrameSync frame_sync
+
+    cdef AudioPull_s* _get_state(self) noexcept nogil
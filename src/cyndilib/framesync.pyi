@@ -1,12 +1,17 @@
 # import _cython_3_0_10
 import threading
+from fractions import Fraction
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+import numpy as np
+import numpy.typing as npt
 
 from .wrapper import FrameFormat
 from .audio_frame import AudioFrameSync
 from .video_frame import VideoFrameSync
 from .receiver import Receiver, ReceiveFrameType
+from .pacing import PacingClock
 
 if TYPE_CHECKING:
     from .callback import _CallbackType
@@ -20,14 +25,28 @@ class FrameSync:
     def __init__(self, receiver: Receiver) -> None: ...
     def audio_samples_available(self) -> int: ...
     def capture_audio(self, no_samples: int) -> int: ...
+    def capture_audio_into(
+        self, dest: npt.NDArray[np.float32], sample_rate: int = ...
+    ) -> int: ...
     def capture_available_audio(self) -> int: ...
     def capture_video(self, fmt: FrameFormat = ...) -> None: ...
+    def capture_video_into(
+        self, dest: npt.NDArray[np.uint8], fmt: FrameFormat = ...
+    ) -> int: ...
     def set_audio_frame(self, audio_frame: AudioFrameSync) -> None: ...
     def set_video_frame(self, video_frame: VideoFrameSync) -> None: ...
     def __reduce__(self): ...
 
 class FrameSyncThread(threading.Thread):
-    def __init__(self, frame_sync: FrameSync, ft: ReceiveFrameType) -> None: ...
+    worker: FrameSyncWorker
+    output_rate: Fraction|None
+    def __init__(
+        self,
+        frame_sync: FrameSync,
+        ft: ReceiveFrameType,
+        output_rate: Fraction|None = ...,
+    ) -> None: ...
+    def get_stats(self) -> dict[str, int]: ...
     def remove_callback(self) -> None: ...
     def run(self) -> None: ...
     def set_callback(self, cb: _CallbackType) -> None: ...
@@ -35,7 +54,15 @@ class FrameSyncThread(threading.Thread):
 
 class FrameSyncWorker:
     # __pyx_vtable__: ClassVar[PyCapsule] = ...
+    pacing_clock: PacingClock
+    num_captures: int
+    num_overruns: int
+    output_rate: Fraction|None
     def __init__(self, *args, **kwargs) -> None: ...
+    @property
+    def num_late(self) -> int: ...
+    @property
+    def num_skipped(self) -> int: ...
     def __reduce__(self): ...
 
 class AudioWorker(FrameSyncWorker):
@@ -47,3 +74,45 @@ class VideoWorker(FrameSyncWorker):
     # __pyx_vtable__: ClassVar[PyCapsule] = ...
     def __init__(self, *args, **kwargs) -> None: ...
     def __reduce__(self): ...
+
+class FrameSyncGroup(FrameSyncWorker):
+    # __pyx_vtable__: ClassVar[PyCapsule] = ...
+    capture_video: bool
+    capture_audio: bool
+    timestamp: int
+    def __init__(
+        self,
+        frame_syncs: Iterable[FrameSync] = ...,
+        ft: ReceiveFrameType = ...,
+        output_rate: Fraction|None = ...,
+    ) -> None: ...
+    def __len__(self) -> int: ...
+    def __enter__(self) -> FrameSyncGroup: ...
+    def __exit__(self, *args) -> None: ...
+    @property
+    def frame_syncs(self) -> tuple[FrameSync, ...]: ...
+    @property
+    def is_running(self) -> bool: ...
+    def add(self, frame_sync: FrameSync) -> None: ...
+    def remove(self, frame_sync: FrameSync) -> None: ...
+    def set_callback(self, cb: Callable[[tuple[Any, ...], int], Any]) -> None: ...
+    def remove_callback(self) -> None: ...
+    def start(self) -> None: ...
+    def close(self, timeout: float|None = ...) -> None: ...
+
+class AudioPullSource:
+    # __pyx_vtable__: ClassVar[PyCapsule] = ...
+    frame_sync: FrameSync
+    sample_rate: int
+    max_queue_samples: int
+    def __init__(
+        self,
+        frame_sync: FrameSync,
+        sample_rate: int = ...,
+        max_queue_samples: int = ...,
+    ) -> None: ...
+    @property
+    def queue_depth(self) -> int: ...
+    def pull(self, dest: npt.NDArray[np.float32]) -> int: ...
+    def get_stats(self) -> dict[str, int]: ...
+    def reset_stats(self) -> None: ...
@@ -1,9 +1,15 @@
 cimport cython
 from libc.math cimport lround
+from libc.string cimport memcpy, memset
 
 import threading
+from fractions import Fraction
 
-from .clock cimport time, sleep
+from .clock cimport time, sleep, monotonic_ns
+from .pacing cimport (
+    pacing_clock_reset, pacing_clock_wait, pacing_clock_deadline,
+    pacing_clock_offset,
+)
 from .framesync_helper cimport (
     FrameSyncVideoInstance_s, FrameSyncAudioInstance_s,
     _free_video_default_func, _free_audio_default_func,
@@ -11,11 +17,174 @@ from .framesync_helper cimport (
 
 
 __all__ = (
-    'FrameSync', 'FrameSyncThread',
+    'FrameSync', 'FrameSyncThread', 'FrameSyncGroup', 'AudioPullSource',
     'FrameSyncWorker', 'VideoWorker', 'AudioWorker',
 )
 
 
+cdef int _fill_framesync_metrics(object obj, MetricsRow_s* row) except -1:
+    cdef FrameSync fs = obj
+    row.audio_queue_depth = fs._audio_samples_available()
+    return 0
+
+
+cdef size_t get_tick_samples(
+    PacingClock_s* clock, int64_t sample_rate, size_t default_nsamples
+) noexcept nogil:
+    # Number of samples between the tick just waited for and the next one,
+    # so the total over many ticks matches the sample rate exactly
+    cdef int64_t index = clock.frame_index
+    if index <= 0:
+        return default_nsamples
+    return (
+        pacing_clock_offset(clock, index, sample_rate) -
+        pacing_clock_offset(clock, index - 1, sample_rate)
+    )
+
+
+cdef size_t video_frame_copy_into(
+    NDIlib_video_frame_v2_t* p, uint8_t[::1] dest
+) except? -1 nogil:
+    # Copy the data of a video frame into dest, returning the number of bytes
+    cdef FourCCPackInfo pack_info
+    if p.p_data is NULL or p.xres <= 0 or p.yres <= 0:
+        return 0
+    fourcc_pack_info_init(&pack_info)
+    pack_info.fourcc = fourcc_type_uncast(p.FourCC)
+    pack_info.xres = p.xres
+    pack_info.yres = p.yres
+    calc_fourcc_pack_info(&pack_info, p.line_stride_in_bytes)
+    if pack_info.total_size > <size_t>dest.shape[0]:
+        raise_withgil(PyExc_ValueError, 'destination is too small for the video frame')
+    memcpy(&dest[0], p.p_data, pack_info.total_size)
+    return pack_info.total_size
+
+
+cdef size_t audio_frame_copy_into(
+    NDIlib_audio_frame_v3_t* p, float[:, ::1] dest, double scale
+) except? -1 nogil:
+    # Copy the samples of an audio frame into dest (multiplied by scale),
+    # returning the number of samples per channel
+    cdef size_t nrows = dest.shape[0], ncols = dest.shape[1], i, j
+    cdef float* src
+    if p.p_data is NULL or p.no_channels <= 0 or p.no_samples <= 0:
+        return 0
+    if <size_t>p.no_channels < nrows:
+        nrows = p.no_channels
+    if <size_t>p.no_samples < ncols:
+        ncols = p.no_samples
+    for i in range(nrows):
+        src = <float*>(p.p_data + i * p.channel_stride_in_bytes)
+        if scale == 1:
+            memcpy(&dest[i, 0], src, ncols * sizeof(float))
+        else:
+            for j in range(ncols):
+                dest[i, j] = src[j] * scale
+    return ncols
+
+
+cdef int _audio_pull_default_depth(NDIlib_framesync_instance_t fs_ptr) noexcept nogil:
+    return NDIlib_framesync_audio_queue_depth(fs_ptr)
+
+
+cdef void _audio_pull_default_capture(
+    NDIlib_framesync_instance_t fs_ptr,
+    NDIlib_audio_frame_v3_t* audio_ptr,
+    int sample_rate,
+    int no_channels,
+    int no_samples,
+) noexcept nogil:
+    NDIlib_framesync_capture_audio_v2(fs_ptr, audio_ptr, sample_rate, no_channels, no_samples)
+
+
+cdef void _audio_pull_default_free(
+    NDIlib_framesync_instance_t fs_ptr,
+    NDIlib_audio_frame_v3_t* audio_ptr,
+) noexcept nogil:
+    NDIlib_framesync_free_audio_v2(fs_ptr, audio_ptr)
+
+
+cdef void audio_pull_init(AudioPull_s* ptr, NDIlib_framesync_instance_t fs_ptr) noexcept nogil:
+    ptr.fs_ptr = fs_ptr
+    ptr.queue_depth = _audio_pull_default_depth
+    ptr.capture = _audio_pull_default_capture
+    ptr.free_audio = _audio_pull_default_free
+    ptr.sample_rate = 48000
+    ptr.max_queue_samples = 0
+    ptr.scale = 1
+    audio_pull_reset_stats(ptr)
+
+
+cdef void audio_pull_reset_stats(AudioPull_s* ptr) noexcept nogil:
+    ptr.last_queue_depth = 0
+    ptr.num_pulls = 0
+    ptr.samples_pulled = 0
+    ptr.num_padded = 0
+    ptr.samples_padded = 0
+    ptr.num_dropped = 0
+    ptr.samples_dropped = 0
+
+
+cdef size_t audio_pull(
+    AudioPull_s* ptr,
+    float* dest,
+    size_t num_channels,
+    size_t num_samples,
+    size_t channel_stride,
+) noexcept nogil:
+    # Fill exactly num_samples for each of num_channels in dest (with rows
+    # channel_stride floats apart). This is meant to be called from the
+    # period callback of an audio device, so nothing here allocates or
+    # needs the GIL.
+    cdef NDIlib_audio_frame_v3_t frame
+    cdef int64_t depth, excess
+    cdef size_t i, j, ncols
+    cdef float* src
+    cdef float* row
+    if num_channels == 0 or num_samples == 0:
+        return 0
+
+    depth = ptr.queue_depth(ptr.fs_ptr)
+    ptr.last_queue_depth = depth
+    if ptr.max_queue_samples > 0:
+        excess = depth - <int64_t>num_samples - ptr.max_queue_samples
+        if excess > 0:
+            # Discard the oldest samples so the latency stays bounded
+            memset(&frame, 0, sizeof(NDIlib_audio_frame_v3_t))
+            ptr.capture(ptr.fs_ptr, &frame, ptr.sample_rate, num_channels, excess)
+            ptr.free_audio(ptr.fs_ptr, &frame)
+            ptr.num_dropped += 1
+            ptr.samples_dropped += excess
+            depth -= excess
+    if depth < <int64_t>num_samples:
+        # The frame sync fills the remainder with silence
+        ptr.num_padded += 1
+        ptr.samples_padded += <int64_t>num_samples - depth
+
+    memset(&frame, 0, sizeof(NDIlib_audio_frame_v3_t))
+    ptr.capture(ptr.fs_ptr, &frame, ptr.sample_rate, num_channels, num_samples)
+    ncols = num_samples
+    if frame.no_samples >= 0 and <size_t>frame.no_samples < ncols:
+        ncols = frame.no_samples
+    for i in range(num_channels):
+        row = dest + i * channel_stride
+        if frame.p_data is NULL or i >= <size_t>frame.no_channels:
+            memset(row, 0, num_samples * sizeof(float))
+            continue
+        src = <float*>(frame.p_data + i * frame.channel_stride_in_bytes)
+        if ptr.scale == 1:
+            memcpy(row, src, ncols * sizeof(float))
+        else:
+            for j in range(ncols):
+                row[j] = src[j] * ptr.scale
+        if ncols < num_samples:
+            memset(row + ncols, 0, (num_samples - ncols) * sizeof(float))
+    ptr.free_audio(ptr.fs_ptr, &frame)
+    ptr.num_pulls += 1
+    ptr.samples_pulled += num_samples
+    return num_samples
+
+
 cdef class FrameSync:
     """A wrapper around the |NDI| frame synchronization module
 
@@ -47,8 +216,10 @@ cdef class FrameSync:
         self.ptr = NDIlib_framesync_create(recv_ptr)
         if self.ptr is NULL:
             raise MemoryError()
+        metrics_register(self, MetricsKind.metrics_framesync, _fill_framesync_metrics)
 
     def __dealloc__(self):
+        metrics_unregister(self)
         cdef NDIlib_framesync_instance_t ptr = self.ptr
         if ptr is not NULL:
             self.ptr = NULL
@@ -92,6 +263,59 @@ cdef class FrameSync:
         """
         return self._capture_audio(no_samples)
 
+    def capture_video_into(
+        self, uint8_t[::1] dest, FrameFormat fmt = FrameFormat.progressive
+    ) -> int:
+        """Capture video and copy its data into *dest*
+
+        The data is copied from the |NDI| library's buffer into *dest* without
+        the :term:`GIL`, so the caller can manage its own (possibly pooled)
+        arrays instead of reading from :attr:`video_frame`, which is
+        not modified.
+
+        Arguments:
+            dest: A writable, contiguous buffer of unsigned 8-bit integers
+                (such as a :class:`numpy.ndarray`) large enough for the frame
+            fmt (FrameFormat, optional): The field format to capture
+
+        Returns the number of bytes copied (zero if no video has been
+        received yet)
+
+        Raises:
+            ValueError: If *dest* is too small for the frame
+
+        .. versionadded:: 0.0.10
+        """
+        cdef size_t size
+        with nogil:
+            size = self._capture_video_into(dest, fmt)
+        return size
+
+    def capture_audio_into(self, float[:, ::1] dest, int sample_rate=0) -> int:
+        """Capture available audio samples and copy them into *dest*
+
+        Like :meth:`capture_audio`, but the samples are copied without the
+        :term:`GIL` into *dest*, a writable float32 array with shape
+        ``(num_channels, num_samples)``. Up to ``num_samples`` are captured
+        with the |NDI| library converting to ``num_channels``.
+
+        If the :attr:`audio_frame` is set, the samples are scaled to its
+        :attr:`~.audio_frame.AudioFrame.reference_level`.
+
+        Arguments:
+            dest: The array to copy the samples into
+            sample_rate (int, optional): The sample rate to convert to.
+                If zero (the default), the source sample rate is used
+
+        Returns the number of samples copied for each channel
+
+        .. versionadded:: 0.0.10
+        """
+        cdef size_t nsamp
+        with nogil:
+            nsamp = self._capture_audio_into(dest, sample_rate)
+        return nsamp
+
     def audio_samples_available(self) -> int:
         """Get the number of audio samples currently available for capture
         """
@@ -129,21 +353,28 @@ cdef class FrameSync:
     cdef int _audio_samples_available(self) noexcept nogil:
         return NDIlib_framesync_audio_queue_depth(self.ptr)
 
-    cdef int _capture_video(self, FrameFormat fmt = FrameFormat.progressive) except -1:
+    cdef int _capture_video(self, FrameFormat fmt = FrameFormat.progressive) except -1 nogil:
         cdef NDIlib_video_frame_v2_t* video_ptr = self.video_frame.ptr
+        cdef int64_t trace_start = trace_begin()
         self._do_capture_video(video_ptr, fmt)
         self.video_frame._process_incoming()
+        if trace_start != 0:
+            trace_event(
+                TraceEventType.trace_capture, self.receiver.trace_source_id,
+                trace_next_frame_id(), video_ptr.timestamp, trace_start, 0,
+            )
         return 0
 
-    cdef size_t _capture_available_audio(self) except? -1:
+    cdef size_t _capture_available_audio(self) except? -1 nogil:
         cdef size_t no_samples = self._audio_samples_available()
         if no_samples == 0:
             return 0
         return self._capture_audio(no_samples, False)
 
-    cdef size_t _capture_audio(self, size_t no_samples, bint limit=True, bint truncate=True) except? -1:
+    cdef size_t _capture_audio(self, size_t no_samples, bint limit=True, bint truncate=True) except? -1 nogil:
         cdef NDIlib_audio_frame_v3_t* audio_ptr = self.audio_frame.ptr
         cdef size_t num_available
+        cdef int64_t trace_start
         if limit:
             num_available = self._audio_samples_available()
             if num_available == 0:
@@ -152,10 +383,50 @@ cdef class FrameSync:
                 if not truncate:
                     return 0
                 no_samples = num_available
+        trace_start = trace_begin()
         self._do_capture_audio(audio_ptr, no_samples)
         self.audio_frame._process_incoming()
+        if trace_start != 0:
+            trace_event(
+                TraceEventType.trace_capture, self.receiver.trace_source_id,
+                trace_next_frame_id(), audio_ptr.timestamp, trace_start, no_samples,
+            )
         return no_samples
 
+    cdef size_t _capture_video_into(
+        self,
+        uint8_t[::1] dest,
+        FrameFormat fmt = FrameFormat.progressive,
+    ) except? -1 nogil:
+        cdef NDIlib_video_frame_v2_t frame
+        memset(&frame, 0, sizeof(NDIlib_video_frame_v2_t))
+        self._do_capture_video(&frame, fmt)
+        try:
+            return video_frame_copy_into(&frame, dest)
+        finally:
+            self._free_video(&frame)
+
+    cdef size_t _capture_audio_into(self, float[:, ::1] dest, int sample_rate=0) except? -1 nogil:
+        cdef NDIlib_audio_frame_v3_t frame
+        cdef size_t no_samples = dest.shape[1]
+        cdef size_t num_available = self._audio_samples_available()
+        cdef double scale = 1
+        if num_available < no_samples:
+            no_samples = num_available
+        if no_samples == 0 or dest.shape[0] == 0:
+            return 0
+        if self.audio_frame is not None:
+            if not self.audio_frame.reference_converter._is_ndi_native():
+                scale = self.audio_frame.reference_converter.ptr.divisor
+        memset(&frame, 0, sizeof(NDIlib_audio_frame_v3_t))
+        NDIlib_framesync_capture_audio_v2(
+            self.ptr, &frame, sample_rate, dest.shape[0], no_samples,
+        )
+        try:
+            return audio_frame_copy_into(&frame, dest, scale)
+        finally:
+            self._free_audio(&frame)
+
     cdef int _do_capture_video(
         self,
         NDIlib_video_frame_v2_t* video_ptr,
@@ -183,9 +454,16 @@ cdef class FrameSync:
         NDIlib_framesync_free_audio_v2(self.ptr, audio_ptr)
 
 
-cdef class FrameSyncWorker():
+cdef class FrameSyncWorker:
     """Worker for :class:`FrameSyncThread`
 
+    Captures are paced by a :class:`~.pacing.PacingClock` on absolute
+    deadlines derived from the source frame rate (or the :attr:`output_rate`
+    if one is set), so the capture interval does not drift.
+
+    The capture loop runs without the :term:`GIL`, which is only acquired
+    to trigger the :attr:`callback`.
+
     Attributes:
         frame_sync (FrameSync): The parent FrameSync instance
         running (bool): Current run state
@@ -193,62 +471,106 @@ cdef class FrameSyncWorker():
         target_fps (float): The target frame rate
         target_interval (float): Interval between frames defined as :math:`1/F_r`
         frame_rate (fractions.Fraction): The current frame rate
+        pacing_clock (PacingClock): The clock used to schedule captures
 
-    """
-    cdef FrameSync frame_sync
-    cdef Event wait_event
-    cdef bint running
-    cdef Callback callback
-    cdef double target_fps
-    cdef double target_interval
-    cdef double next_timestamp
-    cdef frame_rate_t frame_rate
+            .. versionadded:: 0.0.10
+
+        num_captures (int): Number of successful captures
+
+            .. versionadded:: 0.0.10
+
+        num_overruns (int): Number of times a capture (and its callback)
+            took long enough to miss the following deadline
 
+            .. versionadded:: 0.0.10
+
+    """
     def __cinit__(self, *args, **kwargs):
-        self.target_fps = 9
-        self.target_interval = 1 / 9.0
-        self.next_timestamp = -1
-        self.frame_rate.numerator = 1
-        self.frame_rate.denominator = 100
+        self.frame_rate.numerator = 30000
+        self.frame_rate.denominator = 1001
+        self.target_fps = 30000 / 1001.
+        self.target_interval = 1 / self.target_fps
+        self.has_output_rate = False
 
     def __init__(self, FrameSync frame_sync):
         self.frame_sync = frame_sync
         self.callback = Callback()
         self.wait_event = Event()
+        self.pacing_clock = PacingClock()
+
+    @property
+    def output_rate(self):
+        """A fixed rate to capture at instead of the source frame rate,
+        or ``None`` to follow the source
+
+        For :class:`AudioWorker`, this is the number of captures per second
+        with the number of samples for each capture derived from it.
+
+        .. versionadded:: 0.0.10
+        """
+        if not self.has_output_rate:
+            return None
+        return Fraction(self._output_rate.numerator, self._output_rate.denominator)
+    @output_rate.setter
+    def output_rate(self, value):
+        if value is None:
+            self.has_output_rate = False
+            return
+        value = Fraction(value)
+        if value <= 0:
+            raise ValueError('Invalid frame rate')
+        self._output_rate.numerator = value.numerator
+        self._output_rate.denominator = value.denominator
+        self.has_output_rate = True
+
+    @property
+    def num_late(self) -> int:
+        """Number of captures started after their deadline
+
+        .. versionadded:: 0.0.10
+        """
+        return self.pacing_clock.clock.late_count
+
+    @property
+    def num_skipped(self) -> int:
+        """Number of capture deadlines skipped after falling too far behind
+
+        .. versionadded:: 0.0.10
+        """
+        return self.pacing_clock.clock.skip_count
+
+    cdef int run(self) except -1:
+        with nogil:
+            self._run()
+        return 0
 
-    cdef run(self):
+    cdef int _run(self) except -1 nogil:
+        cdef PacingClock_s* clock = &self.pacing_clock.clock
+        cdef bint ready = False
         self.running = True
-        cdef double now
-        cdef bint captured = False
-        cdef double wait_time
         while self.running:
-            try:
-                if not self.has_frame() or not self.frame_sync.receiver._is_connected():
-                    self.next_timestamp = -1
-                    self.wait_for_evt(.1)
-                    continue
-                now = self.now()
-
-
-                if (self.can_capture() and
-                    self.next_timestamp >= now or self.next_timestamp == -1):
-
-                    captured = self.do_capture()
-                    if captured:
-                        self.trigger_callback()
-                    self.next_timestamp = self.calc_next_ts(self.now())
-
-                else:
-                    wait_time = self.next_timestamp - now
-                    if wait_time <= 0:
-                        print(f'wait time: {wait_time}')
-                        self.next_timestamp = self.calc_next_ts(self.now())
-                        continue
-                    self.wait_for_evt(wait_time)
-            except:
-                import traceback
-                traceback.print_exc()
+            if not ready:
+                with gil:
+                    ready = self.has_frame()
+            if not ready or not self.is_connected():
+                pacing_clock_reset(clock)
+                self.wait_for_evt(.1)
+                continue
+            if not clock.started:
+                self.update_fps()
+            pacing_clock_wait(clock)
+            if not self.running:
                 break
+            if self.can_capture():
+                if self.do_capture():
+                    self.num_captures += 1
+                    if self._has_callback():
+                        with gil:
+                            self.trigger_callback()
+            self.update_fps()
+            if monotonic_ns() > pacing_clock_deadline(clock, clock.frame_index):
+                self.num_overruns += 1
+        return 0
 
     cdef int trigger_callback(self) except -1:
         """Trigger the :attr:`callback` if set
@@ -263,43 +585,65 @@ cdef class FrameSyncWorker():
     cdef double now(self) noexcept nogil:
         return time()
 
-    cdef int wait_for_evt(self, double timeout) except -1:
+    cdef int wait_for_evt(self, double timeout) except -1 nogil:
         self.wait_event._wait(True, timeout)
         self.wait_event._clear()
         return 0
 
+    cdef bint _has_callback(self) noexcept nogil:
+        return self.callback.has_callback
+
     cdef bint has_frame(self) except -1:
         return False
 
+    cdef bint is_connected(self) except -1 nogil:
+        return self.frame_sync.receiver._is_connected()
+
     cdef bint can_capture(self) noexcept nogil:
         return False
 
-    cdef bint do_capture(self) except -1:
+    cdef bint do_capture(self) except -1 nogil:
         return 0
 
-    cdef void update_fps(self) noexcept nogil:
-        pass
+    cdef int get_source_rate(self, frame_rate_t* fr) except -1 nogil:
+        fr.numerator = 30000
+        fr.denominator = 1001
+        return 0
 
-    cdef double calc_next_ts(self, double now) noexcept nogil:
-        if self.target_fps == 9:
-            self.update_fps()
-        return now + self.target_interval
+    cdef int update_fps(self) except -1 nogil:
+        cdef frame_rate_t fr
+        if self.has_output_rate:
+            fr = self._output_rate
+        else:
+            self.get_source_rate(&fr)
+        self._set_frame_rate(fr.numerator, fr.denominator)
+        return 0
+
+    @cython.cdivision(True)
+    cdef int _set_frame_rate(self, int numerator, int denominator) except -1 nogil:
+        if self.frame_rate.numerator == numerator and self.frame_rate.denominator == denominator:
+            return 0
+        self.frame_rate.numerator = numerator
+        self.frame_rate.denominator = denominator
+        self.target_fps = numerator / <double>denominator
+        self.target_interval = 1 / self.target_fps
+        self.pacing_clock._set_frame_rate(numerator, denominator)
+        return 0
 
     cdef int stop(self) except -1:
-        self.wait_event._set()
         self.running = False
+        self.wait_event._set()
         return 0
 
 
 cdef class VideoWorker(FrameSyncWorker):
     """Worker used by :class:`FrameSyncThread` for video frames
     """
-    cdef VideoFrameSync video_frame
 
     cdef bint can_capture(self) noexcept nogil:
         return True
 
-    cdef bint do_capture(self) except -1:
+    cdef bint do_capture(self) except -1 nogil:
         self.frame_sync._capture_video()
         return True
 
@@ -311,34 +655,41 @@ cdef class VideoWorker(FrameSyncWorker):
             return True
         return False
 
-    @cython.cdivision(True)
-    cdef void update_fps(self) noexcept nogil:
-        cdef frame_rate_t* fr = self.video_frame._get_frame_rate()
-        self.frame_rate.numerator = fr.numerator
-        self.frame_rate.denominator = fr.denominator
-        if fr.denominator <= 0 or fr.numerator == 0:
-            self.target_fps = 9
-            self.target_interval = 1 / 30.
+    cdef int get_source_rate(self, frame_rate_t* fr) except -1 nogil:
+        cdef frame_rate_t* src_fr = self.video_frame._get_frame_rate()
+        if src_fr.denominator <= 0 or src_fr.numerator <= 0:
+            fr.numerator = 30000
+            fr.denominator = 1001
         else:
-            self.target_fps = fr.numerator / <double>fr.denominator
-            self.target_interval = 1 / self.target_fps
+            fr.numerator = src_fr.numerator
+            fr.denominator = src_fr.denominator
+        return 0
 
 
 cdef class AudioWorker(FrameSyncWorker):
     """Worker used by :class:`FrameSyncThread` for audio frames
+
+    Captures :attr:`target_nsamples` per interval, so the pacing rate is
+    the sample rate divided by the number of samples. If an
+    :attr:`~FrameSyncWorker.output_rate` is set, the number of samples
+    for each interval is derived from it instead.
     """
-    cdef AudioFrameSync audio_frame
-    cdef size_t target_nsamples
 
     def __cinit__(self, *args, **kwargs):
         self.target_nsamples = 800
 
+    cdef size_t _get_tick_samples(self) noexcept nogil:
+        cdef int64_t fs = self.audio_frame._get_sample_rate()
+        if not self.has_output_rate or fs <= 0:
+            return self.target_nsamples
+        return get_tick_samples(&self.pacing_clock.clock, fs, self.target_nsamples)
+
     cdef bint can_capture(self) noexcept nogil:
-        return self.frame_sync._audio_samples_available() >= self.target_nsamples
+        return self.frame_sync._audio_samples_available() >= self._get_tick_samples()
 
-    cdef bint do_capture(self) except -1:
+    cdef bint do_capture(self) except -1 nogil:
         cdef size_t nsamp
-        nsamp = self.frame_sync._capture_audio(self.target_nsamples, limit=True, truncate=False)
+        nsamp = self.frame_sync._capture_audio(self._get_tick_samples(), limit=True, truncate=False)
         return nsamp > 0
 
     cdef bint has_frame(self) except -1:
@@ -349,32 +700,13 @@ cdef class AudioWorker(FrameSyncWorker):
             return True
         return False
 
-    @cython.cdivision(True)
-    cdef void update_fps(self) noexcept nogil:
-        cdef frame_rate_t* fr
-        cdef double fps
-        cdef size_t fs = self.audio_frame._get_sample_rate()
-        cdef size_t nsamp
-        nsamp = self.target_nsamples
-        fps = nsamp / <double>fs
-        # if fs == 0:
-        #     fps = 9
-        #     nsamp = 1600
-        # elif video_frame is None:
-        #     nsamp = self.target_nsamples
-        #     fps = nsamp / <double>fs
-        # else:
-        #     fr = video_frame._get_frame_rate()
-        #     if fr.numerator == 0 or fr.denominator == 0:
-        #         fps = 9
-        #         nsamp = 1600
-        #     else:
-        #         fps = fr.numerator / <double>fr.denominator
-        #         nsamp = lround((1 / fps) / (1 / <double>fs))
-        #         fps = fs / nsamp
-        self.target_nsamples = nsamp
-        self.target_fps = fps
-        self.target_interval = 1.0 / fps
+    cdef int get_source_rate(self, frame_rate_t* fr) except -1 nogil:
+        cdef int fs = self.audio_frame._get_sample_rate()
+        if fs <= 0:
+            fs = 48000
+        fr.numerator = fs
+        fr.denominator = self.target_nsamples
+        return 0
 
 
 class FrameSyncThread(threading.Thread):
@@ -389,13 +721,18 @@ class FrameSyncThread(threading.Thread):
         ft (ReceiveFrameType): The type(s) of frames to receive (either
             :attr:`~.receiver.ReceiveFrameType.recv_video` or
             :attr:`~.receiver.ReceiveFrameType.recv_audio`)
+        output_rate (fractions.Fraction, optional): If given, captures are
+            made at this rate instead of the source frame rate
+            (see :attr:`FrameSyncWorker.output_rate`)
+
+            .. versionadded:: 0.0.10
 
     Attributes:
         worker (FrameSyncWorker): Either a :class:`VideoWorker`
             or :class:`AudioWorker`
 
     """
-    def __init__(self, FrameSync frame_sync, ReceiveFrameType ft):
+    def __init__(self, FrameSync frame_sync, ReceiveFrameType ft, output_rate=None):
         super().__init__()
         self.ft = ft
         self.stopped = threading.Event()
@@ -405,6 +742,35 @@ class FrameSyncThread(threading.Thread):
             self.worker = AudioWorker(frame_sync)
         else:
             raise ValueError('frame type must be `recv_video` or `recv_audio`')
+        self.worker.output_rate = output_rate
+
+    @property
+    def output_rate(self):
+        """Alias for :attr:`FrameSyncWorker.output_rate`
+
+        .. versionadded:: 0.0.10
+        """
+        return self.worker.output_rate
+    @output_rate.setter
+    def output_rate(self, value):
+        self.worker.output_rate = value
+
+    def get_stats(self) -> dict[str, int]:
+        """Get the capture counters of the :attr:`worker`
+
+        Returns a :class:`dict` with the keys ``"captures"``, ``"late"``,
+        ``"skipped"`` and ``"overruns"``
+        (see :class:`FrameSyncWorker`)
+
+        .. versionadded:: 0.0.10
+        """
+        w = self.worker
+        return {
+            'captures': w.num_captures,
+            'late': w.num_late,
+            'skipped': w.num_skipped,
+            'overruns': w.num_overruns,
+        }
 
     def run(self):
         cdef FrameSyncWorker w = self.worker
@@ -431,3 +797,413 @@ class FrameSyncThread(threading.Thread):
     def remove_callback(self):
         cdef FrameSyncWorker w = self.worker
         w.callback.remove_callback()
+
+
+cdef class FrameSyncGroup(FrameSyncWorker):
+    """Captures from multiple :class:`FrameSync` instances on one shared clock
+
+    On each tick of the :attr:`~FrameSyncWorker.pacing_clock`, all members
+    are captured in a single pass without the :term:`GIL`, so the frames
+    delivered together were grabbed at (nearly) the same time instead of
+    drifting up to a frame apart as they would with one
+    :class:`FrameSyncThread` per source.
+
+    The callback is called from the capture thread with the captured frames
+    and the |NDI| timestamp of the tick::
+
+        def on_frames(frames, timestamp):
+            ...
+
+    where *frames* is a tuple with one item per member (in the order they
+    were added). Each item is the member's
+    :class:`~.video_frame.VideoFrameSync` or
+    :class:`~.audio_frame.AudioFrameSync`, or a ``(video_frame, audio_frame)``
+    tuple if both are captured. The frames are only valid until the callback
+    returns.
+
+    The tick rate follows the video frame rate of the first member
+    (or 30000/1001 if unknown) unless an
+    :attr:`~FrameSyncWorker.output_rate` is set. Audio is captured with
+    the number of samples spanning one tick, and the |NDI| library inserts
+    silence if fewer samples have been received.
+
+    .. versionadded:: 0.0.10
+
+    Arguments:
+        frame_syncs: An iterable of :class:`FrameSync` instances to add
+        ft (ReceiveFrameType): The frame type(s) to capture. Either
+            :attr:`~.receiver.ReceiveFrameType.recv_video`,
+            :attr:`~.receiver.ReceiveFrameType.recv_audio` or both combined
+        output_rate (fractions.Fraction, optional): A tick rate to use
+            instead of the source frame rate
+
+    Attributes:
+        capture_video (bool): Whether video frames are captured
+        capture_audio (bool): Whether audio frames are captured
+        timestamp (int): The |NDI| timestamp of the most recent tick
+            (in 100ns units)
+
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.members = []
+        self.frames = []
+        self.results = ()
+        self.timestamp = 0
+        self.lock = RLock()
+
+    def __init__(self, frame_syncs=(), ft=ReceiveFrameType.recv_video, output_rate=None):
+        super().__init__(None)
+        cdef int flags = ft
+        self.capture_video = flags & ReceiveFrameType.recv_video != 0
+        self.capture_audio = flags & ReceiveFrameType.recv_audio != 0
+        if not self.capture_video and not self.capture_audio:
+            raise ValueError('frame type must include `recv_video` or `recv_audio`')
+        self.output_rate = output_rate
+        for frame_sync in frame_syncs:
+            self.add(frame_sync)
+
+    def __len__(self):
+        return len(self.members)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def frame_syncs(self) -> tuple:
+        """The member :class:`FrameSync` instances
+        """
+        return tuple(self.members)
+
+    @property
+    def is_running(self) -> bool:
+        """``True`` if the capture thread is running
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    def add(self, FrameSync frame_sync not None):
+        """Add a :class:`FrameSync` to the group
+
+        Its :attr:`~FrameSync.video_frame` and/or
+        :attr:`~FrameSync.audio_frame` must be set for the frame types
+        being captured.
+        """
+        cdef VideoFrameSync video_frame = None
+        cdef AudioFrameSync audio_frame = None
+        if self.capture_video:
+            if frame_sync.video_frame is None:
+                raise ValueError('FrameSync has no video_frame')
+            video_frame = frame_sync.video_frame
+        if self.capture_audio:
+            if frame_sync.audio_frame is None:
+                raise ValueError('FrameSync has no audio_frame')
+            audio_frame = frame_sync.audio_frame
+        self._add_entry(frame_sync, frame_sync.ptr, video_frame, audio_frame)
+
+    def remove(self, frame_sync):
+        """Remove a member from the group
+
+        Raises:
+            ValueError: If *frame_sync* is not a member
+        """
+        cdef size_t i
+        with nogil:
+            self.lock._acquire(True, -1)
+        try:
+            i = self.members.index(frame_sync)
+            del self.members[i]
+            del self.frames[i]
+            self.entries.erase(self.entries.begin() + i)
+            self._rebuild_results()
+        finally:
+            self.lock._release()
+
+    def set_callback(self, cb):
+        """Set the callback to be called with the frames and timestamp of
+        each tick
+        """
+        self.group_callback = cb
+
+    def remove_callback(self):
+        """Remove the callback
+        """
+        self.group_callback = None
+
+    def start(self):
+        """Start the capture thread
+        """
+        if self.is_running:
+            raise RuntimeError('already running')
+        self.thread = threading.Thread(target=self._thread_run, daemon=True)
+        self.thread.start()
+
+    def close(self, timeout=None):
+        """Stop the capture thread and wait for it to exit
+        """
+        self.stop()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def _thread_run(self):
+        try:
+            self.run()
+        except:
+            import traceback
+            traceback.print_exc()
+
+    cdef int _add_entry(
+        self,
+        object member,
+        NDIlib_framesync_instance_t fs_ptr,
+        VideoFrameSync video_frame,
+        AudioFrameSync audio_frame,
+    ) except -1:
+        if member in self.members:
+            raise ValueError('already a member of the group')
+        cdef FrameSyncGroupEntry_s entry
+        entry.fs_ptr = fs_ptr
+        entry.video_ptr = NULL
+        entry.audio_ptr = NULL
+        entry.num_samples = 0
+        if video_frame is not None:
+            entry.video_ptr = video_frame.ptr
+        if audio_frame is not None:
+            entry.audio_ptr = audio_frame.ptr
+        with nogil:
+            self.lock._acquire(True, -1)
+        try:
+            self.entries.push_back(entry)
+            self.members.append(member)
+            self.frames.append((video_frame, audio_frame))
+            self._rebuild_results()
+        finally:
+            self.lock._release()
+        self.wait_event._set()
+        return 0
+
+    cdef int _rebuild_results(self) except -1:
+        if self.capture_video and self.capture_audio:
+            self.results = tuple(self.frames)
+        elif self.capture_video:
+            self.results = tuple([vf for vf, af in self.frames])
+        else:
+            self.results = tuple([af for vf, af in self.frames])
+        return 0
+
+    cdef bint _has_callback(self) noexcept nogil:
+        # The captured frames are processed in trigger_callback, so it is
+        # needed on every tick
+        return True
+
+    cdef bint has_frame(self) except -1:
+        return True
+
+    cdef bint is_connected(self) except -1 nogil:
+        return self.entries.size() > 0
+
+    cdef bint can_capture(self) noexcept nogil:
+        return True
+
+    cdef bint do_capture(self) except -1 nogil:
+        cdef PacingClock_s* clock = &self.pacing_clock.clock
+        cdef FrameSyncGroupEntry_s* entry
+        cdef int64_t sample_rate
+        cdef size_t i
+        self.lock._acquire(True, -1)
+        try:
+            if self.entries.size() == 0:
+                return False
+            self.timestamp = self.pacing_clock._get_ndi_timestamp()
+            for i in range(self.entries.size()):
+                entry = &self.entries[i]
+                if entry.audio_ptr is not NULL:
+                    sample_rate = entry.audio_ptr.sample_rate
+                    if sample_rate <= 0:
+                        sample_rate = 48000
+                    entry.num_samples = get_tick_samples(clock, sample_rate, 0)
+                self._capture_entry(entry)
+        finally:
+            self.lock._release()
+        return True
+
+    cdef int _capture_entry(self, FrameSyncGroupEntry_s* entry) except -1 nogil:
+        cdef NDIlib_audio_frame_v3_t* audio_ptr = entry.audio_ptr
+        if entry.video_ptr is not NULL:
+            NDIlib_framesync_capture_video(
+                entry.fs_ptr, entry.video_ptr, NDIlib_frame_format_type_progressive,
+            )
+        if audio_ptr is not NULL:
+            NDIlib_framesync_capture_audio_v2(
+                entry.fs_ptr, audio_ptr,
+                audio_ptr.sample_rate, audio_ptr.no_channels, entry.num_samples,
+            )
+        return 0
+
+    cdef int trigger_callback(self) except -1:
+        cdef VideoFrameSync video_frame
+        cdef AudioFrameSync audio_frame
+        with nogil:
+            self.lock._acquire(True, -1)
+        try:
+            for video_frame, audio_frame in self.frames:
+                if video_frame is not None:
+                    video_frame._process_incoming()
+                if audio_frame is not None:
+                    audio_frame._process_incoming()
+            results = self.results
+            timestamp = self.timestamp
+            cb = self.group_callback
+        finally:
+            self.lock._release()
+        if cb is not None:
+            cb(results, timestamp)
+        return 0
+
+    cdef int get_source_rate(self, frame_rate_t* fr) except -1 nogil:
+        cdef NDIlib_video_frame_v2_t* p = NULL
+        fr.numerator = 30000
+        fr.denominator = 1001
+        if self.entries.size() > 0:
+            p = self.entries[0].video_ptr
+        if p is not NULL and p.frame_rate_N > 0 and p.frame_rate_D > 0:
+            fr.numerator = p.frame_rate_N
+            fr.denominator = p.frame_rate_D
+        return 0
+
+
+cdef class AudioPullSource:
+    """Audio from a :class:`FrameSync` pulled at the pace of an audio device
+
+    Rather than capturing audio on a timer (as :class:`AudioWorker` does),
+    the audio device's own period callback requests exactly the number of
+    samples it needs. The |NDI| frame sync then resamples to match the rate
+    of the requests, acting as the clock adapter between the source and the
+    device.
+
+    :meth:`pull` can be used from Python. Native callbacks (written in Cython)
+    can call the ``audio_pull`` C function with the pointer returned by
+    ``_get_state()``, which never allocates or acquires the :term:`GIL`::
+
+        cdef AudioPull_s* state = source._get_state()
+
+        # In the device callback (without the GIL)
+        audio_pull(state, out_buffer, num_channels, num_frames, num_frames)
+
+    Statistics are kept on how often the frame sync had to pad the request
+    with silence (not enough samples were queued) and how often samples were
+    dropped to keep the queue within :attr:`max_queue_samples`.
+
+    .. versionadded:: 0.0.10
+
+    Arguments:
+        frame_sync (FrameSync): The FrameSync to pull audio from
+        sample_rate (int, optional): The sample rate of the audio device
+        max_queue_samples (int, optional): If non-zero, the maximum number of
+            samples that may remain queued after a pull. Anything beyond it
+            is dropped (oldest first) to bound the latency
+
+    Attributes:
+        frame_sync (FrameSync): The FrameSync instance
+
+    """
+    def __cinit__(self, *args, **kwargs):
+        audio_pull_init(&self.state, NULL)
+
+    def __init__(
+        self,
+        FrameSync frame_sync not None,
+        int sample_rate=48000,
+        int64_t max_queue_samples=0,
+    ):
+        self.frame_sync = frame_sync
+        self.state.fs_ptr = frame_sync.ptr
+        self.sample_rate = sample_rate
+        self.max_queue_samples = max_queue_samples
+        if frame_sync.audio_frame is not None:
+            if not frame_sync.audio_frame.reference_converter._is_ndi_native():
+                self.state.scale = frame_sync.audio_frame.reference_converter.ptr.divisor
+
+    @property
+    def sample_rate(self) -> int:
+        """The sample rate of the audio device
+        """
+        return self.state.sample_rate
+    @sample_rate.setter
+    def sample_rate(self, int value):
+        if value <= 0:
+            raise ValueError('Invalid sample rate')
+        self.state.sample_rate = value
+
+    @property
+    def max_queue_samples(self) -> int:
+        """The maximum number of samples kept queued after a pull
+        (zero for no limit)
+        """
+        return self.state.max_queue_samples
+    @max_queue_samples.setter
+    def max_queue_samples(self, int64_t value):
+        if value < 0:
+            raise ValueError('max_queue_samples cannot be negative')
+        self.state.max_queue_samples = value
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of queued samples seen by the most recent pull
+        """
+        return self.state.last_queue_depth
+
+    def pull(self, float[:, ::1] dest) -> int:
+        """Fill *dest* with audio
+
+        *dest* is a writable float32 array with shape
+        ``(num_channels, num_samples)`` which is always filled completely
+        (with silence if not enough audio was available).
+
+        Returns the number of samples for each channel
+        """
+        cdef size_t nsamp
+        if self.state.fs_ptr is NULL:
+            raise ValueError('No FrameSync to pull from')
+        if dest.shape[0] == 0 or dest.shape[1] == 0:
+            return 0
+        with nogil:
+            nsamp = audio_pull(
+                &self.state, &dest[0, 0], dest.shape[0], dest.shape[1], dest.shape[1],
+            )
+        return nsamp
+
+    def get_stats(self) -> dict[str, int]:
+        """Get the pull statistics
+
+        Returns a :class:`dict` with the keys:
+
+        - ``"pulls"``: Number of pulls
+        - ``"samples_pulled"``: Number of samples pulled (per channel)
+        - ``"padded"``: Number of pulls padded with silence
+        - ``"samples_padded"``: Number of silent samples inserted
+        - ``"dropped"``: Number of pulls that dropped samples
+        - ``"samples_dropped"``: Number of samples dropped
+        - ``"queue_depth"``: The :attr:`queue_depth`
+        """
+        cdef AudioPull_s* ptr = &self.state
+        return {
+            'pulls': ptr.num_pulls,
+            'samples_pulled': ptr.samples_pulled,
+            'padded': ptr.num_padded,
+            'samples_padded': ptr.samples_padded,
+            'dropped': ptr.num_dropped,
+            'samples_dropped': ptr.samples_dropped,
+            'queue_depth': ptr.last_queue_depth,
+        }
+
+    def reset_stats(self):
+        """Reset the pull statistics
+        """
+        audio_pull_reset_stats(&self.state)
+
+    cdef AudioPull_s* _get_state(self) noexcept nogil:
+        return &self.state
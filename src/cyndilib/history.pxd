@@ -0,0 +1,68 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from libc.stdint cimport *
+from libcpp.deque cimport deque as cpp_deque
+
+from .wrapper cimport *
+from .locks cimport RLock
+
+
+cdef struct HistoryEntry_s:
+    int64_t timestamp
+    int64_t timecode
+    size_t offset
+    size_t size
+    int xres
+    int yres
+    int line_stride
+    FourCC fourcc
+    FrameFormat frame_format
+    int frame_rate_N
+    int frame_rate_D
+    int sample_rate
+    int num_channels
+    int num_samples
+
+
+cdef class HistoryRing:
+    cdef uint8_t* arena
+    cdef readonly size_t capacity
+    cdef size_t head
+    cdef cpp_deque[HistoryEntry_s] entries
+    cdef int64_t duration_ticks
+    cdef readonly size_t num_dropped
+
+    cdef int _allocate(self, size_t capacity) except -1
+    cdef Py_ssize_t _reserve(self, int64_t timestamp, size_t size) noexcept nogil
+    cdef void _commit(self, HistoryEntry_s* entry) noexcept nogil
+    cdef Py_ssize_t _find(self, int64_t timestamp) noexcept nogil
+    cdef Py_ssize_t _find_after(self, int64_t timestamp) noexcept nogil
+    cdef void _clear(self) noexcept nogil
+
+
+cdef class HistoryVideoFrame:
+    cdef readonly int64_t timestamp, timecode
+    cdef readonly int xres, yres, line_stride
+    cdef readonly FourCC fourcc
+    cdef readonly FrameFormat frame_format
+    cdef readonly object frame_rate
+    cdef readonly object data
+
+
+cdef class HistoryAudioFrame:
+    cdef readonly int64_t timestamp, timecode
+    cdef readonly int sample_rate, num_channels, num_samples
+    cdef readonly object data
+
+
+cdef class HistoryBuffer:
+    cdef readonly double duration
+    cdef readonly size_t max_video_bytes, max_audio_bytes
+    cdef readonly HistoryRing video_ring, audio_ring
+    cdef RLock lock
+
+    cdef int _add_video(self, NDIlib_video_frame_v2_t* p) except -1
+    cdef int _add_audio(self, NDIlib_audio_frame_v3_t* p) except -1
+    cdef HistoryVideoFrame _get_video(self, size_t idx)
+    cdef HistoryAudioFrame _get_audio(self, size_t idx)
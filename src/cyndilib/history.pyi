@@ -0,0 +1,80 @@
+from fractions import Fraction
+
+import numpy as np
+import numpy.typing as npt
+
+from .sender import Sender
+from .wrapper.ndi_structs import FourCC, FrameFormat
+
+
+class HistoryRing:
+    capacity: int
+    num_dropped: int
+    def __init__(self, duration: float) -> None: ...
+    def __len__(self) -> int: ...
+    @property
+    def first_timestamp(self) -> int|None: ...
+    @property
+    def last_timestamp(self) -> int|None: ...
+    @property
+    def bytes_used(self) -> int: ...
+
+
+class HistoryVideoFrame:
+    timestamp: int
+    timecode: int
+    xres: int
+    yres: int
+    line_stride: int
+    fourcc: FourCC
+    frame_format: FrameFormat
+    frame_rate: Fraction
+    data: npt.NDArray[np.uint8]
+
+
+class HistoryAudioFrame:
+    timestamp: int
+    timecode: int
+    sample_rate: int
+    num_channels: int
+    num_samples: int
+    data: npt.NDArray[np.float32]
+
+
+class HistoryBuffer:
+    duration: float
+    max_video_bytes: int
+    max_audio_bytes: int
+    video_ring: HistoryRing
+    audio_ring: HistoryRing
+    def __init__(
+        self,
+        duration: float = ...,
+        max_video_bytes: int = ...,
+        max_audio_bytes: int = ...,
+    ) -> None: ...
+    @property
+    def num_video_frames(self) -> int: ...
+    @property
+    def num_audio_frames(self) -> int: ...
+    @property
+    def first_timestamp(self) -> int|None: ...
+    @property
+    def last_timestamp(self) -> int|None: ...
+    def clear(self) -> None: ...
+    def frame_at(self, timestamp: int) -> HistoryVideoFrame|None: ...
+    def audio_at(self, timestamp: int) -> HistoryAudioFrame|None: ...
+    def range(
+        self,
+        start: int,
+        end: int,
+        video: bool = ...,
+        audio: bool = ...,
+    ) -> list[HistoryVideoFrame|HistoryAudioFrame]: ...
+    def play_out(
+        self,
+        sender: Sender,
+        from_ts: int,
+        speed: float = ...,
+        end_ts: int|None = ...,
+    ) -> int: ...
@@ -0,0 +1,592 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+In-memory history of received frames for instant replay
+
+A :class:`HistoryBuffer` attached to a :class:`~.receiver.Receiver` (see
+:meth:`~.receiver.Receiver.set_history`) keeps a copy of every video and
+audio frame received for a configurable duration or byte budget. Frames are
+indexed by their :term:`ndi-timestamp` and can be looked up without
+consuming them::
+
+    history = HistoryBuffer(duration=30)
+    receiver.set_history(history)
+    ...
+    frame = history.frame_at(ts)
+    history.play_out(sender, ts, speed=0.5)
+
+Each stream is stored in a :class:`HistoryRing`, a single block of memory
+allocated when the first frame arrives. The oldest frames are evicted to
+make room for new ones, so no memory is allocated while receiving.
+
+.. versionadded:: 0.0.10
+
+"""
+
+cimport cython
+from libc.math cimport ceil
+from libc.stdlib cimport malloc, free
+from libc.string cimport memcpy
+cimport numpy as cnp
+
+from fractions import Fraction
+
+import numpy as np
+
+from .clock cimport monotonic_ns, sleep_until_ns
+from .sender cimport Sender
+
+__all__ = ('HistoryBuffer', 'HistoryRing', 'HistoryVideoFrame', 'HistoryAudioFrame')
+
+
+# Frame timestamps are in 100 nanosecond units
+cdef int64_t TICKS_PER_SECOND = 10000000
+
+
+cdef int64_t _get_frame_timestamp(int64_t timestamp, int64_t timecode) noexcept nogil:
+    # Senders using older SDK versions leave the timestamp undefined
+    if timestamp == NDIlib_recv_timestamp_undefined:
+        return timecode
+    return timestamp
+
+
+cdef class HistoryRing:
+    """A fixed size arena holding frames of a single stream in arrival order
+
+    Space is handed out sequentially and wraps around to the start of the
+    arena when the end is reached. Frames occupying the space needed for
+    a new frame (or older than the :attr:`~HistoryBuffer.duration`) are
+    evicted first.
+
+    If a frame arrives with a timestamp earlier than the newest frame held
+    (for instance when the source restarts), all frames are discarded.
+
+    Attributes:
+        capacity (int): Size of the arena in bytes (``0`` until the first
+            frame arrives)
+        num_dropped (int): Number of frames that could not be stored because
+            they were larger than the arena
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.arena = NULL
+        self.capacity = 0
+        self.head = 0
+        self.duration_ticks = 0
+        self.num_dropped = 0
+
+    def __init__(self, double duration):
+        self.duration_ticks = <int64_t>(duration * TICKS_PER_SECOND)
+
+    def __dealloc__(self):
+        cdef uint8_t* arena = self.arena
+        self.arena = NULL
+        self.entries.clear()
+        if arena is not NULL:
+            free(arena)
+
+    def __len__(self):
+        return self.entries.size()
+
+    @property
+    def first_timestamp(self):
+        """The timestamp of the oldest frame (or ``None`` if empty)
+        """
+        if self.entries.empty():
+            return None
+        return self.entries.front().timestamp
+
+    @property
+    def last_timestamp(self):
+        """The timestamp of the newest frame (or ``None`` if empty)
+        """
+        if self.entries.empty():
+            return None
+        return self.entries.back().timestamp
+
+    @property
+    def bytes_used(self) -> int:
+        """Number of bytes occupied by the stored frames
+        """
+        cdef size_t result = 0
+        cdef HistoryEntry_s entry
+        for entry in self.entries:
+            result += entry.size
+        return result
+
+    cdef int _allocate(self, size_t capacity) except -1:
+        cdef uint8_t* arena = <uint8_t*>malloc(capacity)
+        if arena is NULL:
+            raise MemoryError()
+        self._clear()
+        if self.arena is not NULL:
+            free(self.arena)
+        self.arena = arena
+        self.capacity = capacity
+        return 0
+
+    cdef Py_ssize_t _reserve(self, int64_t timestamp, size_t size) noexcept nogil:
+        # Evicts whatever is needed to make room for a frame of the given size
+        # and returns its offset in the arena (or -1 if it can not fit)
+        cdef HistoryEntry_s* front
+        if size == 0 or size > self.capacity:
+            self.num_dropped += 1
+            return -1
+        if not self.entries.empty() and timestamp < self.entries.back().timestamp:
+            self._clear()
+        if self.entries.empty():
+            self.head = 0
+        if self.head + size > self.capacity:
+            # Frames past the head are from the previous pass through the
+            # arena and are skipped over along with the unused space
+            while not self.entries.empty() and self.entries.front().offset >= self.head:
+                self.entries.pop_front()
+            self.head = 0
+        while not self.entries.empty():
+            front = &self.entries.front()
+            if front.offset < self.head or front.offset >= self.head + size:
+                break
+            self.entries.pop_front()
+        return self.head
+
+    cdef void _commit(self, HistoryEntry_s* entry) noexcept nogil:
+        # Adds an entry whose data was written at the offset from _reserve
+        cdef int64_t oldest
+        self.entries.push_back(entry[0])
+        self.head = entry.offset + entry.size
+        if self.duration_ticks <= 0:
+            return
+        oldest = entry.timestamp - self.duration_ticks
+        while self.entries.front().timestamp < oldest:
+            self.entries.pop_front()
+
+    @cython.cdivision(True)
+    cdef Py_ssize_t _find(self, int64_t timestamp) noexcept nogil:
+        # Index of the newest entry at or before the timestamp (or -1)
+        cdef size_t lo = 0, hi = self.entries.size(), mid
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.entries[mid].timestamp <= timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return <Py_ssize_t>lo - 1
+
+    @cython.cdivision(True)
+    cdef Py_ssize_t _find_after(self, int64_t timestamp) noexcept nogil:
+        # Index of the oldest entry at or after the timestamp (or the number
+        # of entries if there are none)
+        cdef size_t lo = 0, hi = self.entries.size(), mid
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.entries[mid].timestamp < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    cdef void _clear(self) noexcept nogil:
+        self.entries.clear()
+        self.head = 0
+
+
+cdef class HistoryVideoFrame:
+    """A copy of a video frame taken from a :class:`HistoryBuffer`
+
+    Attributes:
+        timestamp (int): The :term:`ndi-timestamp` of the frame (or its
+            timecode if the sender did not provide one)
+        timecode (int): The frame's timecode
+        xres (int): Horizontal resolution
+        yres (int): Vertical resolution
+        line_stride (int): Bytes per line
+        fourcc (FourCC): The :class:`~.wrapper.ndi_structs.FourCC` format
+        frame_format (FrameFormat): The
+            :class:`~.wrapper.ndi_structs.FrameFormat`
+        frame_rate (fractions.Fraction): The frame rate
+        data (numpy.ndarray): The frame data as a 1-d array of unsigned 8-bit
+            integers
+    """
+    def __repr__(self):
+        return f'<HistoryVideoFrame {self.xres}x{self.yres} {self.fourcc}: {self.timestamp}>'
+
+
+cdef class HistoryAudioFrame:
+    """A copy of an audio frame taken from a :class:`HistoryBuffer`
+
+    Attributes:
+        timestamp (int): The :term:`ndi-timestamp` of the frame (or its
+            timecode if the sender did not provide one)
+        timecode (int): The frame's timecode
+        sample_rate (int): The sample rate
+        num_channels (int): Number of channels
+        num_samples (int): Number of samples per channel
+        data (numpy.ndarray): The samples as a 2-d array of 32-bit floats with
+            shape ``(num_channels, num_samples)``
+    """
+    def __repr__(self):
+        return f'<HistoryAudioFrame {self.num_channels}x{self.num_samples}: {self.timestamp}>'
+
+
+cdef class HistoryBuffer:
+    """Keeps the most recent video and audio frames of a
+    :class:`~.receiver.Receiver` indexed by timestamp
+
+    Arguments:
+        duration (float, optional): Number of seconds of history to keep.
+            Frames older than this (relative to the newest frame) are
+            evicted. If zero, frames are only evicted when the memory budget
+            is used up. Defaults to ``10``
+        max_video_bytes (int, optional): Memory budget for video frames. If
+            zero (the default), enough memory for :attr:`duration` seconds of
+            the first video frame's format is allocated
+        max_audio_bytes (int, optional): Memory budget for audio frames. If
+            zero (the default), enough memory for :attr:`duration` seconds of
+            the first audio frame's format is allocated
+
+    Memory for each stream is allocated when its first frame is received
+    and is kept (even if the format changes) until the buffer is deleted.
+
+    Attributes:
+        video_ring (HistoryRing): Storage for video frames
+        audio_ring (HistoryRing): Storage for audio frames
+    """
+    def __init__(
+        self,
+        double duration=10,
+        size_t max_video_bytes=0,
+        size_t max_audio_bytes=0,
+    ):
+        if duration < 0:
+            raise ValueError('duration cannot be negative')
+        if duration == 0 and (max_video_bytes == 0 or max_audio_bytes == 0):
+            raise ValueError('A duration or memory budget is required')
+        self.duration = duration
+        self.max_video_bytes = max_video_bytes
+        self.max_audio_bytes = max_audio_bytes
+        self.video_ring = HistoryRing(duration)
+        self.audio_ring = HistoryRing(duration)
+        self.lock = RLock()
+
+    @property
+    def num_video_frames(self) -> int:
+        """Number of video frames held
+        """
+        return len(self.video_ring)
+
+    @property
+    def num_audio_frames(self) -> int:
+        """Number of audio frames held
+        """
+        return len(self.audio_ring)
+
+    @property
+    def first_timestamp(self):
+        """The timestamp of the oldest frame held (or ``None`` if empty)
+        """
+        ts = [
+            t for t in (self.video_ring.first_timestamp, self.audio_ring.first_timestamp)
+            if t is not None
+        ]
+        return min(ts) if len(ts) else None
+
+    @property
+    def last_timestamp(self):
+        """The timestamp of the newest frame held (or ``None`` if empty)
+        """
+        ts = [
+            t for t in (self.video_ring.last_timestamp, self.audio_ring.last_timestamp)
+            if t is not None
+        ]
+        return max(ts) if len(ts) else None
+
+    def clear(self):
+        """Discard all frames (the allocated memory is kept)
+        """
+        self.lock._acquire(True, -1)
+        try:
+            self.video_ring._clear()
+            self.audio_ring._clear()
+        finally:
+            self.lock._release()
+
+    def frame_at(self, int64_t timestamp):
+        """Get the video frame that was current at the given timestamp
+
+        Returns:
+            HistoryVideoFrame: The newest frame with a timestamp at or before
+            *timestamp*, or ``None`` if there is none
+        """
+        cdef Py_ssize_t idx
+        self.lock._acquire(True, -1)
+        try:
+            idx = self.video_ring._find(timestamp)
+            if idx < 0:
+                return None
+            return self._get_video(idx)
+        finally:
+            self.lock._release()
+
+    def audio_at(self, int64_t timestamp):
+        """Get the audio frame that was current at the given timestamp
+
+        Returns:
+            HistoryAudioFrame: The newest frame with a timestamp at or before
+            *timestamp*, or ``None`` if there is none
+        """
+        cdef Py_ssize_t idx
+        self.lock._acquire(True, -1)
+        try:
+            idx = self.audio_ring._find(timestamp)
+            if idx < 0:
+                return None
+            return self._get_audio(idx)
+        finally:
+            self.lock._release()
+
+    def range(self, int64_t start, int64_t end, bint video=True, bint audio=True):
+        """Get all frames with timestamps from *start* up to (but not
+        including) *end*
+
+        Arguments:
+            start (int): The starting timestamp
+            end (int): The ending timestamp
+            video (bool, optional): Whether to include video frames
+            audio (bool, optional): Whether to include audio frames
+
+        Returns:
+            list: The :class:`HistoryVideoFrame` and :class:`HistoryAudioFrame`
+            objects sorted by timestamp (video before audio when equal)
+        """
+        cdef list result = []
+        cdef size_t i
+        self.lock._acquire(True, -1)
+        try:
+            if video:
+                i = self.video_ring._find_after(start)
+                while i < self.video_ring.entries.size():
+                    if self.video_ring.entries[i].timestamp >= end:
+                        break
+                    result.append(self._get_video(i))
+                    i += 1
+            if audio:
+                i = self.audio_ring._find_after(start)
+                while i < self.audio_ring.entries.size():
+                    if self.audio_ring.entries[i].timestamp >= end:
+                        break
+                    result.append(self._get_audio(i))
+                    i += 1
+        finally:
+            self.lock._release()
+        result.sort(key=lambda f: (f.timestamp, isinstance(f, HistoryAudioFrame)))
+        return result
+
+    def play_out(self, Sender sender, int64_t from_ts, double speed=1.0, end_ts=None):
+        """Send the stored frames through a :class:`~.sender.Sender`
+
+        Frames are sent with the same spacing they were received with
+        (scaled by *speed*), starting from *from_ts*. This blocks until the
+        last frame is sent. Frames received while playing out are included
+        unless *end_ts* is given.
+
+        The sender must be open and its :attr:`~.sender.Sender.video_frame`
+        (and :attr:`~.sender.Sender.audio_frame` if used) set up with the same
+        format as the received frames. Audio is only sent when *speed* is
+        ``1``.
+
+        Arguments:
+            sender (Sender): The sender to use
+            from_ts (int): The timestamp to start from
+            speed (float, optional): Playback speed. Values below ``1`` play
+                in slow motion. Defaults to ``1``
+            end_ts (int, optional): If given, stop before frames with this
+                timestamp
+
+        Returns:
+            int: The number of frames sent
+        """
+        if speed <= 0:
+            raise ValueError('speed must be positive')
+        cdef bint send_video = sender.has_video_frame
+        cdef bint send_audio = sender.has_audio_frame and speed == 1
+        cdef int64_t stop_ts = INT64_MAX if end_ts is None else end_ts
+        cdef int64_t next_video = from_ts, next_audio = from_ts
+        cdef int64_t vid_ts, aud_ts, ts, deadline
+        cdef int64_t start_ns = monotonic_ns()
+        cdef size_t vid_idx, aud_idx, count = 0
+        cdef HistoryVideoFrame vframe
+        cdef HistoryAudioFrame aframe
+
+        while True:
+            vframe = None
+            aframe = None
+            vid_ts = INT64_MAX
+            aud_ts = INT64_MAX
+            self.lock._acquire(True, -1)
+            try:
+                if send_video:
+                    vid_idx = self.video_ring._find_after(next_video)
+                    if vid_idx < self.video_ring.entries.size():
+                        vid_ts = self.video_ring.entries[vid_idx].timestamp
+                if send_audio:
+                    aud_idx = self.audio_ring._find_after(next_audio)
+                    if aud_idx < self.audio_ring.entries.size():
+                        aud_ts = self.audio_ring.entries[aud_idx].timestamp
+                if vid_ts <= aud_ts and vid_ts < stop_ts:
+                    vframe = self._get_video(vid_idx)
+                elif aud_ts < stop_ts:
+                    aframe = self._get_audio(aud_idx)
+            finally:
+                self.lock._release()
+
+            if vframe is not None:
+                ts = vframe.timestamp
+                next_video = ts + 1
+            elif aframe is not None:
+                ts = aframe.timestamp
+                next_audio = ts + 1
+            else:
+                break
+            deadline = start_ns + <int64_t>((ts - from_ts) * 100 / speed)
+            with nogil:
+                sleep_until_ns(deadline, 0)
+            if vframe is not None:
+                sender.write_video(vframe.data)
+            else:
+                sender.write_audio(aframe.data)
+            count += 1
+        return count
+
+    cdef HistoryVideoFrame _get_video(self, size_t idx):
+        cdef HistoryEntry_s* entry = &self.video_ring.entries[idx]
+        cdef HistoryVideoFrame frame = HistoryVideoFrame.__new__(HistoryVideoFrame)
+        cdef cnp.ndarray[cnp.uint8_t, ndim=1] data = np.empty(entry.size, dtype=np.uint8)
+        memcpy(<void*>data.data, self.video_ring.arena + entry.offset, entry.size)
+        frame.timestamp = entry.timestamp
+        frame.timecode = entry.timecode
+        frame.xres = entry.xres
+        frame.yres = entry.yres
+        frame.line_stride = entry.line_stride
+        frame.fourcc = entry.fourcc
+        frame.frame_format = entry.frame_format
+        if entry.frame_rate_D > 0:
+            frame.frame_rate = Fraction(entry.frame_rate_N, entry.frame_rate_D)
+        else:
+            frame.frame_rate = Fraction(0)
+        frame.data = data
+        return frame
+
+    cdef HistoryAudioFrame _get_audio(self, size_t idx):
+        cdef HistoryEntry_s* entry = &self.audio_ring.entries[idx]
+        cdef HistoryAudioFrame frame = HistoryAudioFrame.__new__(HistoryAudioFrame)
+        cdef cnp.ndarray[cnp.float32_t, ndim=2] data = np.empty(
+            (entry.num_channels, entry.num_samples), dtype=np.float32,
+        )
+        memcpy(<void*>data.data, self.audio_ring.arena + entry.offset, entry.size)
+        frame.timestamp = entry.timestamp
+        frame.timecode = entry.timecode
+        frame.sample_rate = entry.sample_rate
+        frame.num_channels = entry.num_channels
+        frame.num_samples = entry.num_samples
+        frame.data = data
+        return frame
+
+    @cython.cdivision(True)
+    cdef int _add_video(self, NDIlib_video_frame_v2_t* p) except -1:
+        cdef HistoryRing ring = self.video_ring
+        cdef FourCCPackInfo pack_info
+        cdef HistoryEntry_s entry
+        cdef Py_ssize_t offset
+        cdef size_t capacity
+        cdef double fps = 60
+
+        if p.p_data is NULL or p.xres <= 0 or p.yres <= 0:
+            return 0
+        fourcc_pack_info_init(&pack_info)
+        pack_info.fourcc = fourcc_type_uncast(p.FourCC)
+        pack_info.xres = p.xres
+        pack_info.yres = p.yres
+        calc_fourcc_pack_info(&pack_info, p.line_stride_in_bytes)
+
+        entry.timestamp = _get_frame_timestamp(p.timestamp, p.timecode)
+        entry.timecode = p.timecode
+        entry.size = pack_info.total_size
+        entry.xres = p.xres
+        entry.yres = p.yres
+        entry.line_stride = pack_info.line_strides[0]
+        entry.fourcc = pack_info.fourcc
+        entry.frame_format = frame_format_uncast(p.frame_format_type)
+        entry.frame_rate_N = p.frame_rate_N
+        entry.frame_rate_D = p.frame_rate_D
+        entry.sample_rate = 0
+        entry.num_channels = 0
+        entry.num_samples = 0
+
+        self.lock._acquire(True, -1)
+        try:
+            if ring.arena is NULL:
+                capacity = self.max_video_bytes
+                if capacity == 0:
+                    if p.frame_rate_N > 0 and p.frame_rate_D > 0:
+                        fps = p.frame_rate_N / <double>p.frame_rate_D
+                    capacity = (<size_t>ceil(self.duration * fps) + 2) * entry.size
+                ring._allocate(capacity)
+            with nogil:
+                offset = ring._reserve(entry.timestamp, entry.size)
+                if offset >= 0:
+                    entry.offset = offset
+                    memcpy(ring.arena + offset, p.p_data, entry.size)
+                    ring._commit(&entry)
+        finally:
+            self.lock._release()
+        return 0
+
+    cdef int _add_audio(self, NDIlib_audio_frame_v3_t* p) except -1:
+        cdef HistoryRing ring = self.audio_ring
+        cdef HistoryEntry_s entry
+        cdef Py_ssize_t offset
+        cdef size_t capacity, channel_size, i
+        cdef uint8_t* dest
+
+        if p.p_data is NULL or p.no_channels <= 0 or p.no_samples <= 0:
+            return 0
+        channel_size = p.no_samples * sizeof(float)
+
+        entry.timestamp = _get_frame_timestamp(p.timestamp, p.timecode)
+        entry.timecode = p.timecode
+        entry.size = channel_size * p.no_channels
+        entry.xres = 0
+        entry.yres = 0
+        entry.line_stride = 0
+        entry.fourcc = FourCC.UYVY
+        entry.frame_format = FrameFormat.progressive
+        entry.frame_rate_N = 0
+        entry.frame_rate_D = 0
+        entry.sample_rate = p.sample_rate
+        entry.num_channels = p.no_channels
+        entry.num_samples = p.no_samples
+
+        self.lock._acquire(True, -1)
+        try:
+            if ring.arena is NULL:
+                capacity = self.max_audio_bytes
+                if capacity == 0:
+                    capacity = (
+                        <size_t>ceil(self.duration * p.sample_rate) * p.no_channels * sizeof(float)
+                        + 2 * entry.size
+                    )
+                ring._allocate(capacity)
+            with nogil:
+                offset = ring._reserve(entry.timestamp, entry.size)
+                if offset >= 0:
+                    entry.offset = offset
+                    dest = ring.arena + offset
+                    for i in range(<size_t>p.no_channels):
+                        memcpy(
+                            dest + i * channel_size,
+                            p.p_data + i * p.channel_stride_in_bytes,
+                            channel_size,
+                        )
+                    ring._commit(&entry)
+        finally:
+            self.lock._release()
+        return 0
@@ -2,112 +2,381 @@
 # distutils: language = c++
 
 from libc.stdint cimport int64_t
-from libcpp.list cimport list as cpp_list
-from cpython.ref cimport PyObject
-
-cdef extern from *:
-    ctypedef Py_ssize_t Py_intptr_t
-
-cdef extern from "Python.h":
-    ctypedef int64_t _PyTime_t
-
-    _PyTime_t _PyTime_GetMonotonicClock()
-    double _PyTime_AsSecondsDouble(_PyTime_t t)
-
-cdef extern from "pythread.h":
-    ctypedef void *PyThread_type_lock
-
-    cdef enum PyLockStatus:
-        PY_LOCK_FAILURE = 0
-        PY_LOCK_ACQUIRED = 1
-        PY_LOCK_INTR
-    enum:
-        NOWAIT_LOCK = 0
-        WAIT_LOCK = 1
-
-    long PyThread_get_thread_ident()
-    PyThread_type_lock PyThread_allocate_lock()
-    void PyThread_free_lock(PyThread_type_lock)
-    int PyThread_acquire_lock(PyThread_type_lock, int mode) nogil
-    void PyThread_release_lock(PyThread_type_lock) nogil
-    ctypedef long long PY_TIMEOUT_T
-
-    # /* If microseconds == 0, the call is non-blocking: it returns immediately
-    #     even when the lock can't be acquired.
-    #     If microseconds > 0, the call waits up to the specified duration.
-    #     If microseconds < 0, the call waits until success (or abnormal failure)
-    #
-    #     microseconds must be less than PY_TIMEOUT_MAX. Behaviour otherwise is
-    #     undefined.
-    #
-    #     If intr_flag is true and the acquire is interrupted by a signal, then the
-    #     call will return PY_LOCK_INTR.  The caller may reattempt to acquire the
-    #     lock.
-    # */
-    PyLockStatus PyThread_acquire_lock_timed(PyThread_type_lock,
-                                             PY_TIMEOUT_T microseconds,
-                                             int intr_flag) nogil
-
-
-ctypedef cpp_list[Py_intptr_t] obj_ptr_list_t
-
-cdef struct LockStatus_s:
-    PyThread_type_lock lock
-    bint is_locked
-    long owner
-    int acquire_count
-    int pending_requests
+
+
+cdef extern from * nogil:
+    """
+    #include <mutex>
+    #include <condition_variable>
+    #include <atomic>
+    #include <chrono>
+    #include <list>
+    #include <stdint.h>
+    #include "pythread.h"
+
+    // Everything below is static so each extension module that cimports
+    // this file keeps its own copy instead of sharing exported symbols.
+
+    // Releases the GIL (if held by the calling thread) for the lifetime
+    // of the object. Any std::mutex below must be released before the GIL is
+    // restored so a thread holding the GIL never blocks on one that is
+    // waiting for the GIL.
+    class cyndi_gil_release_t {
+    public:
+        PyThreadState* state;
+        cyndi_gil_release_t() : state(NULL) {
+            if (PyGILState_Check()) {
+                state = PyEval_SaveThread();
+            }
+        }
+        ~cyndi_gil_release_t() {
+            if (state != NULL) {
+                PyEval_RestoreThread(state);
+            }
+        }
+    };
+
+    typedef std::chrono::steady_clock cyndi_lock_clock_t;
+
+    static inline cyndi_lock_clock_t::time_point cyndi_lock_deadline(int64_t timeout_ns) {
+        return cyndi_lock_clock_t::now() + std::chrono::nanoseconds(timeout_ns);
+    }
+
+    struct cyndi_lock_t {
+        std::mutex mtx;
+        std::condition_variable cv;
+        long owner;
+        int count;
+        int waiting;
+        bool reentrant;
+    };
+
+    static inline bool _cyndi_lock_try_take(cyndi_lock_t* lock, long tid) {
+        if (lock->count == 0) {
+            lock->owner = tid;
+            lock->count = 1;
+            return true;
+        }
+        if (lock->reentrant && lock->owner == tid) {
+            lock->count += 1;
+            return true;
+        }
+        return false;
+    }
+
+    static inline cyndi_lock_t* cyndi_lock_create(bool reentrant) {
+        cyndi_lock_t* lock = new cyndi_lock_t();
+        lock->owner = -1;
+        lock->count = 0;
+        lock->waiting = 0;
+        lock->reentrant = reentrant;
+        return lock;
+    }
+
+    static inline void cyndi_lock_destroy(cyndi_lock_t* lock) {
+        delete lock;
+    }
+
+    // Waits (without taking the lock) until it is free. Returns false on timeout
+    static inline bool _cyndi_lock_wait_free(
+        cyndi_lock_t* lock, std::unique_lock<std::mutex>& lk,
+        bool has_deadline, cyndi_lock_clock_t::time_point deadline
+    ) {
+        bool result = true;
+        lock->waiting += 1;
+        if (!has_deadline) {
+            lock->cv.wait(lk, [lock]{ return lock->count == 0; });
+        } else {
+            result = lock->cv.wait_until(lk, deadline, [lock]{ return lock->count == 0; });
+        }
+        lock->waiting -= 1;
+        return result;
+    }
+
+    // timeout_ns < 0: wait indefinitely, 0: do not block
+    static inline bool cyndi_lock_acquire(cyndi_lock_t* lock, int64_t timeout_ns) {
+        long tid = PyThread_get_thread_ident();
+        bool has_deadline = timeout_ns > 0;
+        cyndi_lock_clock_t::time_point deadline;
+        {
+            std::lock_guard<std::mutex> lk(lock->mtx);
+            if (_cyndi_lock_try_take(lock, tid)) {
+                return true;
+            }
+            if (timeout_ns == 0) {
+                return false;
+            }
+        }
+        if (has_deadline) {
+            deadline = cyndi_lock_deadline(timeout_ns);
+        }
+        if (!PyGILState_Check()) {
+            std::unique_lock<std::mutex> lk(lock->mtx);
+            if (_cyndi_lock_try_take(lock, tid)) {
+                return true;
+            }
+            if (!_cyndi_lock_wait_free(lock, lk, has_deadline, deadline)) {
+                return false;
+            }
+            return _cyndi_lock_try_take(lock, tid);
+        }
+        // When called with the GIL, only wait for the lock to become free
+        // while it is released. Ownership is taken once the GIL is restored
+        // so the lock is never held by a thread blocked on the GIL.
+        while (true) {
+            {
+                cyndi_gil_release_t nogil;
+                std::unique_lock<std::mutex> lk(lock->mtx);
+                if (!_cyndi_lock_wait_free(lock, lk, has_deadline, deadline)) {
+                    return false;
+                }
+            }
+            std::lock_guard<std::mutex> lk(lock->mtx);
+            if (_cyndi_lock_try_take(lock, tid)) {
+                return true;
+            }
+            if (has_deadline && cyndi_lock_clock_t::now() >= deadline) {
+                return false;
+            }
+        }
+    }
+
+    // Returns 1 if still held (reentrant), 0 if released,
+    // -1 if not locked and -2 if owned by another thread (reentrant only)
+    static inline int cyndi_lock_release(cyndi_lock_t* lock) {
+        std::lock_guard<std::mutex> lk(lock->mtx);
+        if (lock->count == 0) {
+            return -1;
+        }
+        if (lock->reentrant && lock->owner != PyThread_get_thread_ident()) {
+            return -2;
+        }
+        lock->count -= 1;
+        if (lock->count > 0) {
+            return 1;
+        }
+        lock->owner = -1;
+        if (lock->waiting > 0) {
+            lock->cv.notify_one();
+        }
+        return 0;
+    }
+
+    static inline bool cyndi_lock_is_locked(cyndi_lock_t* lock) {
+        std::lock_guard<std::mutex> lk(lock->mtx);
+        return lock->count > 0;
+    }
+
+    static inline bool cyndi_lock_is_owned(cyndi_lock_t* lock) {
+        std::lock_guard<std::mutex> lk(lock->mtx);
+        return lock->count > 0 && lock->owner == PyThread_get_thread_ident();
+    }
+
+
+    struct cyndi_cond_waiter_t {
+        std::condition_variable cv;
+        bool notified;
+    };
+
+    struct cyndi_cond_t {
+        cyndi_lock_t* lock;
+        std::list<cyndi_cond_waiter_t*> waiters;
+    };
+
+    static inline cyndi_cond_t* cyndi_cond_create(cyndi_lock_t* lock) {
+        cyndi_cond_t* cond = new cyndi_cond_t();
+        cond->lock = lock;
+        return cond;
+    }
+
+    static inline void cyndi_cond_destroy(cyndi_cond_t* cond) {
+        delete cond;
+    }
+
+    // Returns 1 if notified, 0 on timeout and -1 if the lock is not owned
+    static inline int cyndi_cond_wait(cyndi_cond_t* cond, int64_t timeout_ns) {
+        cyndi_lock_t* lock = cond->lock;
+        long tid = PyThread_get_thread_ident();
+        cyndi_cond_waiter_t waiter;
+        int saved_count;
+        bool notified;
+
+        waiter.notified = false;
+        // Release the lock before the GIL so no other Python thread can
+        // observe it as held by a thread that is only waiting
+        {
+            std::lock_guard<std::mutex> lk(lock->mtx);
+            if (lock->count == 0 || lock->owner != tid) {
+                return -1;
+            }
+            saved_count = lock->count;
+            lock->count = 0;
+            lock->owner = -1;
+            if (lock->waiting > 0) {
+                lock->cv.notify_one();
+            }
+            cond->waiters.push_back(&waiter);
+        }
+        {
+            cyndi_gil_release_t nogil;
+            std::unique_lock<std::mutex> lk(lock->mtx);
+            if (timeout_ns < 0) {
+                waiter.cv.wait(lk, [&waiter]{ return waiter.notified; });
+            } else {
+                auto deadline = cyndi_lock_deadline(timeout_ns);
+                waiter.cv.wait_until(lk, deadline, [&waiter]{ return waiter.notified; });
+            }
+            notified = waiter.notified;
+            if (!notified) {
+                cond->waiters.remove(&waiter);
+            }
+        }
+        // Re-take the lock only after the GIL (if any) has been restored,
+        // like threading.Condition, so it isn't held while waiting on the GIL
+        cyndi_lock_acquire(lock, -1);
+        {
+            std::lock_guard<std::mutex> lk(lock->mtx);
+            lock->count = saved_count;
+        }
+        return notified ? 1 : 0;
+    }
+
+    // Wakes up to n waiters (all of them if n < 0). Returns the number of
+    // waiters notified or -1 if the lock is not owned
+    static inline Py_ssize_t cyndi_cond_notify(cyndi_cond_t* cond, Py_ssize_t n) {
+        cyndi_lock_t* lock = cond->lock;
+        Py_ssize_t result = 0;
+        std::lock_guard<std::mutex> lk(lock->mtx);
+        if (lock->count == 0 || lock->owner != PyThread_get_thread_ident()) {
+            return -1;
+        }
+        while (n != 0 && !cond->waiters.empty()) {
+            cyndi_cond_waiter_t* waiter = cond->waiters.front();
+            cond->waiters.pop_front();
+            waiter->notified = true;
+            waiter->cv.notify_one();
+            result += 1;
+            if (n > 0) {
+                n -= 1;
+            }
+        }
+        return result;
+    }
+
+    static inline Py_ssize_t cyndi_cond_num_waiters(cyndi_cond_t* cond) {
+        std::lock_guard<std::mutex> lk(cond->lock->mtx);
+        return (Py_ssize_t)cond->waiters.size();
+    }
+
+
+    struct cyndi_event_t {
+        std::mutex mtx;
+        std::condition_variable cv;
+        std::atomic<bool> flag;
+    };
+
+    static inline cyndi_event_t* cyndi_event_create() {
+        cyndi_event_t* evt = new cyndi_event_t();
+        evt->flag = false;
+        return evt;
+    }
+
+    static inline void cyndi_event_destroy(cyndi_event_t* evt) {
+        delete evt;
+    }
+
+    static inline bool cyndi_event_is_set(cyndi_event_t* evt) {
+        return evt->flag.load();
+    }
+
+    static inline void cyndi_event_set(cyndi_event_t* evt) {
+        std::lock_guard<std::mutex> lk(evt->mtx);
+        evt->flag = true;
+        evt->cv.notify_all();
+    }
+
+    static inline void cyndi_event_clear(cyndi_event_t* evt) {
+        std::lock_guard<std::mutex> lk(evt->mtx);
+        evt->flag = false;
+    }
+
+    static inline bool cyndi_event_wait(cyndi_event_t* evt, int64_t timeout_ns) {
+        if (evt->flag.load() || timeout_ns == 0) {
+            return evt->flag.load();
+        }
+        cyndi_gil_release_t nogil;
+        std::unique_lock<std::mutex> lk(evt->mtx);
+        if (timeout_ns < 0) {
+            evt->cv.wait(lk, [evt]{ return evt->flag.load(); });
+            return true;
+        }
+        auto deadline = cyndi_lock_deadline(timeout_ns);
+        return evt->cv.wait_until(lk, deadline, [evt]{ return evt->flag.load(); });
+    }
+    """
+    ctypedef struct cyndi_lock_t:
+        pass
+    ctypedef struct cyndi_cond_t:
+        pass
+    ctypedef struct cyndi_event_t:
+        pass
+
+    cyndi_lock_t* cyndi_lock_create(bint reentrant) except +
+    void cyndi_lock_destroy(cyndi_lock_t* lock)
+    bint cyndi_lock_acquire(cyndi_lock_t* lock, int64_t timeout_ns)
+    int cyndi_lock_release(cyndi_lock_t* lock)
+    bint cyndi_lock_is_locked(cyndi_lock_t* lock)
+    bint cyndi_lock_is_owned(cyndi_lock_t* lock)
+
+    cyndi_cond_t* cyndi_cond_create(cyndi_lock_t* lock) except +
+    void cyndi_cond_destroy(cyndi_cond_t* cond)
+    int cyndi_cond_wait(cyndi_cond_t* cond, int64_t timeout_ns)
+    Py_ssize_t cyndi_cond_notify(cyndi_cond_t* cond, Py_ssize_t n)
+    Py_ssize_t cyndi_cond_num_waiters(cyndi_cond_t* cond)
+
+    cyndi_event_t* cyndi_event_create() except +
+    void cyndi_event_destroy(cyndi_event_t* evt)
+    bint cyndi_event_is_set(cyndi_event_t* evt)
+    void cyndi_event_set(cyndi_event_t* evt)
+    void cyndi_event_clear(cyndi_event_t* evt)
+    bint cyndi_event_wait(cyndi_event_t* evt, int64_t timeout_ns)
+
 
 cdef class Lock:
-    cdef LockStatus_s* _lock
+    cdef cyndi_lock_t* _lock
     cdef public str name
 
-    cdef bint _is_locked(self)
-    cdef bint _do_acquire(self, long owner) except -1
-    cdef bint _do_acquire_timed(self, long owner, PY_TIMEOUT_T microseconds) except -1
-    cdef int _do_release(self) except -1
-    cdef int _check_acquire(self) except -1
-    cdef int _check_release(self) except -1
-    cdef bint _acquire(self, bint block, double timeout) except -1
-    cdef bint _release(self) except -1
+    cdef bint _is_locked(self) noexcept nogil
+    cdef bint _acquire(self, bint block, double timeout) except -1 nogil
+    cdef bint _release(self) except -1 nogil
     cpdef bint acquire(self, bint block=*, double timeout=*) except -1
     cpdef bint release(self) except -1
 
 cdef class RLock(Lock):
 
-    cdef bint _is_owned_c(self, long owner) except -1
+    cdef bint _is_owned_c(self) noexcept nogil
     cpdef bint _is_owned(self) except -1
-    cdef int _acquire_restore_c(self, long current_owner, int count, long owner) except -1
-    cdef int _acquire_restore(self, (int, long) state) except -1
-    cdef (int, long) _release_save_c(self) except *
-    cdef (int, long) _release_save(self) except *
 
 cdef class Condition:
     cdef readonly RLock rlock
-    # cdef readonly object _waiters
-    cdef obj_ptr_list_t _waiters
+    cdef cyndi_cond_t* _cond
 
     cpdef bint acquire(self, bint block=*, double timeout=*) except -1
-    cdef bint _acquire(self, bint block, double timeout) except -1
+    cdef bint _acquire(self, bint block, double timeout) except -1 nogil
     cpdef bint release(self) except -1
-    cdef bint _release(self) except -1
-    # cpdef _acquire_restore(self, state)
-    cdef int _acquire_restore(self, (int, long) state) except -1
-    cdef (int, long) _release_save(self) except *
+    cdef bint _release(self) except -1 nogil
     cpdef bint _is_owned(self) except -1
-    cdef int _ensure_owned(self) except -1
     cpdef bint wait(self, object timeout=*)
-    cdef bint _wait(self, bint block, double timeout=*) except -1
+    cdef bint _wait(self, bint block, double timeout=*) except -1 nogil
     cpdef bint wait_for(self, object predicate, object timeout=*) except -1
-    cdef int _notify(self, Py_ssize_t n=*) except -1
-    cdef int _notify_all(self) except -1
+    cdef int _notify(self, Py_ssize_t n=*) except -1 nogil
+    cdef int _notify_all(self) except -1 nogil
 
 
 cdef class Event:
-    cdef readonly Condition _cond
-    cdef readonly bint _flag
+    cdef cyndi_event_t* _evt
 
     cdef bint _is_set(self) noexcept nogil
-    cdef int _set(self) except -1
-    cdef int _clear(self) except -1
-    cdef bint _wait(self, bint block, double timeout) except -1
+    cdef int _set(self) except -1 nogil
+    cdef int _clear(self) except -1 nogil
+    cdef bint _wait(self, bint block, double timeout) except -1 nogil
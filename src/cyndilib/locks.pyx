@@ -1,125 +1,37 @@
 
 """Thread synchronization primitives implemented at the C level
 
-This module is **heavily** inspired by the `FastRLock`_ library with a few
+The primitives are built on :cpp:class:`std::mutex` and
+:cpp:class:`std::condition_variable` so they can be acquired, waited on and
+notified from ``nogil`` contexts. When called while holding the :term:`GIL`,
+it is released for as long as the call blocks.
+
+The API was originally inspired by the `FastRLock`_ library with a few
 adjustments and additions.
 
 .. _FastRLock: https://github.com/scoder/fastrlock
 """
 
-import threading
-from itertools import islice
-from collections import deque
-
-from cpython.ref cimport Py_INCREF, Py_DECREF
-from cpython.mem cimport PyMem_Malloc, PyMem_Free
-
+from .wrapper.common cimport raise_withgil, PyExc_RuntimeError
 from .clock cimport time
 
 
 __all__ = ('Lock', 'RLock', 'Condition', 'Event')
 
 
-cdef inline bint _lock_lock(LockStatus_s *lock, long current_thread,
-                            bint blocking, PY_TIMEOUT_T microseconds) except -1 nogil:
-
-    return _acquire_lock(lock, current_thread, blocking, microseconds, False)
-
-
-cdef inline bint _lock_rlock(LockStatus_s *lock, long current_thread,
-                             bint blocking, PY_TIMEOUT_T microseconds) except -1 nogil:
-    # Note that this function *must* hold the GIL when being called.
-    # We just use 'nogil' in the signature to make sure that no Python
-    # code execution slips in that might free the GIL
-
-    if lock.acquire_count:
-        # locked! - by myself?
-        if lock.owner == current_thread:
-            lock.acquire_count += 1
-            return True
-    elif not lock.pending_requests:
-        # not locked, not requested - go!
-        lock.owner = current_thread
-        lock.acquire_count = 1
-        return True
-    # need to get the real lock
-    return _acquire_lock(lock, current_thread, blocking, microseconds, True)
-
-cdef inline int _unlock_lock(LockStatus_s *lock) except -1 nogil:
-    # Note that this function *must* hold the GIL when being called.
-    # We just use 'nogil' in the signature to make sure that no Python
-    # code execution slips in that might free the GIL
-
-    #assert lock.acquire_count > 0
-    lock.acquire_count -= 1
-    if lock.acquire_count == 0:
-        lock.owner = -1
-        if lock.is_locked:
-            PyThread_release_lock(lock.lock)
-        lock.is_locked = False
-    return 0
-
-cdef bint _acquire_lock(LockStatus_s *lock, long current_thread, bint blocking,
-                        PY_TIMEOUT_T microseconds, bint reentrant) except -1 nogil:
-    cdef int locked
-    cdef PyLockStatus result
-
-    wait = WAIT_LOCK if blocking else NOWAIT_LOCK
-    if reentrant and not lock.is_locked and not lock.pending_requests:
-        # someone owns it but didn't acquire the real lock - do that
-        # now and tell the owner to release it when done
-        if PyThread_acquire_lock(lock.lock, NOWAIT_LOCK):
-            lock.is_locked = True
-    #assert lock._is_locked
-
-    lock.pending_requests += 1
-
-    # wait for the lock owning thread to release it
-    with nogil:
-        if blocking and microseconds > 0:
-            while True:
-                result = PyThread_acquire_lock_timed(lock.lock, microseconds, 1)
-                if result == PyLockStatus.PY_LOCK_ACQUIRED:
-                    break
-                elif result == PyLockStatus.PY_LOCK_FAILURE:
-                    return False
-        else:
-            while True:
-                locked = PyThread_acquire_lock(lock.lock, wait)
-                if locked:
-                    break
-                if wait == NOWAIT_LOCK:
-                    return False
-    lock.pending_requests -= 1
-    #assert not lock.is_locked
-    #assert lock.reentry_count == 0
-    #assert locked
-    lock.is_locked = True
-    lock.owner = current_thread
-    lock.acquire_count = 1
-    return True
-
-cdef LockStatus_s* LockStatus_create() except *:
-    cdef LockStatus_s* lock = <LockStatus_s*>PyMem_Malloc(sizeof(LockStatus_s))
-    if lock is NULL:
-        raise MemoryError()
-
-    lock.is_locked = False
-    lock.owner = -1
-    lock.acquire_count = 0
-    lock.pending_requests = 0
-    lock.lock = PyThread_allocate_lock()
-    if lock.lock is NULL:
-        PyMem_Free(lock)
-        raise MemoryError()
-    return lock
-
-cdef int LockStatus_destroy(LockStatus_s* lock) except -1:
-    if lock.lock != NULL:
-        PyThread_free_lock(lock.lock)
-        lock.lock = NULL
-    PyMem_Free(lock)
-    return 0
+cdef inline int64_t _get_timeout_ns(bint block, double timeout) noexcept nogil:
+    # Maps the (block, timeout) arguments to the value used by the
+    # C++ primitives: -1 to wait indefinitely, 0 to return immediately
+    cdef int64_t result
+    if timeout > 0:
+        result = <int64_t>(timeout * 1e9)
+        if result < 1:
+            result = 1
+        return result
+    elif timeout == 0 or not block:
+        return 0
+    return -1
+
 
 cdef class Lock:
     """Implementation of :class:`threading.Lock`. A Primitive non-reentrant
@@ -128,16 +40,15 @@ cdef class Lock:
     This class supports use as a :term:`context manager` and can be acquired
     and released using the :keyword:`with` statement.
     """
-    def __cinit__(self):
-        self._lock = LockStatus_create()
+    def __cinit__(self, *args, **kwargs):
+        self._lock = cyndi_lock_create(isinstance(self, RLock))
         self.name = ''
 
     def __dealloc__(self):
-        cdef LockStatus_s* lock
-        if self._lock != NULL:
-            lock = self._lock
-            LockStatus_destroy(lock)
+        cdef cyndi_lock_t* lock = self._lock
+        if lock is not NULL:
             self._lock = NULL
+            cyndi_lock_destroy(lock)
 
     @property
     def locked(self):
@@ -145,59 +56,19 @@ cdef class Lock:
         """
         return self._is_locked()
 
-    cdef bint _is_locked(self):
-        if self._lock.acquire_count > 0 or self._lock.owner >= 0 or self._lock.is_locked:
-            return True
-        return False
-
-    cdef bint _do_acquire(self, long owner) except -1:
-        return _lock_lock(self._lock, owner, True, -1)
+    cdef bint _is_locked(self) noexcept nogil:
+        return cyndi_lock_is_locked(self._lock)
 
-    cdef bint _do_acquire_timed(self, long owner, PY_TIMEOUT_T microseconds) except -1:
-        return _lock_lock(self._lock, owner, True, microseconds)
+    cdef bint _acquire(self, bint block, double timeout) except -1 nogil:
+        return cyndi_lock_acquire(self._lock, _get_timeout_ns(block, timeout))
 
-    cdef int _do_release(self) except -1:
-        _unlock_lock(self._lock)
-        return 0
-
-    cdef int _check_acquire(self) except -1:
-        # cdef long tid = PyThread_get_thread_ident()
-        #
-        # if self._lock.owner == tid:
-        #     raise RuntimeError('lock already acquired')
-        return 0
-
-    cdef int _check_release(self) except -1:
-        # cdef long tid = PyThread_get_thread_ident()
-        #
-        # if self._lock.owner != tid:
-        #     raise RuntimeError('cannot release un-acquired lock')
-        return 0
-
-    cdef bint _acquire(self, bint block, double timeout) except -1:
-        cdef double microseconds
-        cdef double multiplier = 1000000
-        cdef long tid = PyThread_get_thread_ident()
-
-        self._check_acquire()
-        if timeout == 0:
-            block = False
-        elif timeout < 0:
-            block = True
-        if block:
-            if timeout < 0:
-                microseconds = -1
-            else:
-                microseconds = timeout * multiplier
-            return self._do_acquire_timed(tid, <PY_TIMEOUT_T> microseconds)
-        else:
-            microseconds = 0
-            return self._do_acquire_timed(tid, <PY_TIMEOUT_T> microseconds)
-
-    cdef bint _release(self) except -1:
-        self._check_release()
-        self._do_release()
-        return self._lock.is_locked
+    cdef bint _release(self) except -1 nogil:
+        cdef int r = cyndi_lock_release(self._lock)
+        if r == -1:
+            raise_withgil(PyExc_RuntimeError, 'cannot release un-acquired lock')
+        elif r == -2:
+            raise_withgil(PyExc_RuntimeError, 'cannot release un-owned lock')
+        return r == 1
 
     cpdef bint acquire(self, bint block=True, double timeout=-1) except -1:
         """Acquire the lock, blocking or non-blocking
@@ -217,8 +88,8 @@ cdef class Lock:
             :meth:`threading.Lock.acquire` where it is considered an error to
             specify a *timeout* with *blocking* set to ``False``.
 
-            In this implementation, the *block* argument is ignored if *timeout*
-            is given.
+            In this implementation, the *block* argument is ignored if a
+            non-negative *timeout* is given.
 
         Returns:
             bool: ``True`` if the lock was acquired, otherwise ``False``.
@@ -254,52 +125,12 @@ cdef class RLock(Lock):
     This class supports use as a :term:`context manager` and can be acquired
     and released using the :keyword:`with` statement.
     """
-    cdef bint _do_acquire(self, long owner) except -1:
-        return _lock_rlock(self._lock, owner, True, -1)
 
-    cdef bint _do_acquire_timed(self, long owner, PY_TIMEOUT_T microseconds) except -1:
-        return _lock_rlock(self._lock, owner, True, microseconds)
-
-    cdef int _check_acquire(self) except -1:
-        return 0
-
-    cdef int _check_release(self) except -1:
-        cdef long tid = PyThread_get_thread_ident()
-
-        if self._lock.owner != tid:
-            raise RuntimeError('cannot release un-owned lock')
-        return 0
-
-    cdef bint _is_owned_c(self, long owner) except -1:
-        return owner == self._lock.owner
+    cdef bint _is_owned_c(self) noexcept nogil:
+        return cyndi_lock_is_owned(self._lock)
 
     cpdef bint _is_owned(self) except -1:
-        cdef long tid = PyThread_get_thread_ident()
-        return self._is_owned_c(tid)
-
-    cdef int _acquire_restore_c(self, long current_owner, int count, long owner) except -1:
-        self._do_acquire(current_owner)
-        self._lock.acquire_count = count
-        self._lock.owner = owner
-
-    cdef int _acquire_restore(self, (int, long) state) except -1:
-        cdef int count
-        cdef long current_owner, owner
-        current_owner = PyThread_get_thread_ident()
-        count, owner = state
-        self._acquire_restore_c(current_owner, count, owner)
-
-    cdef (int, long) _release_save_c(self) except *:
-        cdef int count = self._lock.acquire_count
-        cdef long owner = self._lock.owner
-
-        self._do_release()
-        return count, owner
-
-    cdef (int, long) _release_save(self) except *:
-        if not self._lock.acquire_count:
-            raise RuntimeError("cannot release un-acquired lock")
-        return self._release_save_c()
+        return self._is_owned_c()
 
 cdef class Condition:
     """Implementation of :class:`threading.Condition`. Allows one or more thread
@@ -321,14 +152,19 @@ cdef class Condition:
         else:
             lock = RLock()
         self.rlock = lock
-        # self._waiters = deque()
+        self._cond = cyndi_cond_create(lock._lock)
+
+    def __dealloc__(self):
+        cdef cyndi_cond_t* cond = self._cond
+        if cond is not NULL:
+            self._cond = NULL
+            cyndi_cond_destroy(cond)
 
     def __enter__(self):
         self.rlock._acquire(True, -1)
         return self
 
     def __exit__(self, *args):
-        # return self.rlock.__exit__(*args)
         self.rlock._release()
 
     cpdef bint acquire(self, bint block=True, double timeout=-1) except -1:
@@ -338,7 +174,7 @@ cdef class Condition:
         """
         return self.rlock._acquire(block, timeout)
 
-    cdef bint _acquire(self, bint block, double timeout) except -1:
+    cdef bint _acquire(self, bint block, double timeout) except -1 nogil:
         return self.rlock._acquire(block, timeout)
 
     cpdef bint release(self) except -1:
@@ -348,27 +184,14 @@ cdef class Condition:
         """
         return self.rlock._release()
 
-    cdef bint _release(self) except -1:
+    cdef bint _release(self) except -1 nogil:
         return self.rlock._release()
 
-    cdef int _acquire_restore(self, (int, long) state) except -1:
-        self.rlock._acquire_restore(state)
-        return 0
-
-    cdef (int, long) _release_save(self) except *:
-        return self.rlock._release_save()
-
     cpdef bint _is_owned(self) except -1:
-        cdef long tid = PyThread_get_thread_ident()
-        return self.rlock._is_owned_c(tid)
-
-    cdef int _ensure_owned(self) except -1:
-        if not self._is_owned():
-            raise RuntimeError("cannot wait on un-acquired lock")
-        return 0
+        return self.rlock._is_owned_c()
 
     def __repr__(self):
-        return "<Condition(%s, %d)>" % (self._lock, self._waiters.size())
+        return "<Condition(%s, %d)>" % (self.rlock, cyndi_cond_num_waiters(self._cond))
 
     cpdef bint wait(self, object timeout=None):
         """Wait until notified or until a timeout occurs
@@ -391,52 +214,19 @@ cdef class Condition:
             RuntimeError: If the lock was not acquired before this
                 method was called
         """
-        cdef bint block
         cdef double _timeout
 
         if timeout is None:
             _timeout = -1
-            block = True
         else:
-            block = False
             _timeout = <double> timeout
-        return self._wait(block, _timeout)
-
-    cdef bint _wait(self, bint block, double timeout=-1) except -1:
-        cdef Lock waiter
-        cdef bint gotit = False
-
-        self._ensure_owned()
-        waiter = Lock()
-        waiter._acquire(True, -1)
-        # self._waiters.append(waiter)
-        cdef PyObject* obj_ptr = <PyObject*>waiter
-        cdef Py_intptr_t w_id = <Py_intptr_t>obj_ptr
-        self._waiters.push_back(w_id)
-        Py_INCREF(waiter)
-        cdef (int, long) saved_state = self._release_save()
-
-        try:    # restore state no matter what (e.g., KeyboardInterrupt)
-            if block:
-                waiter._acquire(True, -1)
-                gotit = True
-            else:
-                if timeout > 0:
-                    gotit = waiter._acquire(True, timeout)
-                else:
-                    gotit = waiter._acquire(False, -1)
-            return gotit
-        finally:
-            self._acquire_restore(saved_state)
-            if not gotit:
-                # if waiter in self._waiters:
-                #     self._waiters.remove(waiter)
-                self._waiters.remove(w_id)
-                Py_DECREF(waiter)
-                # try:
-                #     self._waiters.remove(waiter)
-                # except ValueError:
-                #     pass
+        return self._wait(True, _timeout)
+
+    cdef bint _wait(self, bint block, double timeout=-1) except -1 nogil:
+        cdef int r = cyndi_cond_wait(self._cond, _get_timeout_ns(block, timeout))
+        if r == -1:
+            raise_withgil(PyExc_RuntimeError, 'cannot wait on un-acquired lock')
+        return r == 1
 
     cpdef bint wait_for(self, object predicate, object timeout=None) except -1:
         """Wait until a condition evaluates to ``True``
@@ -461,16 +251,12 @@ cdef class Condition:
             RuntimeError: If the lock was not acquired before this
                 method was called
         """
-        cdef double _timeout, endtime, waittime
+        cdef double endtime = -1, waittime = -1
         cdef bint has_timeout, result
 
-        if timeout is not None:
-            has_timeout = True
-            _timeout = <double> timeout
-            waittime = _timeout
-            endtime = -1
-        else:
-            has_timeout = False
+        has_timeout = timeout is not None and timeout >= 0
+        if has_timeout:
+            waittime = <double> timeout
 
         result = predicate()
         while not result:
@@ -501,38 +287,11 @@ cdef class Condition:
         """
         self._notify(n)
 
-    cdef int _notify(self, Py_ssize_t n=1) except -1:
-        cdef Lock waiter
-
-        self._ensure_owned()
-        # all_waiters = self._waiters
-        # waiters_to_notify = deque(islice(all_waiters, n))
-        # cdef obj_ptr_list_t waiters_to_notify = [v for v in enumerate(self._waiters) if i >= n]
-        # if not waiters_to_notify:
-        #     return
-        cdef PyObject* obj_ptr# = <PyObject*>waiter
-        cdef Py_intptr_t w_id# = <Py_intptr_t>obj_ptr
-        # cdef Lock waiter
-        cdef size_t i = 0
-        while n > 0 and self._waiters.size():
-            # i += 1
-            # if i < n:
-            #     continue
-            w_id = self._waiters.front()
-            self._waiters.pop_front()
-            obj_ptr = <PyObject*>w_id
-            waiter = <object>obj_ptr
-            waiter._release()
-            Py_DECREF(waiter)
-            n -= 1
-            # waiter = waiters_to_notify.popleft()
-            # waiter._release()
-        # for waiter in waiters_to_notify:
-        #     waiter._release()
-        #     try:
-        #         all_waiters.remove(waiter)
-        #     except ValueError:
-        #         pass
+    cdef int _notify(self, Py_ssize_t n=1) except -1 nogil:
+        if n <= 0:
+            return 0
+        if cyndi_cond_notify(self._cond, n) == -1:
+            raise_withgil(PyExc_RuntimeError, 'cannot notify on un-acquired lock')
         return 0
 
     def notify_all(self):
@@ -542,10 +301,11 @@ cdef class Condition:
             RuntimeError: If the lock was not acquired before this
                 method was called
         """
-        self._notify(self._waiters.size())
+        self._notify_all()
 
-    cdef int _notify_all(self) except -1:
-        self._notify(self._waiters.size())
+    cdef int _notify_all(self) except -1 nogil:
+        if cyndi_cond_notify(self._cond, -1) == -1:
+            raise_withgil(PyExc_RuntimeError, 'cannot notify on un-acquired lock')
         return 0
 
 cdef class Event:
@@ -553,30 +313,30 @@ cdef class Event:
     communication primitive where one thread signals an event and other
     threads wait for it.
     """
-    def __init__(self):
-        self._cond = Condition()
-        self._flag = False
+    def __cinit__(self, *args, **kwargs):
+        self._evt = cyndi_event_create()
+
+    def __dealloc__(self):
+        cdef cyndi_event_t* evt = self._evt
+        if evt is not NULL:
+            self._evt = NULL
+            cyndi_event_destroy(evt)
 
     def is_set(self) -> bool:
         """Returns ``True`` if the event has been set
         """
-        return self._flag
+        return self._is_set()
 
     cdef bint _is_set(self) noexcept nogil:
-        return self._flag
+        return cyndi_event_is_set(self._evt)
 
     def set(self):
         """Set the internal flag to ``True``, awakening any threads waiting for it
         """
         self._set()
 
-    cdef int _set(self) except -1:
-        self._cond._acquire(True, -1)
-        try:
-            self._flag = True
-            self._cond.notify_all()
-        finally:
-            self._cond._release()
+    cdef int _set(self) except -1 nogil:
+        cyndi_event_set(self._evt)
         return 0
 
     def clear(self):
@@ -585,10 +345,8 @@ cdef class Event:
         """
         self._clear()
 
-    cdef int _clear(self) except -1:
-        self._cond._acquire(True, -1)
-        self._flag = False
-        self._cond._release()
+    cdef int _clear(self) except -1 nogil:
+        cyndi_event_clear(self._evt)
         return 0
 
     def wait(self, object timeout=None) -> bool:
@@ -603,25 +361,14 @@ cdef class Event:
         Returns:
             bool: ``True`` if the flag was set before a timeout, ``False`` otherwise
         """
-        cdef bint block
         cdef double _timeout
 
         if timeout is None:
             _timeout = -1
-            block = True
         else:
-            block = False
             _timeout = <double> timeout
 
-        return self._wait(block, timeout)
-
-    cdef bint _wait(self, bint block, double timeout) except -1:
-        cdef bint signaled
-        self._cond._acquire(True, -1)
-        try:
-            signaled = self._flag
-            if not signaled:
-                signaled = self._cond._wait(block, timeout)
-            return signaled
-        finally:
-            self._cond._release()
+        return self._wait(True, _timeout)
+
+    cdef bint _wait(self, bint block, double timeout) except -1 nogil:
+        return cyndi_event_wait(self._evt, _get_timeout_ns(block, timeout))
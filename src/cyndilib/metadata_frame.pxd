@@ -3,25 +3,75 @@
 
 from libc.stdint cimport *
 from libcpp.string cimport string as cpp_string
+from libcpp.vector cimport vector as cpp_vector
+from libcpp.deque cimport deque as cpp_deque
+from libcpp.set cimport set as cpp_set
 
 from .wrapper cimport *
+from .locks cimport RLock, Condition
+
+
+cdef struct xml_cursor_s:
+    const char* data
+    size_t length
+    size_t pos
+
+
+cdef class MetadataElement:
+    cdef readonly str tag
+    cdef readonly dict attrs
+    cdef readonly str text
+    cdef readonly list children
+
+    cdef int _write_xml(self, list parts) except -1
+
+
+cdef MetadataElement parse_element_ptr(const char* data, size_t length)
+
+
+cdef class MetadataItem:
+    cdef readonly bytes data
+    cdef readonly int64_t timecode
+    cdef MetadataElement _element
+    cdef bint _parsed
+
+    cdef MetadataElement _get_element(self)
+
 
 cdef class MetadataFrame:
     cdef NDIlib_metadata_frame_t* ptr
     cdef cpp_string xml_bytes
     cdef readonly str tag
     cdef readonly dict attrs
+    cdef int _parse(self) except -1
     cdef char* _get_data(self) nogil
     cdef void _set_data(self, char* data) nogil
     cdef int64_t _get_timecode(self) nogil
     cdef void _set_timecode(self, int64_t value) nogil
 
 cdef class MetadataRecvFrame(MetadataFrame):
+    cdef MetadataItem last_item
+    cdef bint parsed
+    cdef readonly size_t max_buffers
+    cdef readonly bint overwrite
+    cdef readonly size_t overflow_count
+    cdef list bfr_items
+    cdef cpp_deque[size_t] read_indices
+    cdef cpp_set[size_t] read_indices_set
+    cdef readonly RLock read_lock
+    cdef readonly Condition read_ready
+
+    cpdef size_t get_buffer_depth(self)
+    cdef MetadataItem _pop_item(self)
+    cdef size_t _get_next_write_index(self) except? -1 nogil
     cdef bint can_receive(self) except -1 nogil
     cdef int _prepare_incoming(self, NDIlib_recv_instance_t recv_ptr) except -1
     cdef int _process_incoming(self, NDIlib_recv_instance_t recv_ptr) except -1
 
 cdef class MetadataSendFrame(MetadataFrame):
+    cdef bint dirty
+    cdef dict serialized_attrs
     cdef bint _serialize(self) except -1
+    cdef int _set_content(self, str tag, dict attrs) except -1
     cdef int _update(self, dict other) except -1
     cdef int _clear(self) except -1
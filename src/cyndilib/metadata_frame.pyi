@@ -0,0 +1,79 @@
+from typing import Any, Iterator
+
+from .locks import RLock, Condition
+
+
+def parse_xml(xml: str|bytes) -> tuple[str, dict[str, str]]|tuple[None, None]: ...
+def parse_xml_element(xml: str|bytes) -> MetadataElement: ...
+
+
+class MetadataElement:
+    tag: str
+    attrs: dict[str, str]
+    text: str
+    children: list[MetadataElement]
+    def __init__(
+        self,
+        tag: str,
+        attrs: dict[str, str]|None = ...,
+        text: str = ...,
+        children: list[MetadataElement]|None = ...,
+    ) -> None: ...
+    def get(self, name: str, default: Any = ...) -> str|Any: ...
+    def find(self, tag: str) -> MetadataElement|None: ...
+    def findall(self, tag: str) -> list[MetadataElement]: ...
+    def to_xml(self) -> str: ...
+    def __iter__(self) -> Iterator[MetadataElement]: ...
+    def __len__(self) -> int: ...
+
+
+class MetadataFrame:
+    tag: str|None
+    attrs: dict[str, str]
+    def __init__(self, *args, **kwargs) -> None: ...
+    def get_tag(self) -> str|None: ...
+    def set_tag(self, tag: str) -> None: ...
+    def get(self, tag: str) -> str|None: ...
+    def get_timecode(self) -> int: ...
+    def __getitem__(self, key: str) -> str: ...
+
+
+class MetadataItem:
+    data: bytes
+    timecode: int
+    def __init__(self, data: bytes, timecode: int = ...) -> None: ...
+    @property
+    def xml(self) -> str: ...
+    @property
+    def element(self) -> MetadataElement|None: ...
+    @property
+    def tag(self) -> str|None: ...
+    @property
+    def attrs(self) -> dict[str, str]|None: ...
+
+
+class MetadataRecvFrame(MetadataFrame):
+    @property
+    def element(self) -> MetadataElement|None: ...
+    @property
+    def tag(self) -> str|None: ...
+    @property
+    def attrs(self) -> dict[str, str]: ...
+    max_buffers: int
+    overwrite: bool
+    overflow_count: int
+    read_lock: RLock
+    read_ready: Condition
+    def get_buffer_depth(self) -> int: ...
+    def buffer_full(self) -> bool: ...
+    def read(self, timeout: float = ...) -> MetadataItem|None: ...
+    def drain(self) -> list[MetadataItem]: ...
+    def __iter__(self) -> Iterator[MetadataItem]: ...
+    def __len__(self) -> int: ...
+
+
+class MetadataSendFrame(MetadataFrame):
+    def __init__(self, tag: str, initdict: dict[str, str]|None = ..., *args, **kwargs) -> None: ...
+    def __setitem__(self, key: str, value: str) -> None: ...
+    def update(self, other: dict[str, str]) -> None: ...
+    def clear(self) -> None: ...
@@ -1,47 +1,467 @@
-from libc.string cimport strcpy
-# cimport lxml.includes.etreepublic as cetree
-# cdef object etree
-# from lxml import etree
-# cetree.import_lxml__etree()
+cimport cython
+from cpython.ref cimport PyObject, Py_INCREF
+from cpython.unicode cimport PyUnicode_DecodeUTF8
+from cython.operator cimport dereference as deref
+from libc.string cimport strcpy, strlen, memchr, memcmp
+from libcpp.unordered_map cimport unordered_map
 
-# import xml.etree.ElementTree as ET
-import re
+from .wrapper.common cimport raise_withgil, PyExc_ValueError
 
+import sys
 
-__all__ = ('MetadataFrame', 'MetadataRecvFrame', 'MetadataSendFrame')
 
+__all__ = (
+    'MetadataElement', 'MetadataItem',
+    'MetadataFrame', 'MetadataRecvFrame', 'MetadataSendFrame',
+    'parse_xml', 'parse_xml_element',
+)
 
-cdef object DOC_PATTERN = re.compile(r'<(?P<tag>\w+)(?P<attrs>[\w\s,",=]+)/>')
-cdef object ATTR_PATTERN = re.compile(r'(\s+(?P<name>\w+)="(?P<value>\w+)")')
 
+cdef size_t NAME_CACHE_MAX = 4096
+cdef int MAX_ELEMENT_DEPTH = 64
 
-def parse_xml(str xml):
-    cdef object m = DOC_PATTERN.match(xml)
-    if m is None:
-        return None, None
-    cdef str tag = m['tag'], attr_str = m['attrs']
-    cdef dict attrs = {}, d
+# Tag and attribute names seen on the wire are decoded once and shared.
+# Entries are never removed, so the number of names kept is bounded
+cdef unordered_map[cpp_string, PyObject*] _name_cache
 
-    # cdef str key, value
 
-    for m in ATTR_PATTERN.finditer(attr_str):
-        print(f'm: {m!r}')
-        d = m.groupdict()
-        key = d['name']
-        if key is None:
-            continue
-        value = d['value']
-        if value is None:
+cdef str _intern_name(const char* p, size_t n):
+    cdef cpp_string key = cpp_string(p, n)
+    cdef unordered_map[cpp_string, PyObject*].iterator it = _name_cache.find(key)
+    if it != _name_cache.end():
+        return <str><object>deref(it).second
+    cdef str name = sys.intern(PyUnicode_DecodeUTF8(p, n, NULL))
+    if _name_cache.size() < NAME_CACHE_MAX:
+        Py_INCREF(name)
+        _name_cache[key] = <PyObject*>name
+    return name
+
+
+cdef inline bint _is_space(char c) noexcept nogil:
+    return c == b' ' or c == b'\t' or c == b'\n' or c == b'\r'
+
+
+cdef inline bint _is_name_end(char c) noexcept nogil:
+    return (
+        _is_space(c) or c == b'/' or c == b'>' or c == b'=' or
+        c == b'"' or c == b"'" or c == b'<' or c == 0
+    )
+
+
+cdef inline void _skip_space(xml_cursor_s* c) noexcept nogil:
+    while c.pos < c.length and _is_space(c.data[c.pos]):
+        c.pos += 1
+
+
+cdef inline bint _startswith(xml_cursor_s* c, const char* s, size_t n) noexcept nogil:
+    if c.pos + n > c.length:
+        return False
+    return memcmp(c.data + c.pos, s, n) == 0
+
+
+cdef size_t _find(xml_cursor_s* c, const char* s, size_t n) noexcept nogil:
+    """Find the position of *s* at or after the cursor (or ``c.length``)
+    """
+    cdef size_t i = c.pos
+    while i + n <= c.length:
+        if c.data[i] == s[0] and memcmp(c.data + i, s, n) == 0:
+            return i
+        i += 1
+    return c.length
+
+
+cdef int _skip_past(xml_cursor_s* c, const char* s, size_t n) except -1:
+    cdef size_t i = _find(c, s, n)
+    if i == c.length:
+        raise ValueError('unterminated markup')
+    c.pos = i + n
+    return 0
+
+
+cdef int _skip_misc(xml_cursor_s* c) except -1:
+    # Skip whitespace, comments, processing instructions and doctype
+    while True:
+        _skip_space(c)
+        if _startswith(c, b'<?', 2):
+            _skip_past(c, b'?>', 2)
+        elif _startswith(c, b'<!--', 4):
+            _skip_past(c, b'-->', 3)
+        elif _startswith(c, b'<!', 2) and not _startswith(c, b'<![CDATA[', 9):
+            _skip_past(c, b'>', 1)
+        else:
+            return 0
+
+
+cdef str _read_name(xml_cursor_s* c):
+    cdef size_t start = c.pos
+    while c.pos < c.length and not _is_name_end(c.data[c.pos]):
+        c.pos += 1
+    if c.pos == start:
+        raise ValueError(f'expected a name at position {start}')
+    return _intern_name(c.data + start, c.pos - start)
+
+
+cdef uint32_t _entity_codepoint(const char* s, size_t n) noexcept nogil:
+    cdef uint32_t cp = 0
+    cdef size_t i
+    cdef char ch
+    if n == 0:
+        return 0
+    if s[0] == c'#':
+        if n >= 2 and (s[1] == c'x' or s[1] == c'X'):
+            if n == 2:
+                return 0
+            for i in range(2, n):
+                ch = s[i]
+                if c'0' <= ch <= c'9':
+                    cp = cp * 16 + (ch - c'0')
+                elif c'a' <= ch <= c'f':
+                    cp = cp * 16 + (ch - c'a' + 10)
+                elif c'A' <= ch <= c'F':
+                    cp = cp * 16 + (ch - c'A' + 10)
+                else:
+                    return 0
+        else:
+            if n == 1:
+                return 0
+            for i in range(1, n):
+                ch = s[i]
+                if c'0' <= ch <= c'9':
+                    cp = cp * 10 + (ch - c'0')
+                else:
+                    return 0
+        if cp > 0x10FFFF:
+            return 0
+        return cp
+    if n == 3 and memcmp(s, b'amp', 3) == 0:
+        return 0x26
+    if n == 2 and memcmp(s, b'lt', 2) == 0:
+        return 0x3c
+    if n == 2 and memcmp(s, b'gt', 2) == 0:
+        return 0x3e
+    if n == 4 and memcmp(s, b'quot', 4) == 0:
+        return 0x22
+    if n == 4 and memcmp(s, b'apos', 4) == 0:
+        return 0x27
+    return 0
+
+
+cdef void _append_utf8(cpp_string* buf, uint32_t cp) noexcept nogil:
+    if cp < 0x80:
+        buf.push_back(<char>cp)
+    elif cp < 0x800:
+        buf.push_back(<char>(0xC0 | (cp >> 6)))
+        buf.push_back(<char>(0x80 | (cp & 0x3F)))
+    elif cp < 0x10000:
+        buf.push_back(<char>(0xE0 | (cp >> 12)))
+        buf.push_back(<char>(0x80 | ((cp >> 6) & 0x3F)))
+        buf.push_back(<char>(0x80 | (cp & 0x3F)))
+    else:
+        buf.push_back(<char>(0xF0 | (cp >> 18)))
+        buf.push_back(<char>(0x80 | ((cp >> 12) & 0x3F)))
+        buf.push_back(<char>(0x80 | ((cp >> 6) & 0x3F)))
+        buf.push_back(<char>(0x80 | (cp & 0x3F)))
+
+
+cdef str _decode_text(const char* p, size_t n):
+    if n == 0:
+        return ''
+    if memchr(p, b'&', n) is NULL:
+        return PyUnicode_DecodeUTF8(p, n, NULL)
+    cdef cpp_string buf
+    cdef size_t i = 0, j
+    cdef uint32_t cp
+    buf.reserve(n)
+    while i < n:
+        if p[i] != b'&':
+            buf.push_back(p[i])
+            i += 1
             continue
-        attrs[key] = value
-    return tag, attrs
+        j = i + 1
+        while j < n and j - i <= 10 and p[j] != b';':
+            j += 1
+        cp = 0
+        if j < n and p[j] == b';':
+            cp = _entity_codepoint(p + i + 1, j - i - 1)
+        if cp == 0:
+            # Not a known entity, keep the ampersand as-is
+            buf.push_back(p[i])
+            i += 1
+        else:
+            _append_utf8(&buf, cp)
+            i = j + 1
+    return PyUnicode_DecodeUTF8(buf.c_str(), buf.size(), NULL)
+
+
+cdef MetadataElement _parse_element(xml_cursor_s* c, int depth):
+    if depth > MAX_ELEMENT_DEPTH:
+        raise ValueError('maximum element depth exceeded')
+    c.pos += 1  # '<'
+    cdef MetadataElement el = MetadataElement.__new__(MetadataElement)
+    el.tag = _read_name(c)
+    cdef str name
+    cdef char quote
+    cdef size_t end
+    cdef list text_parts = None
+
+    # Attributes
+    while True:
+        _skip_space(c)
+        if c.pos >= c.length:
+            raise ValueError('unexpected end of data')
+        if c.data[c.pos] == b'/':
+            if not _startswith(c, b'/>', 2):
+                raise ValueError(f'expected "/>" at position {c.pos}')
+            c.pos += 2
+            return el
+        if c.data[c.pos] == b'>':
+            c.pos += 1
+            break
+        name = _read_name(c)
+        _skip_space(c)
+        if c.pos >= c.length or c.data[c.pos] != b'=':
+            raise ValueError(f'expected "=" at position {c.pos}')
+        c.pos += 1
+        _skip_space(c)
+        if c.pos >= c.length:
+            raise ValueError('unexpected end of data')
+        quote = c.data[c.pos]
+        if quote != b'"' and quote != b"'":
+            raise ValueError(f'expected quoted value at position {c.pos}')
+        c.pos += 1
+        end = c.pos
+        while end < c.length and c.data[end] != quote:
+            end += 1
+        if end >= c.length:
+            raise ValueError('unterminated attribute value')
+        el.attrs[name] = _decode_text(c.data + c.pos, end - c.pos)
+        c.pos = end + 1
+
+    # Content
+    while True:
+        if c.pos >= c.length:
+            raise ValueError(f'unclosed element "{el.tag}"')
+        if c.data[c.pos] != b'<':
+            end = _find(c, b'<', 1)
+            if text_parts is None:
+                text_parts = []
+            text_parts.append(_decode_text(c.data + c.pos, end - c.pos))
+            c.pos = end
+        elif _startswith(c, b'</', 2):
+            c.pos += 2
+            name = _read_name(c)
+            if name != el.tag:
+                raise ValueError(f'mismatched closing tag "{name}" for "{el.tag}"')
+            _skip_space(c)
+            if c.pos >= c.length or c.data[c.pos] != b'>':
+                raise ValueError(f'expected ">" at position {c.pos}')
+            c.pos += 1
+            break
+        elif _startswith(c, b'<!--', 4):
+            _skip_past(c, b'-->', 3)
+        elif _startswith(c, b'<![CDATA[', 9):
+            c.pos += 9
+            end = _find(c, b']]>', 3)
+            if end == c.length:
+                raise ValueError('unterminated CDATA section')
+            if text_parts is None:
+                text_parts = []
+            text_parts.append(PyUnicode_DecodeUTF8(c.data + c.pos, end - c.pos, NULL))
+            c.pos = end + 3
+        elif _startswith(c, b'<?', 2):
+            _skip_past(c, b'?>', 2)
+        else:
+            el.children.append(_parse_element(c, depth + 1))
+
+    if text_parts is not None:
+        el.text = ''.join(text_parts)
+        if len(el.children) and el.text.isspace():
+            el.text = ''
+    return el
+
+
+cdef MetadataElement parse_element_ptr(const char* data, size_t length):
+    """Parse the first element found in *data*
+
+    Raises :class:`ValueError` if the data is malformed
+    """
+    cdef xml_cursor_s c
+    c.data = data
+    c.length = length
+    c.pos = 0
+    _skip_misc(&c)
+    if c.pos >= c.length or c.data[c.pos] != b'<':
+        raise ValueError('no element found')
+    return _parse_element(&c, 0)
+
+
+cdef bytes _to_bytes(object xml):
+    if isinstance(xml, str):
+        return (<str>xml).encode('UTF-8')
+    return bytes(xml)
+
+
+def parse_xml_element(xml) -> MetadataElement:
+    """Parse an XML string into a :class:`MetadataElement`
+
+    Nested elements, text content, CDATA sections and character entities
+    are supported. Comments and processing instructions are skipped.
+
+    Arguments:
+        xml (str | bytes): The XML data
+
+    Raises:
+        ValueError: If the data is not well-formed
+
+    .. versionadded:: 0.0.10
+
+    """
+    cdef bytes b = _to_bytes(xml)
+    return parse_element_ptr(b, len(b))
+
+
+def parse_xml(xml):
+    """Parse an XML string and return a tuple of the root element's tag
+    and attributes
+
+    If the data could not be parsed, ``(None, None)`` is returned
+    """
+    cdef bytes b = _to_bytes(xml)
+    cdef MetadataElement el
+    try:
+        el = parse_element_ptr(b, len(b))
+    except ValueError:
+        return None, None
+    return el.tag, el.attrs
+
+
+cdef dict _TEXT_ESCAPES = {
+    ord('&'): '&amp;', ord('<'): '&lt;', ord('>'): '&gt;',
+}
+cdef dict _ATTR_ESCAPES = {
+    ord('&'): '&amp;', ord('<'): '&lt;', ord('>'): '&gt;',
+    ord('"'): '&quot;', ord("'"): '&apos;',
+}
+
+
+cdef str _escape(str value, bint is_attr):
+    cdef Py_UCS4 ch
+    cdef bint needs_escape = False
+    for ch in value:
+        if ch == '&' or ch == '<' or ch == '>':
+            needs_escape = True
+            break
+        if is_attr and (ch == '"' or ch == "'"):
+            needs_escape = True
+            break
+    if not needs_escape:
+        return value
+    if is_attr:
+        return value.translate(_ATTR_ESCAPES)
+    return value.translate(_TEXT_ESCAPES)
+
+
+cdef int _write_attrs(list parts, dict attrs) except -1:
+    cdef object key, val
+    for key, val in attrs.items():
+        if not isinstance(val, str):
+            val = str(val)
+        parts.append(' ')
+        parts.append(key)
+        parts.append('="')
+        parts.append(_escape(val, True))
+        parts.append('"')
+    return 0
+
+
+cdef class MetadataElement:
+    """A parsed XML element
+
+    Instances are created by :func:`parse_xml_element` and by
+    :class:`MetadataRecvFrame` for each received message.
+
+    Attributes:
+        tag (str): The element tag name
+        attrs (dict): The element attributes
+        text (str): Text content of the element (with entities decoded)
+        children (list): Child :class:`MetadataElement` instances
+
+    .. versionadded:: 0.0.10
+
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.tag = ''
+        self.attrs = {}
+        self.text = ''
+        self.children = []
+
+    def __init__(self, str tag, dict attrs=None, str text='', list children=None):
+        self.tag = tag
+        if attrs is not None:
+            self.attrs.update(attrs)
+        self.text = text
+        if children is not None:
+            self.children.extend(children)
+
+    def get(self, str name, default=None):
+        """Get the attribute with the given *name* (or *default*)
+        """
+        return self.attrs.get(name, default)
+
+    def find(self, str tag):
+        """Get the first child element with the given *tag* or ``None``
+        """
+        cdef MetadataElement child
+        for child in self.children:
+            if child.tag == tag:
+                return child
+        return None
+
+    def findall(self, str tag) -> list:
+        """Get a list of all child elements with the given *tag*
+        """
+        cdef MetadataElement child
+        return [child for child in self.children if child.tag == tag]
+
+    def to_xml(self) -> str:
+        """Serialize the element (and its children) to a string
+        """
+        cdef list parts = []
+        self._write_xml(parts)
+        return ''.join(parts)
+
+    cdef int _write_xml(self, list parts) except -1:
+        cdef MetadataElement child
+        parts.append('<')
+        parts.append(self.tag)
+        _write_attrs(parts, self.attrs)
+        if not len(self.children) and not len(self.text):
+            parts.append('/>')
+            return 0
+        parts.append('>')
+        parts.append(_escape(self.text, False))
+        for child in self.children:
+            child._write_xml(parts)
+        parts.append('</')
+        parts.append(self.tag)
+        parts.append('>')
+        return 0
+
+    def __iter__(self):
+        return iter(self.children)
+
+    def __len__(self):
+        return len(self.children)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: "{self.tag}">'
 
 
 cdef class MetadataFrame:
     """An |NDI| metadata frame
 
     Metadata frames carry miscellaneous information between sources and receivers
-    formatted as a single XML tag.
+    formatted as XML.
 
     The data can be application-specific although there are some reserved
     namespaces and tag names for standardized use:
@@ -86,17 +506,23 @@ cdef class MetadataFrame:
             metadata_frame_destroy(p)
 
     def get_tag(self):
+        self._parse()
         return self.tag
 
     def set_tag(self, str tag):
         self.tag = tag
 
     def get(self, str tag):
+        self._parse()
         return self.attrs.get(tag)
 
     def __getitem__(self, str key):
+        self._parse()
         return self.attrs[key]
 
+    cdef int _parse(self) except -1:
+        return 0
+
     cdef char* _get_data(self) nogil:
         return self.ptr.p_data
     cdef void _set_data(self, char* data) nogil:
@@ -116,25 +542,301 @@ cdef class MetadataFrame:
         return self.xml_bytes.decode('UTF-8')
 
 
+cdef class MetadataItem:
+    """A buffered message from :class:`MetadataRecvFrame`
+
+    The raw data is kept as received and only parsed when the :attr:`element`
+    (or :attr:`tag` / :attr:`attrs`) is first accessed.
+
+    Attributes:
+        data (bytes): The raw XML data
+        timecode (int): The message timecode (in 100 nanosecond units)
+
+    .. versionadded:: 0.0.10
+
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.data = b''
+        self.timecode = 0
+        self._element = None
+        self._parsed = False
+
+    def __init__(self, bytes data, int64_t timecode=0):
+        self.data = data
+        self.timecode = timecode
+
+    @property
+    def xml(self) -> str:
+        """The raw data decoded as a string
+        """
+        return self.data.decode('UTF-8')
+
+    @property
+    def element(self):
+        """The parsed :class:`MetadataElement` (or ``None`` if the data
+        could not be parsed)
+        """
+        return self._get_element()
+
+    @property
+    def tag(self):
+        """The tag name of the root element (or ``None``)
+        """
+        cdef MetadataElement el = self._get_element()
+        if el is None:
+            return None
+        return el.tag
+
+    @property
+    def attrs(self):
+        """The attributes of the root element (or ``None``)
+        """
+        cdef MetadataElement el = self._get_element()
+        if el is None:
+            return None
+        return el.attrs
+
+    cdef MetadataElement _get_element(self):
+        if not self._parsed:
+            self._parsed = True
+            try:
+                self._element = parse_element_ptr(self.data, len(self.data))
+            except ValueError:
+                self._element = None
+        return self._element
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: "{self.xml}">'
+
+
 cdef class MetadataRecvFrame(MetadataFrame):
     """A MetadataFrame used in :class:`.receiver.Receiver`
+
+    Incoming messages are kept in a bounded buffer (along with their
+    timecodes) so bursts of metadata are not lost between reads. They can be
+    read as :class:`MetadataItem` objects using :meth:`read`, :meth:`drain`
+    or by iterating over the frame.
+
+    The :attr:`~MetadataFrame.tag`, :attr:`~MetadataFrame.attrs` and
+    :attr:`element` attributes always reflect the most recently received
+    message. Messages are stored as received and only parsed when these
+    (or the :class:`MetadataItem` attributes) are first accessed, so each
+    message is parsed at most once.
+
+    Arguments:
+        max_buffers (int, optional): The maximum number of messages to store
+            in the buffer. Defaults to ``16``
+        overwrite (bool, optional): If True (the default), the oldest buffered
+            message is discarded when a new one arrives and the buffer is
+            full (incrementing :attr:`overflow_count`). If False, no
+            messages are requested from the receiver while the buffer is full,
+            leaving them queued in the |NDI| library
+
+    Attributes:
+        max_buffers (int): The maximum number of buffered messages
+
+            .. versionadded:: 0.0.10
+
+        overflow_count (int): The number of messages discarded because
+            the buffer was full
+
+            .. versionadded:: 0.0.10
+
     """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_buffers = kwargs.get('max_buffers', 16)
+        if self.max_buffers < 1:
+            raise ValueError('max_buffers must be at least 1')
+        self.overwrite = kwargs.get('overwrite', True)
+        self.overflow_count = 0
+        self.bfr_items = [None] * self.max_buffers
+        self.read_lock = RLock()
+        self.read_ready = Condition(self.read_lock)
+
+    @property
+    def element(self):
+        """The full parsed element (including any nested elements and text)
+        of the last received message, or ``None`` if it could not be parsed
+
+        .. versionadded:: 0.0.10
+        """
+        if self.last_item is None:
+            return None
+        return self.last_item._get_element()
+
+    @property
+    def tag(self):
+        """The tag name of the last received message
+        """
+        self._parse()
+        return self.tag
+
+    @property
+    def attrs(self):
+        """The attributes of the last received message
+        """
+        self._parse()
+        return self.attrs
+
+    cdef int _parse(self) except -1:
+        cdef MetadataElement el
+        if self.parsed:
+            return 0
+        self.parsed = True
+        if self.last_item is None:
+            return 0
+        el = self.last_item._get_element()
+        if el is not None:
+            self.tag = el.tag
+            self.attrs = el.attrs
+        return 0
+
+    cpdef size_t get_buffer_depth(self):
+        """Get the number of buffered messages
+        """
+        return self.read_indices.size()
+
+    def buffer_full(self) -> bool:
+        """Returns True if the buffers are all in use
+        """
+        return self.read_indices.size() >= self.max_buffers
+
+    def read(self, double timeout=0):
+        """Remove and return the oldest buffered message
+
+        Arguments:
+            timeout (float, optional): Time (in seconds) to wait for a message
+                if the buffer is empty. Defaults to ``0`` (no waiting)
+
+        Returns:
+            MetadataItem: The message, or ``None`` if nothing was available
+
+        .. versionadded:: 0.0.10
+
+        """
+        cdef MetadataItem item = None
+        self.read_lock._acquire(True, -1)
+        try:
+            if self.read_indices.size() == 0 and timeout > 0:
+                self.read_ready._wait(False, timeout)
+            if self.read_indices.size() > 0:
+                item = self._pop_item()
+        finally:
+            self.read_lock._release()
+        return item
+
+    def drain(self) -> list:
+        """Remove and return all buffered messages as a list of
+        :class:`MetadataItem` (oldest first)
+
+        .. versionadded:: 0.0.10
+
+        """
+        cdef list result = []
+        self.read_lock._acquire(True, -1)
+        try:
+            while self.read_indices.size() > 0:
+                result.append(self._pop_item())
+        finally:
+            self.read_lock._release()
+        return result
+
+    def __iter__(self):
+        """Iterate over buffered messages, removing each one as it is yielded
+
+        Iteration stops when the buffer is empty
+        """
+        cdef MetadataItem item
+        while True:
+            self.read_lock._acquire(True, -1)
+            try:
+                if self.read_indices.size() == 0:
+                    return
+                item = self._pop_item()
+            finally:
+                self.read_lock._release()
+            yield item
+
+    def __len__(self):
+        return self.read_indices.size()
+
+    cdef MetadataItem _pop_item(self):
+        cdef size_t idx = self.read_indices.front()
+        cdef MetadataItem item = self.bfr_items[idx]
+        self.bfr_items[idx] = None
+        self.read_indices.pop_front()
+        self.read_indices_set.erase(idx)
+        return item
+
+    cdef size_t _get_next_write_index(self) except? -1 nogil:
+        cdef size_t idx, niter, result, bfr_len = self.read_indices.size()
+
+        if bfr_len > 0:
+            result = self.read_indices.back() + 1
+            if result >= self.max_buffers:
+                result = 0
+        else:
+            result = 0
+        niter = 0
+        while self.read_indices_set.count(result) != 0:
+            result += 1
+            if result >= self.max_buffers:
+                result = 0
+            niter += 1
+            if niter > self.max_buffers * 2:
+                raise_withgil(PyExc_ValueError, 'could not get write index')
+        return result
+
     cdef bint can_receive(self) except -1 nogil:
-        return True
+        if self.overwrite:
+            return True
+        return self.read_indices.size() < self.max_buffers
+
     cdef int _prepare_incoming(self, NDIlib_recv_instance_t recv_ptr) except -1:
+        cdef size_t bfr_idx
         self.tag = None
-        self.attrs.clear()
+        self.attrs = {}
+        self.last_item = None
+        self.parsed = True
+        if self.read_indices.size() >= self.max_buffers:
+            self.read_lock._acquire(True, -1)
+            try:
+                if self.read_indices.size() >= self.max_buffers:
+                    bfr_idx = self.read_indices.front()
+                    self.read_indices.pop_front()
+                    self.read_indices_set.erase(bfr_idx)
+                    self.bfr_items[bfr_idx] = None
+                    self.overflow_count += 1
+            finally:
+                self.read_lock._release()
         return 0
+
     cdef int _process_incoming(self, NDIlib_recv_instance_t recv_ptr) except -1:
-        self.xml_bytes = self.ptr.p_data
-        cdef str data_str = self.xml_bytes.decode('UTF-8')
-        if len(data_str):
-            tag, attrs = parse_xml(data_str)
-            if tag is not None:
-                self.tag = tag
-                self.attrs = attrs
-
-        NDIlib_recv_free_metadata(recv_ptr, self.ptr)
+        cdef const char* data = self.ptr.p_data
+        cdef MetadataItem item = MetadataItem.__new__(MetadataItem)
+        cdef size_t bfr_idx
+        if data is not NULL:
+            item.data = data[:strlen(data)]
+        item.timecode = self.ptr.timecode
+        self.xml_bytes = item.data
+
+        # Parsing is left to the first access of the item (or of the
+        # tag / attrs / element of this frame)
+        self.read_lock._acquire(True, -1)
+        try:
+            bfr_idx = self._get_next_write_index()
+            self.bfr_items[bfr_idx] = item
+            self.read_indices.push_back(bfr_idx)
+            self.read_indices_set.insert(bfr_idx)
+            self.read_ready._notify_all()
+        finally:
+            self.read_lock._release()
+        self.last_item = item
+        self.parsed = False
+
+        if recv_ptr is not NULL:
+            NDIlib_recv_free_metadata(recv_ptr, self.ptr)
         return 0
 
 
@@ -145,6 +847,15 @@ cdef class MetadataSendFrame(MetadataFrame):
 
         >>> metadata_frame['program_tally'] = "false"
         >>> metadata_frame.update({'preview_tally':'true'})
+
+    The serialized XML is cached and only rebuilt when the tag or attributes
+    have changed. Changes made directly to :attr:`~MetadataFrame.attrs` are
+    detected by comparing it to a copy taken at the last serialization.
+    Attribute values are escaped as needed.
+
+    .. versionchanged:: 0.0.10
+
+        The XML is no longer rebuilt on every send
     """
     def __init__(self, str tag, object initdict=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -154,46 +865,70 @@ cdef class MetadataSendFrame(MetadataFrame):
             d.update(initdict)
         d.update(kwargs)
         self.attrs.update(d)
+        self.dirty = True
         self._serialize()
 
     def set_tag(self, str tag):
-        super().set_tag(tag)
-        self._serialize()
+        if tag != self.tag:
+            self.tag = tag
+            self.dirty = True
 
     def __setitem__(self, str key, str value):
-        self.attrs[key] = value
-        self._serialize()
+        if self.attrs.get(key) != value:
+            self.attrs[key] = value
+            self.dirty = True
 
     def update(self, dict other):
         self._update(other)
 
     cdef int _update(self, dict other) except -1:
-        self.attrs.update(other)
-        self._serialize()
+        if len(other):
+            self.attrs.update(other)
+            self.dirty = True
         return 0
 
     def clear(self):
         self._clear()
 
     cdef int _clear(self) except -1:
-        self.tag = ''
-        self.attrs.clear()
-        self._serialize()
+        if len(self.tag) or len(self.attrs):
+            self.tag = ''
+            self.attrs.clear()
+            self.dirty = True
         return 0
 
-    cdef bint _serialize(self) except -1:
-        cdef bint has_attrs = len(self.attrs) > 0, has_tag = len(self.tag) > 0
-        cdef str key, val, result_str = ''
+    cdef int _set_content(self, str tag, dict attrs) except -1:
+        """Replace the tag and attributes, marking the frame dirty only if
+        either differs from the current content
+        """
+        if tag != self.tag or attrs != self.attrs:
+            self.tag = tag
+            self.attrs.clear()
+            self.attrs.update(attrs)
+            self.dirty = True
+        return 0
+
+    def __str__(self):
+        self._serialize()
+        return self.xml_bytes.decode('UTF-8')
 
+    cdef bint _serialize(self) except -1:
+        cdef bint has_tag = self.tag is not None and len(self.tag) > 0
+        cdef list parts
+        if not self.dirty and self.attrs == self.serialized_attrs:
+            return has_tag
         if has_tag:
-            if has_attrs:
-                result_str = ' '.join([f'{key}="{val}"' for key, val in self.attrs.items()])
-            result_str = f'<{self.tag} {result_str}/>'
-            self.xml_bytes = result_str.encode('UTF-8')
-            self.ptr.p_data = <char*>cpp_string(self.xml_bytes).c_str()
+            parts = ['<', self.tag]
+            _write_attrs(parts, self.attrs)
+            parts.append('/>')
+            self.xml_bytes = ''.join(parts).encode('UTF-8')
         else:
             self.xml_bytes = b''
-            self.ptr.p_data = <char*>cpp_string(self.xml_bytes).c_str()
+        # Point to the member string (not a temporary) so the data
+        # stays valid until the next serialization
+        self.ptr.p_data = <char*>self.xml_bytes.c_str()
+        self.serialized_attrs = self.attrs.copy()
+        self.dirty = False
         return has_tag
 
 
@@ -0,0 +1,45 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from cpython.ref cimport PyObject
+from libc.stdint cimport *
+
+
+cpdef enum MetricsKind:
+    metrics_receiver = 1
+    metrics_sender = 2
+    metrics_framesync = 3
+    metrics_finder = 4
+
+
+cdef struct MetricsRow_s:
+    uint32_t id
+    uint32_t kind
+    int64_t video_frames
+    int64_t video_dropped
+    int64_t audio_frames
+    int64_t audio_dropped
+    int64_t metadata_frames
+    int64_t metadata_dropped
+    int64_t video_buffer_depth
+    int64_t audio_buffer_depth
+    int64_t audio_queue_depth
+    int64_t connections
+    int64_t sources
+    uint8_t connected
+    uint8_t tally_program
+    uint8_t tally_preview
+
+
+ctypedef int (*metrics_fill_func)(object obj, MetricsRow_s* row) except -1
+
+
+cdef struct MetricsEntry_s:
+    PyObject* obj
+    uint32_t id
+    MetricsKind kind
+    metrics_fill_func fill
+
+
+cdef int metrics_register(object obj, MetricsKind kind, metrics_fill_func fill) except -1
+cdef void metrics_unregister(object obj) noexcept
@@ -0,0 +1,21 @@
+from typing import Any
+from http.server import ThreadingHTTPServer
+import enum
+
+import numpy as np
+import numpy.typing as npt
+
+
+class MetricsKind(enum.IntEnum):
+    metrics_receiver = 1
+    metrics_sender = 2
+    metrics_framesync = 3
+    metrics_finder = 4
+
+
+METRICS_DTYPE: np.dtype[np.void]
+
+def get_snapshot() -> npt.NDArray[np.void]: ...
+def get_labels() -> dict[int, str]: ...
+def get_prometheus_text() -> str: ...
+def start_http_server(port: int, addr: str = ...) -> ThreadingHTTPServer: ...
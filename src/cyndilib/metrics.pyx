@@ -0,0 +1,304 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+A process-wide registry of live receivers, senders, frame syncs and finders
+
+Each :class:`~.receiver.Receiver`, :class:`~.sender.Sender`,
+:class:`~.framesync.FrameSync` and :class:`~.finder.Finder` adds itself to
+the registry when created and removes itself when deallocated.
+:func:`get_snapshot` collects the counters of all of them into a single
+structured array (see :data:`METRICS_DTYPE`)::
+
+    from cyndilib import metrics
+
+    snapshot = metrics.get_snapshot()
+    receivers = snapshot[snapshot['kind'] == metrics.MetricsKind.metrics_receiver]
+    print(receivers['video_dropped'].sum())
+
+The same values can be exported in the `Prometheus text format`_ with
+:func:`get_prometheus_text` or served over HTTP with :func:`start_http_server`.
+
+.. _Prometheus text format: https://prometheus.io/docs/instrumenting/exposition_formats/
+
+.. versionadded:: 0.0.10
+
+"""
+
+from libcpp.vector cimport vector
+cimport numpy as cnp
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+__all__ = (
+    'MetricsKind', 'METRICS_DTYPE', 'get_snapshot', 'get_labels',
+    'get_prometheus_text', 'start_http_server',
+)
+
+
+METRICS_DTYPE = np.dtype([
+    ('id', np.uint32),
+    ('kind', np.uint32),
+    ('video_frames', np.int64),
+    ('video_dropped', np.int64),
+    ('audio_frames', np.int64),
+    ('audio_dropped', np.int64),
+    ('metadata_frames', np.int64),
+    ('metadata_dropped', np.int64),
+    ('video_buffer_depth', np.int64),
+    ('audio_buffer_depth', np.int64),
+    ('audio_queue_depth', np.int64),
+    ('connections', np.int64),
+    ('sources', np.int64),
+    ('connected', np.bool_),
+    ('tally_program', np.bool_),
+    ('tally_preview', np.bool_),
+], align=True)
+
+if METRICS_DTYPE.itemsize != sizeof(MetricsRow_s):
+    raise RuntimeError('METRICS_DTYPE does not match MetricsRow_s')
+
+
+# Only accessed while holding the GIL
+cdef vector[MetricsEntry_s] _entries
+cdef uint32_t _next_id = 1
+
+cdef dict _kind_names = {
+    MetricsKind.metrics_receiver:'receiver',
+    MetricsKind.metrics_sender:'sender',
+    MetricsKind.metrics_framesync:'framesync',
+    MetricsKind.metrics_finder:'finder',
+}
+
+
+cdef int metrics_register(object obj, MetricsKind kind, metrics_fill_func fill) except -1:
+    global _next_id
+    cdef MetricsEntry_s entry
+    entry.obj = <PyObject*>obj
+    entry.id = _next_id
+    entry.kind = kind
+    entry.fill = fill
+    _next_id += 1
+    _entries.push_back(entry)
+    return 0
+
+
+cdef void metrics_unregister(object obj) noexcept:
+    # Called from __dealloc__, so obj is never dereferenced here
+    cdef PyObject* ptr = <PyObject*>obj
+    cdef size_t i
+    for i in range(_entries.size()):
+        if _entries[i].obj == ptr:
+            _entries.erase(_entries.begin() + i)
+            return
+
+
+def get_snapshot():
+    """Collect the current counters of all registered objects
+
+    Fields that do not apply to an object's :class:`MetricsKind` are zero.
+
+    =======================  ====================================================
+    Field                    Description
+    =======================  ====================================================
+    ``id``                   Identifier of the object (see :func:`get_labels`)
+    ``kind``                 The :class:`MetricsKind` of the object
+    ``video_frames``         Video frames received (receivers) or sent (senders)
+    ``video_dropped``        Video frames dropped by a receiver
+    ``audio_frames``         Audio frames received or sent
+    ``audio_dropped``        Audio frames dropped by a receiver
+    ``metadata_frames``      Metadata frames received or sent
+    ``metadata_dropped``     Metadata frames dropped by a receiver
+    ``video_buffer_depth``   Frames waiting to be read from the receiver's
+                             :class:`~.video_frame.VideoRecvFrame`
+    ``audio_buffer_depth``   Frames waiting to be read from the receiver's
+                             :class:`~.audio_frame.AudioRecvFrame`
+    ``audio_queue_depth``    Audio samples queued in a frame sync
+    ``connections``          Number of connections of a receiver or sender
+    ``sources``              Number of sources found by a finder
+    ``connected``            Whether a receiver is connected
+    ``tally_program``        Program tally state of a receiver or sender
+    ``tally_preview``        Preview tally state of a receiver or sender
+    =======================  ====================================================
+
+    Returns:
+        numpy.ndarray: A structured array of :data:`METRICS_DTYPE` with one
+        row per object, in the order they were created
+    """
+    # Copied so the loop is unaffected if an object is removed meanwhile
+    cdef vector[MetricsEntry_s] entries = _entries
+    cdef size_t n = entries.size(), i
+    cdef cnp.ndarray arr = np.zeros(n, dtype=METRICS_DTYPE)
+    cdef MetricsRow_s* rows = <MetricsRow_s*>cnp.PyArray_DATA(arr)
+    cdef MetricsEntry_s entry
+    for i in range(n):
+        entry = entries[i]
+        rows[i].id = entry.id
+        rows[i].kind = entry.kind
+        entry.fill(<object>entry.obj, &rows[i])
+    return arr
+
+
+cdef str _get_label(MetricsKind kind, object obj):
+    if kind == MetricsKind.metrics_receiver:
+        return obj.source_name
+    elif kind == MetricsKind.metrics_sender:
+        return obj.ndi_name
+    elif kind == MetricsKind.metrics_framesync:
+        return obj.receiver.source_name
+    return ''
+
+
+def get_labels():
+    """Get the name of each registered object
+
+    Returns:
+        dict: A dict mapping the ``id`` field of :func:`get_snapshot` to the
+        source name of receivers and frame syncs, the
+        :attr:`~.sender.Sender.ndi_name` of senders or an empty string for
+        finders
+    """
+    cdef dict result = {}
+    cdef MetricsEntry_s entry
+    for entry in _entries:
+        result[entry.id] = _get_label(entry.kind, <object>entry.obj)
+    return result
+
+
+# (name, type, help, kinds, ((field, media), ...))
+cdef tuple _prometheus_metrics = (
+    (
+        'cyndilib_frames_total', 'counter',
+        'Frames received by a receiver or sent by a sender',
+        (MetricsKind.metrics_receiver, MetricsKind.metrics_sender),
+        (('video_frames', 'video'), ('audio_frames', 'audio'), ('metadata_frames', 'metadata')),
+    ),
+    (
+        'cyndilib_frames_dropped_total', 'counter',
+        'Frames dropped by a receiver',
+        (MetricsKind.metrics_receiver,),
+        (('video_dropped', 'video'), ('audio_dropped', 'audio'), ('metadata_dropped', 'metadata')),
+    ),
+    (
+        'cyndilib_buffer_depth', 'gauge',
+        'Frames waiting to be read from a receive frame',
+        (MetricsKind.metrics_receiver,),
+        (('video_buffer_depth', 'video'), ('audio_buffer_depth', 'audio')),
+    ),
+    (
+        'cyndilib_audio_queue_depth', 'gauge',
+        'Audio samples queued in a frame sync',
+        (MetricsKind.metrics_framesync,),
+        (('audio_queue_depth', None),),
+    ),
+    (
+        'cyndilib_connections', 'gauge',
+        'Number of connections of a receiver or sender',
+        (MetricsKind.metrics_receiver, MetricsKind.metrics_sender),
+        (('connections', None),),
+    ),
+    (
+        'cyndilib_connected', 'gauge',
+        'Whether a receiver is connected',
+        (MetricsKind.metrics_receiver,),
+        (('connected', None),),
+    ),
+    (
+        'cyndilib_tally_program', 'gauge',
+        'Program tally state of a receiver or sender',
+        (MetricsKind.metrics_receiver, MetricsKind.metrics_sender),
+        (('tally_program', None),),
+    ),
+    (
+        'cyndilib_tally_preview', 'gauge',
+        'Preview tally state of a receiver or sender',
+        (MetricsKind.metrics_receiver, MetricsKind.metrics_sender),
+        (('tally_preview', None),),
+    ),
+    (
+        'cyndilib_sources', 'gauge',
+        'Number of sources found by a finder',
+        (MetricsKind.metrics_finder,),
+        (('sources', None),),
+    ),
+)
+
+
+cdef str _escape_label(str value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def get_prometheus_text():
+    """Format a :func:`get_snapshot` in the Prometheus text format
+
+    Each object is labeled by ``kind``, ``id`` and ``name``
+    (see :func:`get_labels`). Per-media counters add a ``media`` label.
+
+    Returns:
+        str: The formatted metrics
+    """
+    arr = get_snapshot()
+    cdef dict labels = get_labels()
+    cdef list lines = []
+    cdef list row_labels = []
+    cdef Py_ssize_t i
+    cdef str name, metric_type, help_text, field, label
+    cdef tuple kinds, fields
+
+    for i in range(arr.shape[0]):
+        row_id = int(arr['id'][i])
+        row_labels.append('kind="{}",id="{}",name="{}"'.format(
+            _kind_names.get(int(arr['kind'][i]), ''), row_id,
+            _escape_label(labels.get(row_id, '')),
+        ))
+
+    for name, metric_type, help_text, kinds, fields in _prometheus_metrics:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        kind_mask = np.isin(arr['kind'], kinds)
+        for field, media in fields:
+            values = arr[field]
+            for i in np.flatnonzero(kind_mask):
+                label = row_labels[i]
+                if media is not None:
+                    label = f'{label},media="{media}"'
+                lines.append(f'{name}{{{label}}} {int(values[i])}')
+    lines.append('')
+    return '\n'.join(lines)
+
+
+class _PrometheusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = get_prometheus_text().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(int port, str addr='127.0.0.1'):
+    """Serve :func:`get_prometheus_text` over HTTP from a background thread
+
+    Any ``GET`` request is answered with the current metrics.
+
+    Arguments:
+        port (int): The port to listen on. If ``0``, a free port is chosen
+            (available from the ``server_address`` of the returned server)
+        addr (str, optional): The address to bind to. Defaults to
+            ``"127.0.0.1"``
+
+    Returns:
+        http.server.ThreadingHTTPServer: The running server. Call its
+        ``shutdown()`` and ``server_close()`` methods to stop it
+    """
+    server = ThreadingHTTPServer((addr, port), _PrometheusHandler)
+    server.daemon_threads = True
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    return server
@@ -0,0 +1,41 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from libc.stdint cimport *
+
+from .wrapper cimport *
+
+
+cdef struct PacingClock_s:
+    int64_t numerator
+    int64_t denominator
+    int64_t start_ns
+    int64_t start_ndi
+    int64_t frame_index
+    int64_t spin_ns
+    int64_t max_late_frames
+    int64_t late_count
+    int64_t skip_count
+    bint started
+
+
+cdef void pacing_clock_init(PacingClock_s* ptr) noexcept nogil
+cdef int pacing_clock_set_rate(
+    PacingClock_s* ptr, int64_t numerator, int64_t denominator
+) except -1 nogil
+cdef void pacing_clock_start(PacingClock_s* ptr) noexcept nogil
+cdef void pacing_clock_reset(PacingClock_s* ptr) noexcept nogil
+cdef int64_t pacing_clock_offset(PacingClock_s* ptr, int64_t index, int64_t units_per_sec) noexcept nogil
+cdef int64_t pacing_clock_deadline(PacingClock_s* ptr, int64_t index) noexcept nogil
+cdef int64_t pacing_clock_ndi_timestamp(PacingClock_s* ptr, int64_t index) noexcept nogil
+cdef int64_t pacing_clock_wait(PacingClock_s* ptr) noexcept nogil
+
+
+cdef class PacingClock:
+    cdef PacingClock_s clock
+
+    cdef int _set_frame_rate(self, int64_t numerator, int64_t denominator) except -1 nogil
+    cdef void _reset(self) noexcept nogil
+    cdef int64_t _wait(self) noexcept nogil
+    cdef int64_t _get_next_deadline(self) noexcept nogil
+    cdef int64_t _get_ndi_timestamp(self) noexcept nogil
@@ -0,0 +1,32 @@
+from fractions import Fraction
+
+
+class PacingClock:
+    def __init__(
+        self,
+        frame_rate: Fraction|None = ...,
+        spin_time: float = ...,
+        max_late_frames: int = ...,
+    ) -> None: ...
+    @property
+    def frame_rate(self) -> Fraction: ...
+    @frame_rate.setter
+    def frame_rate(self, value: Fraction) -> None: ...
+    @property
+    def spin_time(self) -> float: ...
+    @spin_time.setter
+    def spin_time(self, value: float) -> None: ...
+    @property
+    def started(self) -> bool: ...
+    @property
+    def frame_index(self) -> int: ...
+    @property
+    def late_count(self) -> int: ...
+    @property
+    def skip_count(self) -> int: ...
+    def wait(self) -> float: ...
+    def reset(self) -> None: ...
+    def get_next_deadline(self) -> float: ...
+    def get_ndi_timestamp(self) -> int: ...
+    def get_ndi_timestamp_for(self, index: int) -> int: ...
+    def __reduce__(self): ...
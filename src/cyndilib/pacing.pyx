@@ -0,0 +1,269 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+Drift-free frame pacing on the monotonic clock.
+
+.. versionadded:: 0.0.10
+
+"""
+
+from fractions import Fraction
+
+from .clock cimport monotonic_ns, realtime_ns, sleep_until_ns
+from .wrapper.common cimport raise_withgil, PyExc_ValueError
+
+__all__ = ('PacingClock',)
+
+
+cdef int64_t NS_PER_SEC = 1000000000
+cdef int64_t NDI_PER_SEC = 10000000
+cdef int64_t NS_PER_NDI = 100
+
+
+cdef void pacing_clock_init(PacingClock_s* ptr) noexcept nogil:
+    ptr.numerator = 30000
+    ptr.denominator = 1001
+    ptr.start_ns = 0
+    ptr.start_ndi = 0
+    ptr.frame_index = 0
+    ptr.spin_ns = 200000
+    ptr.max_late_frames = 2
+    ptr.late_count = 0
+    ptr.skip_count = 0
+    ptr.started = False
+
+
+cdef int pacing_clock_set_rate(
+    PacingClock_s* ptr, int64_t numerator, int64_t denominator
+) except -1 nogil:
+    if numerator <= 0 or denominator <= 0:
+        raise_withgil(PyExc_ValueError, 'Invalid frame rate')
+    if numerator == ptr.numerator and denominator == ptr.denominator:
+        return 0
+    cdef int64_t next_deadline, next_ndi
+    if ptr.started:
+        # Re-anchor on the next pending deadline so the phase is kept
+        next_deadline = pacing_clock_deadline(ptr, ptr.frame_index)
+        next_ndi = pacing_clock_ndi_timestamp(ptr, ptr.frame_index)
+        ptr.start_ns = next_deadline
+        ptr.start_ndi = next_ndi
+        ptr.frame_index = 0
+    ptr.numerator = numerator
+    ptr.denominator = denominator
+    return 0
+
+
+cdef void pacing_clock_start(PacingClock_s* ptr) noexcept nogil:
+    ptr.start_ns = monotonic_ns()
+    ptr.start_ndi = realtime_ns() // NS_PER_NDI
+    ptr.frame_index = 0
+    ptr.started = True
+
+
+cdef void pacing_clock_reset(PacingClock_s* ptr) noexcept nogil:
+    ptr.started = False
+    ptr.frame_index = 0
+
+
+cdef int64_t pacing_clock_offset(
+    PacingClock_s* ptr, int64_t index, int64_t units_per_sec
+) noexcept nogil:
+    # Split the index so the intermediate products can't overflow
+    # for long running streams
+    cdef int64_t q = index // ptr.numerator
+    cdef int64_t r = index % ptr.numerator
+    return q * ptr.denominator * units_per_sec + (
+        r * ptr.denominator * units_per_sec
+    ) // ptr.numerator
+
+
+cdef int64_t pacing_clock_deadline(PacingClock_s* ptr, int64_t index) noexcept nogil:
+    return ptr.start_ns + pacing_clock_offset(ptr, index, NS_PER_SEC)
+
+
+cdef int64_t pacing_clock_ndi_timestamp(PacingClock_s* ptr, int64_t index) noexcept nogil:
+    return ptr.start_ndi + pacing_clock_offset(ptr, index, NDI_PER_SEC)
+
+
+cdef int64_t pacing_clock_index_at(PacingClock_s* ptr, int64_t now) noexcept nogil:
+    cdef double elapsed = (now - ptr.start_ns) / <double>NS_PER_SEC
+    cdef int64_t index = <int64_t>(elapsed * ptr.numerator / ptr.denominator)
+    if index < 0:
+        index = 0
+    while pacing_clock_deadline(ptr, index + 1) <= now:
+        index += 1
+    while index > 0 and pacing_clock_deadline(ptr, index) > now:
+        index -= 1
+    return index
+
+
+cdef int64_t pacing_clock_wait(PacingClock_s* ptr) noexcept nogil:
+    if not ptr.started:
+        pacing_clock_start(ptr)
+        ptr.frame_index = 1
+        return 0
+    cdef int64_t deadline = pacing_clock_deadline(ptr, ptr.frame_index)
+    cdef int64_t now = monotonic_ns()
+    cdef int64_t late = 0, interval, index
+    if now < deadline:
+        sleep_until_ns(deadline, ptr.spin_ns)
+    else:
+        late = now - deadline
+        if late > 0:
+            ptr.late_count += 1
+            interval = pacing_clock_offset(ptr, 1, NS_PER_SEC)
+            if ptr.max_late_frames > 0 and late >= ptr.max_late_frames * interval:
+                index = pacing_clock_index_at(ptr, now)
+                if index > ptr.frame_index:
+                    ptr.skip_count += index - ptr.frame_index
+                    ptr.frame_index = index
+    ptr.frame_index += 1
+    return late
+
+
+cdef class PacingClock:
+    """A frame clock using absolute deadlines on the monotonic system clock
+
+    Deadlines are computed from the integer numerator and denominator of the
+    frame rate and the frame index, so rounding errors never accumulate no
+    matter how long the clock runs. Waiting is done with an absolute
+    (``TIMER_ABSTIME``) sleep followed by a short spin to absorb scheduler
+    wakeup latency.
+
+    Each deadline also maps to an |NDI| timestamp (in 100 nanosecond units)
+    anchored to the wall clock when the clock was started.
+
+    Arguments:
+        frame_rate (fractions.Fraction, optional): The frame rate.
+            Defaults to ``30000/1001``
+        spin_time (float, optional): Time (in seconds) before each deadline
+            to stop sleeping and spin instead. Defaults to ``0.0002``
+        max_late_frames (int, optional): If a deadline is missed by this many
+            frame intervals (or more), the clock skips ahead rather than
+            trying to catch up. A value of zero disables skipping.
+            Defaults to ``2``
+
+    .. versionadded:: 0.0.10
+
+    """
+    def __cinit__(self, *args, **kwargs):
+        pacing_clock_init(&self.clock)
+
+    def __init__(self, frame_rate=None, double spin_time=.0002, int max_late_frames=2):
+        if frame_rate is not None:
+            self.frame_rate = frame_rate
+        self.spin_time = spin_time
+        self.clock.max_late_frames = max_late_frames
+
+    @property
+    def frame_rate(self) -> Fraction:
+        """The frame rate of the clock
+
+        If changed while running, the clock is re-anchored on the next pending
+        deadline
+        """
+        return Fraction(self.clock.numerator, self.clock.denominator)
+    @frame_rate.setter
+    def frame_rate(self, value):
+        value = Fraction(value)
+        self._set_frame_rate(value.numerator, value.denominator)
+
+    @property
+    def spin_time(self) -> float:
+        """Time (in seconds) spent spinning before each deadline
+        """
+        return self.clock.spin_ns / <double>NS_PER_SEC
+    @spin_time.setter
+    def spin_time(self, double value):
+        if value < 0:
+            raise ValueError('spin_time must be non-negative')
+        self.clock.spin_ns = <int64_t>(value * NS_PER_SEC)
+
+    @property
+    def started(self) -> bool:
+        """True if the clock has been started (by the first call to
+        :meth:`wait`)
+        """
+        return self.clock.started
+
+    @property
+    def frame_index(self) -> int:
+        """Index of the next deadline :meth:`wait` will block on
+        """
+        return self.clock.frame_index
+
+    @property
+    def late_count(self) -> int:
+        """Number of times :meth:`wait` was called after its deadline
+        """
+        return self.clock.late_count
+
+    @property
+    def skip_count(self) -> int:
+        """Total number of deadlines skipped after falling too far behind
+        """
+        return self.clock.skip_count
+
+    def wait(self) -> float:
+        """Block until the next deadline and advance to the one following it
+
+        The first call starts the clock and returns immediately.
+
+        Returns the amount of time (in seconds) the deadline had already
+        passed when this method was called (zero if it was waited for)
+        """
+        cdef int64_t late
+        with nogil:
+            late = self._wait()
+        return late / <double>NS_PER_SEC
+
+    def reset(self):
+        """Stop the clock
+
+        The next call to :meth:`wait` will restart it
+        """
+        self._reset()
+
+    def get_next_deadline(self) -> float:
+        """Get the next deadline in seconds on the monotonic clock
+        """
+        return self._get_next_deadline() / <double>NS_PER_SEC
+
+    def get_ndi_timestamp(self) -> int:
+        """Get the |NDI| timestamp (in 100 nanosecond units) of the deadline
+        most recently returned from :meth:`wait`
+        """
+        return self._get_ndi_timestamp()
+
+    def get_ndi_timestamp_for(self, int64_t index) -> int:
+        """Get the |NDI| timestamp (in 100 nanosecond units) for the given
+        frame index
+        """
+        return pacing_clock_ndi_timestamp(&self.clock, index)
+
+    def __reduce__(self):
+        # Only the settings are kept (the copy starts out stopped)
+        return (
+            self.__class__,
+            (self.frame_rate, self.spin_time, self.clock.max_late_frames),
+        )
+
+    cdef int _set_frame_rate(self, int64_t numerator, int64_t denominator) except -1 nogil:
+        return pacing_clock_set_rate(&self.clock, numerator, denominator)
+
+    cdef void _reset(self) noexcept nogil:
+        pacing_clock_reset(&self.clock)
+
+    cdef int64_t _wait(self) noexcept nogil:
+        return pacing_clock_wait(&self.clock)
+
+    cdef int64_t _get_next_deadline(self) noexcept nogil:
+        if not self.clock.started:
+            return monotonic_ns()
+        return pacing_clock_deadline(&self.clock, self.clock.frame_index)
+
+    cdef int64_t _get_ndi_timestamp(self) noexcept nogil:
+        cdef int64_t index = self.clock.frame_index - 1
+        if index < 0:
+            index = 0
+        return pacing_clock_ndi_timestamp(&self.clock, index)
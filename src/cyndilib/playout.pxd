@@ -0,0 +1,37 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from libc.stdint cimport *
+
+from .wrapper cimport *
+from .locks cimport Condition
+from .sender cimport Sender
+from .recorder cimport RecordMediaType, RecordIndex_s, RecordingReader
+
+
+cdef class FilePlayoutSender:
+    cdef readonly Sender sender
+    cdef readonly RecordingReader reader
+    cdef readonly bint loop
+    cdef readonly double rate
+    cdef readonly bint send_video, send_audio, send_metadata
+    cdef readonly size_t num_video_sent, num_audio_sent, num_metadata_sent
+    cdef readonly size_t num_loops
+    cdef Condition cond
+    cdef object thread
+    cdef size_t position
+    cdef int64_t last_timestamp
+    cdef bint stopping, rebase
+    cdef Py_ssize_t seek_position
+    cdef NDIlib_video_frame_v2_t video_frame_s
+    cdef NDIlib_audio_frame_v3_t audio_frame_s
+    cdef NDIlib_metadata_frame_t metadata_frame_s
+    cdef char* metadata_buffer
+    cdef size_t metadata_buffer_size
+
+    cdef int _run(self) except -1 nogil
+    cdef bint _send_entry(self, RecordIndex_s* entry, const uint8_t* data) noexcept nogil
+    cdef bint _send_video(self, RecordIndex_s* entry, const uint8_t* data) noexcept nogil
+    cdef bint _send_audio(self, RecordIndex_s* entry, const uint8_t* data) noexcept nogil
+    cdef bint _send_metadata(self, RecordIndex_s* entry, const uint8_t* data) noexcept nogil
+    cdef void _flush_video(self) noexcept nogil
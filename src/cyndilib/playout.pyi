@@ -0,0 +1,40 @@
+from __future__ import annotations
+import os
+
+from .sender import Sender
+from .recorder import RecordingReader
+
+
+class FilePlayoutSender:
+    sender: Sender
+    reader: RecordingReader
+    loop: bool
+    rate: float
+    send_video: bool
+    send_audio: bool
+    send_metadata: bool
+    num_video_sent: int
+    num_audio_sent: int
+    num_metadata_sent: int
+    num_loops: int
+    def __init__(
+        self,
+        sender: Sender,
+        recording: str|os.PathLike|RecordingReader,
+        loop: bool = ...,
+        rate: float = ...,
+        video: bool = ...,
+        audio: bool = ...,
+        metadata: bool = ...,
+    ) -> None: ...
+    def __enter__(self) -> FilePlayoutSender: ...
+    def __exit__(self, *args) -> None: ...
+    @property
+    def is_running(self) -> bool: ...
+    @property
+    def timestamp(self) -> int|None: ...
+    def start(self) -> None: ...
+    def stop(self) -> None: ...
+    def wait(self, timeout: float|None = ...) -> bool: ...
+    def seek(self, timestamp: int) -> None: ...
+    def set_rate(self, rate: float) -> None: ...
@@ -0,0 +1,335 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+Playback of recordings through a :class:`~.sender.Sender`
+
+:class:`FilePlayoutSender` sends the frames of a recording made by a
+:class:`~.recorder.Recorder` with their original spacing. Frame data is
+passed to |NDI| directly from the mapped file::
+
+    with Sender('Replay') as sender:
+        with FilePlayoutSender(sender, 'camera1.cyndirec', loop=True) as playout:
+            ...
+            playout.seek(ts)
+            playout.set_rate(.5)
+
+.. versionadded:: 0.0.10
+
+"""
+
+cimport cython
+from libc.stdlib cimport realloc, free
+from libc.string cimport memcpy
+
+import threading
+
+from .clock cimport monotonic_ns, sleep_until_ns
+from .recorder import RecordingReader as _RecordingReader
+
+__all__ = ('FilePlayoutSender',)
+
+
+# Waits longer than this are done on the condition so seek(), set_rate()
+# and stop() take effect immediately. The remainder is slept precisely.
+cdef int64_t WAIT_MARGIN_NS = 2000000
+
+
+cdef class FilePlayoutSender:
+    """Sends a recording through a :class:`~.sender.Sender` from a
+    background thread
+
+    Frames are sent in the order they were recorded, spaced by the
+    differences of their timestamps (scaled by :attr:`rate`). Timecodes are
+    synthesized by |NDI|.
+
+    The sender must be open before calling :meth:`start`. While playing,
+    nothing else should be sent through it.
+
+    Arguments:
+        sender (Sender): The sender to use
+        recording: The filename of a recording or a
+            :class:`~.recorder.RecordingReader`
+        loop (bool, optional): If ``True``, start over at the end of the
+            recording. Defaults to ``False``
+        rate (float, optional): Playback rate. Defaults to ``1``
+        video (bool, optional): Whether to send video frames
+        audio (bool, optional): Whether to send audio frames. Audio is only
+            sent while :attr:`rate` is ``1``
+        metadata (bool, optional): Whether to send metadata frames
+
+    This class supports use as a :term:`context manager`, calling
+    :meth:`start` and :meth:`stop`.
+
+    Attributes:
+        reader (RecordingReader): The reader for the recording
+        num_video_sent (int): Number of video frames sent
+        num_audio_sent (int): Number of audio frames sent
+        num_metadata_sent (int): Number of metadata frames sent
+        num_loops (int): Number of times playback started over
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.metadata_buffer = NULL
+        self.metadata_buffer_size = 0
+        self.position = 0
+        self.last_timestamp = 0
+        self.seek_position = -1
+        self.stopping = False
+        self.rebase = True
+        self.num_video_sent = 0
+        self.num_audio_sent = 0
+        self.num_metadata_sent = 0
+        self.num_loops = 0
+
+    def __init__(
+        self,
+        Sender sender,
+        object recording,
+        bint loop=False,
+        double rate=1,
+        bint video=True,
+        bint audio=True,
+        bint metadata=True,
+    ):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.sender = sender
+        if isinstance(recording, _RecordingReader):
+            self.reader = recording
+        else:
+            self.reader = _RecordingReader(recording)
+        self.loop = loop
+        self.rate = rate
+        self.send_video = video
+        self.send_audio = audio
+        self.send_metadata = metadata
+        self.cond = Condition()
+
+    def __dealloc__(self):
+        cdef char* buffer = self.metadata_buffer
+        self.metadata_buffer = NULL
+        if buffer is not NULL:
+            free(buffer)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        """``True`` while the playback thread is running
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    @property
+    def timestamp(self):
+        """The timestamp of the last frame sent (or ``None``)
+        """
+        if self.num_video_sent + self.num_audio_sent + self.num_metadata_sent == 0:
+            return None
+        return self.last_timestamp
+
+    def start(self):
+        """Start playback from the current position (or from the beginning
+        if the end was reached)
+        """
+        if self.is_running:
+            return
+        if self.position >= self.reader.num_entries:
+            self.position = 0
+        self.stopping = False
+        self.rebase = True
+        self.thread = threading.Thread(target=self._thread_func, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop playback and wait for the thread to exit
+
+        The position is kept, so :meth:`start` resumes where playback stopped
+        """
+        if self.thread is None:
+            return
+        self.cond._acquire(True, -1)
+        try:
+            self.stopping = True
+            self.cond._notify_all()
+        finally:
+            self.cond._release()
+        self.thread.join()
+        self.thread = None
+
+    def wait(self, timeout=None):
+        """Wait for playback to reach the end of the recording
+
+        Returns:
+            bool: ``False`` if the timeout was reached
+        """
+        if self.thread is None:
+            return True
+        self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+    def seek(self, int64_t timestamp):
+        """Continue playback from the given timestamp
+
+        Playback continues with the video frame that was current at
+        *timestamp* (or the audio frame if the recording has no video).
+        """
+        cdef RecordMediaType media_type = RecordMediaType.record_video
+        if not len(self.reader.get_positions(media_type)):
+            media_type = RecordMediaType.record_audio
+        cdef Py_ssize_t i = self.reader.find(media_type, timestamp)
+        self.cond._acquire(True, -1)
+        try:
+            self.seek_position = max(i, 0)
+            self.cond._notify_all()
+        finally:
+            self.cond._release()
+
+    def set_rate(self, double rate):
+        """Set the playback :attr:`rate`
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.cond._acquire(True, -1)
+        try:
+            self.rate = rate
+            self.rebase = True
+            self.cond._notify_all()
+        finally:
+            self.cond._release()
+
+    def _thread_func(self):
+        with nogil:
+            self._run()
+
+    @cython.cdivision(True)
+    cdef int _run(self) except -1 nogil:
+        cdef RecordIndex_s* entry
+        cdef size_t idx
+        cdef int64_t base_ts = 0, base_ns = 0, deadline, remaining
+        cdef bint enabled
+
+        self.cond._acquire(True, -1)
+        try:
+            while not self.stopping:
+                if self.seek_position >= 0:
+                    self.position = self.seek_position
+                    self.seek_position = -1
+                    self.rebase = True
+                if self.position >= self.reader.num_entries:
+                    if not self.loop or self.reader.num_entries == 0:
+                        break
+                    self.position = 0
+                    self.num_loops += 1
+                    self.rebase = True
+                if self.reader.data is NULL:
+                    break
+                idx = self.position
+                entry = self.reader._get_entry(idx)
+                if entry.media_type == RecordMediaType.record_video:
+                    enabled = self.send_video
+                elif entry.media_type == RecordMediaType.record_audio:
+                    enabled = self.send_audio and self.rate == 1
+                else:
+                    enabled = self.send_metadata
+                if not enabled:
+                    self.position += 1
+                    continue
+
+                # Timing restarts from this entry after a seek, loop or rate
+                # change (or if timestamps in the recording went backwards)
+                if self.rebase or entry.timestamp < base_ts:
+                    base_ts = entry.timestamp
+                    base_ns = monotonic_ns()
+                    self.rebase = False
+                deadline = base_ns + <int64_t>((entry.timestamp - base_ts) * 100 / self.rate)
+                remaining = deadline - monotonic_ns()
+                if remaining > WAIT_MARGIN_NS:
+                    self.cond._wait(True, (remaining - WAIT_MARGIN_NS) / 1e9)
+                    continue
+
+                self.cond._release()
+                try:
+                    sleep_until_ns(deadline, 0)
+                    self._send_entry(entry, self.reader._get_data(idx))
+                finally:
+                    self.cond._acquire(True, -1)
+                self.last_timestamp = entry.timestamp
+                if self.position == idx:
+                    self.position += 1
+        finally:
+            self.cond._release()
+            self._flush_video()
+        return 0
+
+    cdef bint _send_entry(self, RecordIndex_s* entry, const uint8_t* data) noexcept nogil:
+        if self.sender is None or not self.sender._check_running_noexcept():
+            return False
+        if entry.media_type == RecordMediaType.record_video:
+            return self._send_video(entry, data)
+        elif entry.media_type == RecordMediaType.record_audio:
+            return self._send_audio(entry, data)
+        return self._send_metadata(entry, data)
+
+    cdef bint _send_video(self, RecordIndex_s* entry, const uint8_t* data) noexcept nogil:
+        cdef NDIlib_video_frame_v2_t* p = &self.video_frame_s
+        p.xres = entry.xres
+        p.yres = entry.yres
+        p.FourCC = fourcc_type_cast(<FourCC>entry.fourcc)
+        p.frame_rate_N = entry.frame_rate_N
+        p.frame_rate_D = entry.frame_rate_D
+        p.picture_aspect_ratio = 0
+        p.frame_format_type = frame_format_cast(<FrameFormat>entry.frame_format)
+        p.timecode = NDIlib_send_timecode_synthesize
+        p.p_data = <uint8_t*>data
+        p.line_stride_in_bytes = entry.line_stride
+        p.p_metadata = NULL
+        p.timestamp = 0
+        # The mapped data stays valid until the next call (or _flush_video)
+        if not self.sender._send_video_frame(p, True):
+            return False
+        self.num_video_sent += 1
+        return True
+
+    cdef bint _send_audio(self, RecordIndex_s* entry, const uint8_t* data) noexcept nogil:
+        cdef NDIlib_audio_frame_v3_t* p = &self.audio_frame_s
+        p.sample_rate = entry.sample_rate
+        p.no_channels = entry.num_channels
+        p.no_samples = entry.num_samples
+        p.timecode = NDIlib_send_timecode_synthesize
+        p.FourCC = NDIlib_FourCC_audio_type_FLTP
+        p.p_data = <uint8_t*>data
+        p.channel_stride_in_bytes = entry.num_samples * sizeof(float)
+        p.p_metadata = NULL
+        p.timestamp = 0
+        if not self.sender._send_audio_frame(p):
+            return False
+        self.num_audio_sent += 1
+        return True
+
+    cdef bint _send_metadata(self, RecordIndex_s* entry, const uint8_t* data) noexcept nogil:
+        # Metadata is stored without the null terminator
+        cdef char* buffer
+        cdef NDIlib_metadata_frame_t* p = &self.metadata_frame_s
+        if entry.size + 1 > self.metadata_buffer_size:
+            buffer = <char*>realloc(self.metadata_buffer, entry.size + 1)
+            if buffer is NULL:
+                return False
+            self.metadata_buffer = buffer
+            self.metadata_buffer_size = entry.size + 1
+        memcpy(self.metadata_buffer, data, entry.size)
+        self.metadata_buffer[entry.size] = 0
+        p.length = entry.size + 1
+        p.timecode = NDIlib_send_timecode_synthesize
+        p.p_data = self.metadata_buffer
+        if not self.sender._send_metadata_struct(p):
+            return False
+        self.num_metadata_sent += 1
+        return True
+
+    cdef void _flush_video(self) noexcept nogil:
+        if self.sender is not None:
+            self.sender._flush_video()
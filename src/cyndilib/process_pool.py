@@ -0,0 +1,792 @@
+"""Receivers running in worker processes
+
+:class:`ReceiverProcessPool` spreads :class:`~cyndilib.receiver.Receiver`
+instances across a number of worker processes. Each receiver is driven by a
+thread in its worker and passes its frames back to the controlling process
+through a :class:`~cyndilib.shared_frames.SharedFramePublisher`. Statistics
+are shared through a structured array in shared memory
+(see :data:`POOL_STATS_DTYPE`).
+
+The controller side of each receiver is a :class:`PooledReceiver`, which
+mirrors the methods of :class:`~cyndilib.receiver.Receiver`::
+
+    with ReceiverProcessPool(num_workers=4) as pool:
+        receivers = [pool.create_receiver(source) for source in sources]
+        while True:
+            for receiver in receivers:
+                ft = receiver.receive(ReceiveFrameType.recv_video, 0)
+                if ft & ReceiveFrameType.recv_video:
+                    process(receiver.video_frame.data)
+
+If a worker process exits unexpectedly, it is restarted and its receivers
+are recreated. Receivers in the other workers are not affected.
+
+.. versionadded:: 0.0.10
+"""
+from __future__ import annotations
+
+from typing import NamedTuple, Callable, Any
+from collections import deque
+import itertools
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import os
+import threading
+import time
+
+import numpy as np
+
+from .wrapper.ndi_recv import RecvColorFormat, RecvBandwidth
+from .finder import Source
+from .receiver import Receiver, ReceiveFrameType
+from .video_frame import VideoRecvFrame
+from .audio_frame import AudioRecvFrame
+from .recorder import RecordMediaType
+from .shared_frames import SharedFramePublisher, SharedFrameSubscriber, SharedFrame
+
+
+__all__ = (
+    'ReceiverProcessPool', 'PooledReceiver', 'POOL_STATS_DTYPE', 'STRATEGIES',
+    'default_receiver_factory',
+)
+
+
+POOL_STATS_DTYPE = np.dtype([
+    ('worker', np.int32),
+    ('generation', np.int32),
+    ('pid', np.int64),
+    ('connected', np.uint8),
+    ('num_connections', np.int32),
+    ('video_frames', np.int64),
+    ('video_dropped', np.int64),
+    ('audio_frames', np.int64),
+    ('audio_dropped', np.int64),
+    ('metadata_frames', np.int64),
+    ('metadata_dropped', np.int64),
+    ('frames_per_second', np.float64),
+    ('num_published', np.int64),
+    ('num_publish_dropped', np.int64),
+    ('updated', np.float64),
+], align=True)
+"""Structured dtype of the statistics shared by the workers (one row per
+:class:`PooledReceiver`)
+
+``frames_per_second`` is the rate of video, audio and metadata frames
+received since the previous update and ``updated`` is the
+:func:`time.time` of the update. ``num_published`` and
+``num_publish_dropped`` are the
+:attr:`~cyndilib.shared_frames.SharedFramePublisher.num_published` and
+:attr:`~cyndilib.shared_frames.SharedFramePublisher.num_dropped` counters
+of the receiver's publisher.
+"""
+
+STRATEGIES = ('least_sources', 'least_load', 'round_robin')
+"""Names of the strategies used by :class:`ReceiverProcessPool` to assign
+receivers to workers
+
+``'least_sources'``
+    The worker with the fewest receivers
+
+``'least_load'``
+    The worker with the lowest total ``frames_per_second``
+    (see :data:`POOL_STATS_DTYPE`), then the fewest receivers
+
+``'round_robin'``
+    Each worker in turn
+"""
+
+MEDIA_FRAME_TYPES = {
+    RecordMediaType.record_video: ReceiveFrameType.recv_video,
+    RecordMediaType.record_audio: ReceiveFrameType.recv_audio,
+    RecordMediaType.record_metadata: ReceiveFrameType.recv_metadata,
+}
+
+ReceiverFactory = Callable[[str, RecvColorFormat, RecvBandwidth], Receiver]
+
+_pool_ids = itertools.count()
+
+
+def default_receiver_factory(
+    source_name: str,
+    color_format: RecvColorFormat,
+    bandwidth: RecvBandwidth,
+) -> Receiver:
+    """The default receiver factory for :class:`ReceiverProcessPool`
+
+    Creates a :class:`~cyndilib.receiver.Receiver` connecting to the source
+    with the given name (if not empty)
+    """
+    return Receiver(source_name=source_name, color_format=color_format, bandwidth=bandwidth)
+
+
+class _WorkerConfig(NamedTuple):
+    stats_name: str
+    max_receivers: int
+    slot_size: int
+    num_slots: int
+    color_format: int
+    bandwidth: int
+    recv_frame_type: int
+    timeout_ms: int
+    stats_interval: float
+    receiver_factory: ReceiverFactory
+
+
+class _WorkerReceiver:
+    """A receiver within a worker process and the thread driving it
+    """
+    def __init__(self, config: _WorkerConfig, stats: np.ndarray, slot: int, publisher_name: str) -> None:
+        self.config = config
+        self.row = stats[slot:slot+1]
+        self.publisher = SharedFramePublisher(
+            config.slot_size, config.num_slots, name=publisher_name,
+            video=bool(config.recv_frame_type & ReceiveFrameType.recv_video),
+            audio=bool(config.recv_frame_type & ReceiveFrameType.recv_audio),
+            metadata=bool(config.recv_frame_type & ReceiveFrameType.recv_metadata),
+        )
+        self.receiver: Receiver|None = None
+        self.video_frame = VideoRecvFrame(max_buffers=2)
+        self.audio_frame = AudioRecvFrame(max_buffers=2)
+        self.running = threading.Event()
+        self.thread: threading.Thread|None = None
+        self.last_count = 0
+        self.last_time = time.monotonic()
+
+    def set_source(self, source_name: str) -> None:
+        # Receivers are created with the source name since Source objects
+        # from the controller can't be used here
+        self.stop()
+        config = self.config
+        receiver = config.receiver_factory(
+            source_name, RecvColorFormat(config.color_format), RecvBandwidth(config.bandwidth),
+        )
+        receiver.set_video_frame(self.video_frame)
+        receiver.set_audio_frame(self.audio_frame)
+        receiver.set_publisher(self.publisher)
+        self.receiver = receiver
+        self.running.set()
+        self.thread = threading.Thread(target=self._receive_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.running.clear()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.receiver is not None:
+            self.receiver.set_publisher(None)
+            self.receiver = None
+
+    def close(self) -> None:
+        self.stop()
+        self.publisher.close()
+
+    def _receive_loop(self) -> None:
+        receiver, vf, af = self.receiver, self.video_frame, self.audio_frame
+        assert receiver is not None
+        recv_type = self.config.recv_frame_type
+        timeout_ms = self.config.timeout_ms
+        while self.running.is_set():
+            ft = receiver.receive(recv_type, timeout_ms)
+            # The publisher has copied the frames, so the buffers are
+            # emptied to keep room for the next ones
+            if ft & ReceiveFrameType.recv_video:
+                vf.skip_frames(True)
+            if ft & ReceiveFrameType.recv_audio:
+                af.get_all_read_data()
+
+    def update_stats(self) -> None:
+        receiver = self.receiver
+        if receiver is None:
+            return
+        perf = receiver.get_performance_data()
+        row = self.row
+        row['connected'] = receiver.is_connected()
+        row['num_connections'] = receiver.get_num_connections()
+        count = 0
+        for key in ['video', 'audio', 'metadata']:
+            row[f'{key}_frames'] = perf[key]['frames_total']
+            row[f'{key}_dropped'] = perf[key]['frames_dropped']
+            count += perf[key]['frames_total']
+        now = time.monotonic()
+        if now > self.last_time:
+            row['frames_per_second'] = max(count - self.last_count, 0) / (now - self.last_time)
+        self.last_count, self.last_time = count, now
+        row['num_published'] = self.publisher.num_published
+        row['num_publish_dropped'] = self.publisher.num_dropped
+        row['updated'] = time.time()
+
+
+def _worker_main(index: int, conn: Any, config: _WorkerConfig) -> None:
+    """Entry point of a worker process
+    """
+    stats_shm = shared_memory.SharedMemory(name=config.stats_name)
+    stats = np.ndarray((config.max_receivers,), dtype=POOL_STATS_DTYPE, buffer=stats_shm.buf)
+    receivers: dict[int, _WorkerReceiver] = {}
+    lock = threading.Lock()
+    stopped = threading.Event()
+
+    def stats_loop():
+        while not stopped.wait(config.stats_interval):
+            with lock:
+                for r in receivers.values():
+                    r.update_stats()
+
+    stats_thread = threading.Thread(target=stats_loop, daemon=True)
+    stats_thread.start()
+    try:
+        while True:
+            try:
+                cmd, *args = conn.recv()
+            except (EOFError, OSError):
+                # The controller has gone away
+                break
+            if cmd == 'stop':
+                break
+            try:
+                with lock:
+                    if cmd == 'add':
+                        slot, source_name, publisher_name = args
+                        r = _WorkerReceiver(config, stats, slot, publisher_name)
+                        receivers[slot] = r
+                        r.set_source(source_name)
+                    elif cmd == 'set_source':
+                        slot, source_name = args
+                        receivers[slot].set_source(source_name)
+                    elif cmd == 'remove':
+                        slot, = args
+                        receivers.pop(slot).close()
+                    else:
+                        raise ValueError(f'Unknown command: {cmd}')
+            except Exception as exc:
+                conn.send(('error', f'{exc.__class__.__name__}: {exc}'))
+            else:
+                conn.send(('ok', os.getpid()))
+    finally:
+        stopped.set()
+        stats_thread.join()
+        for r in receivers.values():
+            r.close()
+        receivers.clear()
+        del stats
+        stats_shm.close()
+
+
+class _Worker:
+    """Controller side of a worker process
+    """
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.process: Any = None
+        self.conn: Any = None
+        self.lock = threading.Lock()
+        self.receivers: set[PooledReceiver] = set()
+        self.num_restarts = 0
+
+    @property
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    @property
+    def pid(self) -> int|None:
+        return None if self.process is None else self.process.pid
+
+    def start(self, ctx: Any, config: _WorkerConfig) -> None:
+        parent_conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(self.index, child_conn, config), daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+    def command(self, timeout: float, *args: Any) -> None:
+        with self.lock:
+            try:
+                self.conn.send(args)
+                if not self.conn.poll(timeout):
+                    raise TimeoutError(f'Worker {self.index} did not respond')
+                status, value = self.conn.recv()
+            except (EOFError, OSError) as exc:
+                raise RuntimeError(f'Worker {self.index} is not running') from exc
+        if status != 'ok':
+            raise RuntimeError(f'Worker {self.index}: {value}')
+
+    def stop(self, timeout: float) -> None:
+        if self.process is None:
+            return
+        with self.lock:
+            try:
+                self.conn.send(('stop',))
+            except (EOFError, OSError):
+                pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+        self.process = None
+        self.conn = None
+
+
+def _unlink_shared_memory(name: str) -> None:
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.unlink()
+    shm.close()
+
+
+class PooledReceiver:
+    """A receiver running in a worker process of a :class:`ReceiverProcessPool`
+
+    Instances are created with :meth:`ReceiverProcessPool.create_receiver`.
+    The methods mirror those of :class:`~cyndilib.receiver.Receiver`, but
+    received frames are :class:`~cyndilib.shared_frames.SharedFrame`
+    objects.
+
+    Attributes:
+        pool (ReceiverProcessPool): The pool this receiver belongs to
+        slot (int): Index of this receiver's row in
+            :attr:`ReceiverProcessPool.stats`
+        worker (int): Index of the worker running this receiver
+        source_name (str): Name of the source (empty if not connected)
+        video_frame (SharedFrame): The last video frame received
+            (or ``None``)
+        audio_frame (SharedFrame): The last audio frame received
+            (or ``None``)
+        metadata_frame (SharedFrame): The last metadata frame received
+            (or ``None``)
+    """
+    def __init__(self, pool: ReceiverProcessPool, slot: int, worker: int, source_name: str) -> None:
+        self.pool = pool
+        self.slot = slot
+        self.worker = worker
+        self.source_name = source_name
+        self.video_frame: SharedFrame|None = None
+        self.audio_frame: SharedFrame|None = None
+        self.metadata_frame: SharedFrame|None = None
+        self.generation = 0
+        self.publisher_name = ''
+        self.subscriber: SharedFrameSubscriber|None = None
+        self.pending: dict[int, deque[SharedFrame]] = {
+            ft: deque(maxlen=pool.num_slots) for ft in MEDIA_FRAME_TYPES.values()
+        }
+        self.closed = False
+
+    def __repr__(self) -> str:
+        return f'<PooledReceiver {self.slot} (worker {self.worker}): "{self.source_name}">'
+
+    @property
+    def stats(self) -> np.void:
+        """This receiver's row of :attr:`ReceiverProcessPool.stats`
+        """
+        return self.pool.stats[self.slot]
+
+    def set_source(self, src: Source|str|None) -> None:
+        """Set the source to connect to (by :class:`~cyndilib.finder.Source`
+        or name)
+
+        The receiver in the worker is recreated for the new source.
+        If ``None``, disconnects
+        """
+        if isinstance(src, Source):
+            source_name = src.name
+        else:
+            source_name = src or ''
+        if source_name == self.source_name:
+            return
+        self.source_name = source_name
+        self.pool._workers[self.worker].command(
+            self.pool.command_timeout, 'set_source', self.slot, source_name,
+        )
+
+    def connect_to(self, src: Source|str) -> None:
+        """Alias for :meth:`set_source`
+        """
+        self.set_source(src)
+
+    def disconnect(self) -> None:
+        """Disconnect from the current source
+        """
+        self.set_source(None)
+
+    def is_connected(self) -> bool:
+        """Returns ``True`` if the receiver was connected at the last
+        statistics update
+        """
+        return bool(self.stats['connected'])
+
+    def get_num_connections(self) -> int:
+        """The number of connections at the last statistics update
+        """
+        return int(self.stats['num_connections'])
+
+    def get_performance_data(self) -> dict[str, dict[str, Any]]:
+        """Get the frame counts at the last statistics update in the same
+        form as :meth:`Receiver.get_performance_data
+        <cyndilib.receiver.Receiver.get_performance_data>`
+        """
+        row = self.stats
+        result = {}
+        for key in ['video', 'audio', 'metadata']:
+            total = int(row[f'{key}_frames'])
+            dropped = int(row[f'{key}_dropped'])
+            result[key] = {
+                'frames_total': total,
+                'frames_dropped': dropped,
+                'dropped_percent': dropped / total * 100 if total else 0,
+            }
+        return result
+
+    def receive(self, recv_type: ReceiveFrameType, timeout_ms: int) -> ReceiveFrameType:
+        """Receive a frame of the given type(s)
+
+        The frame is stored in :attr:`video_frame`, :attr:`audio_frame` or
+        :attr:`metadata_frame`. Frames of other types that arrive meanwhile
+        are kept for later calls (up to
+        :attr:`~ReceiverProcessPool.num_slots` of each type).
+
+        Arguments:
+            recv_type (ReceiveFrameType): The frame type(s) to receive
+            timeout_ms (int): Time (in milliseconds) to wait for a frame
+
+        Returns a :class:`~cyndilib.receiver.ReceiveFrameType` indicating
+        what was received (:attr:`~cyndilib.receiver.ReceiveFrameType.nothing`
+        if the timeout was reached)
+        """
+        for ft, pending in self.pending.items():
+            if recv_type & ft and len(pending):
+                self._set_frame(ft, pending.popleft())
+                return ft
+        end_time = time.monotonic() + timeout_ms / 1000
+        while not self.closed:
+            subscriber = self.subscriber
+            remaining = max(end_time - time.monotonic(), 0)
+            try:
+                # Waits are split so a subscriber replaced after a worker
+                # restart is picked up
+                frame = None if subscriber is None else subscriber.read(min(remaining, .1))
+            except ValueError:
+                frame = None
+            if frame is None:
+                if time.monotonic() >= end_time:
+                    break
+                if subscriber is None:
+                    time.sleep(min(remaining, .01))
+                continue
+            ft = MEDIA_FRAME_TYPES[frame.media_type]
+            if recv_type & ft:
+                self._set_frame(ft, frame)
+                return ft
+            self.pending[ft].append(frame)
+        return ReceiveFrameType.nothing
+
+    def _set_frame(self, ft: ReceiveFrameType, frame: SharedFrame) -> None:
+        if ft == ReceiveFrameType.recv_video:
+            self.video_frame = frame
+        elif ft == ReceiveFrameType.recv_audio:
+            self.audio_frame = frame
+        else:
+            self.metadata_frame = frame
+
+    def close(self) -> None:
+        """Stop the receiver and remove it from the pool
+        """
+        self.pool.remove_receiver(self)
+
+    def _attach(self, publisher_name: str) -> None:
+        subscriber = SharedFrameSubscriber(publisher_name)
+        old = self.subscriber
+        self.subscriber = subscriber
+        self.publisher_name = publisher_name
+        for pending in self.pending.values():
+            pending.clear()
+        if old is not None:
+            old.close()
+
+    def _detach(self) -> None:
+        self.closed = True
+        if self.subscriber is not None:
+            self.subscriber.close()
+            self.subscriber = None
+
+
+class ReceiverProcessPool:
+    """Runs receivers in a pool of worker processes
+
+    Arguments:
+        num_workers (int, optional): Number of worker processes. Defaults to
+            :func:`os.cpu_count`
+        strategy (str or callable, optional): How receivers are assigned to
+            workers. One of :data:`STRATEGIES` or a callable taking the pool
+            and returning a worker index. Defaults to ``'least_sources'``
+        slot_size (int, optional): Maximum size (in bytes) of a frame.
+            Defaults to the size of a 1920x1080 BGRA frame
+        num_slots (int, optional): Number of frames buffered for each
+            receiver (see :class:`~cyndilib.shared_frames.SharedFramePublisher`)
+        max_receivers (int, optional): Maximum number of receivers
+        color_format (RecvColorFormat, optional): Color format for the receivers
+        bandwidth (RecvBandwidth, optional): Bandwidth for the receivers
+        recv_frame_type (ReceiveFrameType, optional): Frame types to receive.
+            Defaults to :attr:`~cyndilib.receiver.ReceiveFrameType.recv_all`
+        timeout_ms (int, optional): Timeout used by the workers when calling
+            :meth:`Receiver.receive <cyndilib.receiver.Receiver.receive>`
+        stats_interval (float, optional): Interval (in seconds) between
+            statistics updates
+        monitor_interval (float, optional): Interval (in seconds) between
+            checks for worker processes that have exited
+        receiver_factory (callable, optional): Called in the workers with the
+            source name, color format and bandwidth to create each receiver
+            (see :func:`default_receiver_factory`). Must be picklable
+        command_timeout (float, optional): Maximum time (in seconds) to wait
+            for a worker to respond
+
+    This class supports use as a :term:`context manager`, calling
+    :meth:`start` and :meth:`close`.
+
+    Attributes:
+        stats (numpy.ndarray): Statistics of each receiver as an array of
+            :data:`POOL_STATS_DTYPE` in shared memory
+        receivers (list): The :class:`PooledReceiver` instances
+    """
+    def __init__(
+        self,
+        num_workers: int|None = None,
+        strategy: str|Callable[[ReceiverProcessPool], int] = 'least_sources',
+        slot_size: int = 1920 * 1080 * 4,
+        num_slots: int = 4,
+        max_receivers: int = 64,
+        color_format: RecvColorFormat = RecvColorFormat.UYVY_BGRA,
+        bandwidth: RecvBandwidth = RecvBandwidth.highest,
+        recv_frame_type: ReceiveFrameType = ReceiveFrameType.recv_all,
+        timeout_ms: int = 100,
+        stats_interval: float = .25,
+        monitor_interval: float = .5,
+        receiver_factory: ReceiverFactory = default_receiver_factory,
+        command_timeout: float = 10.,
+    ) -> None:
+        if not callable(strategy) and strategy not in STRATEGIES:
+            raise ValueError(f'Unknown strategy: {strategy}')
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        if num_workers < 1 or max_receivers < 1:
+            raise ValueError('num_workers and max_receivers must be positive')
+        self.strategy = strategy
+        self.num_slots = num_slots
+        self.max_receivers = max_receivers
+        self.monitor_interval = monitor_interval
+        self.command_timeout = command_timeout
+        self._id = next(_pool_ids)
+        self._ctx = mp.get_context('spawn')
+        self._stats_shm = shared_memory.SharedMemory(
+            create=True, size=max_receivers * POOL_STATS_DTYPE.itemsize,
+        )
+        self.stats = np.ndarray((max_receivers,), dtype=POOL_STATS_DTYPE, buffer=self._stats_shm.buf)
+        self.stats[...] = 0
+        self._config = _WorkerConfig(
+            stats_name=self._stats_shm.name,
+            max_receivers=max_receivers,
+            slot_size=slot_size,
+            num_slots=num_slots,
+            color_format=int(color_format),
+            bandwidth=int(bandwidth),
+            recv_frame_type=int(recv_frame_type),
+            timeout_ms=timeout_ms,
+            stats_interval=stats_interval,
+            receiver_factory=receiver_factory,
+        )
+        self._workers = [_Worker(i) for i in range(num_workers)]
+        self.receivers: list[PooledReceiver] = []
+        self._slots: list[PooledReceiver|None] = [None] * max_receivers
+        self._next_worker = 0
+        self._lock = threading.RLock()
+        self._running = False
+        self._stopped = threading.Event()
+        self._monitor_thread: threading.Thread|None = None
+
+    def __enter__(self) -> ReceiverProcessPool:
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def num_workers(self) -> int:
+        """Number of worker processes
+        """
+        return len(self._workers)
+
+    @property
+    def is_running(self) -> bool:
+        """``True`` between :meth:`start` and :meth:`close`
+        """
+        return self._running
+
+    def start(self) -> None:
+        """Start the worker processes
+        """
+        with self._lock:
+            if self._running:
+                return
+            if self._stats_shm is None:
+                raise RuntimeError('Pool is closed')
+            for w in self._workers:
+                w.start(self._ctx, self._config)
+            self._running = True
+            self._stopped.clear()
+            self._monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
+            self._monitor_thread.start()
+
+    def close(self) -> None:
+        """Stop all receivers and worker processes and release the shared
+        memory
+        """
+        with self._lock:
+            if not self._running and self._stats_shm is None:
+                return
+            self._running = False
+            self._stopped.set()
+        if self._monitor_thread is not None:
+            self._monitor_thread.join()
+            self._monitor_thread = None
+        with self._lock:
+            for w in self._workers:
+                w.stop(self.command_timeout)
+            for rx in self.receivers:
+                rx._detach()
+                # Normally done by the worker, unless it exited unexpectedly
+                _unlink_shared_memory(rx.publisher_name)
+            self.receivers.clear()
+            self._slots = [None] * self.max_receivers
+            for w in self._workers:
+                w.receivers.clear()
+            del self.stats
+            self._stats_shm.close()
+            self._stats_shm.unlink()
+            self._stats_shm = None
+
+    def create_receiver(self, source: Source|str|None = None, worker: int|None = None) -> PooledReceiver:
+        """Create a receiver in one of the workers
+
+        Arguments:
+            source: The :class:`~cyndilib.finder.Source` (or source name) to
+                connect to
+            worker (int, optional): The worker to use. If not given, one is
+                chosen using the :attr:`strategy`
+
+        Returns:
+            PooledReceiver: The controller side of the new receiver
+        """
+        if isinstance(source, Source):
+            source_name = source.name
+        else:
+            source_name = source or ''
+        with self._lock:
+            if not self._running:
+                raise RuntimeError('Pool is not running')
+            try:
+                slot = self._slots.index(None)
+            except ValueError:
+                raise RuntimeError('Maximum number of receivers reached') from None
+            if worker is None:
+                worker = self._choose_worker()
+            elif not 0 <= worker < self.num_workers:
+                raise IndexError(f'Invalid worker index: {worker}')
+            rx = PooledReceiver(self, slot, worker, source_name)
+            self.stats[slot] = 0
+            self.stats['worker'][slot] = worker
+            self._add_to_worker(rx)
+            self._slots[slot] = rx
+            self.receivers.append(rx)
+            self._workers[worker].receivers.add(rx)
+        return rx
+
+    def remove_receiver(self, rx: PooledReceiver) -> None:
+        """Stop a receiver and remove it from the pool
+        """
+        with self._lock:
+            if rx not in self.receivers:
+                return
+            self.receivers.remove(rx)
+            self._slots[rx.slot] = None
+            w = self._workers[rx.worker]
+            w.receivers.discard(rx)
+            rx._detach()
+            try:
+                w.command(self.command_timeout, 'remove', rx.slot)
+            except RuntimeError:
+                _unlink_shared_memory(rx.publisher_name)
+
+    def get_worker_loads(self) -> list[dict[str, Any]]:
+        """Get the state of each worker
+
+        Returns a list of dictionaries with the ``index``, ``pid``,
+        ``alive``, ``num_receivers``, ``frames_per_second`` (the total for
+        its receivers) and ``num_restarts`` of each worker
+        """
+        with self._lock:
+            fps = self._get_frame_rates()
+            return [{
+                'index': w.index,
+                'pid': w.pid,
+                'alive': w.is_alive,
+                'num_receivers': len(w.receivers),
+                'frames_per_second': fps[w.index],
+                'num_restarts': w.num_restarts,
+            } for w in self._workers]
+
+    def _get_frame_rates(self) -> list[float]:
+        fps = [0.] * self.num_workers
+        for rx in self.receivers:
+            fps[rx.worker] += float(self.stats[rx.slot]['frames_per_second'])
+        return fps
+
+    def _choose_worker(self) -> int:
+        if callable(self.strategy):
+            return self.strategy(self)
+        if self.strategy == 'round_robin':
+            index = self._next_worker
+            self._next_worker = (index + 1) % self.num_workers
+            return index
+        counts = [len(w.receivers) for w in self._workers]
+        if self.strategy == 'least_load':
+            fps = self._get_frame_rates()
+            keys = list(zip(fps, counts))
+        else:
+            keys = counts
+        return min(range(self.num_workers), key=keys.__getitem__)
+
+    def _add_to_worker(self, rx: PooledReceiver) -> None:
+        w = self._workers[rx.worker]
+        rx.generation += 1
+        publisher_name = f'cyp{os.getpid():x}_{self._id}_{rx.slot}_{rx.generation}'
+        w.command(self.command_timeout, 'add', rx.slot, rx.source_name, publisher_name)
+        self.stats['generation'][rx.slot] = rx.generation
+        self.stats['pid'][rx.slot] = w.pid
+        rx._attach(publisher_name)
+
+    def _restart_worker(self, w: _Worker) -> None:
+        w.stop(self.command_timeout)
+        w.num_restarts += 1
+        w.start(self._ctx, self._config)
+        for rx in sorted(w.receivers, key=lambda rx: rx.slot):
+            old_name = rx.publisher_name
+            self._add_to_worker(rx)
+            _unlink_shared_memory(old_name)
+
+    def _monitor_loop(self) -> None:
+        while not self._stopped.wait(self.monitor_interval):
+            with self._lock:
+                if not self._running:
+                    break
+                for w in self._workers:
+                    if w.is_alive:
+                        continue
+                    try:
+                        self._restart_worker(w)
+                    except Exception:
+                        import traceback
+                        traceback.print_exc()
@@ -0,0 +1,59 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from libc.stdint cimport *
+
+from .wrapper cimport *
+from .sender cimport Sender
+from .framesync cimport FrameSync
+from .video_frame cimport VideoRecvFrame, VideoFrameSync
+from .pacing cimport (
+    PacingClock_s, pacing_clock_init, pacing_clock_set_rate,
+    pacing_clock_reset, pacing_clock_wait,
+)
+
+
+cpdef enum ConvertMode:
+    convert_nearest = 1
+    convert_drop_repeat = 2
+    convert_blend = 3
+
+
+cdef void blend_frames(
+    const uint8_t* a,
+    const uint8_t* b,
+    uint8_t* dest,
+    size_t size,
+    uint32_t weight,
+    bint wide,
+) noexcept nogil
+
+
+cdef class FrameRateConverter:
+    cdef readonly Sender sender
+    cdef readonly VideoRecvFrame recv_frame
+    cdef readonly VideoFrameSync sync_frame
+    cdef readonly FrameSync frame_sync
+    cdef readonly ConvertMode mode
+    cdef PacingClock_s clock
+    cdef NDIlib_video_frame_v2_t video_frame_s
+    cdef uint8_t* blend_buffer
+    cdef size_t blend_buffer_size
+    cdef bint has_current
+    cdef size_t current_index
+    cdef int64_t current_timestamp
+    cdef bint time_valid
+    cdef double source_time
+    cdef object thread
+    cdef bint stopping
+    cdef readonly size_t num_ticks, num_video_sent, num_repeated
+    cdef readonly size_t num_dropped, num_blended, num_missed, num_resyncs
+
+    cdef int _run(self) except -1 nogil
+    cdef int _tick(self) except -1 nogil
+    cdef bint _tick_recv(self) except -1 nogil
+    cdef bint _tick_sync(self) except -1 nogil
+    cdef int _capture(self) except -1 nogil
+    cdef int _update_source_time(self, int64_t oldest, int64_t newest, double period) noexcept nogil
+    cdef size_t _locate(self, size_t num_buffered, size_t* next_pos, uint32_t* weight) noexcept nogil
+    cdef bint _send_video(self, NDIlib_video_frame_v2_t* p) noexcept nogil
@@ -0,0 +1,58 @@
+from __future__ import annotations
+import enum
+from fractions import Fraction
+
+import numpy as np
+import numpy.typing as npt
+
+from .sender import Sender
+from .framesync import FrameSync
+from .video_frame import VideoRecvFrame, VideoFrameSync
+from .wrapper.ndi_structs import FourCC
+
+
+class ConvertMode(enum.IntEnum):
+    convert_nearest = 1
+    convert_drop_repeat = 2
+    convert_blend = 3
+
+
+def blend(
+    a: npt.NDArray[np.uint8],
+    b: npt.NDArray[np.uint8],
+    dest: npt.NDArray[np.uint8],
+    weight: float,
+    fourcc: FourCC = ...,
+) -> None: ...
+
+
+class FrameRateConverter:
+    sender: Sender|None
+    recv_frame: VideoRecvFrame|None
+    sync_frame: VideoFrameSync|None
+    frame_sync: FrameSync|None
+    mode: ConvertMode
+    num_ticks: int
+    num_video_sent: int
+    num_repeated: int
+    num_dropped: int
+    num_blended: int
+    num_missed: int
+    num_resyncs: int
+    def __init__(
+        self,
+        sender: Sender|None,
+        source: VideoRecvFrame|FrameSync|VideoFrameSync,
+        frame_rate: Fraction|None = ...,
+        mode: ConvertMode = ...,
+    ) -> None: ...
+    def __enter__(self) -> FrameRateConverter: ...
+    def __exit__(self, *args) -> None: ...
+    @property
+    def source(self) -> VideoRecvFrame|FrameSync|VideoFrameSync: ...
+    @property
+    def is_running(self) -> bool: ...
+    @property
+    def frame_rate(self) -> Fraction: ...
+    def start(self) -> None: ...
+    def stop(self) -> None: ...
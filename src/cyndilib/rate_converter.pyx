@@ -0,0 +1,530 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+Frame rate conversion between a receiver and a :class:`~.sender.Sender`
+
+:class:`FrameRateConverter` sends the frames of a video source on the
+output clock of a sender, selecting (or blending) frames by their |NDI|
+timestamps::
+
+    rx = Receiver()
+    rx.set_video_frame(VideoRecvFrame())
+    rx.set_source(src)
+    recv_thread = RecvThread(rx, 100)
+    ...
+    with Sender('Converted', clock_video=False) as sender:
+        sender.set_video_frame(VideoSendFrame())
+        sender.video_frame.set_frame_rate(Fraction(50))
+        with FrameRateConverter(sender, rx.video_frame, mode=ConvertMode.convert_blend):
+            ...
+
+Audio is not handled here and should be sent as received
+(or through an :class:`~.audio_mixer.AudioMixer`).
+
+.. versionadded:: 0.0.10
+
+"""
+
+cimport cython
+from libc.math cimport fabs
+from libc.stdlib cimport realloc, free
+
+from fractions import Fraction
+import threading
+
+__all__ = ('FrameRateConverter', 'ConvertMode', 'blend')
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void blend_frames(
+    const uint8_t* a,
+    const uint8_t* b,
+    uint8_t* dest,
+    size_t size,
+    uint32_t weight,
+    bint wide,
+) noexcept nogil:
+    """Blend *size* bytes of *a* and *b* into *dest*
+
+    *weight* is the weight of *b* in 1/256 steps. If *wide* is True, the
+    data is treated as 16-bit samples (as in the ``P216`` and ``PA16``
+    formats).
+    """
+    cdef uint32_t inv_weight = 256 - weight
+    cdef const uint16_t* a16
+    cdef const uint16_t* b16
+    cdef uint16_t* dest16
+    cdef size_t i
+    if wide:
+        a16 = <const uint16_t*>a
+        b16 = <const uint16_t*>b
+        dest16 = <uint16_t*>dest
+        for i in range(size // 2):
+            dest16[i] = <uint16_t>((a16[i] * inv_weight + b16[i] * weight + 128) >> 8)
+    else:
+        for i in range(size):
+            dest[i] = <uint8_t>((a[i] * inv_weight + b[i] * weight + 128) >> 8)
+
+
+def blend(
+    const uint8_t[::1] a,
+    const uint8_t[::1] b,
+    uint8_t[::1] dest,
+    double weight,
+    FourCC fourcc = FourCC.UYVY,
+):
+    """Blend two frames as done by :attr:`ConvertMode.convert_blend`
+
+    Arguments:
+        a: Data of the first frame
+        b: Data of the second frame
+        dest: Buffer to write the result to (may be *a* or *b*)
+        weight (float): Weight of *b* in the result from ``0`` to ``1``
+        fourcc (FourCC, optional): Format of the frames
+
+    Raises:
+        ValueError: If the buffers differ in size or *weight* is out of range
+    """
+    cdef size_t size = a.shape[0]
+    cdef uint32_t w
+    cdef bint wide = fourcc in (FourCC.P216, FourCC.PA16)
+    if <size_t>b.shape[0] != size or <size_t>dest.shape[0] != size:
+        raise ValueError('buffer sizes do not match')
+    if not 0 <= weight <= 1:
+        raise ValueError('weight must be between 0 and 1')
+    if size == 0:
+        return
+    w = <uint32_t>(weight * 256 + .5)
+    with nogil:
+        blend_frames(&a[0], &b[0], &dest[0], size, w, wide)
+
+
+cdef class FrameRateConverter:
+    """Sends the frames of a video source through a
+    :class:`~.sender.Sender` at the sender's frame rate from a background
+    thread
+
+    When reading from a :class:`~.video_frame.VideoRecvFrame`, the frames
+    are chosen by their |NDI| timestamps according to the :attr:`mode`:
+
+    :attr:`~ConvertMode.convert_nearest`
+        The frame with the timestamp nearest to the output time
+    :attr:`~ConvertMode.convert_drop_repeat`
+        The most recently received frame (ignoring timestamps). This has the
+        lowest latency
+    :attr:`~ConvertMode.convert_blend`
+        A blend of the two frames on either side of the output time,
+        weighted by their distance to it
+
+    The output time follows the source timestamps one source frame behind
+    the most recent frame, so the timestamp based modes add one frame of
+    latency. If the source falls too far behind or ahead of the output
+    clock (or its timestamps jump), the output time is reset to the most
+    recent frame (see :attr:`num_resyncs`). Sources without timestamps are
+    converted as in :attr:`~ConvertMode.convert_drop_repeat` mode.
+
+    Frames are sent from the receive buffers without copying them. The read
+    lock of the source is not held during the send, so the receiver is never
+    blocked by it. The last frame sent stays in the buffer queue so it can be
+    repeated, which leaves one less buffer for the receiver. Only blended
+    frames are written to a separate buffer. Because of this, a :class:`~.video_frame.VideoRecvFrame`
+    source must have a :attr:`~.video_frame.VideoRecvFrame.max_buffers` of at
+    least 2 (or 3 for :attr:`~ConvertMode.convert_blend`, which holds two
+    source frames at a time).
+
+    When reading from a :class:`~.framesync.FrameSync`, a video frame is
+    captured on each tick and the |NDI| library's time base correction takes
+    the place of the :attr:`mode` (so :attr:`~ConvertMode.convert_blend`
+    cannot be used). A :class:`~.video_frame.VideoFrameSync` in
+    :attr:`~.video_frame.VideoFrameSync.double_buffered` mode may also be
+    used if it is captured by something else.
+
+    The source must be driven by something else (such as a
+    :class:`~.receiver.RecvThread`) and should not be read from while the
+    converter is running. The sender must be open before calling
+    :meth:`start`. While running, no other video should be sent through it.
+    Audio is not touched.
+
+    The converter paces the output with its own clock, so the sender should
+    be created with ``clock_video=False``. Otherwise the |NDI| library clocks
+    each frame again and the sends block for up to a frame.
+
+    Arguments:
+        sender (Sender): The sender to use
+        source: A :class:`~.video_frame.VideoRecvFrame`,
+            :class:`~.framesync.FrameSync` (with its
+            :attr:`~.framesync.FrameSync.video_frame` set) or double-buffered
+            :class:`~.video_frame.VideoFrameSync`
+        frame_rate (fractions.Fraction, optional): Rate of the output clock.
+            Defaults to the frame rate of the sender's
+            :attr:`~.sender.Sender.video_frame` (if set) or ``30000/1001``
+        mode (ConvertMode, optional): The conversion mode. Defaults to
+            :attr:`~ConvertMode.convert_nearest`
+
+    This class supports use as a :term:`context manager`, calling
+    :meth:`start` and :meth:`stop`.
+
+    Attributes:
+        mode (ConvertMode): The conversion mode
+        recv_frame (VideoRecvFrame): The source frame (if reading from a
+            :class:`~.video_frame.VideoRecvFrame`)
+        sync_frame (VideoFrameSync): The source frame (if reading from a
+            :class:`~.video_frame.VideoFrameSync` or
+            :class:`~.framesync.FrameSync`)
+        frame_sync (FrameSync): The frame sync captured on each tick
+            (if given)
+        num_ticks (int): Number of output clock ticks
+        num_video_sent (int): Number of frames sent
+        num_repeated (int): Number of ticks where the previous frame was
+            sent again
+        num_dropped (int): Number of source frames discarded without
+            being sent
+        num_blended (int): Number of blended frames sent
+        num_missed (int): Number of ticks where nothing could be sent
+        num_resyncs (int): Number of times the output time was reset
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.blend_buffer = NULL
+        self.blend_buffer_size = 0
+        self.has_current = False
+        self.current_index = 0
+        self.current_timestamp = 0
+        self.time_valid = False
+        self.source_time = 0
+        self.stopping = False
+        self.num_ticks = 0
+        self.num_video_sent = 0
+        self.num_repeated = 0
+        self.num_dropped = 0
+        self.num_blended = 0
+        self.num_missed = 0
+        self.num_resyncs = 0
+        pacing_clock_init(&self.clock)
+
+    def __init__(
+        self,
+        Sender sender,
+        object source,
+        object frame_rate=None,
+        ConvertMode mode=ConvertMode.convert_nearest,
+    ):
+        self.sender = sender
+        if isinstance(source, VideoRecvFrame):
+            self.recv_frame = source
+        elif isinstance(source, FrameSync):
+            if source.video_frame is None:
+                raise ValueError('frame_sync has no video_frame')
+            self.frame_sync = source
+            self.sync_frame = source.video_frame
+        elif isinstance(source, VideoFrameSync):
+            if not source.double_buffered:
+                raise ValueError('VideoFrameSync sources must be double_buffered')
+            self.sync_frame = source
+        else:
+            raise TypeError(f'Unsupported source type: {type(source)!r}')
+        if mode == ConvertMode.convert_blend and self.recv_frame is None:
+            raise ValueError('convert_blend requires a VideoRecvFrame source')
+        if self.recv_frame is not None:
+            min_buffers = 3 if mode == ConvertMode.convert_blend else 2
+            if self.recv_frame.max_buffers < min_buffers:
+                raise ValueError(
+                    f'{mode!r} requires a VideoRecvFrame with max_buffers >= {min_buffers}'
+                )
+        self.mode = mode
+        if frame_rate is None:
+            if sender is not None and sender.has_video_frame:
+                frame_rate = sender.video_frame.get_frame_rate()
+            else:
+                frame_rate = Fraction(30000, 1001)
+        frame_rate = Fraction(frame_rate)
+        pacing_clock_set_rate(&self.clock, frame_rate.numerator, frame_rate.denominator)
+
+    def __dealloc__(self):
+        cdef uint8_t* buffer = self.blend_buffer
+        self.blend_buffer = NULL
+        if buffer is not NULL:
+            free(buffer)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def source(self):
+        """The video source
+        """
+        if self.recv_frame is not None:
+            return self.recv_frame
+        if self.frame_sync is not None:
+            return self.frame_sync
+        return self.sync_frame
+
+    @property
+    def is_running(self) -> bool:
+        """``True`` while the conversion thread is running
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    @property
+    def frame_rate(self) -> Fraction:
+        """Rate of the output clock
+        """
+        return Fraction(self.clock.numerator, self.clock.denominator)
+
+    def start(self):
+        """Start the conversion thread
+        """
+        if self.is_running:
+            return
+        self.stopping = False
+        self.thread = threading.Thread(target=self._thread_func, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the conversion thread and wait for it to exit
+        """
+        if self.thread is None:
+            return
+        self.stopping = True
+        self.thread.join()
+        self.thread = None
+
+    def _thread_func(self):
+        with nogil:
+            self._run()
+
+    cdef int _run(self) except -1 nogil:
+        pacing_clock_reset(&self.clock)
+        while not self.stopping:
+            pacing_clock_wait(&self.clock)
+            if self.stopping:
+                break
+            self._tick()
+        return 0
+
+    cdef int _tick(self) except -1 nogil:
+        cdef bint sent
+        self.num_ticks += 1
+        if self.recv_frame is not None:
+            sent = self._tick_recv()
+        else:
+            sent = self._tick_sync()
+        if not sent:
+            self.num_missed += 1
+        return 0
+
+    cdef int _capture(self) except -1 nogil:
+        if self.frame_sync is not None:
+            self.frame_sync._capture_video()
+        return 0
+
+    cdef int _update_source_time(self, int64_t oldest, int64_t newest, double period) noexcept nogil:
+        cdef double latest = <double>newest
+        cdef double out_period = 1e7 * self.clock.denominator / self.clock.numerator
+        if not self.time_valid:
+            self.source_time = latest - period
+            self.time_valid = True
+            return 0
+        self.source_time += out_period
+        # Too far ahead of the newest frame (the source stalled or its
+        # timestamps went backwards) or behind the oldest (frames are piling
+        # up or the timestamps jumped ahead)
+        if self.source_time > latest + period or self.source_time < <double>oldest - period:
+            self.source_time = latest - period
+            self.num_resyncs += 1
+        return 0
+
+    cdef size_t _locate(self, size_t num_buffered, size_t* next_pos, uint32_t* weight) noexcept nogil:
+        # Find the position(s) in the read queue to send for the current
+        # output time
+        cdef double target = self.source_time, ts, prev_ts, dist, best_dist = -1
+        cdef double w
+        cdef size_t i, idx, pos = 0
+        next_pos[0] = 0
+        weight[0] = 0
+        if self.mode == ConvertMode.convert_nearest:
+            for i in range(num_buffered):
+                idx = self.recv_frame.read_indices[i]
+                dist = fabs(<double>self.recv_frame.slot_timestamps[idx] - target)
+                if best_dist < 0 or dist < best_dist:
+                    best_dist = dist
+                    pos = i
+            return pos
+
+        for i in range(num_buffered):
+            idx = self.recv_frame.read_indices[i]
+            if <double>self.recv_frame.slot_timestamps[idx] > target:
+                break
+            pos = i
+        if pos + 1 >= num_buffered:
+            return pos
+        idx = self.recv_frame.read_indices[pos]
+        prev_ts = <double>self.recv_frame.slot_timestamps[idx]
+        idx = self.recv_frame.read_indices[pos + 1]
+        ts = <double>self.recv_frame.slot_timestamps[idx]
+        if ts <= prev_ts or target <= prev_ts:
+            return pos
+        w = (target - prev_ts) / (ts - prev_ts)
+        if w >= 1:
+            return pos + 1
+        next_pos[0] = pos + 1
+        weight[0] = <uint32_t>(w * 256 + .5)
+        if weight[0] >= 256:
+            weight[0] = 0
+            return pos + 1
+        return pos
+
+    cdef bint _tick_recv(self) except -1 nogil:
+        cdef NDIlib_video_frame_v2_t* p = &self.video_frame_s
+        cdef NDIlib_video_frame_v2_t* src = self.recv_frame.ptr
+        cdef size_t num_buffered, size, idx, next_idx = 0, front, pos, next_pos = 0
+        cdef uint32_t weight = 0
+        cdef uint8_t* data
+        cdef uint8_t* buffer
+        cdef double period
+        cdef int64_t newest, oldest
+        cdef bint sent = False, wide = False, restored
+
+        self.recv_frame.read_lock._acquire(True, -1)
+        try:
+            num_buffered = self.recv_frame.read_indices.size()
+            if num_buffered == 0:
+                return False
+            size = self.recv_frame._get_read_size()
+            if size == 0:
+                return False
+
+            idx = self.recv_frame.read_indices.front()
+            oldest = self.recv_frame.slot_timestamps[idx]
+            idx = self.recv_frame.read_indices.back()
+            newest = self.recv_frame.slot_timestamps[idx]
+            pos = num_buffered - 1
+            if (
+                self.mode != ConvertMode.convert_drop_repeat and
+                newest != NDIlib_recv_timestamp_undefined
+            ):
+                if src.frame_rate_N > 0 and src.frame_rate_D > 0:
+                    period = 1e7 * src.frame_rate_D / src.frame_rate_N
+                else:
+                    period = 1e7 * self.clock.denominator / self.clock.numerator
+                self._update_source_time(oldest, newest, period)
+                pos = self._locate(num_buffered, &next_pos, &weight)
+
+            data = <uint8_t*>self.recv_frame.all_frame_data.data
+            idx = self.recv_frame.read_indices[pos]
+            p.xres = src.xres
+            p.yres = src.yres
+            p.FourCC = src.FourCC
+            p.frame_rate_N = self.clock.numerator
+            p.frame_rate_D = self.clock.denominator
+            p.picture_aspect_ratio = src.picture_aspect_ratio
+            p.frame_format_type = src.frame_format_type
+            p.timecode = NDIlib_send_timecode_synthesize
+            p.p_data = data + idx * size
+            p.line_stride_in_bytes = src.line_stride_in_bytes
+            p.p_metadata = NULL
+            p.timestamp = 0
+            wide = src.FourCC in (
+                NDIlib_FourCC_video_type_P216, NDIlib_FourCC_video_type_PA16,
+            )
+
+            # Everything before the selected frame can go
+            while self.recv_frame.read_indices.front() != idx:
+                front = self.recv_frame.read_indices.front()
+                self.recv_frame.read_indices.pop_front()
+                self.recv_frame.read_indices_set.erase(front)
+                if not (self.has_current and front == self.current_index):
+                    self.num_dropped += 1
+
+            # Reserve the frame(s) used so the receiver can neither evict nor
+            # overwrite them while they're sent without the lock
+            self.recv_frame._reserve_front()
+            if weight > 0:
+                next_idx = self.recv_frame._reserve_front()
+        finally:
+            self.recv_frame.read_lock._release()
+
+        try:
+            if weight > 0:
+                if size > self.blend_buffer_size:
+                    buffer = <uint8_t*>realloc(self.blend_buffer, size)
+                    if buffer is NULL:
+                        raise_mem_err()
+                    self.blend_buffer = buffer
+                    self.blend_buffer_size = size
+                blend_frames(
+                    p.p_data, data + next_idx * size, self.blend_buffer, size,
+                    weight, wide,
+                )
+                p.p_data = self.blend_buffer
+            sent = self._send_video(p)
+        finally:
+            # The frame sent is kept at the front of the queue in case it
+            # needs to be repeated
+            if weight > 0:
+                self.recv_frame._restore_reserved(next_idx)
+            restored = self.recv_frame._restore_reserved(idx)
+
+        if sent:
+            self.num_video_sent += 1
+            if weight > 0:
+                self.num_blended += 1
+            elif self.has_current and idx == self.current_index:
+                self.num_repeated += 1
+        self.has_current = restored
+        self.current_index = idx
+        return sent
+
+    cdef bint _tick_sync(self) except -1 nogil:
+        cdef NDIlib_video_frame_v2_t* p = &self.video_frame_s
+        cdef NDIlib_video_frame_v2_t* src
+        cdef size_t front, size
+        cdef int64_t timestamp
+        cdef uint8_t* data
+        cdef bint sent
+
+        self._capture()
+        src = self.sync_frame.ptr
+        # Keep a capture from another thread from writing to this buffer
+        if not self.sync_frame._acquire_front(&front, &data, &size):
+            return False
+        timestamp = src.timestamp
+
+        p.xres = src.xres
+        p.yres = src.yres
+        p.FourCC = src.FourCC
+        p.frame_rate_N = self.clock.numerator
+        p.frame_rate_D = self.clock.denominator
+        p.picture_aspect_ratio = src.picture_aspect_ratio
+        p.frame_format_type = src.frame_format_type
+        p.timecode = NDIlib_send_timecode_synthesize
+        p.p_data = data
+        p.line_stride_in_bytes = src.line_stride_in_bytes
+        p.p_metadata = NULL
+        p.timestamp = 0
+
+        try:
+            sent = self._send_video(p)
+        finally:
+            self.sync_frame._release_front(front)
+        if sent:
+            self.num_video_sent += 1
+            # The frame sync repeats the last frame (with its timestamp)
+            # when nothing new has been received
+            if (
+                self.has_current and timestamp == self.current_timestamp and
+                timestamp != NDIlib_recv_timestamp_undefined
+            ):
+                self.num_repeated += 1
+        self.has_current = True
+        self.current_timestamp = timestamp
+        return sent
+
+    cdef bint _send_video(self, NDIlib_video_frame_v2_t* p) noexcept nogil:
+        if self.sender is None:
+            return False
+        return self.sender._send_video_frame(p, False)
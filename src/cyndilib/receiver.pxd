@@ -12,6 +12,12 @@ from .audio_frame cimport AudioRecvFrame
 from .metadata_frame cimport MetadataRecvFrame
 from .framesync cimport FrameSync
 from .callback cimport Callback
+from .timing cimport StageTimer, RecvStage
+from .tracing cimport TraceEventType, trace_event, trace_register_source
+from .history cimport HistoryBuffer
+from .recorder cimport Recorder
+from .shared_frames cimport SharedFramePublisher
+from .metrics cimport MetricsKind, MetricsRow_s, metrics_register, metrics_unregister
 
 
 cpdef enum ReceiveFrameType:
@@ -48,8 +54,12 @@ cdef class Receiver:
     cdef readonly VideoRecvFrame video_frame
     cdef readonly AudioRecvFrame audio_frame
     cdef readonly MetadataRecvFrame metadata_frame
+    cdef readonly HistoryBuffer history
+    cdef readonly Recorder recorder
+    cdef readonly SharedFramePublisher publisher
     cdef readonly str source_name
     cdef readonly bint has_video_frame, has_audio_frame, has_metadata_frame
+    cdef bint has_history, has_recorder, has_publisher
     cdef readonly RLock connection_lock
     cdef readonly Condition connection_notify
     cdef readonly Source source
@@ -65,10 +75,15 @@ cdef class Receiver:
     cdef NDIlib_recv_instance_t ptr
     cdef NDIlib_recv_create_v3_t recv_create
     cdef readonly PTZ ptz
+    cdef readonly StageTimer stage_timer
+    cdef uint32_t trace_source_id
 
     cpdef set_video_frame(self, VideoRecvFrame vf)
     cpdef set_audio_frame(self, AudioRecvFrame af)
     cpdef set_metadata_frame(self, MetadataRecvFrame mf)
+    cpdef set_history(self, HistoryBuffer history)
+    cpdef set_recorder(self, Recorder recorder)
+    cpdef set_publisher(self, SharedFramePublisher publisher)
     cpdef set_source(self, Source src)
     cpdef connect_to(self, Source src)
     cdef int _connect_to(self, NDIlib_source_t* src) except -1
@@ -12,6 +12,10 @@ from .finder import Source
 from .audio_frame import AudioRecvFrame
 from .video_frame import VideoRecvFrame
 from .metadata_frame import MetadataRecvFrame
+from .timing import StageTimer
+from .history import HistoryBuffer
+from .recorder import Recorder
+from .shared_frames import SharedFramePublisher
 if TYPE_CHECKING:
     from .callback import _CallbackType
 
@@ -39,6 +43,9 @@ class Receiver:
     connection_lock: RLock
     connection_notify: Condition
     frame_sync: FrameSync
+    history: HistoryBuffer|None
+    recorder: Recorder|None
+    publisher: SharedFramePublisher|None
     has_audio_frame: bool
     has_metadata_frame: bool
     has_video_frame: bool
@@ -50,6 +57,7 @@ class Receiver:
     video_frame: VideoRecvFrame|None
     video_stats: RecvPerformance_t
     ptz: PTZ
+    stage_timer: StageTimer
     def __init__(
         self,
         source_name: str = ...,
@@ -67,11 +75,16 @@ class Receiver:
     def disconnect(self) -> Any: ...
     def get_num_connections(self) -> Any: ...
     def get_performance_data(self) -> Any: ...
+    def set_stage_timing_enabled(self, enabled: bool) -> None: ...
+    def get_stage_timings(self) -> dict[str, dict[str, Any]|None]: ...
     def is_connected(self) -> Any: ...
     def receive(self, recv_type: ReceiveFrameType, timeout_ms: int) -> ReceiveFrameType: ...
     def reconnect(self) -> Any: ...
     def set_audio_frame(self, af: AudioRecvFrame) -> Any: ...
     def set_metadata_frame(self, mf: MetadataRecvFrame) -> Any: ...
+    def set_history(self, history: HistoryBuffer|None) -> None: ...
+    def set_recorder(self, recorder: Recorder|None) -> None: ...
+    def set_publisher(self, publisher: SharedFramePublisher|None) -> None: ...
     def set_source(self, src: Source) -> Any: ...
     def set_source_tally_preview(self, value: bool) -> Any: ...
     def set_source_tally_program(self, value: bool) -> Any: ...
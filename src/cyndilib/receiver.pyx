@@ -8,6 +8,25 @@ from .clock cimport time, sleep
 __all__ = ('Receiver', 'RecvThreadWorker', 'RecvThread')
 
 
+cdef int _fill_receiver_metrics(object obj, MetricsRow_s* row) except -1:
+    cdef Receiver receiver = obj
+    receiver._update_performance()
+    row.video_frames = receiver.video_stats.frames_total
+    row.video_dropped = receiver.video_stats.frames_dropped
+    row.audio_frames = receiver.audio_stats.frames_total
+    row.audio_dropped = receiver.audio_stats.frames_dropped
+    row.metadata_frames = receiver.metadata_stats.frames_total
+    row.metadata_dropped = receiver.metadata_stats.frames_dropped
+    if receiver.has_video_frame:
+        row.video_buffer_depth = receiver.video_frame.read_indices.size()
+    if receiver.has_audio_frame:
+        row.audio_buffer_depth = receiver.audio_frame.read_indices.size()
+    row.connections = receiver._get_num_connections()
+    row.connected = receiver._connected
+    row.tally_program = receiver.source_tally.on_program
+    row.tally_preview = receiver.source_tally.on_preview
+    return 0
+
 cdef NDIlib_frame_type_e recv_frame_type_cast(ReceiveFrameType ft) noexcept nogil:
     if ft == ReceiveFrameType.recv_video:
         return NDIlib_frame_type_video
@@ -104,10 +123,37 @@ cdef class Receiver:
         metadata_frame (MetadataRecvFrame):
         frame_sync (FrameSync):
         ptz (PTZ): Access to the PTZ methods.
+        stage_timer (StageTimer): Timing for the ``capture``, ``process`` and
+            ``callback`` stages of the receive path.
+            See :meth:`get_stage_timings`
+        history (HistoryBuffer): The :class:`~.history.HistoryBuffer` set by
+            :meth:`set_history` (or ``None``)
+
+            .. versionadded:: 0.0.10
+
+        recorder (Recorder): The :class:`~.recorder.Recorder` set by
+            :meth:`set_recorder` (or ``None``)
+
+            .. versionadded:: 0.0.10
+
+        publisher (SharedFramePublisher): The
+            :class:`~.shared_frames.SharedFramePublisher` set by
+            :meth:`set_publisher` (or ``None``)
+
+            .. versionadded:: 0.0.10
+
     """
     def __cinit__(self, *args, **kwargs):
         self.ptr = NULL
         self.source_ptr = NULL
+        self.history = None
+        self.has_history = False
+        self.recorder = None
+        self.has_recorder = False
+        self.publisher = None
+        self.has_publisher = False
+        self.stage_timer = StageTimer(('capture', 'process', 'callback'))
+        self.trace_source_id = 0
         self.video_stats.frames_total = 0
         self.video_stats.frames_dropped = 0
         self.video_stats.dropped_percent = 0
@@ -146,6 +192,9 @@ cdef class Receiver:
         if source is not None:
             source_name = source.name
         self.source_name = source_name
+        self.trace_source_id = trace_register_source(
+            f'Receiver {recv_name or source_name}'
+        )
         self.settings = RecvCreate(
             source_name, color_format, bandwidth,
             allow_video_fields, recv_name,
@@ -169,8 +218,10 @@ cdef class Receiver:
             raise MemoryError()
         self.frame_sync = FrameSync(self)
         self.ptz = PTZ(self)
+        metrics_register(self, MetricsKind.metrics_receiver, _fill_receiver_metrics)
 
     def __dealloc__(self):
+        metrics_unregister(self)
         self.ptz = None
         self.frame_sync = None
         cdef NDIlib_recv_instance_t p = self.ptr
@@ -187,6 +238,8 @@ cdef class Receiver:
         # if vf is not None:
         #     self.video_ptr = vf.ptr
         self.has_video_frame = vf is not None
+        if vf is not None:
+            vf.trace_source_id = self.trace_source_id
 
     cpdef set_audio_frame(self, AudioRecvFrame af):
         """Set the :attr:`audio_frame`
@@ -197,6 +250,8 @@ cdef class Receiver:
         # if af is not None:
         #     self.audio_ptr = af.ptr
         self.has_audio_frame = af is not None
+        if af is not None:
+            af.trace_source_id = self.trace_source_id
 
     cpdef set_metadata_frame(self, MetadataRecvFrame mf):
         """Set the :attr:`metadata_frame`
@@ -204,6 +259,43 @@ cdef class Receiver:
         self.metadata_frame = mf
         self.has_metadata_frame = mf is not None
 
+    cpdef set_history(self, HistoryBuffer history):
+        """Set the :attr:`history`
+
+        While set, a copy of each video and audio frame received into the
+        :attr:`video_frame` and :attr:`audio_frame` is added to it. Use
+        ``None`` to stop adding frames.
+
+        .. versionadded:: 0.0.10
+        """
+        self.history = history
+        self.has_history = history is not None
+
+    cpdef set_recorder(self, Recorder recorder):
+        """Set the :attr:`recorder`
+
+        While set, each video, audio and metadata frame received into the
+        :attr:`video_frame`, :attr:`audio_frame` and :attr:`metadata_frame`
+        is also passed to it. Use ``None`` to stop recording.
+
+        .. versionadded:: 0.0.10
+        """
+        self.recorder = recorder
+        self.has_recorder = recorder is not None
+
+    cpdef set_publisher(self, SharedFramePublisher publisher):
+        """Set the :attr:`publisher`
+
+        While set, each video, audio and metadata frame received into the
+        :attr:`video_frame`, :attr:`audio_frame` and :attr:`metadata_frame`
+        is also copied into its shared memory. Use ``None`` to stop
+        publishing.
+
+        .. versionadded:: 0.0.10
+        """
+        self.publisher = publisher
+        self.has_publisher = publisher is not None
+
     cpdef set_source(self, Source src):
         """Set the current :attr:`source`
 
@@ -278,13 +370,13 @@ cdef class Receiver:
     cdef int _set_connected(self, bint value) except -1 nogil:
         if value is self._connected:
             return 0
-        with gil:
-            self.connection_lock._acquire(True, -1)
-            try:
-                self._connected = value
-                self.connection_notify._notify_all()
-            finally:
-                self.connection_lock._release()
+        self.connection_lock._acquire(True, -1)
+        try:
+            self._connected = value
+            self.connection_notify._notify_all()
+        finally:
+            self.connection_lock._release()
+        trace_event(TraceEventType.trace_connect, self.trace_source_id, 0, 0, 0, value)
         return 0
 
     cdef bint _wait_for_connect(self, float timeout) except -1 nogil:
@@ -292,14 +384,13 @@ cdef class Receiver:
             return True
         if self._is_connected():
             return True
-        cdef bint r
-        with gil:
-            self.connection_lock._acquire(True, -1)
-            try:
-                self.connection_lock.wait(timeout)
-            finally:
-                self.connection_lock._release()
-        return self._connected
+        self.connection_lock._acquire(True, -1)
+        try:
+            if not self._connected:
+                self.connection_notify._wait(True, timeout)
+        finally:
+            self.connection_lock._release()
+        return self._is_connected()
 
 
     def get_num_connections(self):
@@ -318,6 +409,39 @@ cdef class Receiver:
         }
         return r
 
+    def set_stage_timing_enabled(self, bint enabled):
+        """Enable or disable the :class:`~.timing.StageTimer` of this
+        receiver and its :attr:`video_frame` and :attr:`audio_frame`
+
+        .. versionadded:: 0.0.10
+        """
+        self.stage_timer.enabled = enabled
+        if self.video_frame is not None:
+            self.video_frame.stage_timer.enabled = enabled
+        if self.audio_frame is not None:
+            self.audio_frame.stage_timer.enabled = enabled
+
+    def get_stage_timings(self):
+        """Get a :meth:`~.timing.StageTimer.snapshot` of the stage timings
+        for this receiver and its frames
+
+        Returns:
+            dict: A dict with the snapshots under the ``"receiver"``,
+            ``"video_frame"`` and ``"audio_frame"`` keys (the latter two are
+            ``None`` if no frame is set)
+
+        .. versionadded:: 0.0.10
+        """
+        return {
+            'receiver':self.stage_timer.snapshot(),
+            'video_frame':(
+                self.video_frame.stage_timer.snapshot() if self.video_frame is not None else None
+            ),
+            'audio_frame':(
+                self.audio_frame.stage_timer.snapshot() if self.audio_frame is not None else None
+            ),
+        }
+
     @cython.cdivision(True)
     cdef int _update_performance(self) except -1 nogil:
         NDIlib_recv_get_performance(self.ptr, &(self.perf_total_s), &(self.perf_dropped_s))
@@ -476,9 +600,15 @@ cdef class Receiver:
             else:
                 return ReceiveFrameType.nothing
 
+        cdef StageTimer stage_timer = self.stage_timer
+        cdef int64_t start_ns = stage_timer._start()
         cdef ReceiveFrameType ft = self._do_receive(
             video_ptr, audio_ptr, metadata_ptr, timeout_ms
         )
+        stage_timer._stop(RecvStage.recv_capture, start_ns)
+        if not ft & ReceiveFrameType.recv_all:
+            return ft
+        start_ns = stage_timer._start()
 
         if ft == ReceiveFrameType.recv_video and has_video_frame:
             video_frame._prepare_incoming(self.ptr)
@@ -489,21 +619,38 @@ cdef class Receiver:
 
         if ft == ReceiveFrameType.recv_video:
             if has_video_frame:
+                if self.has_history:
+                    self.history._add_video(video_ptr)
+                if self.has_recorder:
+                    self.recorder._add_video(video_ptr)
+                if self.has_publisher:
+                    self.publisher._add_video(video_ptr)
                 video_frame._process_incoming(self.ptr)
             else:
                 self.free_video(video_ptr)
         elif ft == ReceiveFrameType.recv_audio:
             if has_audio_frame:
+                if self.has_history:
+                    self.history._add_audio(audio_ptr)
+                if self.has_recorder:
+                    self.recorder._add_audio(audio_ptr)
+                if self.has_publisher:
+                    self.publisher._add_audio(audio_ptr)
                 audio_frame._process_incoming(self.ptr)
             else:
                 self.free_audio(audio_ptr)
         elif ft == ReceiveFrameType.recv_metadata:
             if has_metadata_frame:
+                if self.has_recorder:
+                    self.recorder._add_metadata(metadata_ptr)
+                if self.has_publisher:
+                    self.publisher._add_metadata(metadata_ptr)
                 metadata_frame._process_incoming(self.ptr)
                 self._handle_metadata_frame()
             else:
                 self.free_metadata(metadata_ptr)
 
+        stage_timer._stop(RecvStage.recv_process, start_ns)
         return ft
 
     cdef ReceiveFrameType _do_receive(
@@ -869,6 +1016,7 @@ cdef class RecvThreadWorker:
 
     cdef int run(self) except -1:
         cdef ReceiveFrameType ft
+        cdef int64_t start_ns
         self.running = True
         while self.running:
             if self.receiver._is_connected():
@@ -878,7 +1026,9 @@ cdef class RecvThreadWorker:
                     continue
                 if ft & self.recv_frame_type:
                     if self.callback.has_callback:
+                        start_ns = self.receiver.stage_timer._start()
                         self.callback.trigger_callback()
+                        self.receiver.stage_timer._stop(RecvStage.recv_callback, start_ns)
                 if self.wait_time >= 0:
                     self.wait_for_evt(self.wait_time)
             else:
@@ -889,9 +1039,8 @@ cdef class RecvThreadWorker:
         sleep(timeout)
 
     cdef int wait_for_evt(self, double timeout) except -1 nogil:
-        with gil:
-            self.wait_event._wait(True, timeout)
-            self.wait_event._clear()
+        self.wait_event._wait(True, timeout)
+        self.wait_event._clear()
         return 0
 
 
@@ -0,0 +1,377 @@
+"""Warm-standby receivers for fast source switching
+
+Connecting a :class:`~cyndilib.receiver.Receiver` to a new source can take
+hundreds of milliseconds before the first frame arrives. A
+:class:`ReceiverPool` keeps low-bandwidth
+(:attr:`~cyndilib.wrapper.ndi_recv.RecvBandwidth.lowest`) receivers
+connected to a set of candidate sources so that switching to one of them
+can start with frames that are already flowing::
+
+    pool = ReceiverPool(max_connections=8)
+    for source in finder:
+        pool.add_standby(source)
+
+    entry = pool.promote('HOST (Camera 2)')
+    while True:
+        ft = entry.receive(ReceiveFrameType.recv_video, 100)
+        if ft == ReceiveFrameType.recv_video:
+            process(entry.video_frame)
+
+The bandwidth of an |NDI| receiver is fixed when it is created, so
+promoting a source creates an additional
+:attr:`~cyndilib.wrapper.ndi_recv.RecvBandwidth.highest` receiver for it.
+Until that receiver delivers its first frame, :meth:`PoolEntry.receive`
+reads from the standby receiver, so the switch itself takes about one
+frame of the standby stream.
+
+The pool is bounded by a connection budget (each standby and each promoted
+receiver counts as one connection). When it is exceeded, the least
+recently used sources are demoted and then removed.
+
+.. versionadded:: 0.0.10
+"""
+from __future__ import annotations
+
+from typing import Callable, Iterator
+from collections import OrderedDict
+import threading
+
+from .wrapper.ndi_recv import RecvColorFormat, RecvBandwidth
+from .finder import Source, Finder
+from .receiver import Receiver, ReceiveFrameType
+from .video_frame import VideoRecvFrame
+from .audio_frame import AudioRecvFrame
+from .metadata_frame import MetadataRecvFrame
+
+
+__all__ = ('ReceiverPool', 'PoolEntry', 'default_receiver_factory')
+
+
+ReceiverFactory = Callable[[Source|str, RecvColorFormat, RecvBandwidth], Receiver]
+
+MEDIA_FRAME_TYPES = (
+    ReceiveFrameType.recv_video | ReceiveFrameType.recv_audio
+    | ReceiveFrameType.recv_metadata
+)
+
+
+def default_receiver_factory(
+    source: Source|str,
+    color_format: RecvColorFormat,
+    bandwidth: RecvBandwidth,
+) -> Receiver:
+    """The default receiver factory for :class:`ReceiverPool`
+
+    Creates a :class:`~cyndilib.receiver.Receiver` connecting to the source
+    (either a :class:`~cyndilib.finder.Source` or a source name)
+    """
+    if isinstance(source, Source):
+        rx = Receiver(color_format=color_format, bandwidth=bandwidth)
+        rx.set_source(source)
+        return rx
+    return Receiver(source_name=source, color_format=color_format, bandwidth=bandwidth)
+
+
+class PoolEntry:
+    """A source held by a :class:`ReceiverPool`
+
+    Instances are created with :meth:`ReceiverPool.add_standby` and
+    :meth:`ReceiverPool.promote`.
+
+    Attributes:
+        pool (ReceiverPool): The pool this entry belongs to
+        source_name (str): Name of the source
+        standby (Receiver): The low-bandwidth receiver
+        program (Receiver): The high-bandwidth receiver while promoted
+            (or ``None``)
+        receiver (Receiver): The receiver used by the last call to
+            :meth:`receive` that returned a frame (or ``None``)
+    """
+    def __init__(self, pool: ReceiverPool, source: Source|str) -> None:
+        self.pool = pool
+        self.source = source
+        self.source_name = source.name if isinstance(source, Source) else source
+        self.program: Receiver|None = None
+        self.program_ready = False
+        self.receiver: Receiver|None = None
+        self.standby = self._create_receiver(RecvBandwidth.lowest)
+
+    def __repr__(self) -> str:
+        state = 'promoted' if self.is_promoted else 'standby'
+        return f'<PoolEntry "{self.source_name}" ({state})>'
+
+    @property
+    def is_promoted(self) -> bool:
+        """``True`` if the source has a high-bandwidth receiver
+        """
+        return self.program is not None
+
+    @property
+    def is_ready(self) -> bool:
+        """``True`` once the high-bandwidth receiver has delivered a frame
+        (and is being used by :meth:`receive`)
+        """
+        return self.program_ready
+
+    @property
+    def num_connections(self) -> int:
+        """Number of receivers held for the source
+        """
+        return 1 + int(self.program is not None)
+
+    @property
+    def video_frame(self) -> VideoRecvFrame|None:
+        """The :attr:`~cyndilib.receiver.Receiver.video_frame` of the
+        :attr:`receiver`
+        """
+        if self.receiver is None:
+            return None
+        return self.receiver.video_frame
+
+    @property
+    def audio_frame(self) -> AudioRecvFrame|None:
+        """The :attr:`~cyndilib.receiver.Receiver.audio_frame` of the
+        :attr:`receiver`
+        """
+        if self.receiver is None:
+            return None
+        return self.receiver.audio_frame
+
+    @property
+    def metadata_frame(self) -> MetadataRecvFrame|None:
+        """The :attr:`~cyndilib.receiver.Receiver.metadata_frame` of the
+        :attr:`receiver`
+        """
+        if self.receiver is None:
+            return None
+        return self.receiver.metadata_frame
+
+    def receive(self, recv_type: ReceiveFrameType, timeout_ms: int) -> ReceiveFrameType:
+        """Receive frames from the best available receiver
+
+        While promoted, the high-bandwidth receiver is polled first. Until it
+        delivers its first frame, frames are received from the
+        :attr:`standby` receiver instead.
+
+        Arguments:
+            recv_type: The frame types to receive
+            timeout_ms: Time (in milliseconds) to wait for a frame
+
+        Returns:
+            ReceiveFrameType: The type of frame received (the frame is in
+            :attr:`video_frame`, :attr:`audio_frame` or
+            :attr:`metadata_frame`)
+        """
+        program = self.program
+        if program is not None:
+            if self.program_ready:
+                return self._receive_from(program, recv_type, timeout_ms)
+            ft = self._receive_from(program, recv_type, 0)
+            if ft & MEDIA_FRAME_TYPES:
+                self.program_ready = True
+                return ft
+        return self._receive_from(self.standby, recv_type, timeout_ms)
+
+    def _receive_from(
+        self,
+        rx: Receiver,
+        recv_type: ReceiveFrameType,
+        timeout_ms: int,
+    ) -> ReceiveFrameType:
+        ft = rx.receive(recv_type, timeout_ms)
+        if ft & MEDIA_FRAME_TYPES:
+            self.receiver = rx
+        return ft
+
+    def _create_receiver(self, bandwidth: RecvBandwidth) -> Receiver:
+        rx = self.pool.receiver_factory(self.source, self.pool.color_format, bandwidth)
+        if rx.video_frame is None:
+            rx.set_video_frame(VideoRecvFrame())
+        if rx.audio_frame is None:
+            rx.set_audio_frame(AudioRecvFrame())
+        return rx
+
+    def _promote(self) -> None:
+        if self.program is None:
+            self.program_ready = False
+            self.program = self._create_receiver(RecvBandwidth.highest)
+
+    def _demote(self) -> None:
+        program = self.program
+        if program is None:
+            return
+        if self.receiver is program:
+            self.receiver = None
+        self.program = None
+        self.program_ready = False
+        program.disconnect()
+
+    def _close(self) -> None:
+        self._demote()
+        self.receiver = None
+        self.standby.disconnect()
+
+
+class ReceiverPool:
+    """Keeps receivers connected to candidate sources for fast switching
+
+    Arguments:
+        max_connections (int, optional): The connection budget. Each
+            standby and each promoted receiver counts as one connection
+        max_promoted (int, optional): Maximum number of promoted sources.
+            Promoting another demotes the least recently used one
+        color_format (RecvColorFormat, optional): Color format for the
+            receivers
+        receiver_factory (callable, optional): Called with the source (or
+            source name), color format and bandwidth to create each
+            receiver (see :func:`default_receiver_factory`)
+        finder (Finder, optional): If given, source names are looked up
+            with :meth:`Finder.get_source <cyndilib.finder.Finder.get_source>`
+            (names it hasn't discovered yet are used as is)
+
+    Since a promoted source holds two receivers, *max_connections* must be
+    at least twice *max_promoted*.
+
+    Attributes:
+        entries (OrderedDict): The :class:`PoolEntry` of each source (by
+            name), from least to most recently used
+    """
+    def __init__(
+        self,
+        max_connections: int = 8,
+        max_promoted: int = 1,
+        color_format: RecvColorFormat = RecvColorFormat.UYVY_BGRA,
+        receiver_factory: ReceiverFactory = default_receiver_factory,
+        finder: Finder|None = None,
+    ) -> None:
+        if max_promoted < 1:
+            raise ValueError('max_promoted must be positive')
+        if max_connections < 2 * max_promoted:
+            raise ValueError('max_connections must be at least twice max_promoted')
+        self.max_connections = max_connections
+        self.max_promoted = max_promoted
+        self.color_format = color_format
+        self.receiver_factory = receiver_factory
+        self.finder = finder
+        self.entries: OrderedDict[str, PoolEntry] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, source: Source|str) -> bool:
+        return self._get_name(source) in self.entries
+
+    def __iter__(self) -> Iterator[PoolEntry]:
+        return iter(list(self.entries.values()))
+
+    @property
+    def num_connections(self) -> int:
+        """Total number of receivers held by the pool
+        """
+        with self._lock:
+            return sum(entry.num_connections for entry in self.entries.values())
+
+    @property
+    def promoted(self) -> list[PoolEntry]:
+        """The promoted entries, from least to most recently used
+        """
+        with self._lock:
+            return [entry for entry in self.entries.values() if entry.is_promoted]
+
+    def get(self, source: Source|str) -> PoolEntry|None:
+        """Get the :class:`PoolEntry` for a source (or ``None``) without
+        marking it as used
+        """
+        return self.entries.get(self._get_name(source))
+
+    def add_standby(self, source: Source|str) -> PoolEntry:
+        """Connect a low-bandwidth receiver to the source (if not already
+        in the pool) and mark it as the most recently used
+
+        Other sources are removed if needed to stay within the
+        :attr:`max_connections` budget.
+        """
+        with self._lock:
+            entry = self._touch(source)
+            self._enforce_budget(entry)
+            return entry
+
+    def promote(self, source: Source|str) -> PoolEntry:
+        """Switch the source to high bandwidth
+
+        The source is added to the pool if needed. Other sources are
+        demoted or removed (least recently used first) to stay within
+        :attr:`max_promoted` and :attr:`max_connections`.
+
+        Returns:
+            PoolEntry: The entry to receive from
+        """
+        with self._lock:
+            entry = self._touch(source)
+            if not entry.is_promoted:
+                promoted = [e for e in self.promoted if e is not entry]
+                for other in promoted[:len(promoted) - self.max_promoted + 1]:
+                    other._demote()
+                entry._promote()
+            self._enforce_budget(entry)
+            return entry
+
+    def demote(self, source: Source|str) -> None:
+        """Switch the source back to its standby receiver
+        """
+        with self._lock:
+            entry = self.entries.get(self._get_name(source))
+            if entry is not None:
+                entry._demote()
+
+    def remove(self, source: Source|str) -> None:
+        """Disconnect all receivers for the source and remove it
+        """
+        with self._lock:
+            entry = self.entries.pop(self._get_name(source), None)
+            if entry is not None:
+                entry._close()
+
+    def close(self) -> None:
+        """Disconnect and remove all sources
+        """
+        with self._lock:
+            while self.entries:
+                _, entry = self.entries.popitem(last=False)
+                entry._close()
+
+    def _get_name(self, source: Source|str) -> str:
+        if isinstance(source, Source):
+            return source.name
+        return source
+
+    def _touch(self, source: Source|str) -> PoolEntry:
+        name = self._get_name(source)
+        entry = self.entries.get(name)
+        if entry is None:
+            if not name:
+                raise ValueError('source name cannot be empty')
+            if not isinstance(source, Source) and self.finder is not None:
+                # Sources not discovered yet are connected to by name
+                source = self.finder.get_source(name) or name
+            entry = PoolEntry(self, source)
+            self.entries[name] = entry
+        else:
+            self.entries.move_to_end(name)
+        return entry
+
+    def _enforce_budget(self, keep: PoolEntry) -> None:
+        num_connections = self.num_connections
+        for entry in list(self.entries.values()):
+            if num_connections <= self.max_connections:
+                break
+            if entry is keep:
+                continue
+            if entry.is_promoted:
+                entry._demote()
+                num_connections -= 1
+            if num_connections > self.max_connections:
+                del self.entries[entry.source_name]
+                entry._close()
+                num_connections -= 1
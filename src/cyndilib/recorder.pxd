@@ -0,0 +1,110 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from libc.stdint cimport *
+from libc.stdio cimport FILE
+from libcpp.deque cimport deque as cpp_deque
+from libcpp.vector cimport vector
+
+from .wrapper cimport *
+from .locks cimport RLock, Condition
+
+
+cpdef enum RecordMediaType:
+    record_video = 1
+    record_audio = 2
+    record_metadata = 3
+
+
+cdef struct RecordFileHeader_s:
+    char magic[8]
+    uint32_t version
+    uint32_t block_size
+
+
+cdef struct RecordChunkHeader_s:
+    char magic[8]
+    uint32_t num_entries
+    uint32_t max_entries
+    uint64_t payload_offset
+    uint64_t chunk_size
+
+
+cdef struct RecordIndex_s:
+    int64_t timestamp
+    int64_t timecode
+    uint64_t offset
+    uint64_t size
+    uint32_t media_type
+    uint32_t fourcc
+    int32_t xres
+    int32_t yres
+    int32_t line_stride
+    int32_t frame_format
+    int32_t frame_rate_N
+    int32_t frame_rate_D
+    int32_t sample_rate
+    int32_t num_channels
+    int32_t num_samples
+    int32_t reserved
+
+
+cdef enum RecordChunkState:
+    chunk_free = 0
+    chunk_filling = 1
+    chunk_queued = 2
+    chunk_writing = 3
+
+
+cdef struct RecordChunk_s:
+    uint8_t* buffer
+    size_t capacity
+    size_t payload_size
+    RecordChunkState state
+
+
+cdef class Recorder:
+    cdef readonly str filename
+    cdef readonly size_t chunk_size, num_chunks, max_entries
+    cdef readonly double flush_interval
+    cdef readonly size_t num_recorded, num_dropped, bytes_written
+    cdef readonly bint is_open
+    cdef FILE* fp
+    cdef size_t payload_offset
+    cdef vector[RecordChunk_s] chunks
+    cdef Py_ssize_t fill_idx
+    cdef cpp_deque[size_t] queue
+    cdef bint stopping
+    cdef int write_errno
+    cdef Condition cond
+    cdef object thread
+
+    cdef int _allocate_chunks(self) except -1
+    cdef void _free_chunks(self) noexcept
+    cdef RecordIndex_s* _reserve(
+        self, RecordMediaType media_type, int64_t timestamp, int64_t timecode, size_t size
+    ) except? NULL
+    cdef uint8_t* _get_entry_data(self, RecordIndex_s* entry) noexcept nogil
+    cdef int _queue_fill_chunk(self) except -1 nogil
+    cdef int _write_chunk(self, RecordChunk_s* chunk) noexcept nogil
+    cdef int _run_writer(self) except -1
+    cdef int _add_video(self, NDIlib_video_frame_v2_t* p) except -1
+    cdef int _add_audio(self, NDIlib_audio_frame_v3_t* p) except -1
+    cdef int _add_metadata(self, NDIlib_metadata_frame_t* p) except -1
+
+
+cdef class RecordingReader:
+    cdef readonly str filename
+    cdef object _file
+    cdef object _mmap
+    cdef const uint8_t[:] _view
+    cdef const uint8_t* data
+    cdef readonly size_t size
+    cdef readonly object index
+    cdef RecordIndex_s* index_ptr
+    cdef readonly size_t num_entries
+    cdef dict _positions
+
+    cdef RecordIndex_s* _get_entry(self, size_t i) noexcept nogil
+    cdef const uint8_t* _get_data(self, size_t i) noexcept nogil
+    cdef int _read_index(self) except -1
@@ -0,0 +1,58 @@
+from __future__ import annotations
+import enum
+import os
+
+import numpy as np
+import numpy.typing as npt
+
+
+class RecordMediaType(enum.IntEnum):
+    record_video = 1
+    record_audio = 2
+    record_metadata = 3
+
+
+RECORD_INDEX_DTYPE: np.dtype[np.void]
+BLOCK_SIZE: int
+
+
+class Recorder:
+    filename: str
+    chunk_size: int
+    num_chunks: int
+    max_entries: int
+    flush_interval: float
+    num_recorded: int
+    num_dropped: int
+    bytes_written: int
+    is_open: bool
+    def __init__(
+        self,
+        filename: str|os.PathLike,
+        chunk_size: int = ...,
+        num_chunks: int = ...,
+        max_entries: int = ...,
+        flush_interval: float = ...,
+    ) -> None: ...
+    def __enter__(self) -> Recorder: ...
+    def __exit__(self, *args) -> None: ...
+    def open(self) -> None: ...
+    def close(self) -> None: ...
+    def flush(self, timeout: float|None = ...) -> bool: ...
+
+
+class RecordingReader:
+    filename: str
+    index: npt.NDArray[np.void]
+    num_entries: int
+    size: int
+    def __init__(self, filename: str|os.PathLike) -> None: ...
+    def __len__(self) -> int: ...
+    def __enter__(self) -> RecordingReader: ...
+    def __exit__(self, *args) -> None: ...
+    def close(self) -> None: ...
+    def get_positions(self, media_type: RecordMediaType) -> npt.NDArray[np.intp]: ...
+    def find(self, media_type: RecordMediaType, timestamp: int) -> int: ...
+    def read(
+        self, i: int
+    ) -> npt.NDArray[np.uint8]|npt.NDArray[np.float32]|str: ...
@@ -0,0 +1,693 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+Recording of received frames to disk
+
+A :class:`Recorder` attached to a :class:`~.receiver.Receiver` (see
+:meth:`~.receiver.Receiver.set_recorder`) copies each received video, audio
+and metadata frame into memory and a background thread appends them to a
+file. Recordings are read back with :class:`RecordingReader`, which maps the
+file into memory so frame data is accessed without copying::
+
+    with Recorder('camera1.cyndirec') as recorder:
+        receiver.set_recorder(recorder)
+        ...
+
+    with RecordingReader('camera1.cyndirec') as reader:
+        i = reader.find(RecordMediaType.record_video, ts)
+        data = reader.read(i)
+
+
+File Format
+-----------
+
+All values are stored in native byte order. The file starts with a
+:data:`block <BLOCK_SIZE>` containing the ``b'CYNDIREC'`` magic, the format
+version and the block size, followed by any number of chunks.
+
+Each chunk starts with a header (the ``b'CYNDCHNK'`` magic, the number of
+entries, the maximum number of entries, the offset of the payload within the
+chunk and the total size of the chunk) followed by a fixed-width index
+(see :data:`RECORD_INDEX_DTYPE`). Frame data follows at the payload offset.
+Chunks are padded to a multiple of the block size and are written with a
+single call, so a recording cut short contains every chunk but the last.
+
+.. versionadded:: 0.0.10
+
+"""
+
+cimport cython
+from libc.errno cimport errno
+from libc.stdlib cimport malloc, calloc, realloc, free
+from libc.string cimport memcpy, memset, memcmp, strlen, strerror
+from libc.stdio cimport fopen, fclose, fwrite, setvbuf, _IONBF
+cimport numpy as cnp
+
+import os
+import mmap
+import threading
+
+import numpy as np
+
+from .clock cimport time
+
+__all__ = (
+    'RecordMediaType', 'RECORD_INDEX_DTYPE', 'BLOCK_SIZE', 'Recorder',
+    'RecordingReader',
+)
+
+
+RECORD_INDEX_DTYPE = np.dtype([
+    ('timestamp', np.int64),
+    ('timecode', np.int64),
+    ('offset', np.uint64),
+    ('size', np.uint64),
+    ('media_type', np.uint32),
+    ('fourcc', np.uint32),
+    ('xres', np.int32),
+    ('yres', np.int32),
+    ('line_stride', np.int32),
+    ('frame_format', np.int32),
+    ('frame_rate_N', np.int32),
+    ('frame_rate_D', np.int32),
+    ('sample_rate', np.int32),
+    ('num_channels', np.int32),
+    ('num_samples', np.int32),
+    ('reserved', np.int32),
+], align=True)
+
+if RECORD_INDEX_DTYPE.itemsize != sizeof(RecordIndex_s):
+    raise RuntimeError('RECORD_INDEX_DTYPE does not match RecordIndex_s')
+
+cdef uint32_t FORMAT_VERSION = 1
+cdef size_t _BLOCK_SIZE = 4096
+cdef size_t PAYLOAD_ALIGN = 64
+cdef const char* FILE_MAGIC = b'CYNDIREC'
+cdef const char* CHUNK_MAGIC = b'CYNDCHNK'
+
+BLOCK_SIZE = _BLOCK_SIZE
+
+
+@cython.cdivision(True)
+cdef inline size_t _align(size_t value, size_t alignment) noexcept nogil:
+    return (value + alignment - 1) // alignment * alignment
+
+
+cdef class Recorder:
+    """Writes received frames to a file in a background thread
+
+    Incoming frames are copied into one of several in-memory chunks. Once
+    a chunk is full (or :attr:`flush_interval` has passed) it is handed to
+    the writer thread and the next free chunk is used. If the writer falls
+    behind and no chunk is free, frames are dropped rather than blocking
+    the receive thread.
+
+    Arguments:
+        filename (str): The file to write. It is created or truncated when
+            the recorder is opened
+        chunk_size (int, optional): Size of the frame data held in each chunk.
+            Chunks grow to fit a single frame if needed.
+            Defaults to 16 MiB
+        num_chunks (int, optional): Number of chunks. Defaults to ``4``
+        max_entries (int, optional): Maximum number of frames per chunk.
+            Defaults to ``256``
+        flush_interval (float, optional): Maximum number of seconds frames
+            are held before being written. Defaults to ``1``
+
+    This class supports use as a :term:`context manager`, calling
+    :meth:`open` and :meth:`close`.
+
+    Attributes:
+        num_recorded (int): Number of frames recorded
+        num_dropped (int): Number of frames dropped because no chunk was
+            available or a write failed
+        bytes_written (int): Number of bytes written to the file
+        is_open (bool): ``True`` between calls to :meth:`open` and
+            :meth:`close`
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.fp = NULL
+        self.fill_idx = -1
+        self.is_open = False
+        self.stopping = False
+        self.write_errno = 0
+        self.num_recorded = 0
+        self.num_dropped = 0
+        self.bytes_written = 0
+
+    def __init__(
+        self,
+        object filename,
+        size_t chunk_size=16*1024*1024,
+        size_t num_chunks=4,
+        size_t max_entries=256,
+        double flush_interval=1,
+    ):
+        if chunk_size == 0 or num_chunks == 0 or max_entries == 0:
+            raise ValueError('chunk_size, num_chunks and max_entries must be positive')
+        self.filename = os.fspath(filename)
+        self.chunk_size = chunk_size
+        self.num_chunks = num_chunks
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+        self.payload_offset = _align(
+            sizeof(RecordChunkHeader_s) + max_entries * sizeof(RecordIndex_s),
+            _BLOCK_SIZE,
+        )
+        self.cond = Condition()
+
+    def __dealloc__(self):
+        if self.fp is not NULL:
+            fclose(self.fp)
+            self.fp = NULL
+        self._free_chunks()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def open(self):
+        """Create the file and start the writer thread
+        """
+        cdef bytes path = os.fsencode(self.filename)
+        cdef RecordFileHeader_s* header
+        cdef uint8_t* block
+        cdef size_t n
+        if self.is_open:
+            return
+        self.fp = fopen(path, b'wb')
+        if self.fp is NULL:
+            raise OSError(errno, strerror(errno).decode(), self.filename)
+        setvbuf(self.fp, NULL, _IONBF, 0)
+
+        block = <uint8_t*>calloc(_BLOCK_SIZE, 1)
+        if block is NULL:
+            raise MemoryError()
+        header = <RecordFileHeader_s*>block
+        memcpy(header.magic, FILE_MAGIC, 8)
+        header.version = FORMAT_VERSION
+        header.block_size = _BLOCK_SIZE
+        n = fwrite(block, 1, _BLOCK_SIZE, self.fp)
+        free(block)
+        if n != _BLOCK_SIZE:
+            fclose(self.fp)
+            self.fp = NULL
+            raise OSError(errno, strerror(errno).decode(), self.filename)
+
+        self._allocate_chunks()
+        self.num_recorded = 0
+        self.num_dropped = 0
+        self.bytes_written = _BLOCK_SIZE
+        self.write_errno = 0
+        self.stopping = False
+        self.is_open = True
+        self.thread = threading.Thread(target=self._writer_thread, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        """Write any remaining frames, stop the writer thread and close
+        the file
+
+        Raises:
+            OSError: If writing to the file failed
+        """
+        cdef int err
+        if not self.is_open:
+            return
+        self.cond._acquire(True, -1)
+        try:
+            self.is_open = False
+            self.stopping = True
+            self.cond._notify_all()
+        finally:
+            self.cond._release()
+        self.thread.join()
+        self.thread = None
+        fclose(self.fp)
+        self.fp = NULL
+        self._free_chunks()
+        err = self.write_errno
+        if err != 0:
+            raise OSError(err, strerror(err).decode(), self.filename)
+
+    def flush(self, timeout=None):
+        """Wait for all frames recorded so far to be written
+
+        Arguments:
+            timeout (float, optional): Maximum number of seconds to wait
+
+        Returns:
+            bool: ``False`` if the timeout was reached
+        """
+        cdef double end_time = -1, wait_time = -1
+        cdef size_t i
+        cdef bint idle
+        if timeout is not None:
+            wait_time = timeout
+            end_time = time() + wait_time
+        self.cond._acquire(True, -1)
+        try:
+            if self.fill_idx >= 0:
+                self._queue_fill_chunk()
+            while True:
+                idle = True
+                for i in range(self.chunks.size()):
+                    if (self.chunks[i].state == RecordChunkState.chunk_queued or
+                            self.chunks[i].state == RecordChunkState.chunk_writing):
+                        idle = False
+                        break
+                if idle:
+                    return True
+                if end_time >= 0:
+                    wait_time = end_time - time()
+                    if wait_time <= 0:
+                        return False
+                self.cond._wait(True, wait_time)
+        finally:
+            self.cond._release()
+
+    def _writer_thread(self):
+        self._run_writer()
+
+    cdef int _allocate_chunks(self) except -1:
+        cdef RecordChunk_s chunk
+        cdef size_t i
+        self._free_chunks()
+        chunk.capacity = _align(self.payload_offset + self.chunk_size, _BLOCK_SIZE)
+        chunk.payload_size = 0
+        chunk.state = RecordChunkState.chunk_free
+        for i in range(self.num_chunks):
+            chunk.buffer = <uint8_t*>malloc(chunk.capacity)
+            if chunk.buffer is NULL:
+                raise MemoryError()
+            self.chunks.push_back(chunk)
+        self.fill_idx = -1
+        self.queue.clear()
+        return 0
+
+    cdef void _free_chunks(self) noexcept:
+        cdef size_t i
+        for i in range(self.chunks.size()):
+            free(self.chunks[i].buffer)
+        self.chunks.clear()
+        self.queue.clear()
+        self.fill_idx = -1
+
+    cdef RecordIndex_s* _reserve(
+        self, RecordMediaType media_type, int64_t timestamp, int64_t timecode, size_t size
+    ) except? NULL:
+        # Must be called with the lock held. Returns the index entry for the
+        # frame in the current chunk (or NULL if it must be dropped)
+        cdef RecordChunk_s* chunk
+        cdef RecordChunkHeader_s* header
+        cdef RecordIndex_s* entry
+        cdef uint8_t* buffer
+        cdef size_t i, required
+        if self.write_errno != 0:
+            self.num_dropped += 1
+            return NULL
+        if self.fill_idx >= 0:
+            chunk = &self.chunks[self.fill_idx]
+            header = <RecordChunkHeader_s*>chunk.buffer
+            required = self.payload_offset + chunk.payload_size + size
+            if header.num_entries >= self.max_entries or required > chunk.capacity:
+                self._queue_fill_chunk()
+        if self.fill_idx < 0:
+            for i in range(self.chunks.size()):
+                if self.chunks[i].state == RecordChunkState.chunk_free:
+                    self.fill_idx = i
+                    break
+            if self.fill_idx < 0:
+                self.num_dropped += 1
+                return NULL
+            chunk = &self.chunks[self.fill_idx]
+            chunk.state = RecordChunkState.chunk_filling
+            chunk.payload_size = 0
+            (<RecordChunkHeader_s*>chunk.buffer).num_entries = 0
+
+        chunk = &self.chunks[self.fill_idx]
+        required = _align(self.payload_offset + chunk.payload_size + size, _BLOCK_SIZE)
+        if required > chunk.capacity:
+            # Only reached for an empty chunk and a frame larger than chunk_size
+            buffer = <uint8_t*>realloc(chunk.buffer, required)
+            if buffer is NULL:
+                raise MemoryError()
+            chunk.buffer = buffer
+            chunk.capacity = required
+        header = <RecordChunkHeader_s*>chunk.buffer
+        entry = <RecordIndex_s*>(chunk.buffer + sizeof(RecordChunkHeader_s)) + header.num_entries
+        header.num_entries += 1
+        memset(entry, 0, sizeof(RecordIndex_s))
+        entry.timestamp = timestamp
+        entry.timecode = timecode
+        entry.offset = chunk.payload_size
+        entry.size = size
+        entry.media_type = media_type
+        chunk.payload_size = _align(chunk.payload_size + size, PAYLOAD_ALIGN)
+        self.num_recorded += 1
+        return entry
+
+    cdef uint8_t* _get_entry_data(self, RecordIndex_s* entry) noexcept nogil:
+        # Location for the data of an entry returned by _reserve (the offset
+        # is relative to the payload until the chunk is written)
+        return self.chunks[self.fill_idx].buffer + self.payload_offset + entry.offset
+
+    cdef int _queue_fill_chunk(self) except -1 nogil:
+        cdef RecordChunk_s* chunk = &self.chunks[self.fill_idx]
+        chunk.state = RecordChunkState.chunk_queued
+        self.queue.push_back(self.fill_idx)
+        self.fill_idx = -1
+        self.cond._notify_all()
+        return 0
+
+    cdef int _write_chunk(self, RecordChunk_s* chunk) noexcept nogil:
+        # Returns zero on success or the error number
+        cdef RecordChunkHeader_s* header = <RecordChunkHeader_s*>chunk.buffer
+        cdef RecordIndex_s* index = <RecordIndex_s*>(chunk.buffer + sizeof(RecordChunkHeader_s))
+        cdef size_t payload_end = self.payload_offset + chunk.payload_size
+        cdef size_t chunk_size = _align(payload_end, _BLOCK_SIZE)
+        cdef uint64_t base = self.bytes_written + self.payload_offset
+        cdef uint32_t i
+
+        memcpy(header.magic, CHUNK_MAGIC, 8)
+        header.max_entries = self.max_entries
+        header.payload_offset = self.payload_offset
+        header.chunk_size = chunk_size
+        for i in range(header.num_entries):
+            index[i].offset += base
+        memset(
+            &index[header.num_entries], 0,
+            (self.max_entries - header.num_entries) * sizeof(RecordIndex_s),
+        )
+        memset(chunk.buffer + payload_end, 0, chunk_size - payload_end)
+        if fwrite(chunk.buffer, 1, chunk_size, self.fp) != chunk_size:
+            return errno if errno != 0 else -1
+        return 0
+
+    cdef int _run_writer(self) except -1:
+        cdef Condition cond = self.cond
+        cdef RecordChunk_s* chunk
+        cdef size_t idx, chunk_size
+        cdef double timeout = self.flush_interval if self.flush_interval > 0 else -1
+        cdef int err
+
+        while True:
+            cond._acquire(True, -1)
+            try:
+                while self.queue.empty():
+                    if self.fill_idx >= 0 and self.stopping:
+                        self._queue_fill_chunk()
+                        break
+                    if self.stopping:
+                        return 0
+                    if not cond._wait(True, timeout) and self.fill_idx >= 0:
+                        self._queue_fill_chunk()
+                idx = self.queue.front()
+                self.queue.pop_front()
+                chunk = &self.chunks[idx]
+                chunk.state = RecordChunkState.chunk_writing
+                err = self.write_errno
+            finally:
+                cond._release()
+
+            chunk_size = _align(self.payload_offset + chunk.payload_size, _BLOCK_SIZE)
+            if err == 0:
+                with nogil:
+                    err = self._write_chunk(chunk)
+
+            cond._acquire(True, -1)
+            try:
+                if err == 0:
+                    self.bytes_written += chunk_size
+                elif self.write_errno == 0:
+                    self.write_errno = err
+                    self.num_dropped += (<RecordChunkHeader_s*>chunk.buffer).num_entries
+                chunk.state = RecordChunkState.chunk_free
+                cond._notify_all()
+            finally:
+                cond._release()
+
+    cdef int _add_video(self, NDIlib_video_frame_v2_t* p) except -1:
+        cdef FourCCPackInfo pack_info
+        cdef RecordIndex_s* entry
+        cdef int64_t timestamp = p.timestamp
+
+        if p.p_data is NULL or p.xres <= 0 or p.yres <= 0:
+            return 0
+        if timestamp == NDIlib_recv_timestamp_undefined:
+            timestamp = p.timecode
+        fourcc_pack_info_init(&pack_info)
+        pack_info.fourcc = fourcc_type_uncast(p.FourCC)
+        pack_info.xres = p.xres
+        pack_info.yres = p.yres
+        calc_fourcc_pack_info(&pack_info, p.line_stride_in_bytes)
+
+        self.cond._acquire(True, -1)
+        try:
+            if not self.is_open:
+                return 0
+            entry = self._reserve(
+                RecordMediaType.record_video, timestamp, p.timecode, pack_info.total_size,
+            )
+            if entry is NULL:
+                return 0
+            entry.fourcc = <uint32_t>pack_info.fourcc
+            entry.xres = p.xres
+            entry.yres = p.yres
+            entry.line_stride = pack_info.line_strides[0]
+            entry.frame_format = frame_format_uncast(p.frame_format_type)
+            entry.frame_rate_N = p.frame_rate_N
+            entry.frame_rate_D = p.frame_rate_D
+            with nogil:
+                memcpy(self._get_entry_data(entry), p.p_data, pack_info.total_size)
+        finally:
+            self.cond._release()
+        return 0
+
+    cdef int _add_audio(self, NDIlib_audio_frame_v3_t* p) except -1:
+        cdef RecordIndex_s* entry
+        cdef int64_t timestamp = p.timestamp
+        cdef size_t channel_size, i
+        cdef uint8_t* dest
+
+        if p.p_data is NULL or p.no_channels <= 0 or p.no_samples <= 0:
+            return 0
+        if timestamp == NDIlib_recv_timestamp_undefined:
+            timestamp = p.timecode
+        channel_size = p.no_samples * sizeof(float)
+
+        self.cond._acquire(True, -1)
+        try:
+            if not self.is_open:
+                return 0
+            entry = self._reserve(
+                RecordMediaType.record_audio, timestamp, p.timecode,
+                channel_size * p.no_channels,
+            )
+            if entry is NULL:
+                return 0
+            entry.sample_rate = p.sample_rate
+            entry.num_channels = p.no_channels
+            entry.num_samples = p.no_samples
+            dest = self._get_entry_data(entry)
+            with nogil:
+                for i in range(<size_t>p.no_channels):
+                    memcpy(
+                        dest + i * channel_size,
+                        p.p_data + i * p.channel_stride_in_bytes,
+                        channel_size,
+                    )
+        finally:
+            self.cond._release()
+        return 0
+
+    cdef int _add_metadata(self, NDIlib_metadata_frame_t* p) except -1:
+        cdef RecordIndex_s* entry
+        cdef size_t size
+
+        if p.p_data is NULL:
+            return 0
+        # The length includes the null terminator, which is not stored
+        if p.length > 0:
+            size = p.length - 1
+        else:
+            size = strlen(p.p_data)
+        if size == 0:
+            return 0
+
+        self.cond._acquire(True, -1)
+        try:
+            if not self.is_open:
+                return 0
+            entry = self._reserve(
+                RecordMediaType.record_metadata, p.timecode, p.timecode, size,
+            )
+            if entry is NULL:
+                return 0
+            memcpy(self._get_entry_data(entry), p.p_data, size)
+        finally:
+            self.cond._release()
+        return 0
+
+
+cdef class RecordingReader:
+    """Reads a file written by a :class:`Recorder`
+
+    The file is mapped into memory. Arrays returned by :meth:`read` are views
+    of the mapped data and remain valid after :meth:`close` is called.
+
+    Arguments:
+        filename (str): The file to read
+
+    This class supports use as a :term:`context manager`.
+
+    Attributes:
+        index (numpy.ndarray): All entries of the recording in the order they
+            were recorded, as a structured array of :data:`RECORD_INDEX_DTYPE`
+        num_entries (int): Number of entries in the recording
+        size (int): Size of the file in bytes
+
+    Raises:
+        ValueError: If the file is not a recording
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.data = NULL
+        self.index_ptr = NULL
+        self.num_entries = 0
+        self.size = 0
+
+    def __init__(self, object filename):
+        self.filename = os.fspath(filename)
+        self._file = open(self.filename, 'rb')
+        try:
+            if os.fstat(self._file.fileno()).st_size == 0:
+                raise ValueError(f'{self.filename} is not a recording')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = self._mmap
+            self.data = &self._view[0]
+            self.size = self._view.shape[0]
+            self._read_index()
+        except:
+            self.close()
+            raise
+
+    def __len__(self):
+        return self.num_entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Release the mapping and close the file
+        """
+        self.data = NULL
+        self._view = None
+        self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    cdef int _read_index(self) except -1:
+        cdef const RecordFileHeader_s* header = <const RecordFileHeader_s*>self.data
+        cdef const RecordChunkHeader_s* chunk
+        cdef size_t pos
+        cdef list arrays = []
+        cdef cnp.ndarray index
+
+        if (self.size < sizeof(RecordFileHeader_s) or
+                memcmp(header.magic, FILE_MAGIC, 8) != 0):
+            raise ValueError(f'{self.filename} is not a recording')
+        if header.version != FORMAT_VERSION:
+            raise ValueError(f'Unsupported recording version: {header.version}')
+
+        # Stop at the first incomplete chunk
+        pos = header.block_size
+        while pos + sizeof(RecordChunkHeader_s) <= self.size:
+            chunk = <const RecordChunkHeader_s*>(self.data + pos)
+            if memcmp(chunk.magic, CHUNK_MAGIC, 8) != 0:
+                break
+            if chunk.chunk_size == 0 or pos + chunk.chunk_size > self.size:
+                break
+            arrays.append(np.frombuffer(
+                self._mmap, dtype=RECORD_INDEX_DTYPE, count=chunk.num_entries,
+                offset=pos + sizeof(RecordChunkHeader_s),
+            ))
+            pos += chunk.chunk_size
+
+        if len(arrays):
+            index = np.concatenate(arrays)
+        else:
+            index = np.zeros(0, dtype=RECORD_INDEX_DTYPE)
+        self.index = index
+        self.index_ptr = <RecordIndex_s*>cnp.PyArray_DATA(index)
+        self.num_entries = index.shape[0]
+        self._positions = {}
+        return 0
+
+    cdef RecordIndex_s* _get_entry(self, size_t i) noexcept nogil:
+        return &self.index_ptr[i]
+
+    cdef const uint8_t* _get_data(self, size_t i) noexcept nogil:
+        return self.data + self.index_ptr[i].offset
+
+    def get_positions(self, RecordMediaType media_type):
+        """Get the positions in :attr:`index` of all entries of the given
+        :class:`RecordMediaType`
+        """
+        cdef object result = self._positions.get(media_type)
+        if result is None:
+            result = np.flatnonzero(self.index['media_type'] == media_type)
+            self._positions[media_type] = result
+        return result
+
+    def find(self, RecordMediaType media_type, int64_t timestamp):
+        """Find the entry of the given :class:`RecordMediaType` that was current
+        at the given timestamp
+
+        Timestamps of each media type are assumed to increase throughout the
+        recording.
+
+        Returns:
+            int: Position in :attr:`index` of the newest entry with a timestamp
+            at or before *timestamp*, or ``-1`` if there is none
+        """
+        positions = self.get_positions(media_type)
+        timestamps = self.index['timestamp'][positions]
+        i = np.searchsorted(timestamps, timestamp, side='right') - 1
+        if i < 0:
+            return -1
+        return int(positions[i])
+
+    def read(self, Py_ssize_t i):
+        """Read the data of an entry
+
+        Returns:
+            The data as a 1-d array of unsigned 8-bit integers for video
+            frames, a 2-d array of 32-bit floats with shape
+            ``(num_channels, num_samples)`` for audio frames or a :class:`str`
+            for metadata frames. Arrays are read-only views of the file
+        """
+        cdef RecordIndex_s* entry
+        if self.data is NULL:
+            raise ValueError('Reader is closed')
+        if i < 0:
+            i += self.num_entries
+        if i < 0 or <size_t>i >= self.num_entries:
+            raise IndexError('entry index out of range')
+        entry = self._get_entry(i)
+        if entry.media_type == RecordMediaType.record_video:
+            return np.frombuffer(
+                self._mmap, dtype=np.uint8, count=entry.size, offset=entry.offset,
+            )
+        elif entry.media_type == RecordMediaType.record_audio:
+            return np.frombuffer(
+                self._mmap, dtype=np.float32,
+                count=entry.num_channels * entry.num_samples, offset=entry.offset,
+            ).reshape((entry.num_channels, entry.num_samples))
+        return (<const char*>self._get_data(i))[:entry.size].decode('UTF-8')
@@ -1,6 +1,8 @@
 # cython: language_level=3
 # distutils: language = c++
 
+from libc.stdint cimport int64_t, uint64_t
+
 from .wrapper cimport *
 
 cdef extern from *:
@@ -20,6 +22,8 @@ cdef struct SendFrame_item_s:
     size_t alloc_size
     bint write_available
     bint read_available
+    int64_t ready_ns
+    uint64_t frame_id
     Py_ssize_t[3] shape
     Py_ssize_t[3] strides
 
@@ -20,6 +20,8 @@ cdef int frame_status_item_init(SendFrame_item_s_ft* ptr) except -1 nogil:
     ptr.data.alloc_size = 0
     ptr.data.write_available = True
     ptr.data.read_available = False
+    ptr.data.ready_ns = 0
+    ptr.data.frame_id = 0
     cdef size_t i
     for i in range(3):
         ptr.data.shape[i] = 0
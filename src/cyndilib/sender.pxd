@@ -7,12 +7,18 @@ cimport numpy as cnp
 from .wrapper cimport *
 from .finder cimport Source
 from .send_frame_status cimport (
-    VideoSendFrame_status_s, VideoSendFrame_item_s,
+    SendFrame_item_s, VideoSendFrame_status_s, VideoSendFrame_item_s,
     AudioSendFrame_status_s, AudioSendFrame_item_s,
 )
 from .video_frame cimport VideoSendFrame
 from .audio_frame cimport AudioSendFrame
 from .metadata_frame cimport MetadataSendFrame
+from .pacing cimport PacingClock
+from .timing cimport StageTimer, SendStage
+from .tracing cimport (
+    TraceEventType, trace_begin, trace_event, trace_register_source,
+)
+from .metrics cimport MetricsKind, MetricsRow_s, metrics_register, metrics_unregister
 
 
 cdef class Sender:
@@ -22,6 +28,10 @@ cdef class Sender:
     cdef readonly Source source
     cdef readonly str ndi_name, ndi_groups
     cdef readonly bint clock_video, clock_audio
+    cdef readonly bint pace_video
+    cdef readonly PacingClock video_clock
+    cdef readonly StageTimer stage_timer
+    cdef uint32_t trace_source_id
     cdef bytes _b_ndi_name, _b_ndi_groups
     cdef readonly VideoSendFrame video_frame
     cdef readonly AudioSendFrame audio_frame
@@ -29,6 +39,10 @@ cdef class Sender:
     cdef readonly bint has_video_frame, has_audio_frame
     cdef readonly bint _running
     cdef VideoSendFrame_item_s* last_async_sender
+    cdef int64_t audio_stream_timecode
+    cdef int64_t audio_stream_position
+    cdef bint audio_stream_started
+    cdef readonly uint64_t num_video_sent, num_audio_sent, num_metadata_sent
 
     cdef int _open(self) except -1
     cdef int _close(self) except -1
@@ -36,8 +50,19 @@ cdef class Sender:
     cpdef set_audio_frame(self, AudioSendFrame af)
     cdef bint _check_running(self) except -1 nogil
     cdef bint _check_running_noexcept(self) noexcept nogil
+    cdef void _ndi_send_video(self, NDIlib_video_frame_v2_t* p) noexcept nogil
+    cdef void _ndi_send_video_async(self, NDIlib_video_frame_v2_t* p) noexcept nogil
+    cdef void _ndi_send_audio(self, NDIlib_audio_frame_v3_t* p) noexcept nogil
+    cdef void _ndi_send_metadata(self, NDIlib_metadata_frame_t* p) noexcept nogil
     cdef void _set_async_video_sender(self, VideoSendFrame_item_s* item) noexcept nogil
     cdef void _clear_async_video_status(self) noexcept nogil
+    cdef void _pace_video_frame(self, NDIlib_video_frame_v2_t* p) noexcept nogil
+    cdef void _trace_send(
+        self,
+        SendFrame_item_s* item,
+        int64_t timecode,
+        int64_t trace_start,
+    ) noexcept nogil
     cdef bint _write_video_and_audio(
         self,
         cnp.uint8_t[:] video_data,
@@ -47,9 +72,20 @@ cdef class Sender:
     cdef bint _write_video_async(self, cnp.uint8_t[:] data) except -1
     cdef bint _send_video(self) noexcept nogil
     cdef bint _send_video_async(self) noexcept nogil
+    cdef bint _send_video_frame(self, NDIlib_video_frame_v2_t* p, bint is_async) noexcept nogil
+    cdef void _flush_video(self) noexcept nogil
     cdef bint _write_audio(self, cnp.float32_t[:,:] data) except -1
     cdef bint _send_audio(self) noexcept nogil
+    cdef bint _send_audio_frame(self, NDIlib_audio_frame_v3_t* p) noexcept nogil
+    cdef size_t _write_audio_stream(
+        self,
+        cnp.float32_t[:,:] data,
+        size_t frame_size,
+        bint flush,
+    ) except? -1
+    cdef int64_t _get_audio_stream_timecode(self, int sample_rate) noexcept nogil
     cdef bint _send_metadata(self, str tag, dict attrs) except -1
     cdef bint _send_metadata_frame(self, MetadataSendFrame mf) except -1
+    cdef bint _send_metadata_struct(self, NDIlib_metadata_frame_t* p) noexcept nogil
     cdef int _get_num_connections(self, uint32_t timeout_ms) except? -1 nogil
     cdef bint _update_tally(self, uint32_t timeout_ms) except -1 nogil
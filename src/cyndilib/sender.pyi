@@ -1,4 +1,5 @@
 # import _cython_3_0_10
+from typing import Any
 from typing_extensions import Self
 from _typeshed import ReadableBuffer
 
@@ -9,6 +10,8 @@ from cyndilib.finder import Source
 from cyndilib.audio_frame import AudioSendFrame
 from cyndilib.video_frame import VideoSendFrame
 from cyndilib.metadata_frame import MetadataSendFrame
+from cyndilib.pacing import PacingClock
+from cyndilib.timing import StageTimer
 
 _UintArray = npt.NDArray[np.uint8]
 _FloatArray = npt.NDArray[np.float32]
@@ -24,14 +27,21 @@ class Sender:
     _running: bool
     ndi_groups: str
     ndi_name: str
+    pace_video: bool
     source: Source|None
     video_frame: VideoSendFrame|None
+    video_clock: PacingClock
+    stage_timer: StageTimer
+    num_video_sent: int
+    num_audio_sent: int
+    num_metadata_sent: int
     def __init__(
         self,
         ndi_name: str,
         ndi_groups: str = ...,
         clock_video: bool = ...,
         clock_audio: bool = ...,
+        pace_video: bool = ...,
     ) -> None: ...
     @property
     def has_any_frame(self) -> bool: ...
@@ -43,6 +53,8 @@ class Sender:
     def program_tally(self) -> bool: ...
     def close(self) -> None: ...
     def get_num_connections(self, timeout: float) -> int: ...
+    def set_stage_timing_enabled(self, enabled: bool) -> None: ...
+    def get_stage_timings(self) -> dict[str, dict[str, Any]|None]: ...
     def open(self) -> None: ...
     def send_audio(self) -> bool: ...
     def send_metadata(self, tag: str, attrs: dict) -> bool: ...
@@ -53,6 +65,13 @@ class Sender:
     def set_video_frame(self, vf: VideoSendFrame) -> None: ...
     def update_tally(self, timeout: float) -> bool: ...
     def write_audio(self, data: ReadableBuffer|_FloatArray) -> bool: ...
+    def write_audio_stream(
+        self,
+        data: ReadableBuffer|_FloatArray,
+        frame_size: int = ...,
+        timecode: int|None = ...,
+        flush: bool = ...,
+    ) -> int: ...
     def write_video(self, data: ReadableBuffer|_UintArray) -> bool: ...
     def write_video_and_audio(self, video_data: ReadableBuffer|_UintArray, audio_data: ReadableBuffer|_FloatArray) -> bool: ...
     def write_video_async(self, data: ReadableBuffer|_UintArray) -> bool: ...
@@ -3,10 +3,27 @@
 
 from libc.math cimport lround
 
+from .clock cimport realtime_ns
+
 
 __all__ = ('Sender',)
 
 
+cdef int _fill_sender_metrics(object obj, MetricsRow_s* row) except -1:
+    cdef Sender sender = obj
+    cdef NDIlib_tally_t tally
+    row.video_frames = sender.num_video_sent
+    row.audio_frames = sender.num_audio_sent
+    row.metadata_frames = sender.num_metadata_sent
+    if not sender._running:
+        return 0
+    row.connections = sender._get_num_connections(0)
+    NDIlib_send_get_tally(sender.ptr, &tally, 0)
+    row.tally_program = tally.on_program
+    row.tally_preview = tally.on_preview
+    return 0
+
+
 cdef class Sender:
     """Sends video and audio streams
 
@@ -23,10 +40,37 @@ cdef class Sender:
         clock_audio (bool): True if the audio frames should clock themselves.
             If False, no rate limiting will be applied to keep within the
             desired frame rate
+        pace_video (bool): If True, each video frame is held until its
+            deadline on :attr:`video_clock` and stamped with the matching
+            |NDI| timecode. This is meant to be used with :attr:`clock_video`
+            set to False (when the application paces frames itself).
+            Default is False
+
+            .. versionadded:: 0.0.10
+
+        video_clock (PacingClock): The :class:`~.pacing.PacingClock` used when
+            :attr:`pace_video` is enabled. Its frame rate is taken from the
+            :attr:`video_frame` when the sender is opened
+
+            .. versionadded:: 0.0.10
+
+        stage_timer (StageTimer): Timing for the ``pace``, ``write``,
+            ``send_video`` and ``send_audio`` stages.
+            See :meth:`get_stage_timings`
+
+            .. versionadded:: 0.0.10
+
+        num_video_sent (int): Number of video frames sent
+        num_audio_sent (int): Number of audio frames sent
+        num_metadata_sent (int): Number of metadata frames sent
+
+            .. versionadded:: 0.0.10
 
     """
     def __cinit__(self, *args, **kwargs):
         self.ptr = NULL
+        self.stage_timer = StageTimer(('pace', 'write', 'send_video', 'send_audio'))
+        self.trace_source_id = 0
         self.source_ptr = NULL
         self.has_video_frame = False
         self.has_audio_frame = False
@@ -35,6 +79,12 @@ cdef class Sender:
         self.audio_frame = None
         # self.metadata_frame = None
         self.last_async_sender = NULL
+        self.audio_stream_timecode = 0
+        self.audio_stream_position = 0
+        self.audio_stream_started = False
+        self.num_video_sent = 0
+        self.num_audio_sent = 0
+        self.num_metadata_sent = 0
 
     def __init__(
         self,
@@ -42,6 +92,7 @@ cdef class Sender:
         str ndi_groups='',
         bint clock_video=True,
         bint clock_audio=True,
+        bint pace_video=False,
     ):
         self.ndi_name = ndi_name
         self.ndi_groups = ndi_groups
@@ -49,14 +100,19 @@ cdef class Sender:
         self._b_ndi_groups = ndi_groups.encode()
         self.clock_video = clock_video
         self.clock_audio = clock_audio
+        self.pace_video = pace_video
+        self.video_clock = PacingClock()
+        self.trace_source_id = trace_register_source(f'Sender {ndi_name}')
         self.metadata_frame = MetadataSendFrame('')
         self.source = None
         send_t_initialize(&(self.send_create), self._b_ndi_name, NULL)
         if len(self._b_ndi_groups):
             self.send_create.ndi_groups = self._b_ndi_groups
+        metrics_register(self, MetricsKind.metrics_sender, _fill_sender_metrics)
 
 
     def __dealloc__(self):
+        metrics_unregister(self)
         cdef NDIlib_send_instance_t ptr = self.ptr
         self.ptr = NULL
         if ptr is not NULL:
@@ -117,13 +173,19 @@ cdef class Sender:
         if not self.has_video_frame and not self.has_audio_frame:
             raise_exception('Cannot start sender. No frame objects')
         self._running = True
+        self.audio_stream_started = False
         cdef NDIlib_send_instance_t ptr
         cdef void* source_ptr
+        cdef frame_rate_t* fr
         try:
             if self.has_video_frame:
                 self.video_frame._set_sender_status(True)
             if self.has_audio_frame:
                 self.audio_frame._set_sender_status(True)
+            if self.has_video_frame and self.pace_video:
+                fr = self.video_frame._get_frame_rate()
+                self.video_clock._set_frame_rate(fr.numerator, fr.denominator)
+                self.video_clock._reset()
             self.send_create.clock_video = self.clock_video
             self.send_create.clock_audio = self.clock_audio
             self.ptr = NDIlib_send_create(&(self.send_create))
@@ -183,6 +245,39 @@ cdef class Sender:
         self.audio_frame = af
         self.has_audio_frame = af is not None
 
+    def set_stage_timing_enabled(self, bint enabled):
+        """Enable or disable the :class:`~.timing.StageTimer` of this
+        sender and its :attr:`video_frame` and :attr:`audio_frame`
+
+        .. versionadded:: 0.0.10
+        """
+        self.stage_timer.enabled = enabled
+        if self.video_frame is not None:
+            self.video_frame.stage_timer.enabled = enabled
+        if self.audio_frame is not None:
+            self.audio_frame.stage_timer.enabled = enabled
+
+    def get_stage_timings(self):
+        """Get a :meth:`~.timing.StageTimer.snapshot` of the stage timings
+        for this sender and its frames
+
+        Returns:
+            dict: A dict with the snapshots under the ``"sender"``,
+            ``"video_frame"`` and ``"audio_frame"`` keys (the latter two are
+            ``None`` if no frame is set)
+
+        .. versionadded:: 0.0.10
+        """
+        return {
+            'sender':self.stage_timer.snapshot(),
+            'video_frame':(
+                self.video_frame.stage_timer.snapshot() if self.video_frame is not None else None
+            ),
+            'audio_frame':(
+                self.audio_frame.stage_timer.snapshot() if self.audio_frame is not None else None
+            ),
+        }
+
     cdef bint _check_running(self) except -1 nogil:
         if not self._running:
             return False
@@ -195,6 +290,20 @@ cdef class Sender:
             return False
         return self._running
 
+    cdef void _ndi_send_video(self, NDIlib_video_frame_v2_t* p) noexcept nogil:
+        # All frames go through these methods to the NDI library (so they
+        # can be replaced without an NDI instance)
+        NDIlib_send_send_video_v2(self.ptr, p)
+
+    cdef void _ndi_send_video_async(self, NDIlib_video_frame_v2_t* p) noexcept nogil:
+        NDIlib_send_send_video_async_v2(self.ptr, p)
+
+    cdef void _ndi_send_audio(self, NDIlib_audio_frame_v3_t* p) noexcept nogil:
+        NDIlib_send_send_audio_v3(self.ptr, p)
+
+    cdef void _ndi_send_metadata(self, NDIlib_metadata_frame_t* p) noexcept nogil:
+        NDIlib_send_send_metadata(self.ptr, p)
+
     cdef void _set_async_video_sender(self, VideoSendFrame_item_s* item) noexcept nogil:
         self._clear_async_video_status()
         self.last_async_sender = item
@@ -204,8 +313,31 @@ cdef class Sender:
         if item is NULL:
             return
         self.last_async_sender = NULL
+        trace_event(
+            TraceEventType.trace_async_complete, self.trace_source_id,
+            item.data.frame_id, item.frame_ptr.timecode, 0, item.data.idx,
+        )
         self.video_frame._on_sender_write(item)
 
+    cdef void _pace_video_frame(self, NDIlib_video_frame_v2_t* p) noexcept nogil:
+        if not self.pace_video:
+            return
+        cdef int64_t start_ns = self.stage_timer._start()
+        self.video_clock._wait()
+        self.stage_timer._stop(SendStage.send_pace, start_ns)
+        p.timecode = self.video_clock._get_ndi_timestamp()
+
+    cdef void _trace_send(
+        self,
+        SendFrame_item_s* item,
+        int64_t timecode,
+        int64_t trace_start,
+    ) noexcept nogil:
+        trace_event(
+            TraceEventType.trace_send, self.trace_source_id, item.frame_id,
+            timecode, trace_start, item.idx,
+        )
+
     def write_video_and_audio(self, cnp.uint8_t[:] video_data, cnp.float32_t[:,:] audio_data):
         """Write and send the given video and audio data
 
@@ -233,6 +365,7 @@ cdef class Sender:
         cdef NDIlib_video_frame_v2_t* vid_ptr = self.video_frame.ptr
         cdef NDIlib_audio_frame_v3_t aud_send_frame
         cdef bint vid_result = True, aud_result = True
+        cdef int64_t start_ns, trace_start
 
         vid_item = self.video_frame._prepare_buffer_write()
         aud_item = self.audio_frame._prepare_buffer_write()
@@ -248,19 +381,36 @@ cdef class Sender:
 
 
         with nogil:
+            start_ns = self.stage_timer._start()
             aud_memview[...] = audio_data
+            self.stage_timer._stop(SendStage.send_write, start_ns)
             self.audio_frame._set_buffer_write_complete(aud_item)
+            start_ns = self.stage_timer._start()
             vid_memview[...] = video_data
+            self.stage_timer._stop(SendStage.send_write, start_ns)
             self.video_frame._set_buffer_write_complete(vid_item)
 
             audio_frame_copy(aud_item.frame_ptr, &aud_send_frame)
             aud_send_frame.p_data = <uint8_t*>aud_item.frame_ptr.p_data
-            NDIlib_send_send_audio_v3(self.ptr, &aud_send_frame)
+            if self.pace_video:
+                self._pace_video_frame(vid_ptr)
+                aud_send_frame.timecode = vid_ptr.timecode
+            trace_start = trace_begin()
+            start_ns = self.stage_timer._start()
+            self._ndi_send_audio(&aud_send_frame)
+            self.num_audio_sent += 1
+            self.stage_timer._stop(SendStage.send_audio, start_ns)
+            self._trace_send(&aud_item.data, aud_send_frame.timecode, trace_start)
             self._clear_async_video_status()
             self.audio_frame._on_sender_write(aud_item)
 
             vid_ptr.p_data = vid_item.frame_ptr.p_data
-            NDIlib_send_send_video_async_v2(self.ptr, vid_ptr)
+            trace_start = trace_begin()
+            start_ns = self.stage_timer._start()
+            self._ndi_send_video_async(vid_ptr)
+            self.num_video_sent += 1
+            self.stage_timer._stop(SendStage.send_video, start_ns)
+            self._trace_send(&vid_item.data, vid_ptr.timecode, trace_start)
             self._set_async_video_sender(vid_item)
 
         return vid_result and aud_result
@@ -277,15 +427,24 @@ cdef class Sender:
     cdef bint _write_video(self, cnp.uint8_t[:] data) except -1:
         if not self._check_running():
             return False
+        cdef int64_t start_ns, trace_start
         cdef NDIlib_video_frame_v2_t* vid_ptr = self.video_frame.ptr
         cdef VideoSendFrame_item_s* item = self.video_frame._prepare_buffer_write()
         cdef cnp.uint8_t[:] vid_memview = self.video_frame
 
         with nogil:
+            start_ns = self.stage_timer._start()
             vid_memview[...] = data
+            self.stage_timer._stop(SendStage.send_write, start_ns)
             self.video_frame._set_buffer_write_complete(item)
             item.frame_ptr.p_metadata = vid_ptr.p_metadata
-            NDIlib_send_send_video_v2(self.ptr, item.frame_ptr)
+            self._pace_video_frame(item.frame_ptr)
+            trace_start = trace_begin()
+            start_ns = self.stage_timer._start()
+            self._ndi_send_video(item.frame_ptr)
+            self.num_video_sent += 1
+            self.stage_timer._stop(SendStage.send_video, start_ns)
+            self._trace_send(&item.data, item.frame_ptr.timecode, trace_start)
             self._clear_async_video_status()
             self.video_frame._on_sender_write(item)
         return True
@@ -312,15 +471,24 @@ cdef class Sender:
     cdef bint _write_video_async(self, cnp.uint8_t[:] data) except -1:
         if not self._check_running():
             return False
+        cdef int64_t start_ns, trace_start
         cdef NDIlib_video_frame_v2_t* vid_ptr = self.video_frame.ptr
         cdef VideoSendFrame_item_s* item = self.video_frame._prepare_buffer_write()
         cdef cnp.uint8_t[:] vid_memview = self.video_frame
 
         with nogil:
+            start_ns = self.stage_timer._start()
             vid_memview[...] = data
+            self.stage_timer._stop(SendStage.send_write, start_ns)
             self.video_frame._set_buffer_write_complete(item)
             item.frame_ptr.p_metadata = vid_ptr.p_metadata
-            NDIlib_send_send_video_async_v2(self.ptr, item.frame_ptr)
+            self._pace_video_frame(item.frame_ptr)
+            trace_start = trace_begin()
+            start_ns = self.stage_timer._start()
+            self._ndi_send_video_async(item.frame_ptr)
+            self.num_video_sent += 1
+            self.stage_timer._stop(SendStage.send_video, start_ns)
+            self._trace_send(&item.data, item.frame_ptr.timecode, trace_start)
             self._set_async_video_sender(item)
         return True
 
@@ -337,7 +505,10 @@ cdef class Sender:
             sent with a single method call.
 
         """
-        return self._send_video()
+        cdef bint result
+        with nogil:
+            result = self._send_video()
+        return result
 
     def send_video_async(self):
         """Send a frame of video data as described in :meth:`send_video`
@@ -360,16 +531,26 @@ cdef class Sender:
             and syncronization.
 
         """
-        return self._send_video_async()
+        cdef bint result
+        with nogil:
+            result = self._send_video_async()
+        return result
 
     cdef bint _send_video(self) noexcept nogil:
         if not self._check_running_noexcept():
             return False
+        cdef int64_t start_ns, trace_start
         if not self.video_frame._send_frame_available():
             return False
         # Use noexcept version since availability was just checked
         cdef VideoSendFrame_item_s* item = self.video_frame._get_send_frame_noexcept()
-        NDIlib_send_send_video_v2(self.ptr, item.frame_ptr)
+        self._pace_video_frame(item.frame_ptr)
+        trace_start = trace_begin()
+        start_ns = self.stage_timer._start()
+        self._ndi_send_video(item.frame_ptr)
+        self.num_video_sent += 1
+        self.stage_timer._stop(SendStage.send_video, start_ns)
+        self._trace_send(&item.data, item.frame_ptr.timecode, trace_start)
         self._clear_async_video_status()
         self.video_frame._on_sender_write(item)
         return True
@@ -377,14 +558,45 @@ cdef class Sender:
     cdef bint _send_video_async(self) noexcept nogil:
         if not self._check_running_noexcept():
             return False
+        cdef int64_t start_ns, trace_start
         if not self.video_frame._send_frame_available():
             return False
         # Use noexcept version since availability was just checked
         cdef VideoSendFrame_item_s* item = self.video_frame._get_send_frame_noexcept()
-        NDIlib_send_send_video_async_v2(self.ptr, item.frame_ptr)
+        self._pace_video_frame(item.frame_ptr)
+        trace_start = trace_begin()
+        start_ns = self.stage_timer._start()
+        self._ndi_send_video_async(item.frame_ptr)
+        self.num_video_sent += 1
+        self.stage_timer._stop(SendStage.send_video, start_ns)
+        self._trace_send(&item.data, item.frame_ptr.timecode, trace_start)
         self._set_async_video_sender(item)
         return True
 
+    cdef bint _send_video_frame(self, NDIlib_video_frame_v2_t* p, bint is_async) noexcept nogil:
+        # Send a frame with data owned by the caller (instead of the
+        # video_frame buffers). If *is_async* is True, the data must stay
+        # valid until the next video send or `_flush_video`
+        if not self._check_running_noexcept():
+            return False
+        cdef int64_t start_ns = self.stage_timer._start()
+        if is_async:
+            self._ndi_send_video_async(p)
+        else:
+            self._ndi_send_video(p)
+        self.num_video_sent += 1
+        self.stage_timer._stop(SendStage.send_video, start_ns)
+        # Any frame the sender was holding for an async send is now released
+        self._clear_async_video_status()
+        return True
+
+    cdef void _flush_video(self) noexcept nogil:
+        # Wait for NDI to finish with the last async video frame
+        if not self._check_running_noexcept():
+            return
+        self._ndi_send_video_async(NULL)
+        self._clear_async_video_status()
+
     def write_audio(self, cnp.float32_t[:,:] data):
         """Write the given audio data and send it
 
@@ -397,6 +609,7 @@ cdef class Sender:
     cdef bint _write_audio(self, cnp.float32_t[:,:] data) except -1:
         if not self._check_running():
             return False
+        cdef int64_t start_ns, trace_start
         cdef AudioSendFrame_item_s* item = self.audio_frame._prepare_buffer_write()
         self.audio_frame._set_shape_from_memview(item, data)
         cdef cnp.float32_t[:,:] aud_memview = self.audio_frame
@@ -404,14 +617,127 @@ cdef class Sender:
 
         with nogil:
             audio_frame_copy(item.frame_ptr, &send_frame)
+            start_ns = self.stage_timer._start()
             aud_memview[...] = data
+            self.stage_timer._stop(SendStage.send_write, start_ns)
             self.audio_frame._set_buffer_write_complete(item)
             send_frame.p_data = <uint8_t*>item.frame_ptr.p_data
-            NDIlib_send_send_audio_v3(self.ptr, &send_frame)
+            trace_start = trace_begin()
+            start_ns = self.stage_timer._start()
+            self._ndi_send_audio(&send_frame)
+            self.num_audio_sent += 1
+            self.stage_timer._stop(SendStage.send_audio, start_ns)
+            self._trace_send(&item.data, send_frame.timecode, trace_start)
             self._clear_async_video_status()
             self.audio_frame._on_sender_write(item)
         return True
 
+    def write_audio_stream(
+        self,
+        cnp.float32_t[:,:] data,
+        size_t frame_size=0,
+        timecode=None,
+        bint flush=False,
+    ):
+        """Split a block of audio data into frames and send them
+
+        Each chunk is converted to the |NDI| reference level and copied
+        into the :attr:`audio_frame` buffers in a single pass, then sent.
+        The entire loop runs without the :term:`GIL`.
+
+        Timecodes are generated from the number of samples sent and the
+        :attr:`~.audio_frame.AudioFrame.sample_rate`, so successive calls
+        form a continuous stream.
+
+        Arguments:
+            data: A 2-d array or memoryview of 32-bit floats with shape
+                ``(num_channels, num_samples)``. The number of samples
+                may be any length
+            frame_size (int, optional): Number of samples per frame.
+                If zero (the default), the
+                :attr:`~.audio_frame.AudioSendFrame.max_num_samples`
+                of the :attr:`audio_frame` is used
+            timecode (int, optional): If given, the |NDI| timecode (in 100
+                nanosecond units) of the first sample in *data*.
+                This restarts the stream timing. If not given,
+                the stream continues from the previous call
+                (or from the current time for the first call)
+            flush (bool, optional): If True, any remaining samples less
+                than *frame_size* are sent as a shorter frame. Otherwise
+                they are left unconsumed. Default is False
+
+        Returns:
+            int: The number of samples consumed from *data*
+
+        .. versionadded:: 0.0.10
+
+        """
+        if timecode is not None:
+            self.audio_stream_timecode = timecode
+            self.audio_stream_position = 0
+            self.audio_stream_started = True
+        return self._write_audio_stream(data, frame_size, flush)
+
+    cdef int64_t _get_audio_stream_timecode(self, int sample_rate) noexcept nogil:
+        cdef int64_t pos = self.audio_stream_position
+        return self.audio_stream_timecode + (pos // sample_rate) * 10000000 + (
+            (pos % sample_rate) * 10000000
+        ) // sample_rate
+
+    cdef size_t _write_audio_stream(
+        self,
+        cnp.float32_t[:,:] data,
+        size_t frame_size,
+        bint flush,
+    ) except? -1:
+        if not self._check_running():
+            return 0
+        cdef AudioSendFrame af = self.audio_frame
+        if frame_size == 0:
+            frame_size = af.max_num_samples
+        if frame_size > af.max_num_samples:
+            raise ValueError('frame_size exceeds max_num_samples')
+        if <int>data.shape[0] != af.ptr.no_channels:
+            raise ValueError('number of channels must match')
+        cdef int sample_rate = af.ptr.sample_rate
+        if sample_rate <= 0:
+            raise ValueError('invalid sample rate')
+
+        cdef size_t total = data.shape[1], offset = 0, n
+        cdef AudioSendFrame_item_s* item
+        cdef NDIlib_audio_frame_v3_t send_frame
+        cdef int64_t start_ns, trace_start
+
+        with nogil:
+            if not self.audio_stream_started:
+                self.audio_stream_timecode = realtime_ns() // 100
+                self.audio_stream_position = 0
+                self.audio_stream_started = True
+            while offset < total:
+                n = total - offset
+                if n > frame_size:
+                    n = frame_size
+                elif n < frame_size and not flush:
+                    break
+                item = af._prepare_buffer_write()
+                start_ns = self.stage_timer._start()
+                af._write_converted(item, data[:,offset:offset+n])
+                self.stage_timer._stop(SendStage.send_write, start_ns)
+                audio_frame_copy(item.frame_ptr, &send_frame)
+                send_frame.p_data = <uint8_t*>item.frame_ptr.p_data
+                send_frame.timecode = self._get_audio_stream_timecode(sample_rate)
+                trace_start = trace_begin()
+                start_ns = self.stage_timer._start()
+                self._ndi_send_audio(&send_frame)
+                self.num_audio_sent += 1
+                self.stage_timer._stop(SendStage.send_audio, start_ns)
+                self._trace_send(&item.data, send_frame.timecode, trace_start)
+                self._clear_async_video_status()
+                af._on_sender_write(item)
+                self.audio_stream_position += n
+                offset += n
+        return offset
+
     def send_audio(self):
         """Send audio data (if available) that was previously
         written to the :attr:`audio_frame` using its
@@ -430,22 +756,39 @@ cdef class Sender:
     cdef bint _send_audio(self) noexcept nogil:
         if not self._check_running_noexcept():
             return False
+        cdef int64_t start_ns, trace_start
         if not self.audio_frame._send_frame_available():
             return False
         # Use noexcept version since availability was just checked
         cdef AudioSendFrame_item_s* item = self.audio_frame._get_send_frame_noexcept()
-        NDIlib_send_send_audio_v3(self.ptr, item.frame_ptr)
+        trace_start = trace_begin()
+        start_ns = self.stage_timer._start()
+        self._ndi_send_audio(item.frame_ptr)
+        self.num_audio_sent += 1
+        self.stage_timer._stop(SendStage.send_audio, start_ns)
+        self._trace_send(&item.data, item.frame_ptr.timecode, trace_start)
         self._clear_async_video_status()
         self.audio_frame._on_sender_write(item)
         return True
 
+    cdef bint _send_audio_frame(self, NDIlib_audio_frame_v3_t* p) noexcept nogil:
+        # Send a frame with data owned by the caller (instead of the
+        # audio_frame buffers)
+        if not self._check_running_noexcept():
+            return False
+        cdef int64_t start_ns = self.stage_timer._start()
+        self._ndi_send_audio(p)
+        self.num_audio_sent += 1
+        self.stage_timer._stop(SendStage.send_audio, start_ns)
+        self._clear_async_video_status()
+        return True
+
     def send_metadata(self, str tag, dict attrs):
         return self._send_metadata(tag, attrs)
 
     cdef bint _send_metadata(self, str tag, dict attrs) except -1:
-        self.metadata_frame._clear()
-        self.metadata_frame.tag = tag
-        self.metadata_frame.attrs.update(attrs)
+        # Only re-serialized if the content changed since the last call
+        self.metadata_frame._set_content(tag, attrs)
         return self._send_metadata_frame(self.metadata_frame)
 
     def send_metadata_frame(self, MetadataSendFrame mf):
@@ -456,7 +799,18 @@ cdef class Sender:
             return False
         if not mf._serialize():
             return False
-        NDIlib_send_send_metadata(self.ptr, mf.ptr)
+        self._ndi_send_metadata(mf.ptr)
+        self.num_metadata_sent += 1
+        self._clear_async_video_status()
+        return True
+
+    cdef bint _send_metadata_struct(self, NDIlib_metadata_frame_t* p) noexcept nogil:
+        # Send a frame with data owned by the caller (instead of a
+        # MetadataSendFrame)
+        if not self._check_running_noexcept():
+            return False
+        self._ndi_send_metadata(p)
+        self.num_metadata_sent += 1
         self._clear_async_video_status()
         return True
 
@@ -0,0 +1,120 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from libc.stdint cimport *
+cimport numpy as cnp
+
+from .wrapper cimport *
+from .locks cimport RLock
+from .recorder cimport RecordMediaType, RecordIndex_s
+
+
+cdef extern from * nogil:
+    """
+    #include <atomic>
+    #include <stdint.h>
+
+    // Values in shared memory are accessed through std::atomic so they are
+    // consistent between processes (uint64_t atomics are lock-free and
+    // address-free on all supported platforms)
+    static inline uint64_t cyndi_shm_load(void* p) {
+        return reinterpret_cast<std::atomic<uint64_t>*>(p)->load(std::memory_order_acquire);
+    }
+
+    static inline void cyndi_shm_store(void* p, uint64_t value) {
+        reinterpret_cast<std::atomic<uint64_t>*>(p)->store(value, std::memory_order_release);
+    }
+
+    static inline bool cyndi_shm_compare_exchange(void* p, uint64_t expected, uint64_t value) {
+        return reinterpret_cast<std::atomic<uint64_t>*>(p)->compare_exchange_strong(expected, value);
+    }
+
+    static inline void cyndi_shm_fence_acquire() {
+        std::atomic_thread_fence(std::memory_order_acquire);
+    }
+
+    static inline void cyndi_shm_fence_release() {
+        std::atomic_thread_fence(std::memory_order_release);
+    }
+    """
+    uint64_t cyndi_shm_load(void* p)
+    void cyndi_shm_store(void* p, uint64_t value)
+    bint cyndi_shm_compare_exchange(void* p, uint64_t expected, uint64_t value)
+    void cyndi_shm_fence_acquire()
+    void cyndi_shm_fence_release()
+
+
+cdef struct SharedHeader_s:
+    char magic[8]
+    uint32_t version
+    uint32_t num_slots
+    uint64_t slot_size
+    uint64_t slot_stride
+    uint64_t slots_offset
+    uint32_t max_subscribers
+    uint32_t overwrite
+    uint8_t _pad0[16]
+    uint64_t write_count
+    uint8_t _pad1[56]
+
+
+cdef struct SharedSubscriber_s:
+    uint64_t active
+    uint64_t read_count
+    uint8_t _pad[48]
+
+
+cdef struct SharedSlot_s:
+    uint64_t seq
+    uint64_t _pad0
+    RecordIndex_s info
+    uint8_t _pad1[32]
+
+
+cdef class SharedFramePublisher:
+    cdef readonly str name
+    cdef readonly object shm
+    cdef uint8_t[:] _view
+    cdef uint8_t* base
+    cdef SharedHeader_s* header
+    cdef SharedSubscriber_s* subscribers
+    cdef readonly size_t slot_size, num_slots, max_subscribers
+    cdef readonly bint overwrite
+    cdef readonly bint publish_video, publish_audio, publish_metadata
+    cdef readonly size_t num_published, num_dropped
+    cdef RLock lock
+
+    cdef SharedSlot_s* _get_slot(self, uint64_t frame_num) noexcept nogil
+    cdef SharedSlot_s* _begin_write(self, size_t size) noexcept nogil
+    cdef void _end_write(self, SharedSlot_s* slot) noexcept nogil
+    cdef int _add_video(self, NDIlib_video_frame_v2_t* p) except -1
+    cdef int _add_audio(self, NDIlib_audio_frame_v3_t* p) except -1
+    cdef int _add_metadata(self, NDIlib_metadata_frame_t* p) except -1
+
+
+cdef class SharedFrame:
+    cdef readonly uint64_t sequence
+    cdef readonly RecordMediaType media_type
+    cdef readonly int64_t timestamp, timecode
+    cdef readonly object info
+    cdef readonly object data
+    cdef SharedSlot_s* slot
+    cdef uint64_t expected_seq
+    cdef object subscriber
+
+
+cdef class SharedFrameSubscriber:
+    cdef readonly str name
+    cdef readonly object shm
+    cdef uint8_t[:] _view
+    cdef uint8_t* base
+    cdef SharedHeader_s* header
+    cdef SharedSubscriber_s* subscriber
+    cdef readonly size_t slot_size, num_slots
+    cdef readonly uint64_t next_frame
+    cdef readonly size_t num_read, num_lagged
+
+    cdef SharedSlot_s* _get_slot(self, uint64_t frame_num) noexcept nogil
+    cdef cnp.ndarray _wrap_data(
+        self, RecordIndex_s* info, int nd, cnp.npy_intp* dims, int typenum
+    )
@@ -0,0 +1,64 @@
+from __future__ import annotations
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import numpy.typing as npt
+
+from .recorder import RecordMediaType
+
+
+class SharedFramePublisher:
+    name: str
+    shm: SharedMemory|None
+    slot_size: int
+    num_slots: int
+    max_subscribers: int
+    overwrite: bool
+    publish_video: bool
+    publish_audio: bool
+    publish_metadata: bool
+    num_published: int
+    num_dropped: int
+    def __init__(
+        self,
+        slot_size: int,
+        num_slots: int = ...,
+        name: str|None = ...,
+        overwrite: bool = ...,
+        max_subscribers: int = ...,
+        video: bool = ...,
+        audio: bool = ...,
+        metadata: bool = ...,
+    ) -> None: ...
+    def __enter__(self) -> SharedFramePublisher: ...
+    def __exit__(self, *args) -> None: ...
+    @property
+    def num_subscribers(self) -> int: ...
+    def close(self) -> None: ...
+
+
+class SharedFrame:
+    sequence: int
+    media_type: RecordMediaType
+    timestamp: int
+    timecode: int
+    info: np.void
+    data: npt.NDArray[np.uint8]|npt.NDArray[np.float32]|str
+    def is_valid(self) -> bool: ...
+
+
+class SharedFrameSubscriber:
+    name: str
+    shm: SharedMemory
+    slot_size: int
+    num_slots: int
+    next_frame: int
+    num_read: int
+    num_lagged: int
+    def __init__(self, name: str) -> None: ...
+    def __enter__(self) -> SharedFrameSubscriber: ...
+    def __exit__(self, *args) -> None: ...
+    @property
+    def num_pending(self) -> int: ...
+    def close(self) -> None: ...
+    def read(self, timeout: float|None = ..., latest: bool = ...) -> SharedFrame|None: ...
@@ -0,0 +1,608 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+Sharing received frames with other processes
+
+A :class:`SharedFramePublisher` attached to a :class:`~.receiver.Receiver`
+(see :meth:`~.receiver.Receiver.set_publisher`) copies each received frame
+into a ring of fixed-size slots in shared memory. Any number of
+:class:`SharedFrameSubscriber` objects in other processes can attach to it
+by name and read the frames as views of the shared memory::
+
+    # In the receiving process
+    publisher = SharedFramePublisher(slot_size=1920*1080*2)
+    receiver.set_publisher(publisher)
+
+    # In each worker process
+    subscriber = SharedFrameSubscriber(publisher_name)
+    while True:
+        frame = subscriber.read(timeout=1)
+        if frame is None:
+            continue
+        process(frame.data)
+        if not frame.is_valid():
+            # The slot was overwritten while processing
+            ...
+
+Publishing never waits for subscribers. Each slot is protected by a
+sequence counter which is odd while the slot is being written, so
+subscribers can tell whether a frame was overwritten while they were reading
+it (see :meth:`SharedFrame.is_valid`).
+
+.. versionadded:: 0.0.10
+
+"""
+
+cimport cython
+from libc.string cimport memcpy, memset, memcmp, strlen
+from cpython.ref cimport Py_INCREF
+cimport numpy as cnp
+
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .clock cimport sleep
+from .recorder import RECORD_INDEX_DTYPE
+
+__all__ = ('SharedFramePublisher', 'SharedFrameSubscriber', 'SharedFrame')
+
+cnp.import_array()
+
+
+cdef uint32_t FORMAT_VERSION = 1
+cdef const char* SHM_MAGIC = b'CYNDISHM'
+cdef size_t SLOT_ALIGN = 64
+cdef size_t PAGE_SIZE = 4096
+
+# Interval between checks for new frames in SharedFrameSubscriber.read()
+cdef double POLL_INTERVAL = .0005
+
+
+@cython.cdivision(True)
+cdef inline size_t _align(size_t value, size_t alignment) noexcept nogil:
+    return (value + alignment - 1) // alignment * alignment
+
+
+cdef object _attach_shm(str name):
+    # Before Python 3.13, attaching registers the segment with the resource
+    # tracker on POSIX, which unlinks it when this process exits. It is owned
+    # by the publisher, so registration is skipped.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+cdef class SharedFramePublisher:
+    """Publishes frames to a ring of slots in shared memory
+
+    Arguments:
+        slot_size (int): Maximum size (in bytes) of a frame. Larger frames
+            are dropped
+        num_slots (int, optional): Number of slots in the ring.
+            Defaults to ``8``
+        name (str, optional): Name of the shared memory block. If not given,
+            a unique name is chosen (available as :attr:`name`)
+        overwrite (bool, optional): If ``True`` (the default), the oldest
+            frame is always overwritten. If ``False``, new frames are dropped
+            while any subscriber is :attr:`num_slots` frames behind (see
+            below)
+        max_subscribers (int, optional): Maximum number of subscribers.
+            Defaults to ``16``
+        video (bool, optional): Whether to publish video frames
+        audio (bool, optional): Whether to publish audio frames
+        metadata (bool, optional): Whether to publish metadata frames
+
+    This class supports use as a :term:`context manager`, calling
+    :meth:`close` on exit.
+
+    .. note::
+
+        A subscriber is only detached when it is closed or deleted. If its
+        process exits without doing so (for example if it crashes), it
+        stays attached and never reads another frame. With *overwrite*
+        set to ``False``, this drops all frames once the publisher is
+        :attr:`num_slots` frames ahead, until the publisher is recreated.
+        Use ``overwrite=False`` only when the subscriber processes are
+        supervised along with the publisher.
+
+    Attributes:
+        name (str): Name of the shared memory block (used to create a
+            :class:`SharedFrameSubscriber`)
+        shm (multiprocessing.shared_memory.SharedMemory): The shared memory
+            block (``None`` once closed)
+        num_published (int): Number of frames published
+        num_dropped (int): Number of frames dropped because they were too
+            large or (if :attr:`overwrite` is ``False``) a subscriber was
+            too far behind
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.base = NULL
+        self.header = NULL
+        self.subscribers = NULL
+        self.num_published = 0
+        self.num_dropped = 0
+
+    def __init__(
+        self,
+        size_t slot_size,
+        size_t num_slots=8,
+        str name=None,
+        bint overwrite=True,
+        size_t max_subscribers=16,
+        bint video=True,
+        bint audio=True,
+        bint metadata=True,
+    ):
+        if slot_size == 0 or num_slots == 0 or max_subscribers == 0:
+            raise ValueError('slot_size, num_slots and max_subscribers must be positive')
+        cdef size_t slot_stride = _align(sizeof(SharedSlot_s) + slot_size, SLOT_ALIGN)
+        cdef size_t slots_offset = _align(
+            sizeof(SharedHeader_s) + max_subscribers * sizeof(SharedSubscriber_s),
+            PAGE_SIZE,
+        )
+        cdef size_t total_size = slots_offset + slot_stride * num_slots
+        cdef size_t i
+
+        self.slot_size = slot_size
+        self.num_slots = num_slots
+        self.max_subscribers = max_subscribers
+        self.overwrite = overwrite
+        self.publish_video = video
+        self.publish_audio = audio
+        self.publish_metadata = metadata
+        self.lock = RLock()
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=total_size)
+        self.name = self.shm.name
+        self._view = self.shm.buf
+        self.base = &self._view[0]
+        memset(self.base, 0, slots_offset)
+        for i in range(num_slots):
+            memset(self.base + slots_offset + i * slot_stride, 0, sizeof(SharedSlot_s))
+
+        self.header = <SharedHeader_s*>self.base
+        self.subscribers = <SharedSubscriber_s*>(self.base + sizeof(SharedHeader_s))
+        self.header.version = FORMAT_VERSION
+        self.header.num_slots = num_slots
+        self.header.slot_size = slot_size
+        self.header.slot_stride = slot_stride
+        self.header.slots_offset = slots_offset
+        self.header.max_subscribers = max_subscribers
+        self.header.overwrite = overwrite
+        cyndi_shm_store(&self.header.write_count, 0)
+        # Written last so subscribers never see a partial header
+        cyndi_shm_fence_release()
+        memcpy(self.header.magic, SHM_MAGIC, 8)
+
+    def __dealloc__(self):
+        # The view must be released before the SharedMemory is closed
+        self._view = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def num_subscribers(self) -> int:
+        """Number of attached subscribers
+        """
+        cdef size_t i, result = 0
+        if self.header is NULL:
+            return 0
+        for i in range(self.max_subscribers):
+            if cyndi_shm_load(&self.subscribers[i].active):
+                result += 1
+        return result
+
+    def close(self):
+        """Close and remove the shared memory block
+
+        Subscribers that are still attached keep their mapping until they
+        are closed.
+        """
+        if self.shm is None:
+            return
+        self.lock._acquire(True, -1)
+        try:
+            self.base = NULL
+            self.header = NULL
+            self.subscribers = NULL
+            self._view = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+        finally:
+            self.lock._release()
+
+    @cython.cdivision(True)
+    cdef SharedSlot_s* _get_slot(self, uint64_t frame_num) noexcept nogil:
+        return <SharedSlot_s*>(
+            self.base + self.header.slots_offset
+            + (frame_num % self.num_slots) * self.header.slot_stride
+        )
+
+    cdef SharedSlot_s* _begin_write(self, size_t size) noexcept nogil:
+        # Must be called with the lock held. Returns the slot for the next
+        # frame (marked as being written) or NULL if it must be dropped
+        cdef uint64_t frame_num, read_count
+        cdef SharedSlot_s* slot
+        cdef size_t i
+        if self.header is NULL:
+            return NULL
+        if size > self.slot_size:
+            self.num_dropped += 1
+            return NULL
+        frame_num = cyndi_shm_load(&self.header.write_count)
+        if not self.overwrite:
+            for i in range(self.max_subscribers):
+                if not cyndi_shm_load(&self.subscribers[i].active):
+                    continue
+                read_count = cyndi_shm_load(&self.subscribers[i].read_count)
+                if frame_num >= read_count + self.num_slots:
+                    self.num_dropped += 1
+                    return NULL
+        slot = self._get_slot(frame_num)
+        cyndi_shm_store(&slot.seq, frame_num * 2 + 1)
+        cyndi_shm_fence_release()
+        memset(&slot.info, 0, sizeof(RecordIndex_s))
+        slot.info.size = size
+        slot.info.offset = <uint8_t*>slot + sizeof(SharedSlot_s) - self.base
+        return slot
+
+    cdef void _end_write(self, SharedSlot_s* slot) noexcept nogil:
+        cdef uint64_t frame_num = cyndi_shm_load(&self.header.write_count)
+        cyndi_shm_store(&slot.seq, frame_num * 2 + 2)
+        cyndi_shm_store(&self.header.write_count, frame_num + 1)
+        self.num_published += 1
+
+    cdef int _add_video(self, NDIlib_video_frame_v2_t* p) except -1:
+        cdef FourCCPackInfo pack_info
+        cdef SharedSlot_s* slot
+        cdef int64_t timestamp = p.timestamp
+
+        if not self.publish_video or p.p_data is NULL or p.xres <= 0 or p.yres <= 0:
+            return 0
+        if timestamp == NDIlib_recv_timestamp_undefined:
+            timestamp = p.timecode
+        fourcc_pack_info_init(&pack_info)
+        pack_info.fourcc = fourcc_type_uncast(p.FourCC)
+        pack_info.xres = p.xres
+        pack_info.yres = p.yres
+        calc_fourcc_pack_info(&pack_info, p.line_stride_in_bytes)
+
+        self.lock._acquire(True, -1)
+        try:
+            with nogil:
+                slot = self._begin_write(pack_info.total_size)
+                if slot is not NULL:
+                    slot.info.media_type = RecordMediaType.record_video
+                    slot.info.timestamp = timestamp
+                    slot.info.timecode = p.timecode
+                    slot.info.fourcc = <uint32_t>pack_info.fourcc
+                    slot.info.xres = p.xres
+                    slot.info.yres = p.yres
+                    slot.info.line_stride = pack_info.line_strides[0]
+                    slot.info.frame_format = frame_format_uncast(p.frame_format_type)
+                    slot.info.frame_rate_N = p.frame_rate_N
+                    slot.info.frame_rate_D = p.frame_rate_D
+                    memcpy(self.base + slot.info.offset, p.p_data, pack_info.total_size)
+                    self._end_write(slot)
+        finally:
+            self.lock._release()
+        return 0
+
+    cdef int _add_audio(self, NDIlib_audio_frame_v3_t* p) except -1:
+        cdef SharedSlot_s* slot
+        cdef int64_t timestamp = p.timestamp
+        cdef size_t channel_size, i
+        cdef uint8_t* dest
+
+        if not self.publish_audio or p.p_data is NULL or p.no_channels <= 0 or p.no_samples <= 0:
+            return 0
+        if timestamp == NDIlib_recv_timestamp_undefined:
+            timestamp = p.timecode
+        channel_size = p.no_samples * sizeof(float)
+
+        self.lock._acquire(True, -1)
+        try:
+            with nogil:
+                slot = self._begin_write(channel_size * p.no_channels)
+                if slot is not NULL:
+                    slot.info.media_type = RecordMediaType.record_audio
+                    slot.info.timestamp = timestamp
+                    slot.info.timecode = p.timecode
+                    slot.info.sample_rate = p.sample_rate
+                    slot.info.num_channels = p.no_channels
+                    slot.info.num_samples = p.no_samples
+                    dest = self.base + slot.info.offset
+                    for i in range(<size_t>p.no_channels):
+                        memcpy(
+                            dest + i * channel_size,
+                            p.p_data + i * p.channel_stride_in_bytes,
+                            channel_size,
+                        )
+                    self._end_write(slot)
+        finally:
+            self.lock._release()
+        return 0
+
+    cdef int _add_metadata(self, NDIlib_metadata_frame_t* p) except -1:
+        cdef SharedSlot_s* slot
+        cdef size_t size
+
+        if not self.publish_metadata or p.p_data is NULL:
+            return 0
+        # The length includes the null terminator, which is not shared
+        if p.length > 0:
+            size = p.length - 1
+        else:
+            size = strlen(p.p_data)
+        if size == 0:
+            return 0
+
+        self.lock._acquire(True, -1)
+        try:
+            with nogil:
+                slot = self._begin_write(size)
+                if slot is not NULL:
+                    slot.info.media_type = RecordMediaType.record_metadata
+                    slot.info.timestamp = p.timecode
+                    slot.info.timecode = p.timecode
+                    memcpy(self.base + slot.info.offset, p.p_data, size)
+                    self._end_write(slot)
+        finally:
+            self.lock._release()
+        return 0
+
+
+cdef class SharedFrame:
+    """A frame read by a :class:`SharedFrameSubscriber`
+
+    Attributes:
+        sequence (int): The frame number (counting from the first frame
+            published)
+        media_type (RecordMediaType): The type of frame
+        timestamp (int): The :term:`ndi-timestamp` of the frame (or its
+            timecode if the sender did not provide one)
+        timecode (int): The frame's timecode
+        info (numpy.void): A copy of the frame's details as a record of
+            :data:`~.recorder.RECORD_INDEX_DTYPE` (``offset`` is relative to
+            the start of the shared memory block)
+        data: A read-only view of the frame data in shared memory. A 1-d array
+            of unsigned 8-bit integers for video frames, a 2-d array of
+            32-bit floats with shape ``(num_channels, num_samples)`` for audio
+            frames or a :class:`str` for metadata frames
+    """
+    def is_valid(self) -> bool:
+        """Check whether the slot holding the frame is unchanged
+
+        Once the publisher wraps around the ring, the slot is reused and
+        :attr:`data` no longer contains this frame. Call this after using
+        the data to find out whether it was overwritten meanwhile.
+        """
+        if self.subscriber is None:
+            return False
+        return cyndi_shm_load(&self.slot.seq) == self.expected_seq
+
+    def __repr__(self):
+        return f'<SharedFrame {self.sequence}: {self.timestamp}>'
+
+
+cdef class SharedFrameSubscriber:
+    """Reads frames from a :class:`SharedFramePublisher`, possibly in
+    another process
+
+    Only frames published after the subscriber is created are read.
+
+    Arguments:
+        name (str): The :attr:`~SharedFramePublisher.name` of the publisher
+
+    This class supports use as a :term:`context manager`, calling
+    :meth:`close` on exit.
+
+    Attributes:
+        name (str): Name of the shared memory block
+        next_frame (int): The sequence number of the next frame to read
+        num_read (int): Number of frames read
+        num_lagged (int): Number of frames that were overwritten before they
+            could be read
+
+    Raises:
+        ValueError: If the shared memory block does not belong to a publisher
+        RuntimeError: If the publisher has no room for another subscriber
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.base = NULL
+        self.header = NULL
+        self.subscriber = NULL
+        self.num_read = 0
+        self.num_lagged = 0
+
+    def __init__(self, str name):
+        cdef SharedSubscriber_s* subscribers
+        cdef size_t i
+        self.name = name
+        self.shm = _attach_shm(name)
+        self._view = self.shm.buf
+        self.base = &self._view[0]
+        self.header = <SharedHeader_s*>self.base
+        if (<size_t>self._view.shape[0] < sizeof(SharedHeader_s) or
+                memcmp(self.header.magic, SHM_MAGIC, 8) != 0 or
+                self.header.version != FORMAT_VERSION):
+            self.close()
+            raise ValueError(f'{name} is not a SharedFramePublisher')
+        cyndi_shm_fence_acquire()
+        self.slot_size = self.header.slot_size
+        self.num_slots = self.header.num_slots
+
+        subscribers = <SharedSubscriber_s*>(self.base + sizeof(SharedHeader_s))
+        # Only the read_count of the slot that was claimed may be written
+        # (the others belong to live subscribers)
+        for i in range(self.header.max_subscribers):
+            if cyndi_shm_compare_exchange(&subscribers[i].active, 0, 1):
+                self.subscriber = &subscribers[i]
+                break
+        if self.subscriber is NULL:
+            self.close()
+            raise RuntimeError('Maximum number of subscribers reached')
+        self.next_frame = cyndi_shm_load(&self.header.write_count)
+        cyndi_shm_store(&self.subscriber.read_count, self.next_frame)
+
+    def __dealloc__(self):
+        if self.subscriber is not NULL and self.shm is not None:
+            cyndi_shm_store(&self.subscriber.active, 0)
+            self.subscriber = NULL
+        self.base = NULL
+        self.header = NULL
+        self._view = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def num_pending(self) -> int:
+        """Number of frames published but not yet read
+        """
+        if self.header is NULL:
+            return 0
+        return cyndi_shm_load(&self.header.write_count) - self.next_frame
+
+    def close(self):
+        """Detach from the publisher
+
+        The shared memory stays mapped until the subscriber and the
+        :attr:`~SharedFrame.data` of all frames read from it are deleted.
+        """
+        if self.subscriber is not NULL:
+            cyndi_shm_store(&self.subscriber.active, 0)
+            self.subscriber = NULL
+        self.header = NULL
+
+    @cython.cdivision(True)
+    cdef SharedSlot_s* _get_slot(self, uint64_t frame_num) noexcept nogil:
+        return <SharedSlot_s*>(
+            self.base + self.header.slots_offset
+            + (frame_num % self.num_slots) * self.header.slot_stride
+        )
+
+    def read(self, timeout=None, bint latest=False):
+        """Read the next frame
+
+        Arguments:
+            timeout (float, optional): Maximum number of seconds to wait for a
+                frame. If ``None`` (the default), waits indefinitely.
+                If ``0``, returns immediately
+            latest (bool, optional): If ``True``, skip to the most recently
+                published frame
+
+        Returns:
+            SharedFrame: The frame, or ``None`` if the timeout was reached
+
+        Raises:
+            ValueError: If the subscriber is (or becomes) closed
+        """
+        cdef SharedSlot_s* slot
+        cdef RecordIndex_s info
+        cdef uint64_t write_count, frame_num, seq, expected
+        cdef double end_time = -1
+        cdef cnp.npy_intp dims[2]
+        cdef SharedFrame frame
+        cdef bytes metadata = None
+
+        if timeout is not None:
+            end_time = time.monotonic() + timeout
+        while True:
+            # Checked on each pass since close() may be called while waiting
+            if self.header is NULL:
+                raise ValueError('Subscriber is closed')
+            write_count = cyndi_shm_load(&self.header.write_count)
+            if write_count <= self.next_frame:
+                if end_time >= 0 and time.monotonic() >= end_time:
+                    return None
+                with nogil:
+                    sleep(POLL_INTERVAL)
+                continue
+            if latest:
+                self.num_lagged += write_count - 1 - self.next_frame
+                self.next_frame = write_count - 1
+            elif write_count - self.next_frame > self.num_slots:
+                self.num_lagged += write_count - self.num_slots - self.next_frame
+                self.next_frame = write_count - self.num_slots
+
+            frame_num = self.next_frame
+            slot = self._get_slot(frame_num)
+            expected = frame_num * 2 + 2
+            seq = cyndi_shm_load(&slot.seq)
+            if seq == expected:
+                info = slot.info
+                if info.media_type == RecordMediaType.record_metadata:
+                    # Copied before the check below (and decoded after it)
+                    # since it may be overwritten meanwhile. The size may
+                    # be torn as well, so it is limited to the slot
+                    metadata = (<char*>slot + sizeof(SharedSlot_s))[
+                        :min(info.size, self.slot_size)
+                    ]
+                cyndi_shm_fence_acquire()
+                seq = cyndi_shm_load(&slot.seq)
+            if seq != expected:
+                # Overwritten before it could be read
+                self.num_lagged += 1
+                self.next_frame += 1
+                continue
+            break
+
+        self.next_frame += 1
+        self.num_read += 1
+        cyndi_shm_store(&self.subscriber.read_count, self.next_frame)
+
+        frame = SharedFrame.__new__(SharedFrame)
+        frame.sequence = frame_num
+        frame.media_type = <RecordMediaType>info.media_type
+        frame.timestamp = info.timestamp
+        frame.timecode = info.timecode
+        frame.slot = slot
+        frame.expected_seq = expected
+        frame.subscriber = self
+        frame.info = np.frombuffer(
+            (<char*>&info)[:sizeof(RecordIndex_s)], dtype=RECORD_INDEX_DTYPE,
+        )[0]
+        if info.media_type == RecordMediaType.record_video:
+            dims[0] = info.size
+            frame.data = self._wrap_data(&info, 1, dims, cnp.NPY_UINT8)
+        elif info.media_type == RecordMediaType.record_audio:
+            dims[0] = info.num_channels
+            dims[1] = info.num_samples
+            frame.data = self._wrap_data(&info, 2, dims, cnp.NPY_FLOAT32)
+        else:
+            frame.data = metadata.decode('UTF-8')
+        return frame
+
+    cdef cnp.ndarray _wrap_data(
+        self, RecordIndex_s* info, int nd, cnp.npy_intp* dims, int typenum
+    ):
+        # The array keeps a reference to the subscriber, so the memory stays
+        # mapped for as long as the array exists
+        cdef cnp.ndarray arr = cnp.PyArray_SimpleNewFromData(
+            nd, dims, typenum, self.base + info.offset,
+        )
+        cnp.PyArray_CLEARFLAGS(arr, cnp.NPY_ARRAY_WRITEABLE)
+        Py_INCREF(self)
+        cnp.PyArray_SetBaseObject(arr, self)
+        return arr
@@ -0,0 +1,60 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from libc.stdint cimport *
+
+from .wrapper cimport *
+from .receiver cimport Receiver
+from .sender cimport Sender
+from .video_frame cimport VideoRecvFrame
+from .audio_frame cimport AudioRecvFrame
+from .pacing cimport (
+    PacingClock_s, pacing_clock_init, pacing_clock_set_rate,
+    pacing_clock_reset, pacing_clock_wait,
+)
+
+
+cdef class SwitcherInput:
+    cdef readonly Receiver receiver
+    cdef readonly VideoRecvFrame video_frame
+    cdef readonly AudioRecvFrame audio_frame
+    cdef readonly Py_ssize_t index
+    cdef readonly size_t num_video_discarded, num_audio_discarded
+    cdef SwitcherInput next
+
+    cdef int _discard_stale(self, Py_ssize_t selected, Py_ssize_t fading) except -1 nogil
+    cdef size_t _keep_latest_video(self) except? -1 nogil
+    cdef size_t _keep_latest_audio(self) except? -1 nogil
+
+
+cdef class Switcher:
+    cdef readonly Sender sender
+    cdef readonly tuple inputs
+    cdef readonly bint send_video, send_audio
+    cdef readonly double crossfade
+    cdef readonly Py_ssize_t selected
+    cdef Py_ssize_t pending
+    cdef bint switch_pending
+    cdef SwitcherInput first_input
+    cdef SwitcherInput current
+    cdef SwitcherInput fade_from
+    cdef bint fading
+    cdef size_t fade_length, fade_position, fade_offset
+    cdef float* mix_buffer
+    cdef size_t mix_buffer_size
+    cdef PacingClock_s clock
+    cdef object thread
+    cdef bint stopping
+    cdef NDIlib_video_frame_v2_t video_frame_s
+    cdef NDIlib_audio_frame_v3_t audio_frame_s
+    cdef readonly size_t num_video_sent, num_audio_sent, num_switches
+    cdef readonly size_t num_video_missed, num_video_dropped
+
+    cdef int _run(self) except -1 nogil
+    cdef int _tick(self) except -1 nogil
+    cdef bint _apply_switch(self) except -1
+    cdef bint _forward_video(self) except -1 nogil
+    cdef size_t _forward_audio(self) except? -1 nogil
+    cdef int _mix_crossfade(self, float* data, size_t num_channels, size_t num_samples) except -1 nogil
+    cdef bint _send_video(self, NDIlib_video_frame_v2_t* p) noexcept nogil
+    cdef bint _send_audio(self, NDIlib_audio_frame_v3_t* p) noexcept nogil
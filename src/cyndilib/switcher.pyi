@@ -0,0 +1,55 @@
+from __future__ import annotations
+from fractions import Fraction
+from typing import Iterable
+
+from .sender import Sender
+from .receiver import Receiver
+from .video_frame import VideoRecvFrame
+from .audio_frame import AudioRecvFrame
+
+
+class SwitcherInput:
+    receiver: Receiver
+    video_frame: VideoRecvFrame|None
+    audio_frame: AudioRecvFrame|None
+    index: int
+    num_video_discarded: int
+    num_audio_discarded: int
+    def __init__(self, receiver: Receiver, index: int) -> None: ...
+
+
+class Switcher:
+    sender: Sender|None
+    inputs: tuple[SwitcherInput, ...]
+    send_video: bool
+    send_audio: bool
+    crossfade: float
+    selected: int
+    num_video_sent: int
+    num_audio_sent: int
+    num_switches: int
+    num_video_missed: int
+    num_video_dropped: int
+    def __init__(
+        self,
+        sender: Sender|None,
+        receivers: Iterable[Receiver],
+        frame_rate: Fraction|None = ...,
+        crossfade: float = ...,
+        video: bool = ...,
+        audio: bool = ...,
+    ) -> None: ...
+    def __enter__(self) -> Switcher: ...
+    def __exit__(self, *args) -> None: ...
+    def __len__(self) -> int: ...
+    @property
+    def receivers(self) -> tuple[Receiver, ...]: ...
+    @property
+    def is_running(self) -> bool: ...
+    @property
+    def frame_rate(self) -> Fraction: ...
+    @property
+    def pending_input(self) -> int: ...
+    def select(self, index: int) -> None: ...
+    def start(self) -> None: ...
+    def stop(self) -> None: ...
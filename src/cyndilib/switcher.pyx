@@ -0,0 +1,497 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+Frame-accurate switching between receivers into a :class:`~.sender.Sender`
+
+:class:`Switcher` forwards the frames of one of several receivers to a
+single sender on its own output clock. Video is sent to |NDI| directly
+from the receive buffers of the selected input::
+
+    receivers = []
+    for src in sources:
+        rx = Receiver()
+        rx.set_video_frame(VideoRecvFrame())
+        rx.set_audio_frame(AudioRecvFrame())
+        rx.set_source(src)
+        receivers.append(rx)
+    threads = [RecvThread(rx, 100) for rx in receivers]
+    ...
+    with Sender('Program') as sender:
+        with Switcher(sender, receivers, crossfade=.02) as switcher:
+            ...
+            switcher.select(2)
+
+.. versionadded:: 0.0.10
+
+"""
+
+cimport cython
+from libc.stdlib cimport realloc, free
+from libc.string cimport memcpy
+
+from fractions import Fraction
+import threading
+
+__all__ = ('Switcher', 'SwitcherInput')
+
+
+cdef class SwitcherInput:
+    """An input of a :class:`Switcher`
+
+    Created by the switcher for each of its receivers.
+
+    While an input is not selected, all but the most recent of its buffered
+    frames are discarded on each tick so the receiver's buffers don't fill
+    and a switch to it starts with a current frame.
+
+    Attributes:
+        receiver (Receiver): The input receiver
+        video_frame (VideoRecvFrame): The receiver's
+            :attr:`~.receiver.Receiver.video_frame` (or ``None``)
+        audio_frame (AudioRecvFrame): The receiver's
+            :attr:`~.receiver.Receiver.audio_frame` (or ``None``)
+        index (int): Index of the input in :attr:`Switcher.inputs`
+        num_video_discarded (int): Number of video frames discarded while
+            not selected
+        num_audio_discarded (int): Number of audio frames discarded while
+            not selected (or when selected)
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.num_video_discarded = 0
+        self.num_audio_discarded = 0
+
+    def __init__(self, Receiver receiver not None, Py_ssize_t index):
+        if receiver.video_frame is None and receiver.audio_frame is None:
+            raise ValueError('receivers must have a video_frame or audio_frame')
+        self.receiver = receiver
+        self.video_frame = receiver.video_frame
+        self.audio_frame = receiver.audio_frame
+        self.index = index
+
+    def __repr__(self):
+        return f'<SwitcherInput {self.index}: {self.receiver!r}>'
+
+    cdef int _discard_stale(self, Py_ssize_t selected, Py_ssize_t fading) except -1 nogil:
+        # Called on the first input and passed along the chain
+        if self.index != selected:
+            self._keep_latest_video()
+            if self.index != fading:
+                self._keep_latest_audio()
+        if self.next is not None:
+            self.next._discard_stale(selected, fading)
+        return 0
+
+    cdef size_t _keep_latest_video(self) except? -1 nogil:
+        cdef size_t idx, num_discarded = 0
+        if self.video_frame is None:
+            return 0
+        self.video_frame.read_lock._acquire(True, -1)
+        try:
+            while self.video_frame.read_indices.size() > 1:
+                idx = self.video_frame.read_indices.front()
+                self.video_frame.read_indices.pop_front()
+                self.video_frame.read_indices_set.erase(idx)
+                num_discarded += 1
+        finally:
+            self.video_frame.read_lock._release()
+        self.num_video_discarded += num_discarded
+        return num_discarded
+
+    cdef size_t _keep_latest_audio(self) except? -1 nogil:
+        cdef size_t idx, num_discarded = 0
+        if self.audio_frame is None:
+            return 0
+        self.audio_frame.read_lock._acquire(True, -1)
+        try:
+            while self.audio_frame.read_indices.size() > 1:
+                idx = self.audio_frame.read_indices.front()
+                self.audio_frame.read_indices.pop_front()
+                self.audio_frame.read_indices_set.erase(idx)
+                self.audio_frame.frame_timestamps.pop_front()
+                num_discarded += 1
+        finally:
+            self.audio_frame.read_lock._release()
+        self.num_audio_discarded += num_discarded
+        return num_discarded
+
+
+cdef class Switcher:
+    """Forwards the frames of the selected receiver through a
+    :class:`~.sender.Sender` from a background thread
+
+    On each tick of the output clock the most recent video frame of the
+    selected input is sent (older buffered frames are discarded), followed
+    by all of its buffered audio. Only the most recent frames of the other
+    inputs are kept (see :class:`SwitcherInput`). Video frames are sent from
+    the receive buffers of the input's :class:`~.video_frame.VideoRecvFrame`
+    without copying them. Audio frames are copied out of the
+    :class:`~.audio_frame.AudioRecvFrame` one at a time (to apply its
+    reference level and the crossfade). Neither holds the receiver's read
+    lock while sending. The thread runs without the :term:`GIL` except for
+    a brief moment when a switch takes effect.
+
+    The receivers must be driven by something else (such as a
+    :class:`~.receiver.RecvThread`) and should not be read from while the
+    switcher is running. The sender must be open before calling
+    :meth:`start`. While running, nothing else should be sent through it.
+
+    Arguments:
+        sender (Sender): The sender to use
+        receivers: A sequence of :class:`~.receiver.Receiver` objects to
+            switch between. Each must have its
+            :attr:`~.receiver.Receiver.video_frame` or
+            :attr:`~.receiver.Receiver.audio_frame` set
+        frame_rate (fractions.Fraction, optional): Rate of the output clock.
+            Defaults to the frame rate of the sender's
+            :attr:`~.sender.Sender.video_frame` (if set) or ``30000/1001``
+        crossfade (float, optional): Duration (in seconds) of the audio
+            crossfade when switching. Defaults to ``0`` (a hard cut)
+        video (bool, optional): Whether to send video frames
+        audio (bool, optional): Whether to send audio frames
+
+    This class supports use as a :term:`context manager`, calling
+    :meth:`start` and :meth:`stop`.
+
+    Attributes:
+        inputs (tuple): The :class:`SwitcherInput` for each receiver
+        selected (int): Index of the input currently being sent
+        num_video_sent (int): Number of video frames sent
+        num_audio_sent (int): Number of audio frames sent
+        num_switches (int): Number of times the selected input changed
+        num_video_missed (int): Number of ticks where the selected input had
+            no new video frame
+        num_video_dropped (int): Number of buffered video frames discarded
+            in favor of a more recent one
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.selected = -1
+        self.pending = 0
+        self.switch_pending = True
+        self.fading = False
+        self.fade_length = 0
+        self.fade_position = 0
+        self.fade_offset = 0
+        self.mix_buffer = NULL
+        self.mix_buffer_size = 0
+        self.stopping = False
+        self.num_video_sent = 0
+        self.num_audio_sent = 0
+        self.num_switches = 0
+        self.num_video_missed = 0
+        self.num_video_dropped = 0
+        pacing_clock_init(&self.clock)
+
+    def __init__(
+        self,
+        Sender sender,
+        object receivers,
+        object frame_rate=None,
+        double crossfade=0,
+        bint video=True,
+        bint audio=True,
+    ):
+        cdef SwitcherInput inp, prev = None
+        cdef list inputs = []
+        if crossfade < 0:
+            raise ValueError('crossfade cannot be negative')
+        self.sender = sender
+        for rx in receivers:
+            inp = SwitcherInput(rx, len(inputs))
+            if prev is None:
+                self.first_input = inp
+            else:
+                prev.next = inp
+            inputs.append(inp)
+            prev = inp
+        if not len(inputs):
+            raise ValueError('at least one receiver is required')
+        self.inputs = tuple(inputs)
+        if frame_rate is None:
+            if sender is not None and sender.has_video_frame:
+                frame_rate = sender.video_frame.get_frame_rate()
+            else:
+                frame_rate = Fraction(30000, 1001)
+        frame_rate = Fraction(frame_rate)
+        pacing_clock_set_rate(&self.clock, frame_rate.numerator, frame_rate.denominator)
+        self.crossfade = crossfade
+        self.send_video = video
+        self.send_audio = audio
+
+    def __dealloc__(self):
+        cdef float* buffer = self.mix_buffer
+        self.mix_buffer = NULL
+        if buffer is not NULL:
+            free(buffer)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def __len__(self):
+        return len(self.inputs)
+
+    @property
+    def receivers(self) -> tuple:
+        """The input receivers
+        """
+        return tuple(inp.receiver for inp in self.inputs)
+
+    @property
+    def is_running(self) -> bool:
+        """``True`` while the switching thread is running
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    @property
+    def frame_rate(self) -> Fraction:
+        """Rate of the output clock
+        """
+        return Fraction(self.clock.numerator, self.clock.denominator)
+
+    @property
+    def pending_input(self) -> int:
+        """Index of the input that will be sent from the next tick on
+        """
+        return self.pending
+
+    def select(self, Py_ssize_t index):
+        """Select the input to send
+
+        The switch takes effect on the next tick of the output clock.
+        Buffered audio of the new input received before the switch is
+        discarded.
+        """
+        if not 0 <= index < len(self.inputs):
+            raise IndexError(f'Invalid input index: {index}')
+        self.pending = index
+        self.switch_pending = index != self.selected
+
+    def start(self):
+        """Start the switching thread
+        """
+        if self.is_running:
+            return
+        self.stopping = False
+        self.thread = threading.Thread(target=self._thread_func, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the switching thread and wait for it to exit
+        """
+        if self.thread is None:
+            return
+        self.stopping = True
+        self.thread.join()
+        self.thread = None
+
+    def _thread_func(self):
+        with nogil:
+            self._run()
+
+    cdef int _run(self) except -1 nogil:
+        pacing_clock_reset(&self.clock)
+        while not self.stopping:
+            pacing_clock_wait(&self.clock)
+            if self.stopping:
+                break
+            self._tick()
+        return 0
+
+    cdef int _tick(self) except -1 nogil:
+        cdef bint switched
+        if self.switch_pending:
+            with gil:
+                switched = self._apply_switch()
+            if switched:
+                # Audio buffered before the switch would only add latency
+                self.current._keep_latest_audio()
+        if self.current is None:
+            return 0
+        self.first_input._discard_stale(
+            self.selected, self.fade_from.index if self.fading else -1,
+        )
+        if self.send_video and self.current.video_frame is not None:
+            self._forward_video()
+        if self.send_audio and self.current.audio_frame is not None:
+            self._forward_audio()
+        return 0
+
+    cdef bint _apply_switch(self) except -1:
+        cdef SwitcherInput prev = self.current
+        cdef SwitcherInput inp = self.inputs[self.pending]
+        cdef int sample_rate
+        self.switch_pending = False
+        if inp is prev:
+            return False
+        if prev is not None:
+            self.num_switches += 1
+        self.selected = inp.index
+        self.current = inp
+        self.fading = False
+        self.fade_from = None
+        if self.crossfade <= 0 or prev is None:
+            return True
+        if prev.audio_frame is None or inp.audio_frame is None:
+            return True
+        sample_rate = prev.audio_frame._get_sample_rate()
+        if sample_rate <= 0:
+            return True
+        # The previous input's buffered audio continues from where it was
+        # last read and is faded out over the new input's first samples
+        self.fade_from = prev
+        self.fade_length = <size_t>(self.crossfade * sample_rate)
+        self.fade_position = 0
+        self.fade_offset = 0
+        self.fading = self.fade_length > 0
+        return True
+
+    cdef bint _forward_video(self) except -1 nogil:
+        cdef NDIlib_video_frame_v2_t* p = &self.video_frame_s
+        cdef NDIlib_video_frame_v2_t* src = self.current.video_frame.ptr
+        cdef size_t idx, size, num_dropped
+        cdef uint8_t* data
+        cdef bint sent
+
+        # The buffer is kept from being reused by the receiver until the
+        # synchronous send returns, without blocking it while sending
+        if not self.current.video_frame._reserve_latest(&idx, &data, &size, &num_dropped):
+            self.num_video_missed += 1
+            return False
+        self.num_video_dropped += num_dropped
+        try:
+            p.xres = src.xres
+            p.yres = src.yres
+            p.FourCC = src.FourCC
+            p.frame_rate_N = self.clock.numerator
+            p.frame_rate_D = self.clock.denominator
+            p.picture_aspect_ratio = src.picture_aspect_ratio
+            p.frame_format_type = src.frame_format_type
+            p.timecode = NDIlib_send_timecode_synthesize
+            p.p_data = data
+            p.line_stride_in_bytes = src.line_stride_in_bytes
+            p.p_metadata = NULL
+            p.timestamp = 0
+
+            sent = self._send_video(p)
+            if sent:
+                self.num_video_sent += 1
+            return sent
+        finally:
+            self.current.video_frame._release_reserved(idx)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef size_t _forward_audio(self) except? -1 nogil:
+        cdef NDIlib_audio_frame_v3_t* p = &self.audio_frame_s
+        cdef size_t idx, num_channels, num_samples, frame_size, i
+        cdef size_t num_sent = 0
+        cdef int sample_rate
+        cdef double scale
+        cdef float* data
+        cdef float* buffer
+
+        while True:
+            # Each frame is copied (and scaled to the frame's reference
+            # level) so the lock isn't held while it's sent
+            self.current.audio_frame.read_lock._acquire(True, -1)
+            try:
+                if not self.current.audio_frame.read_indices.size():
+                    break
+                num_channels = self.current.audio_frame.all_frame_data.shape[1]
+                num_samples = self.current.audio_frame.all_frame_data.shape[2]
+                frame_size = num_channels * num_samples
+                scale = self.current.audio_frame.reference_converter.ptr.multiplier
+                sample_rate = self.current.audio_frame._get_sample_rate()
+                idx = self.current.audio_frame.read_indices.front()
+                if frame_size > self.mix_buffer_size:
+                    buffer = <float*>realloc(self.mix_buffer, frame_size * sizeof(float))
+                    if buffer is NULL:
+                        raise_mem_err()
+                    self.mix_buffer = buffer
+                    self.mix_buffer_size = frame_size
+                data = <float*>self.current.audio_frame.all_frame_data.data + idx * frame_size
+                if scale == 1:
+                    memcpy(self.mix_buffer, data, frame_size * sizeof(float))
+                else:
+                    for i in range(frame_size):
+                        self.mix_buffer[i] = data[i] * scale
+                self.current.audio_frame.read_indices.pop_front()
+                self.current.audio_frame.read_indices_set.erase(idx)
+                self.current.audio_frame.frame_timestamps.pop_front()
+            finally:
+                self.current.audio_frame.read_lock._release()
+
+            if self.fading:
+                self._mix_crossfade(self.mix_buffer, num_channels, num_samples)
+            p.sample_rate = sample_rate
+            p.no_channels = num_channels
+            p.no_samples = num_samples
+            p.timecode = NDIlib_send_timecode_synthesize
+            p.FourCC = NDIlib_FourCC_audio_type_FLTP
+            p.p_data = <uint8_t*>self.mix_buffer
+            p.channel_stride_in_bytes = num_samples * sizeof(float)
+            p.p_metadata = NULL
+            p.timestamp = 0
+            if self._send_audio(p):
+                self.num_audio_sent += 1
+                num_sent += 1
+        return num_sent
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef int _mix_crossfade(self, float* data, size_t num_channels, size_t num_samples) except -1 nogil:
+        # Mix the remaining samples of the previous input into data (already
+        # in NDI levels) with a linear ramp
+        cdef size_t j, c, idx = 0, prev_channels, prev_samples
+        cdef float gain, prev_value
+        cdef float* prev = NULL
+        cdef double prev_scale
+
+        self.fade_from.audio_frame.read_lock._acquire(True, -1)
+        try:
+            prev_channels = self.fade_from.audio_frame.all_frame_data.shape[1]
+            prev_samples = self.fade_from.audio_frame.all_frame_data.shape[2]
+            prev_scale = self.fade_from.audio_frame.reference_converter.ptr.multiplier
+            for j in range(num_samples):
+                if self.fade_position >= self.fade_length:
+                    self.fading = False
+                    break
+                gain = <float>self.fade_position / self.fade_length
+                if prev is NULL and self.fade_from.audio_frame.read_indices.size() and prev_samples > 0:
+                    idx = self.fade_from.audio_frame.read_indices.front()
+                    prev = <float*>self.fade_from.audio_frame.all_frame_data.data + idx * prev_channels * prev_samples
+                for c in range(num_channels):
+                    prev_value = 0
+                    if prev is not NULL and c < prev_channels:
+                        prev_value = prev[c * prev_samples + self.fade_offset] * prev_scale
+                    data[c * num_samples + j] = (
+                        data[c * num_samples + j] * gain + prev_value * (1 - gain)
+                    )
+                if prev is not NULL:
+                    self.fade_offset += 1
+                    if self.fade_offset >= prev_samples:
+                        self.fade_from.audio_frame.read_indices.pop_front()
+                        self.fade_from.audio_frame.read_indices_set.erase(idx)
+                        self.fade_from.audio_frame.frame_timestamps.pop_front()
+                        self.fade_offset = 0
+                        prev = NULL
+                self.fade_position += 1
+            if self.fade_position >= self.fade_length:
+                self.fading = False
+        finally:
+            self.fade_from.audio_frame.read_lock._release()
+        return 0
+
+    cdef bint _send_video(self, NDIlib_video_frame_v2_t* p) noexcept nogil:
+        if self.sender is None:
+            return False
+        return self.sender._send_video_frame(p, False)
+
+    cdef bint _send_audio(self, NDIlib_audio_frame_v3_t* p) noexcept nogil:
+        if self.sender is None:
+            return False
+        return self.sender._send_audio_frame(p)
@@ -0,0 +1,144 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from libc.stdint cimport *
+from libcpp.vector cimport vector
+cimport numpy as cnp
+
+from .wrapper cimport *
+from .sender cimport Sender
+from .video_frame cimport VideoSendFrame
+from .audio_frame cimport AudioSendFrame
+from .send_frame_status cimport VideoSendFrame_item_s, AudioSendFrame_item_s
+from .pacing cimport (
+    PacingClock_s, pacing_clock_init, pacing_clock_set_rate,
+    pacing_clock_reset, pacing_clock_wait, pacing_clock_offset,
+)
+
+
+cpdef enum VideoPattern:
+    pattern_bars = 1
+    pattern_ramp = 2
+    pattern_black = 3
+
+
+cpdef enum AudioWaveform:
+    waveform_tone = 1
+    waveform_sweep = 2
+    waveform_silence = 3
+
+
+cdef struct Layout_s:
+    FourCC fourcc
+    size_t xres
+    size_t yres
+    size_t size
+    size_t[4] line_strides
+    size_t[4] offsets
+
+
+cdef struct Color_s:
+    uint8_t r
+    uint8_t g
+    uint8_t b
+    uint8_t a
+    uint8_t y
+    uint8_t u
+    uint8_t v
+    uint16_t y16
+    uint16_t u16
+    uint16_t v16
+    uint16_t a16
+
+
+cdef void color_init(Color_s* color, uint8_t r, uint8_t g, uint8_t b, uint8_t a) noexcept nogil
+cdef void fill_rect(
+    const Layout_s* layout,
+    uint8_t* data,
+    size_t x,
+    size_t y,
+    size_t width,
+    size_t height,
+    const Color_s* color,
+) noexcept nogil
+cdef void draw_text(
+    const Layout_s* layout,
+    uint8_t* data,
+    size_t x,
+    size_t y,
+    size_t scale,
+    const char* text,
+    const Color_s* fg,
+    const Color_s* bg,
+) noexcept nogil
+
+
+cdef class VideoTestSource:
+    cdef readonly size_t xres, yres
+    cdef readonly FourCC fourcc
+    cdef readonly VideoPattern pattern
+    cdef readonly bint moving_box, burn_in
+    cdef readonly int64_t frame_index
+    cdef PacingClock_s clock
+    cdef Layout_s layout
+    cdef cnp.ndarray background
+    cdef uint8_t* background_ptr
+    cdef size_t text_scale, box_size
+    cdef Color_s fg_color, bg_color, box_color
+
+    cdef int _render_background(self) except -1
+    cdef int _render(self, uint8_t* data, int64_t frame_index) except -1 nogil
+    cdef int _check_frame(self, VideoSendFrame frame) except -1
+    cdef int _write_frame(self, VideoSendFrame frame, int64_t frame_index) except -1 nogil
+
+
+cdef class AudioTestSource:
+    cdef readonly size_t num_channels
+    cdef readonly int sample_rate
+    cdef readonly AudioWaveform waveform
+    cdef readonly double frequency, amplitude
+    cdef readonly double sweep_start, sweep_end, sweep_time
+    cdef readonly int64_t sample_index
+    cdef PacingClock_s clock
+
+    cdef int _render(
+        self, float* dest, size_t num_samples, size_t channel_stride, int64_t sample_index,
+    ) except -1 nogil
+    cdef int _check_frame(self, AudioSendFrame frame) except -1
+    cdef int _write_frame(
+        self, AudioSendFrame frame, size_t num_samples, int64_t sample_index,
+    ) except -1 nogil
+
+
+cdef class LoadGenerator
+
+
+cdef class LoadGeneratorOutput:
+    cdef readonly Sender sender
+    cdef readonly VideoSendFrame video_frame
+    cdef readonly AudioSendFrame audio_frame
+    cdef readonly Py_ssize_t index
+    cdef readonly size_t worker
+    cdef readonly size_t num_video_sent, num_audio_sent, num_skipped
+    cdef LoadGeneratorOutput next
+
+    cdef int _tick(self, LoadGenerator generator, size_t worker, int64_t frame_index) except -1 nogil
+
+
+cdef class LoadGenerator:
+    cdef readonly VideoTestSource video
+    cdef readonly AudioTestSource audio
+    cdef readonly tuple outputs
+    cdef readonly size_t num_threads
+    cdef int64_t frame_rate_N, frame_rate_D
+    cdef LoadGeneratorOutput first_output
+    cdef vector[PacingClock_s] clocks
+    cdef list threads
+    cdef bint stopping
+
+    cdef int _setup(self, VideoTestSource video, AudioTestSource audio, object frame_rate, size_t num_threads) except -1
+    cdef int _add_output(self, Sender sender, VideoSendFrame video_frame, AudioSendFrame audio_frame) except -1
+    cdef int _run(self, size_t worker) except -1 nogil
+    cdef int _tick(self, size_t worker, int64_t frame_index) except -1 nogil
+    cdef bint _send_video(self, LoadGeneratorOutput output) noexcept nogil
+    cdef bint _send_audio(self, LoadGeneratorOutput output) noexcept nogil
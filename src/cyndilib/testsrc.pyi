@@ -0,0 +1,138 @@
+from __future__ import annotations
+from typing import Sequence
+import enum
+from fractions import Fraction
+
+import numpy as np
+import numpy.typing as npt
+
+from .sender import Sender
+from .video_frame import VideoSendFrame
+from .audio_frame import AudioSendFrame
+from .wrapper.ndi_structs import FourCC
+
+
+class VideoPattern(enum.IntEnum):
+    pattern_bars = 1
+    pattern_ramp = 2
+    pattern_black = 3
+
+
+class AudioWaveform(enum.IntEnum):
+    waveform_tone = 1
+    waveform_sweep = 2
+    waveform_silence = 3
+
+
+class VideoTestSource:
+    xres: int
+    yres: int
+    fourcc: FourCC
+    pattern: VideoPattern
+    moving_box: bool
+    burn_in: bool
+    frame_index: int
+    def __init__(
+        self,
+        xres: int = ...,
+        yres: int = ...,
+        fourcc: FourCC = ...,
+        frame_rate: Fraction|None = ...,
+        pattern: VideoPattern = ...,
+        moving_box: bool = ...,
+        burn_in: bool = ...,
+    ) -> None: ...
+    @property
+    def frame_rate(self) -> Fraction: ...
+    @property
+    def frame_size(self) -> int: ...
+    def setup_frame(self, frame: VideoSendFrame) -> None: ...
+    def render(
+        self,
+        dest: npt.NDArray[np.uint8]|None = ...,
+        frame_index: int|None = ...,
+    ) -> npt.NDArray[np.uint8]: ...
+    def write_frame(self, frame: VideoSendFrame) -> int: ...
+
+
+class AudioTestSource:
+    num_channels: int
+    sample_rate: int
+    waveform: AudioWaveform
+    frequency: float
+    amplitude: float
+    sweep_start: float
+    sweep_end: float
+    sweep_time: float
+    sample_index: int
+    def __init__(
+        self,
+        num_channels: int = ...,
+        sample_rate: int = ...,
+        waveform: AudioWaveform = ...,
+        frequency: float = ...,
+        amplitude: float = ...,
+        sweep_start: float = ...,
+        sweep_end: float = ...,
+        sweep_time: float = ...,
+    ) -> None: ...
+    def setup_frame(self, frame: AudioSendFrame) -> None: ...
+    def render(
+        self,
+        dest: npt.NDArray[np.float32],
+        sample_index: int|None = ...,
+    ) -> None: ...
+    def write_frame(self, frame: AudioSendFrame, num_samples: int) -> int: ...
+
+
+class LoadGeneratorOutput:
+    sender: Sender|None
+    video_frame: VideoSendFrame|None
+    audio_frame: AudioSendFrame|None
+    index: int
+    worker: int
+    num_video_sent: int
+    num_audio_sent: int
+    num_skipped: int
+    def __init__(
+        self,
+        sender: Sender|None,
+        video_frame: VideoSendFrame|None,
+        audio_frame: AudioSendFrame|None,
+        index: int,
+        worker: int,
+    ) -> None: ...
+
+
+class LoadGenerator:
+    video: VideoTestSource|None
+    audio: AudioTestSource|None
+    outputs: tuple[LoadGeneratorOutput, ...]
+    num_threads: int
+    def __init__(
+        self,
+        senders: Sequence[Sender],
+        video: VideoTestSource|None = ...,
+        audio: AudioTestSource|None = ...,
+        frame_rate: Fraction|None = ...,
+        num_threads: int = ...,
+    ) -> None: ...
+    def __enter__(self) -> LoadGenerator: ...
+    def __exit__(self, *args) -> None: ...
+    def __len__(self) -> int: ...
+    @property
+    def senders(self) -> tuple[Sender, ...]: ...
+    @property
+    def is_running(self) -> bool: ...
+    @property
+    def frame_rate(self) -> Fraction: ...
+    @property
+    def num_video_sent(self) -> int: ...
+    @property
+    def num_audio_sent(self) -> int: ...
+    @property
+    def num_skipped(self) -> int: ...
+    @property
+    def num_late(self) -> int: ...
+    def start(self) -> None: ...
+    def stop(self) -> None: ...
@@ -0,0 +1,964 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+Native test patterns and load generation for senders
+
+:class:`VideoTestSource` renders color bars or ramps with a moving box and
+a burned-in frame counter and timecode directly into the buffers of a
+:class:`~.video_frame.VideoSendFrame` in any supported
+:class:`~.wrapper.ndi_structs.FourCC`. :class:`AudioTestSource` does the
+same with tone or sweep audio for an :class:`~.audio_frame.AudioSendFrame`.
+Rendering is done without the :term:`GIL`.
+
+A single source can be sent manually::
+
+    video = VideoTestSource(1920, 1080, FourCC.UYVY, Fraction(60))
+    sender = Sender('Bars')
+    sender.set_video_frame(VideoSendFrame())
+    video.setup_frame(sender.video_frame)
+    with sender:
+        while True:
+            video.write_frame(sender.video_frame)
+            sender.send_video_async()
+
+Or :class:`LoadGenerator` can drive any number of senders from background
+threads::
+
+    senders = []
+    for i in range(32):
+        sender = Sender(f'Load {i}')
+        sender.set_video_frame(VideoSendFrame())
+        sender.set_audio_frame(AudioSendFrame())
+        video.setup_frame(sender.video_frame)
+        audio.setup_frame(sender.audio_frame)
+        senders.append(sender)
+    ...
+    with LoadGenerator(senders, video, audio, num_threads=4):
+        ...
+
+.. versionadded:: 0.0.10
+
+"""
+
+cimport cython
+from libc.math cimport sin, exp, log, fmod, M_PI
+from libc.stdio cimport snprintf
+from libc.string cimport memcpy, memset, strlen
+
+from fractions import Fraction
+import threading
+
+import numpy as np
+
+__all__ = (
+    'VideoTestSource', 'AudioTestSource', 'LoadGenerator',
+    'LoadGeneratorOutput', 'VideoPattern', 'AudioWaveform',
+)
+
+
+# 3x5 pixel glyphs for the digits, ":" and " " (one row per byte, with the
+# left column in bit 2)
+cdef uint8_t[60] FONT_GLYPHS
+for _i, _row in enumerate((
+    7, 5, 5, 5, 7,      # 0
+    2, 6, 2, 2, 7,      # 1
+    7, 1, 7, 4, 7,      # 2
+    7, 1, 7, 1, 7,      # 3
+    5, 5, 7, 1, 1,      # 4
+    7, 4, 7, 1, 7,      # 5
+    7, 4, 7, 5, 7,      # 6
+    7, 1, 1, 1, 1,      # 7
+    7, 5, 7, 5, 7,      # 8
+    7, 5, 7, 1, 7,      # 9
+    0, 2, 0, 2, 0,      # :
+    0, 0, 0, 0, 0,      # (space)
+)):
+    FONT_GLYPHS[_i] = _row
+
+# 75% color bars (white, yellow, cyan, green, magenta, red, blue)
+cdef uint8_t[21] BAR_COLORS
+for _i, _row in enumerate((
+    191, 191, 191,
+    191, 191, 0,
+    0, 191, 191,
+    0, 191, 0,
+    191, 0, 191,
+    191, 0, 0,
+    0, 0, 191,
+)):
+    BAR_COLORS[_i] = _row
+
+
+cdef void color_init(Color_s* color, uint8_t r, uint8_t g, uint8_t b, uint8_t a) noexcept nogil:
+    """Set the RGB values of *color* along with their limited range BT.709
+    YCbCr (8 and 16-bit) equivalents
+    """
+    cdef double rf = r / 255., gf = g / 255., bf = b / 255.
+    cdef double luma = .2126 * rf + .7152 * gf + .0722 * bf
+    cdef double y = 16 + 219 * luma
+    cdef double u = 128 + 224 * (bf - luma) / 1.8556
+    cdef double v = 128 + 224 * (rf - luma) / 1.5748
+    color.r = r
+    color.g = g
+    color.b = b
+    color.a = a
+    color.y = <uint8_t>(y + .5)
+    color.u = <uint8_t>(u + .5)
+    color.v = <uint8_t>(v + .5)
+    color.y16 = <uint16_t>(y * 256 + .5)
+    color.u16 = <uint16_t>(u * 256 + .5)
+    color.v16 = <uint16_t>(v * 256 + .5)
+    color.a16 = <uint16_t>a * 257
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void fill_rect(
+    const Layout_s* layout,
+    uint8_t* data,
+    size_t x,
+    size_t y,
+    size_t width,
+    size_t height,
+    const Color_s* color,
+) noexcept nogil:
+    """Fill a rectangle of the frame in *data* with *color*
+
+    The rectangle is clipped to the frame. For formats with subsampled
+    chroma, the chroma of the pixels sharing a sample with the edges of the
+    rectangle is overwritten as well.
+    """
+    cdef FourCC fourcc = layout.fourcc
+    cdef size_t row, px, cx, x1, cx0, cx1
+    cdef uint8_t* row_p
+    cdef uint8_t* row_p2
+    cdef uint16_t* row16
+    cdef uint8_t c0, c1, c2, c3
+
+    if x >= layout.xres or y >= layout.yres or width == 0 or height == 0:
+        return
+    if width > layout.xres - x:
+        width = layout.xres - x
+    if height > layout.yres - y:
+        height = layout.yres - y
+    x1 = x + width
+    cx0 = x >> 1
+    cx1 = (x1 + 1) >> 1
+
+    if fourcc == FourCC.BGRA or fourcc == FourCC.BGRX or fourcc == FourCC.RGBA or fourcc == FourCC.RGBX:
+        if fourcc == FourCC.BGRA or fourcc == FourCC.BGRX:
+            c0, c2 = color.b, color.r
+        else:
+            c0, c2 = color.r, color.b
+        c1 = color.g
+        c3 = color.a if fourcc == FourCC.BGRA or fourcc == FourCC.RGBA else 255
+        for row in range(y, y + height):
+            row_p = data + row * layout.line_strides[0]
+            for px in range(x, x1):
+                row_p[px * 4] = c0
+                row_p[px * 4 + 1] = c1
+                row_p[px * 4 + 2] = c2
+                row_p[px * 4 + 3] = c3
+    elif fourcc == FourCC.UYVY or fourcc == FourCC.UYVA:
+        for row in range(y, y + height):
+            row_p = data + row * layout.line_strides[0]
+            for cx in range(cx0, cx1):
+                row_p[cx * 4] = color.u
+                row_p[cx * 4 + 2] = color.v
+            for px in range(x, x1):
+                row_p[px * 2 + 1] = color.y
+            if fourcc == FourCC.UYVA:
+                row_p = data + layout.offsets[1] + row * layout.line_strides[1]
+                memset(row_p + x, color.a, width)
+    elif fourcc == FourCC.P216 or fourcc == FourCC.PA16:
+        for row in range(y, y + height):
+            row16 = <uint16_t*>(data + row * layout.line_strides[0])
+            for px in range(x, x1):
+                row16[px] = color.y16
+            row16 = <uint16_t*>(data + layout.offsets[1] + row * layout.line_strides[1])
+            for cx in range(cx0, cx1):
+                row16[cx * 2] = color.u16
+                row16[cx * 2 + 1] = color.v16
+            if fourcc == FourCC.PA16:
+                row16 = <uint16_t*>(data + layout.offsets[2] + row * layout.line_strides[2])
+                for px in range(x, x1):
+                    row16[px] = color.a16
+    elif fourcc == FourCC.NV12:
+        for row in range(y, y + height):
+            memset(data + row * layout.line_strides[0] + x, color.y, width)
+            row_p = data + layout.offsets[1] + (row >> 1) * layout.line_strides[1]
+            for cx in range(cx0, cx1):
+                row_p[cx * 2] = color.u
+                row_p[cx * 2 + 1] = color.v
+    elif fourcc == FourCC.I420 or fourcc == FourCC.YV12:
+        # The U plane comes first in I420 and second in YV12
+        if fourcc == FourCC.I420:
+            c0, c1 = color.u, color.v
+        else:
+            c0, c1 = color.v, color.u
+        for row in range(y, y + height):
+            memset(data + row * layout.line_strides[0] + x, color.y, width)
+            row_p = data + layout.offsets[1] + (row >> 1) * layout.line_strides[1]
+            row_p2 = data + layout.offsets[2] + (row >> 1) * layout.line_strides[2]
+            memset(row_p + cx0, c0, cx1 - cx0)
+            memset(row_p2 + cx0, c1, cx1 - cx0)
+
+
+cdef void draw_text(
+    const Layout_s* layout,
+    uint8_t* data,
+    size_t x,
+    size_t y,
+    size_t scale,
+    const char* text,
+    const Color_s* fg,
+    const Color_s* bg,
+) noexcept nogil:
+    """Draw *text* (digits, ``":"`` and spaces) with its top left corner at
+    (*x*, *y*) on a box filled with *bg*
+
+    Each glyph is 3x5 pixels multiplied by *scale*.
+    """
+    cdef size_t num_chars = strlen(text), i, row, col, glyph
+    cdef uint8_t bits
+    cdef char c
+    fill_rect(layout, data, x, y, (num_chars * 4 + 1) * scale, 7 * scale, bg)
+    for i in range(num_chars):
+        c = text[i]
+        if c >= 48 and c <= 57:
+            glyph = c - 48
+        elif c == 58:
+            glyph = 10
+        else:
+            glyph = 11
+        for row in range(5):
+            bits = FONT_GLYPHS[glyph * 5 + row]
+            for col in range(3):
+                if bits & (4 >> col):
+                    fill_rect(
+                        layout, data, x + (i * 4 + col + 1) * scale,
+                        y + (row + 1) * scale, scale, scale, fg,
+                    )
+
+
+cdef size_t _bounce(size_t position, size_t span) noexcept nogil:
+    cdef size_t p
+    if span == 0:
+        return 0
+    p = position % (span * 2)
+    if p > span:
+        return span * 2 - p
+    return p
+
+
+cdef class VideoTestSource:
+    """Renders test patterns into video frames
+
+    The frame is filled with the :attr:`pattern`. If enabled, a white box
+    bounces around the frame and the frame index and its timecode
+    (``HH:MM:SS:FF``) are drawn in the top left corner. The pattern is
+    rendered once (on creation) so each frame only needs a copy of it and
+    the moving parts drawn over it.
+
+    YCbCr formats use limited range BT.709 values.
+
+    Arguments:
+        xres (int, optional): Horizontal resolution. Defaults to ``1920``
+        yres (int, optional): Vertical resolution. Defaults to ``1080``
+        fourcc (FourCC, optional): The pixel format. Defaults to
+            :attr:`~.wrapper.ndi_structs.FourCC.UYVY`
+        frame_rate (fractions.Fraction, optional): The frame rate (used for
+            the timecode). Defaults to ``30000/1001``
+        pattern (VideoPattern, optional): The background pattern. Defaults to
+            :attr:`~VideoPattern.pattern_bars`
+        moving_box (bool, optional): Whether to draw the moving box
+        burn_in (bool, optional): Whether to draw the frame index and timecode
+
+    Attributes:
+        xres (int): Horizontal resolution
+        yres (int): Vertical resolution
+        fourcc (FourCC): The pixel format
+        pattern (VideoPattern): The background pattern
+        moving_box (bool): Whether the moving box is drawn
+        burn_in (bool): Whether the frame index and timecode are drawn
+        frame_index (int): Index of the next frame written by
+            :meth:`write_frame`
+
+    Raises:
+        ValueError: If the resolution is not a positive, even number of pixels
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.frame_index = 0
+        self.background_ptr = NULL
+        color_init(&self.fg_color, 255, 255, 255, 255)
+        color_init(&self.bg_color, 0, 0, 0, 255)
+        color_init(&self.box_color, 255, 255, 255, 255)
+
+    def __init__(
+        self,
+        size_t xres=1920,
+        size_t yres=1080,
+        FourCC fourcc=FourCC.UYVY,
+        object frame_rate=None,
+        VideoPattern pattern=VideoPattern.pattern_bars,
+        bint moving_box=True,
+        bint burn_in=True,
+    ):
+        cdef FourCCPackInfo* pack_info
+        cdef size_t i
+        if xres == 0 or yres == 0 or xres % 2 or yres % 2:
+            raise ValueError('xres and yres must be positive and even')
+        if frame_rate is None:
+            frame_rate = Fraction(30000, 1001)
+        frame_rate = Fraction(frame_rate)
+        if frame_rate <= 0:
+            raise ValueError('frame_rate must be positive')
+        self.xres = xres
+        self.yres = yres
+        self.fourcc = fourcc
+        # Only used for its rate (to calculate timecodes)
+        pacing_clock_init(&self.clock)
+        pacing_clock_set_rate(&self.clock, frame_rate.numerator, frame_rate.denominator)
+        self.pattern = pattern
+        self.moving_box = moving_box
+        self.burn_in = burn_in
+
+        pack_info = get_fourcc_pack_info(fourcc, xres, yres)
+        try:
+            self.layout.fourcc = fourcc
+            self.layout.xres = xres
+            self.layout.yres = yres
+            self.layout.size = pack_info.total_size
+            for i in range(4):
+                self.layout.line_strides[i] = pack_info.line_strides[i]
+                self.layout.offsets[i] = pack_info.stride_offsets[i]
+        finally:
+            fourcc_pack_info_destroy(pack_info)
+        self.text_scale = max(1, yres // 108)
+        self.box_size = max(2, (yres // 8) & ~1)
+        self._render_background()
+
+    @property
+    def frame_rate(self) -> Fraction:
+        """The frame rate
+        """
+        return Fraction(self.clock.numerator, self.clock.denominator)
+
+    @property
+    def frame_size(self) -> int:
+        """Size of each frame in bytes
+        """
+        return self.layout.size
+
+    def setup_frame(self, VideoSendFrame frame not None):
+        """Set the resolution, :class:`~.wrapper.ndi_structs.FourCC` and
+        frame rate of *frame* to match this source
+
+        This must be done before the frame's sender is opened.
+        """
+        frame.set_resolution(self.xres, self.yres)
+        frame.set_fourcc(self.fourcc)
+        frame.set_frame_rate(self.frame_rate)
+
+    def render(self, uint8_t[::1] dest=None, frame_index=None):
+        """Render a frame into *dest*
+
+        Arguments:
+            dest (optional): A writable, contiguous buffer of unsigned
+                8-bit integers of at least :attr:`frame_size`. If not
+                given, a new array is created
+            frame_index (int, optional): Index of the frame to render.
+                Defaults to :attr:`frame_index` (which is not changed)
+
+        Returns the array rendered into (*dest* if given)
+
+        Raises:
+            ValueError: If *dest* is too small
+        """
+        cdef int64_t index = self.frame_index if frame_index is None else frame_index
+        if dest is None:
+            dest = np.empty(self.layout.size, dtype=np.uint8)
+        elif <size_t>dest.shape[0] < self.layout.size:
+            raise ValueError('dest is too small for the frame')
+        with nogil:
+            self._render(&dest[0], index)
+        return dest.base
+
+    def write_frame(self, VideoSendFrame frame not None) -> int:
+        """Render the next frame into the write buffer of *frame* and mark
+        it ready to send
+
+        The frame can then be sent with :meth:`.sender.Sender.send_video`
+        or :meth:`.sender.Sender.send_video_async`. Its timecode is set to
+        the frame's time from the start of the stream.
+
+        Returns the index of the frame written
+
+        Raises:
+            ValueError: If the format of *frame* doesn't match or its sender
+                is not open
+        """
+        cdef int64_t index = self.frame_index
+        self._check_frame(frame)
+        with nogil:
+            self._write_frame(frame, index)
+        self.frame_index += 1
+        return index
+
+    cdef int _render_background(self) except -1:
+        cdef Color_s color
+        cdef size_t i, x0, x1, value
+        self.background = np.zeros(self.layout.size, dtype=np.uint8)
+        self.background_ptr = <uint8_t*>cnp.PyArray_DATA(self.background)
+        with nogil:
+            fill_rect(
+                &self.layout, self.background_ptr, 0, 0, self.xres, self.yres,
+                &self.bg_color,
+            )
+            if self.pattern == VideoPattern.pattern_bars:
+                for i in range(7):
+                    x0 = (i * self.xres // 7) & ~1
+                    x1 = ((i + 1) * self.xres // 7) & ~1
+                    color_init(
+                        &color, BAR_COLORS[i * 3], BAR_COLORS[i * 3 + 1],
+                        BAR_COLORS[i * 3 + 2], 255,
+                    )
+                    fill_rect(&self.layout, self.background_ptr, x0, 0, x1 - x0, self.yres, &color)
+            elif self.pattern == VideoPattern.pattern_ramp:
+                for i in range(self.xres):
+                    value = i * 255 // (self.xres - 1)
+                    color_init(&color, value, value, value, 255)
+                    fill_rect(&self.layout, self.background_ptr, i, 0, 1, self.yres, &color)
+        return 0
+
+    cdef int _render(self, uint8_t* data, int64_t frame_index) except -1 nogil:
+        cdef size_t box = self.box_size, scale = self.text_scale
+        cdef size_t x_speed, y_speed, bx, by
+        cdef int64_t fps, total_seconds
+        cdef char[32] text
+        memcpy(data, self.background_ptr, self.layout.size)
+        if self.moving_box:
+            x_speed = max(1, self.xres // 192)
+            y_speed = max(1, self.yres // 192)
+            bx = _bounce(frame_index * x_speed, self.xres - box) & ~1
+            by = _bounce(frame_index * y_speed, self.yres - box)
+            fill_rect(&self.layout, data, bx, by, box, box, &self.box_color)
+        if self.burn_in:
+            fps = (self.clock.numerator + self.clock.denominator - 1) // self.clock.denominator
+            total_seconds = frame_index // fps
+            snprintf(text, 32, '%08lld', <long long>(frame_index % 100000000))
+            draw_text(&self.layout, data, scale * 2, scale * 2, scale, text, &self.fg_color, &self.bg_color)
+            snprintf(
+                text, 32, '%02d:%02d:%02d:%02d',
+                <int>(total_seconds // 3600 % 24), <int>(total_seconds // 60 % 60),
+                <int>(total_seconds % 60), <int>(frame_index % fps),
+            )
+            draw_text(&self.layout, data, scale * 2, scale * 10, scale, text, &self.fg_color, &self.bg_color)
+        return 0
+
+    cdef int _check_frame(self, VideoSendFrame frame) except -1:
+        if (
+            <size_t>frame._get_xres() != self.xres or <size_t>frame._get_yres() != self.yres or
+            frame._get_fourcc() != self.fourcc
+        ):
+            raise ValueError('frame format does not match the source')
+        if not frame.send_status.data.attached_to_sender:
+            raise ValueError('frame buffers are not allocated until its sender is open')
+        return 0
+
+    cdef int _write_frame(self, VideoSendFrame frame, int64_t frame_index) except -1 nogil:
+        cdef VideoSendFrame_item_s* item = frame._prepare_buffer_write()
+        self._render(<uint8_t*>item.frame_ptr.p_data, frame_index)
+        item.frame_ptr.timecode = pacing_clock_offset(&self.clock, frame_index, 10000000)
+        frame._set_buffer_write_complete(item)
+        return 0
+
+
+cdef class AudioTestSource:
+    """Renders tone or sweep audio into audio frames
+
+    The same signal is rendered on all channels. Samples are computed from
+    their index in the stream, so the signal is continuous across frames of
+    any length.
+
+    Arguments:
+        num_channels (int, optional): Number of channels. Defaults to ``2``
+        sample_rate (int, optional): The sample rate. Defaults to ``48000``
+        waveform (AudioWaveform, optional): The signal to render. Defaults
+            to :attr:`~AudioWaveform.waveform_tone`
+        frequency (float, optional): Frequency of the tone in Hz.
+            Defaults to ``1000``
+        amplitude (float, optional): Peak amplitude of the signal (in the
+            units of the frame's :attr:`~.audio_frame.AudioFrame.reference_level`).
+            Defaults to ``0.1``
+        sweep_start (float, optional): Start frequency of the sweep in Hz.
+            Defaults to ``20``
+        sweep_end (float, optional): End frequency of the sweep in Hz.
+            Defaults to ``20000``
+        sweep_time (float, optional): Duration of the (logarithmic) sweep in
+            seconds, after which it starts over. Defaults to ``10``
+
+    Attributes:
+        num_channels (int): Number of channels
+        sample_rate (int): The sample rate
+        waveform (AudioWaveform): The signal rendered
+        frequency (float): Frequency of the tone
+        amplitude (float): Peak amplitude of the signal
+        sweep_start (float): Start frequency of the sweep
+        sweep_end (float): End frequency of the sweep
+        sweep_time (float): Duration of the sweep
+        sample_index (int): Index of the next sample written by
+            :meth:`write_frame`
+
+    Raises:
+        ValueError: If any of the arguments are out of range
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.sample_index = 0
+
+    def __init__(
+        self,
+        size_t num_channels=2,
+        int sample_rate=48000,
+        AudioWaveform waveform=AudioWaveform.waveform_tone,
+        double frequency=1000,
+        double amplitude=.1,
+        double sweep_start=20,
+        double sweep_end=20000,
+        double sweep_time=10,
+    ):
+        if num_channels == 0 or sample_rate <= 0:
+            raise ValueError('num_channels and sample_rate must be positive')
+        if frequency <= 0 or sweep_start <= 0 or sweep_end <= 0 or sweep_time <= 0:
+            raise ValueError('frequencies and sweep_time must be positive')
+        if amplitude < 0:
+            raise ValueError('amplitude cannot be negative')
+        self.num_channels = num_channels
+        self.sample_rate = sample_rate
+        # Only used for its rate (to calculate timecodes)
+        pacing_clock_init(&self.clock)
+        pacing_clock_set_rate(&self.clock, sample_rate, 1)
+        self.waveform = waveform
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.sweep_start = sweep_start
+        self.sweep_end = sweep_end
+        self.sweep_time = sweep_time
+
+    def setup_frame(self, AudioSendFrame frame not None):
+        """Set the sample rate and number of channels of *frame* to match
+        this source
+
+        This must be done before the frame's sender is opened.
+        """
+        frame.sample_rate = self.sample_rate
+        frame.num_channels = self.num_channels
+
+    def render(self, float[:, ::1] dest not None, sample_index=None):
+        """Render samples into *dest*
+
+        Arguments:
+            dest: A writable, contiguous 2-d buffer of 32-bit floats with
+                shape ``(num_channels, num_samples)``
+            sample_index (int, optional): Index of the first sample to
+                render. Defaults to :attr:`sample_index` (which is not changed)
+
+        Raises:
+            ValueError: If the number of channels in *dest* doesn't match
+        """
+        cdef int64_t index = self.sample_index if sample_index is None else sample_index
+        cdef size_t num_samples = dest.shape[1]
+        if <size_t>dest.shape[0] != self.num_channels:
+            raise ValueError('number of channels must match')
+        if num_samples == 0:
+            return
+        with nogil:
+            self._render(&dest[0, 0], num_samples, num_samples, index)
+
+    def write_frame(self, AudioSendFrame frame not None, size_t num_samples) -> int:
+        """Render the next *num_samples* into the write buffer of *frame*
+        and mark it ready to send
+
+        The frame can then be sent with :meth:`.sender.Sender.send_audio`.
+        Its timecode is set to the time of the first sample from the start
+        of the stream.
+
+        Returns the index of the first sample written
+
+        Raises:
+            ValueError: If the format of *frame* doesn't match, its sender is
+                not open or *num_samples* exceeds its
+                :attr:`~.audio_frame.AudioSendFrame.max_num_samples`
+        """
+        cdef int64_t index = self.sample_index
+        self._check_frame(frame)
+        if num_samples > frame.max_num_samples:
+            raise ValueError('num_samples exceeds the max_num_samples of the frame')
+        with nogil:
+            self._write_frame(frame, num_samples, index)
+        self.sample_index += num_samples
+        return index
+
+    @cython.cdivision(True)
+    cdef int _render(
+        self, float* dest, size_t num_samples, size_t channel_stride, int64_t sample_index,
+    ) except -1 nogil:
+        cdef double fs = self.sample_rate, cycles, t, rate = 0
+        cdef int64_t sweep_length = <int64_t>(self.sweep_time * fs), position
+        cdef size_t i, ch
+        if self.waveform == AudioWaveform.waveform_silence or self.amplitude == 0:
+            for ch in range(self.num_channels):
+                memset(dest + ch * channel_stride, 0, num_samples * sizeof(float))
+            return 0
+        if sweep_length < 1:
+            sweep_length = 1
+        if self.sweep_end != self.sweep_start:
+            rate = log(self.sweep_end / self.sweep_start) / self.sweep_time
+        for i in range(num_samples):
+            if self.waveform == AudioWaveform.waveform_sweep:
+                position = (sample_index + <int64_t>i) % sweep_length
+                t = position / fs
+                if rate == 0:
+                    cycles = self.sweep_start * t
+                else:
+                    # Integral of the exponentially rising frequency
+                    cycles = self.sweep_start * (exp(rate * t) - 1) / rate
+            else:
+                cycles = (sample_index + <int64_t>i) * self.frequency / fs
+            dest[i] = <float>(self.amplitude * sin(2 * M_PI * fmod(cycles, 1.)))
+        for ch in range(1, self.num_channels):
+            memcpy(dest + ch * channel_stride, dest, num_samples * sizeof(float))
+        return 0
+
+    cdef int _check_frame(self, AudioSendFrame frame) except -1:
+        if (
+            <size_t>frame._get_num_channels() != self.num_channels or
+            frame._get_sample_rate() != self.sample_rate
+        ):
+            raise ValueError('frame format does not match the source')
+        if not frame.send_status.data.attached_to_sender:
+            raise ValueError('frame buffers are not allocated until its sender is open')
+        return 0
+
+    cdef int _write_frame(
+        self, AudioSendFrame frame, size_t num_samples, int64_t sample_index,
+    ) except -1 nogil:
+        cdef AudioSendFrame_item_s* item = frame._prepare_buffer_write()
+        item.data.shape[1] = num_samples
+        item.data.strides[0] = sizeof(float) * num_samples
+        item.frame_ptr.no_samples = num_samples
+        item.frame_ptr.channel_stride_in_bytes = item.data.strides[0]
+        self._render(<float*>item.frame_ptr.p_data, num_samples, num_samples, sample_index)
+        item.frame_ptr.timecode = pacing_clock_offset(&self.clock, sample_index, 10000000)
+        # Converts to NDI levels in place (if needed) and marks it ready
+        frame._set_buffer_write_complete(item)
+        return 0
+
+
+cdef class LoadGeneratorOutput:
+    """A sender driven by a :class:`LoadGenerator`
+
+    Created by the generator for each of its senders.
+
+    Attributes:
+        sender (Sender): The sender
+        video_frame (VideoSendFrame): The frame video is written to
+            (``None`` if the generator has no video source)
+        audio_frame (AudioSendFrame): The frame audio is written to
+            (``None`` if the generator has no audio source)
+        index (int): Index of the output in :attr:`LoadGenerator.outputs`
+        worker (int): Index of the thread writing to this output
+        num_video_sent (int): Number of video frames sent
+        num_audio_sent (int): Number of audio frames sent
+        num_skipped (int): Number of video frames skipped because no buffer
+            was available
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.num_video_sent = 0
+        self.num_audio_sent = 0
+        self.num_skipped = 0
+
+    def __init__(
+        self,
+        Sender sender,
+        VideoSendFrame video_frame,
+        AudioSendFrame audio_frame,
+        Py_ssize_t index,
+        size_t worker,
+    ):
+        self.sender = sender
+        self.video_frame = video_frame
+        self.audio_frame = audio_frame
+        self.index = index
+        self.worker = worker
+
+    def __repr__(self):
+        return f'<LoadGeneratorOutput {self.index}: {self.sender!r}>'
+
+    cdef int _tick(self, LoadGenerator generator, size_t worker, int64_t frame_index) except -1 nogil:
+        # Called on the first output and passed along the chain
+        cdef int64_t sample_index, next_index
+        cdef int sample_rate
+        cdef PacingClock_s* clock
+        if self.worker == worker:
+            if self.video_frame is not None:
+                if self.video_frame._write_available():
+                    generator.video._write_frame(self.video_frame, frame_index)
+                    if generator._send_video(self):
+                        self.num_video_sent += 1
+                else:
+                    self.num_skipped += 1
+            if self.audio_frame is not None and self.audio_frame._write_available():
+                sample_rate = generator.audio.sample_rate
+                clock = &generator.clocks[self.worker]
+                sample_index = pacing_clock_offset(clock, frame_index, sample_rate)
+                next_index = pacing_clock_offset(clock, frame_index + 1, sample_rate)
+                generator.audio._write_frame(
+                    self.audio_frame, next_index - sample_index, sample_index,
+                )
+                if generator._send_audio(self):
+                    self.num_audio_sent += 1
+        if self.next is not None:
+            self.next._tick(generator, worker, frame_index)
+        return 0
+
+
+cdef class LoadGenerator:
+    """Sends test patterns through any number of senders from background
+    threads
+
+    On each tick of the output clock, the next frame of the :attr:`video`
+    source is rendered into the :attr:`~.sender.Sender.video_frame` of
+    each sender and sent asynchronously. The matching number of samples
+    from the :attr:`audio` source are rendered into its
+    :attr:`~.sender.Sender.audio_frame` and sent. All senders show the same
+    frame index at the same time. Nothing is copied and all work is done
+    without the :term:`GIL`.
+
+    The senders are split between *num_threads* threads, each with its own
+    output clock. Frames are written at the index of the clock's tick, so
+    when a thread falls behind, the skipped frames show in the frame counter.
+
+    The frames of each sender must be set up for the sources (see
+    :meth:`VideoTestSource.setup_frame` and
+    :meth:`AudioTestSource.setup_frame`). The senders must be open before
+    calling :meth:`start` and nothing else should be sent through them
+    while running.
+
+    Arguments:
+        senders: A sequence of :class:`~.sender.Sender` objects
+        video (VideoTestSource, optional): The video source
+        audio (AudioTestSource, optional): The audio source
+        frame_rate (fractions.Fraction, optional): Rate of the output clock.
+            Defaults to the :attr:`~VideoTestSource.frame_rate` of the video
+            source (or ``30000/1001``)
+        num_threads (int, optional): Number of threads. Defaults to ``1``
+
+    This class supports use as a :term:`context manager`, calling
+    :meth:`start` and :meth:`stop`.
+
+    Attributes:
+        video (VideoTestSource): The video source (or ``None``)
+        audio (AudioTestSource): The audio source (or ``None``)
+        outputs (tuple): The :class:`LoadGeneratorOutput` for each sender
+        num_threads (int): Number of threads
+
+    Raises:
+        ValueError: If there are no senders or sources, or a sender's frames
+            don't match the sources
+    """
+    def __cinit__(self, *args, **kwargs):
+        self.outputs = ()
+        self.threads = []
+        self.stopping = False
+
+    def __init__(
+        self,
+        object senders,
+        VideoTestSource video=None,
+        AudioTestSource audio=None,
+        object frame_rate=None,
+        size_t num_threads=1,
+    ):
+        cdef Sender sender
+        self._setup(video, audio, frame_rate, num_threads)
+        for sender in senders:
+            if video is not None and sender.video_frame is None:
+                raise ValueError('senders must have a video_frame')
+            if audio is not None and sender.audio_frame is None:
+                raise ValueError('senders must have an audio_frame')
+            self._add_output(sender, sender.video_frame, sender.audio_frame)
+        if not len(self.outputs):
+            raise ValueError('at least one sender is required')
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def __len__(self):
+        return len(self.outputs)
+
+    @property
+    def senders(self) -> tuple:
+        """The senders
+        """
+        return tuple(output.sender for output in self.outputs)
+
+    @property
+    def is_running(self) -> bool:
+        """``True`` while the generator threads are running
+        """
+        return any(t.is_alive() for t in self.threads)
+
+    @property
+    def frame_rate(self) -> Fraction:
+        """Rate of the output clock
+        """
+        return Fraction(self.frame_rate_N, self.frame_rate_D)
+
+    @property
+    def num_video_sent(self) -> int:
+        """Total number of video frames sent
+        """
+        return sum(output.num_video_sent for output in self.outputs)
+
+    @property
+    def num_audio_sent(self) -> int:
+        """Total number of audio frames sent
+        """
+        return sum(output.num_audio_sent for output in self.outputs)
+
+    @property
+    def num_skipped(self) -> int:
+        """Total number of video frames skipped because no buffer was available
+        """
+        return sum(output.num_skipped for output in self.outputs)
+
+    @property
+    def num_late(self) -> int:
+        """Number of ticks (of all threads) that started after their deadline
+        """
+        cdef size_t i
+        cdef int64_t result = 0
+        for i in range(self.clocks.size()):
+            result += self.clocks[i].late_count
+        return result
+
+    def start(self):
+        """Start the generator threads
+        """
+        cdef size_t worker
+        if self.is_running:
+            return
+        self.stopping = False
+        self.threads = []
+        for worker in range(self.num_threads):
+            t = threading.Thread(target=self._thread_func, args=(worker,), daemon=True)
+            self.threads.append(t)
+            t.start()
+
+    def stop(self):
+        """Stop the generator threads and wait for them to exit
+        """
+        self.stopping = True
+        for t in self.threads:
+            t.join()
+        self.threads = []
+
+    def _thread_func(self, size_t worker):
+        with nogil:
+            self._run(worker)
+
+    cdef int _setup(
+        self,
+        VideoTestSource video,
+        AudioTestSource audio,
+        object frame_rate,
+        size_t num_threads,
+    ) except -1:
+        cdef size_t i
+        if video is None and audio is None:
+            raise ValueError('a video or audio source is required')
+        if num_threads == 0:
+            raise ValueError('num_threads must be positive')
+        if frame_rate is None:
+            frame_rate = video.frame_rate if video is not None else Fraction(30000, 1001)
+        frame_rate = Fraction(frame_rate)
+        if frame_rate <= 0:
+            raise ValueError('frame_rate must be positive')
+        self.video = video
+        self.audio = audio
+        self.frame_rate_N = frame_rate.numerator
+        self.frame_rate_D = frame_rate.denominator
+        self.num_threads = num_threads
+        self.clocks.resize(num_threads)
+        for i in range(num_threads):
+            pacing_clock_init(&self.clocks[i])
+            pacing_clock_set_rate(&self.clocks[i], self.frame_rate_N, self.frame_rate_D)
+        return 0
+
+    cdef int _add_output(
+        self,
+        Sender sender,
+        VideoSendFrame video_frame,
+        AudioSendFrame audio_frame,
+    ) except -1:
+        cdef Py_ssize_t index = len(self.outputs)
+        cdef LoadGeneratorOutput output, prev
+        cdef int64_t max_samples
+        if self.video is None:
+            video_frame = None
+        elif video_frame is not None:
+            if (
+                <size_t>video_frame._get_xres() != self.video.xres or
+                <size_t>video_frame._get_yres() != self.video.yres or
+                video_frame._get_fourcc() != self.video.fourcc
+            ):
+                raise ValueError('video_frame format does not match the video source')
+        if self.audio is None:
+            audio_frame = None
+        elif audio_frame is not None:
+            if (
+                <size_t>audio_frame._get_num_channels() != self.audio.num_channels or
+                audio_frame._get_sample_rate() != self.audio.sample_rate
+            ):
+                raise ValueError('audio_frame format does not match the audio source')
+            max_samples = pacing_clock_offset(&self.clocks[0], 1, self.audio.sample_rate) + 1
+            if <size_t>max_samples > audio_frame.max_num_samples:
+                raise ValueError('audio_frame max_num_samples is too small for the frame_rate')
+        output = LoadGeneratorOutput(
+            sender, video_frame, audio_frame, index, index % self.num_threads,
+        )
+        if index == 0:
+            self.first_output = output
+        else:
+            prev = self.outputs[index - 1]
+            prev.next = output
+        self.outputs = self.outputs + (output,)
+        return 0
+
+    cdef int _run(self, size_t worker) except -1 nogil:
+        cdef PacingClock_s* clock = &self.clocks[worker]
+        pacing_clock_reset(clock)
+        while not self.stopping:
+            pacing_clock_wait(clock)
+            if self.stopping:
+                break
+            self._tick(worker, clock.frame_index - 1)
+        return 0
+
+    cdef int _tick(self, size_t worker, int64_t frame_index) except -1 nogil:
+        return self.first_output._tick(self, worker, frame_index)
+
+    cdef bint _send_video(self, LoadGeneratorOutput output) noexcept nogil:
+        if output.sender is None:
+            return False
+        return output.sender._send_video_async()
+
+    cdef bint _send_audio(self, LoadGeneratorOutput output) noexcept nogil:
+        if output.sender is None:
+            return False
+        return output.sender._send_audio()
@@ -0,0 +1,54 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from libc.stdint cimport *
+
+
+cdef enum:
+    STAGE_TIMING_NUM_BUCKETS = 24
+    STAGE_TIMER_MAX_STAGES = 8
+
+
+cpdef enum RecvStage:
+    recv_capture = 0
+    recv_process = 1
+    recv_callback = 2
+
+cpdef enum RecvFrameStage:
+    frame_process = 0
+    frame_lock_wait = 1
+    frame_read = 2
+
+cpdef enum SendStage:
+    send_pace = 0
+    send_write = 1
+    send_video = 2
+    send_audio = 3
+
+cpdef enum SendFrameStage:
+    send_frame_in_flight = 0
+
+
+cdef struct StageTiming_s:
+    uint64_t count
+    int64_t total_ns
+    int64_t min_ns
+    int64_t max_ns
+    uint64_t[STAGE_TIMING_NUM_BUCKETS] buckets
+
+
+cdef void stage_timing_init(StageTiming_s* ptr) noexcept nogil
+cdef size_t stage_timing_bucket_index(int64_t elapsed_ns) noexcept nogil
+cdef void stage_timing_add(StageTiming_s* ptr, int64_t elapsed_ns) noexcept nogil
+
+
+cdef class StageTimer:
+    cdef StageTiming_s[STAGE_TIMER_MAX_STAGES] stages
+    cdef readonly tuple stage_names
+    cdef size_t num_stages
+    cdef bint _enabled
+
+    cdef int64_t _start(self) noexcept nogil
+    cdef void _stop(self, size_t stage, int64_t start_ns) noexcept nogil
+    cdef void _reset(self) noexcept nogil
+    cpdef dict snapshot(self)
@@ -0,0 +1,33 @@
+from typing import Any, Iterable
+import enum
+
+
+class RecvStage(enum.IntEnum):
+    recv_capture = 0
+    recv_process = 1
+    recv_callback = 2
+
+class RecvFrameStage(enum.IntEnum):
+    frame_process = 0
+    frame_lock_wait = 1
+    frame_read = 2
+
+class SendStage(enum.IntEnum):
+    send_pace = 0
+    send_write = 1
+    send_video = 2
+    send_audio = 3
+
+class SendFrameStage(enum.IntEnum):
+    send_frame_in_flight = 0
+
+
+def get_bucket_edges() -> list[int|None]: ...
+
+
+class StageTimer:
+    stage_names: tuple[str, ...]
+    enabled: bool
+    def __init__(self, stage_names: Iterable[str]) -> None: ...
+    def reset(self) -> None: ...
+    def snapshot(self) -> dict[str, dict[str, Any]]: ...
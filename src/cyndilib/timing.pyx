@@ -0,0 +1,180 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+Low-overhead per-stage timing of the send and receive paths.
+
+:class:`~.receiver.Receiver`, :class:`~.sender.Sender` and their frame
+objects each own a :class:`StageTimer`. They are disabled by default and
+can be toggled together at runtime::
+
+    receiver.set_stage_timing_enabled(True)
+    ...
+    timings = receiver.get_stage_timings()
+    print(timings['video_frame']['lock_wait']['mean_ns'])
+
+.. versionadded:: 0.0.10
+
+"""
+
+from libc.string cimport memcpy
+
+from .clock cimport monotonic_ns
+
+__all__ = (
+    'StageTimer', 'RecvStage', 'RecvFrameStage', 'SendStage', 'SendFrameStage',
+    'get_bucket_edges',
+)
+
+
+cdef int64_t BUCKET_BASE_NS = 1000
+
+
+cdef void stage_timing_init(StageTiming_s* ptr) noexcept nogil:
+    cdef size_t i
+    ptr.count = 0
+    ptr.total_ns = 0
+    ptr.min_ns = 0
+    ptr.max_ns = 0
+    for i in range(STAGE_TIMING_NUM_BUCKETS):
+        ptr.buckets[i] = 0
+
+
+cdef size_t stage_timing_bucket_index(int64_t elapsed_ns) noexcept nogil:
+    # Bucket 0 holds values under 1 microsecond, each following bucket
+    # doubles the upper edge and the last one holds everything beyond
+    cdef int64_t v = elapsed_ns // BUCKET_BASE_NS
+    cdef size_t i = 0
+    while v > 0 and i < STAGE_TIMING_NUM_BUCKETS - 1:
+        v >>= 1
+        i += 1
+    return i
+
+
+cdef void stage_timing_add(StageTiming_s* ptr, int64_t elapsed_ns) noexcept nogil:
+    if elapsed_ns < 0:
+        elapsed_ns = 0
+    if ptr.count == 0 or elapsed_ns < ptr.min_ns:
+        ptr.min_ns = elapsed_ns
+    if elapsed_ns > ptr.max_ns:
+        ptr.max_ns = elapsed_ns
+    ptr.count += 1
+    ptr.total_ns += elapsed_ns
+    ptr.buckets[stage_timing_bucket_index(elapsed_ns)] += 1
+
+
+def get_bucket_edges():
+    """Get the upper edge (in nanoseconds) of each histogram bucket used by
+    :class:`StageTimer`
+
+    The first bucket holds durations under one microsecond and each bucket
+    after that doubles the edge. The last bucket has no upper edge and is
+    represented as ``None``.
+    """
+    cdef list result = []
+    cdef size_t i
+    for i in range(STAGE_TIMING_NUM_BUCKETS - 1):
+        result.append(BUCKET_BASE_NS << i)
+    result.append(None)
+    return result
+
+
+cdef class StageTimer:
+    """Monotonic clock counters and histograms for a fixed set of stages
+
+    Timing is disabled by default. While disabled, each instrumented stage
+    costs a single flag check. When :attr:`enabled`, each stage adds two
+    monotonic clock reads and a few integer operations.
+
+    Counters are updated without locking. A stage is normally only timed
+    from a single thread, but if two threads time the same stage at once
+    a sample may be lost.
+
+    Arguments:
+        stage_names: Names for each stage (at most ``8``)
+
+    .. versionadded:: 0.0.10
+
+    """
+    def __cinit__(self, *args, **kwargs):
+        cdef size_t i
+        self._enabled = False
+        self.num_stages = 0
+        self.stage_names = ()
+        for i in range(STAGE_TIMER_MAX_STAGES):
+            stage_timing_init(&self.stages[i])
+
+    def __init__(self, stage_names):
+        stage_names = tuple(stage_names)
+        if len(stage_names) > STAGE_TIMER_MAX_STAGES:
+            raise ValueError(f'At most {STAGE_TIMER_MAX_STAGES} stages allowed')
+        self.stage_names = stage_names
+        self.num_stages = len(stage_names)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether timing is enabled
+
+        This can be toggled at any time. Values recorded before timing was
+        disabled are kept until :meth:`reset` is called.
+        """
+        return self._enabled
+    @enabled.setter
+    def enabled(self, bint value):
+        self._enabled = value
+
+    def reset(self):
+        """Clear all recorded values
+        """
+        self._reset()
+
+    cdef void _reset(self) noexcept nogil:
+        cdef size_t i
+        for i in range(STAGE_TIMER_MAX_STAGES):
+            stage_timing_init(&self.stages[i])
+
+    cdef int64_t _start(self) noexcept nogil:
+        # Returns zero if disabled so the matching call to _stop is a no-op
+        if not self._enabled:
+            return 0
+        return monotonic_ns()
+
+    cdef void _stop(self, size_t stage, int64_t start_ns) noexcept nogil:
+        if start_ns == 0 or stage >= self.num_stages:
+            return
+        stage_timing_add(&self.stages[stage], monotonic_ns() - start_ns)
+
+    cpdef dict snapshot(self):
+        """Get the recorded values for all stages
+
+        Returns:
+            dict: A dict keyed by stage name. Each value is a dict of
+
+            * ``count``: Number of samples
+            * ``total_ns``: Sum of all samples
+            * ``mean_ns``: Mean sample (or ``0`` if empty)
+            * ``min_ns`` / ``max_ns``: Minimum and maximum samples
+            * ``histogram``: Sample counts per bucket
+              (see :func:`get_bucket_edges`)
+        """
+        cdef StageTiming_s[STAGE_TIMER_MAX_STAGES] stages
+        cdef StageTiming_s* s
+        cdef size_t i, j
+        cdef dict result = {}
+
+        with nogil:
+            memcpy(stages, self.stages, sizeof(StageTiming_s) * STAGE_TIMER_MAX_STAGES)
+
+        for i in range(self.num_stages):
+            s = &stages[i]
+            result[self.stage_names[i]] = {
+                'count':s.count,
+                'total_ns':s.total_ns,
+                'mean_ns':s.total_ns / s.count if s.count else 0,
+                'min_ns':s.min_ns,
+                'max_ns':s.max_ns,
+                'histogram':[s.buckets[j] for j in range(STAGE_TIMING_NUM_BUCKETS)],
+            }
+        return result
+
+    def __repr__(self):
+        return f'<StageTimer {self.stage_names} (enabled={self._enabled})>'
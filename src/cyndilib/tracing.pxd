@@ -0,0 +1,33 @@
+# cython: language_level=3
+# distutils: language = c++
+
+from libc.stdint cimport *
+
+
+cpdef enum TraceEventType:
+    trace_capture = 1
+    trace_evict = 2
+    trace_read = 3
+    trace_resize = 4
+    trace_connect = 5
+    trace_send = 6
+    trace_async_complete = 7
+
+
+cdef struct TraceFrameInfo_s:
+    uint64_t frame_id
+    int64_t timestamp
+
+
+cdef bint trace_is_enabled() noexcept nogil
+cdef int64_t trace_begin() noexcept nogil
+cdef void trace_event(
+    TraceEventType event_type,
+    uint32_t source_id,
+    uint64_t frame_id,
+    int64_t ndi_timestamp,
+    int64_t start_ns,
+    int64_t value,
+) noexcept nogil
+cdef uint64_t trace_next_frame_id() noexcept nogil
+cdef uint32_t trace_register_source(str name) except *
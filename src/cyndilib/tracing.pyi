@@ -0,0 +1,22 @@
+from typing import Any
+import enum
+import os
+
+
+class TraceEventType(enum.IntEnum):
+    trace_capture = 1
+    trace_evict = 2
+    trace_read = 3
+    trace_resize = 4
+    trace_connect = 5
+    trace_send = 6
+    trace_async_complete = 7
+
+
+def enable_tracing(ring_size: int|None = None) -> None: ...
+def disable_tracing() -> None: ...
+def is_tracing_enabled() -> bool: ...
+def clear_trace() -> None: ...
+def get_trace_events() -> list[dict[str, Any]]: ...
+def get_chrome_trace() -> dict[str, Any]: ...
+def write_chrome_trace(filename: str|os.PathLike) -> None: ...
@@ -0,0 +1,431 @@
+# cython: language_level=3
+# distutils: language = c++
+"""
+Event tracing of the capture and send pipeline
+
+While enabled, the receive and send paths record typed events (see
+:class:`TraceEventType`) into a ring buffer owned by the thread that
+produced them. Each event carries the time it was recorded, the
+:term:`ndi-timestamp` of the frame involved (when known) and an id that
+follows the frame from capture to read (or from write to send).
+
+The events can be exported in the `Chrome trace event format`_ and loaded
+into ``chrome://tracing`` or the `Perfetto UI`_::
+
+    from cyndilib import tracing
+
+    tracing.enable_tracing()
+    ...
+    tracing.write_chrome_trace('capture.json')
+
+Each :class:`~.receiver.Receiver` and :class:`~.sender.Sender` appears as
+a separate process in the trace (along with the frames attached to it) and
+each thread as a separate track.
+
+.. _Chrome trace event format: https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+.. _Perfetto UI: https://ui.perfetto.dev
+
+.. versionadded:: 0.0.10
+
+"""
+
+from libcpp.vector cimport vector
+
+import json
+import threading
+
+from .clock cimport monotonic_ns
+
+__all__ = (
+    'TraceEventType', 'enable_tracing', 'disable_tracing', 'is_tracing_enabled',
+    'clear_trace', 'get_trace_events', 'get_chrome_trace', 'write_chrome_trace',
+)
+
+
+cdef extern from * nogil:
+    """
+    #include <atomic>
+    #include <mutex>
+    #include <vector>
+    #include <new>
+    #include <stdint.h>
+    #include "pythread.h"
+
+    struct cyndi_trace_event_t {
+        int64_t ts_ns;
+        int64_t dur_ns;
+        int64_t ndi_timestamp;
+        uint64_t frame_id;
+        int64_t value;
+        uint32_t source_id;
+        uint32_t event_type;
+    };
+
+    // Written only by the thread that owns it. Readers load the head with
+    // acquire ordering and copy the slots behind it.
+    struct cyndi_trace_ring_t {
+        unsigned long thread_id;
+        size_t capacity;
+        std::atomic<uint64_t> head;
+        std::atomic<bool> in_use;
+        cyndi_trace_event_t* events;
+    };
+
+    static std::atomic<bool> cyndi_trace_enabled(false);
+    static std::atomic<uint64_t> cyndi_trace_frame_counter(0);
+    static std::atomic<size_t> cyndi_trace_ring_size(16384);
+    static std::mutex cyndi_trace_rings_mtx;
+    static std::vector<cyndi_trace_ring_t*> cyndi_trace_rings;
+
+    // Hands the thread's ring back for reuse when the thread exits. Its
+    // events can still be exported until another thread takes it over.
+    struct cyndi_trace_ring_owner_t {
+        cyndi_trace_ring_t* ring;
+        cyndi_trace_ring_owner_t() : ring(NULL) {}
+        ~cyndi_trace_ring_owner_t() {
+            if (ring != NULL) {
+                ring->in_use.store(false);
+            }
+        }
+    };
+    static thread_local cyndi_trace_ring_owner_t cyndi_trace_local;
+
+    static cyndi_trace_ring_t* cyndi_trace_get_ring() {
+        cyndi_trace_ring_t* ring = cyndi_trace_local.ring;
+        if (ring != NULL) {
+            return ring;
+        }
+        size_t capacity = cyndi_trace_ring_size.load();
+        std::lock_guard<std::mutex> lk(cyndi_trace_rings_mtx);
+        for (cyndi_trace_ring_t* r : cyndi_trace_rings) {
+            if (!r->in_use.load() && r->capacity == capacity) {
+                ring = r;
+                break;
+            }
+        }
+        if (ring == NULL) {
+            ring = new (std::nothrow) cyndi_trace_ring_t();
+            if (ring == NULL) {
+                return NULL;
+            }
+            ring->events = new (std::nothrow) cyndi_trace_event_t[capacity];
+            if (ring->events == NULL) {
+                delete ring;
+                return NULL;
+            }
+            ring->capacity = capacity;
+            cyndi_trace_rings.push_back(ring);
+        }
+        ring->thread_id = PyThread_get_thread_ident();
+        ring->head.store(0);
+        ring->in_use.store(true);
+        cyndi_trace_local.ring = ring;
+        return ring;
+    }
+
+    static void cyndi_trace_write(
+        uint32_t event_type, uint32_t source_id, uint64_t frame_id,
+        int64_t ndi_timestamp, int64_t ts_ns, int64_t dur_ns, int64_t value
+    ) {
+        cyndi_trace_ring_t* ring = cyndi_trace_get_ring();
+        if (ring == NULL) {
+            return;
+        }
+        uint64_t head = ring->head.load(std::memory_order_relaxed);
+        cyndi_trace_event_t* e = &ring->events[head % ring->capacity];
+        e->ts_ns = ts_ns;
+        e->dur_ns = dur_ns;
+        e->ndi_timestamp = ndi_timestamp;
+        e->frame_id = frame_id;
+        e->value = value;
+        e->source_id = source_id;
+        e->event_type = event_type;
+        ring->head.store(head + 1, std::memory_order_release);
+    }
+
+    static bool cyndi_trace_is_enabled() {
+        return cyndi_trace_enabled.load(std::memory_order_relaxed);
+    }
+
+    static void cyndi_trace_set_enabled(bool value) {
+        cyndi_trace_enabled.store(value);
+    }
+
+    static void cyndi_trace_set_ring_size(size_t size) {
+        cyndi_trace_ring_size.store(size);
+    }
+
+    static uint64_t cyndi_trace_next_frame_id() {
+        return cyndi_trace_frame_counter.fetch_add(1, std::memory_order_relaxed) + 1;
+    }
+
+    // Copies the most recent events of every ring (up to max_events) into
+    // dest. Returns the number copied
+    static size_t cyndi_trace_copy_events(cyndi_trace_event_t* dest, unsigned long* thread_ids, size_t max_events) {
+        size_t n = 0;
+        std::lock_guard<std::mutex> lk(cyndi_trace_rings_mtx);
+        for (cyndi_trace_ring_t* r : cyndi_trace_rings) {
+            uint64_t head = r->head.load(std::memory_order_acquire);
+            uint64_t count = head < r->capacity ? head : r->capacity;
+            for (uint64_t i = head - count; i < head && n < max_events; i++) {
+                dest[n] = r->events[i % r->capacity];
+                thread_ids[n] = r->thread_id;
+                n++;
+            }
+        }
+        return n;
+    }
+
+    static size_t cyndi_trace_num_events() {
+        size_t n = 0;
+        std::lock_guard<std::mutex> lk(cyndi_trace_rings_mtx);
+        for (cyndi_trace_ring_t* r : cyndi_trace_rings) {
+            uint64_t head = r->head.load(std::memory_order_acquire);
+            n += head < r->capacity ? head : r->capacity;
+        }
+        return n;
+    }
+
+    static void cyndi_trace_clear() {
+        std::lock_guard<std::mutex> lk(cyndi_trace_rings_mtx);
+        for (cyndi_trace_ring_t* r : cyndi_trace_rings) {
+            r->head.store(0);
+        }
+    }
+    """
+    cdef struct cyndi_trace_event_t:
+        int64_t ts_ns
+        int64_t dur_ns
+        int64_t ndi_timestamp
+        uint64_t frame_id
+        int64_t value
+        uint32_t source_id
+        uint32_t event_type
+
+    void cyndi_trace_write(
+        uint32_t event_type, uint32_t source_id, uint64_t frame_id,
+        int64_t ndi_timestamp, int64_t ts_ns, int64_t dur_ns, int64_t value
+    )
+    bint cyndi_trace_is_enabled()
+    void cyndi_trace_set_enabled(bint value)
+    void cyndi_trace_set_ring_size(size_t size)
+    uint64_t cyndi_trace_next_frame_id()
+    size_t cyndi_trace_copy_events(cyndi_trace_event_t* dest, unsigned long* thread_ids, size_t max_events)
+    size_t cyndi_trace_num_events()
+    void cyndi_trace_clear()
+
+
+cdef dict _source_ids = {'cyndilib':0}
+cdef list _source_names = ['cyndilib']
+
+cdef dict _event_names = {
+    TraceEventType.trace_capture:'capture',
+    TraceEventType.trace_evict:'evict',
+    TraceEventType.trace_read:'read',
+    TraceEventType.trace_resize:'resize',
+    TraceEventType.trace_connect:'connect',
+    TraceEventType.trace_send:'send',
+    TraceEventType.trace_async_complete:'async_complete',
+}
+
+
+cdef bint trace_is_enabled() noexcept nogil:
+    return cyndi_trace_is_enabled()
+
+
+cdef int64_t trace_begin() noexcept nogil:
+    # Returns zero if disabled so the matching trace_event records nothing
+    # more than an instant event
+    if not cyndi_trace_is_enabled():
+        return 0
+    return monotonic_ns()
+
+
+cdef void trace_event(
+    TraceEventType event_type,
+    uint32_t source_id,
+    uint64_t frame_id,
+    int64_t ndi_timestamp,
+    int64_t start_ns,
+    int64_t value,
+) noexcept nogil:
+    # If start_ns is zero an instant event is recorded, otherwise the event
+    # spans from start_ns until now
+    cdef int64_t now_ns
+    if not cyndi_trace_is_enabled():
+        return
+    now_ns = monotonic_ns()
+    if start_ns == 0:
+        cyndi_trace_write(
+            event_type, source_id, frame_id, ndi_timestamp, now_ns, -1, value,
+        )
+    else:
+        cyndi_trace_write(
+            event_type, source_id, frame_id, ndi_timestamp, start_ns,
+            now_ns - start_ns, value,
+        )
+
+
+cdef uint64_t trace_next_frame_id() noexcept nogil:
+    return cyndi_trace_next_frame_id()
+
+
+cdef uint32_t trace_register_source(str name) except *:
+    cdef uint32_t source_id
+    if name in _source_ids:
+        return _source_ids[name]
+    source_id = len(_source_names)
+    _source_names.append(name)
+    _source_ids[name] = source_id
+    return source_id
+
+
+def enable_tracing(ring_size=None):
+    """Start recording trace events
+
+    Arguments:
+        ring_size (int, optional): The number of events each thread can hold
+          before the oldest are overwritten. This only applies to threads
+          that have not yet recorded any events. Defaults to ``16384``
+    """
+    if ring_size is not None:
+        if ring_size <= 0:
+            raise ValueError('ring_size must be positive')
+        cyndi_trace_set_ring_size(ring_size)
+    cyndi_trace_set_enabled(True)
+
+
+def disable_tracing():
+    """Stop recording trace events
+
+    Events already recorded are kept until :func:`clear_trace` is called
+    """
+    cyndi_trace_set_enabled(False)
+
+
+def is_tracing_enabled() -> bool:
+    """Whether trace events are being recorded
+    """
+    return cyndi_trace_is_enabled()
+
+
+def clear_trace():
+    """Discard all recorded events
+    """
+    cyndi_trace_clear()
+
+
+def get_trace_events():
+    """Get the recorded events sorted by time
+
+    Events recorded while this is called may be missed (or partially
+    overwritten if a ring wraps around while being copied).
+
+    Returns:
+        list: A list of dicts with the keys
+
+        * ``name``: The event type name (see :class:`TraceEventType`)
+        * ``source``: The name of the receiver or sender the event came from
+        * ``thread_id``: The identifier of the thread that recorded it
+        * ``ts_ns``: The monotonic time (in nanoseconds) of the event, or the
+          start of it for events with a duration
+        * ``dur_ns``: The duration in nanoseconds (or ``None`` for instant
+          events)
+        * ``frame_id``: The frame id (``0`` if not associated with a frame)
+        * ``ndi_timestamp``: The :term:`ndi-timestamp` of the frame (if known)
+        * ``value``: An event-specific value, such as the buffer index for
+          frame events, the new size for ``resize`` and the connection state
+          for ``connect``
+    """
+    cdef size_t max_events = cyndi_trace_num_events(), n, i
+    cdef vector[cyndi_trace_event_t] events
+    cdef vector[unsigned long] thread_ids
+    cdef cyndi_trace_event_t* e
+    cdef list result = []
+    if max_events == 0:
+        return result
+
+    events.resize(max_events)
+    thread_ids.resize(max_events)
+    with nogil:
+        n = cyndi_trace_copy_events(events.data(), thread_ids.data(), max_events)
+    for i in range(n):
+        e = &events[i]
+        result.append({
+            'name':_event_names.get(e.event_type, str(e.event_type)),
+            'source':(
+                _source_names[e.source_id] if e.source_id < len(_source_names) else str(e.source_id)
+            ),
+            'thread_id':thread_ids[i],
+            'ts_ns':e.ts_ns,
+            'dur_ns':e.dur_ns if e.dur_ns >= 0 else None,
+            'frame_id':e.frame_id,
+            'ndi_timestamp':e.ndi_timestamp,
+            'value':e.value,
+        })
+    result.sort(key=lambda ev: ev['ts_ns'])
+    return result
+
+
+def get_chrome_trace():
+    """Get the recorded events in the Chrome trace event format
+
+    Each receiver or sender is represented as a process (``pid``) and each
+    thread as a thread (``tid``). Timestamps are in microseconds of the
+    monotonic clock.
+
+    Returns:
+        dict: An object that can be serialized with :func:`json.dump`
+    """
+    cdef list events = get_trace_events()
+    cdef list trace_events = []
+    cdef dict source_pids = {name:i for i, name in enumerate(_source_names)}
+    cdef dict thread_names = {t.ident:t.name for t in threading.enumerate()}
+    cdef set seen_pids = set(), seen_tids = set()
+    cdef dict ev, item
+
+    for ev in events:
+        pid = source_pids.get(ev['source'], 0)
+        tid = ev['thread_id']
+        if pid not in seen_pids:
+            seen_pids.add(pid)
+            trace_events.append({
+                'name':'process_name', 'ph':'M', 'pid':pid,
+                'args':{'name':ev['source']},
+            })
+        if (pid, tid) not in seen_tids:
+            seen_tids.add((pid, tid))
+            if tid in thread_names:
+                trace_events.append({
+                    'name':'thread_name', 'ph':'M', 'pid':pid, 'tid':tid,
+                    'args':{'name':thread_names[tid]},
+                })
+        item = {
+            'name':ev['name'],
+            'cat':'cyndilib',
+            'pid':pid,
+            'tid':tid,
+            'ts':ev['ts_ns'] / 1000,
+            'args':{
+                'frame_id':ev['frame_id'],
+                'ndi_timestamp':ev['ndi_timestamp'],
+                'value':ev['value'],
+            },
+        }
+        if ev['dur_ns'] is None:
+            item['ph'] = 'i'
+            item['s'] = 't'
+        else:
+            item['ph'] = 'X'
+            item['dur'] = ev['dur_ns'] / 1000
+        trace_events.append(item)
+    return {'traceEvents':trace_events, 'displayTimeUnit':'ms'}
+
+
+def write_chrome_trace(filename):
+    """Write the recorded events to a file in the Chrome trace event format
+
+    See :func:`get_chrome_trace`
+    """
+    with open(filename, 'w') as f:
+        json.dump(get_chrome_trace(), f)
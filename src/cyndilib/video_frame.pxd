@@ -5,12 +5,18 @@ from cython cimport view
 from libc.stdint cimport *
 from libcpp.deque cimport deque as cpp_deque
 from libcpp.set cimport set as cpp_set
+from libcpp.vector cimport vector
 cimport numpy as cnp
 
 from .wrapper cimport *
 from .buffertypes cimport *
-from .locks cimport RLock, Condition
+from .locks cimport Lock, RLock, Condition
 from .send_frame_status cimport *
+from .timing cimport StageTimer, RecvFrameStage, SendFrameStage
+from .tracing cimport (
+    TraceEventType, TraceFrameInfo_s, trace_is_enabled, trace_begin,
+    trace_event, trace_next_frame_id,
+)
 from .framesync_helper cimport FrameSyncVideoInstance_s
 
 
@@ -54,6 +60,7 @@ cdef class VideoFrame:
     cdef int _recalc_pack_info(self, bint use_ptr_stride=*) except -1 nogil
 
 cdef class VideoRecvFrame(VideoFrame):
+    cdef readonly StageTimer stage_timer
     cdef readonly size_t max_buffers
     cdef cpp_deque[size_t] read_indices
     cdef cpp_set[size_t] read_indices_set
@@ -69,10 +76,33 @@ cdef class VideoRecvFrame(VideoFrame):
     cdef size_t[1] bfr_shape
     cdef size_t[1] bfr_strides
     cdef size_t view_count
+    cdef uint32_t trace_source_id
+    cdef vector[TraceFrameInfo_s] trace_slots
+    cdef vector[int64_t] slot_timestamps
+    cdef size_t num_reserved
+    cdef list stale_frame_data
+    cdef bint has_stale_frame_data
 
+    cdef void _trace_slot(
+        self,
+        TraceEventType event_type,
+        size_t bfr_idx,
+        int64_t start_ns,
+    ) noexcept nogil
     cdef int _check_read_array_size(self) except -1
     cdef int _fill_read_data(self, bint advance) except -1 nogil
     cdef size_t _get_next_write_index(self) except? -1 nogil
+    cdef size_t _get_read_size(self) noexcept nogil
+    cdef bint _reserve_latest(
+        self,
+        size_t* bfr_idx,
+        uint8_t** data,
+        size_t* size,
+        size_t* num_dropped,
+    ) except -1 nogil
+    cdef int _release_reserved(self, size_t bfr_idx) except -1 nogil
+    cdef size_t _reserve_front(self) noexcept nogil
+    cdef bint _restore_reserved(self, size_t bfr_idx) except -1 nogil
     cdef bint can_receive(self) except -1 nogil
     cdef int _check_write_array_size(self) except -1
     cdef int _prepare_incoming(self, NDIlib_recv_instance_t recv_ptr) except -1
@@ -84,13 +114,29 @@ cdef class VideoFrameSync(VideoFrame):
     cdef readonly size_t[1] shape
     cdef readonly size_t[1] strides
     cdef size_t view_count
+    cdef readonly bint double_buffered
+    cdef uint8_t* db_buffers[2]
+    cdef size_t db_capacity[2]
+    cdef size_t db_shapes[2]
+    cdef size_t db_view_counts[2]
+    cdef size_t db_front
+    cdef Lock db_lock
 
     cdef void _free_framesync_pointers(self) noexcept nogil
     cdef void _free_framesync_data(self) noexcept nogil
     cdef int _process_incoming(self) except -1 nogil
+    cdef int _process_double_buffered(self) except -1 nogil
+    cdef bint _acquire_front(
+        self,
+        size_t* idx,
+        uint8_t** data,
+        size_t* size,
+    ) except -1 nogil
+    cdef int _release_front(self, size_t idx) except -1 nogil
 
 
 cdef class VideoSendFrame(VideoFrame):
+    cdef readonly StageTimer stage_timer
     cdef VideoSendFrame_status_s send_status
     cdef VideoSendFrame_item_s* buffer_write_item
 
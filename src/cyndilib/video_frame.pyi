@@ -7,6 +7,7 @@ import numpy as np
 
 from .wrapper import FourCC
 from .locks import RLock, Condition
+from .timing import StageTimer
 
 _UintArray = npt.NDArray[np.uint8]
 
@@ -44,6 +45,8 @@ class VideoFrame:
 class VideoFrameSync(VideoFrame, ReadOnlyBuffer):
     shape: tuple[int]
     strides: tuple[int]
+    double_buffered: bool
+    def __init__(self, *args, double_buffered: bool = ..., **kwargs) -> None: ...
     def get_array(self) -> _UintArray: ...
     def __buffer__(self, flags) -> tuple[int, int, int, int, int, int]: ...
 
@@ -54,6 +57,7 @@ class VideoRecvFrame(VideoFrame, ReadOnlyBuffer):
     max_buffers: int
     read_lock: RLock
     read_ready: Condition
+    stage_timer: StageTimer
     write_lock: RLock
     write_ready: Condition
     def buffer_full(self) -> bool: ...
@@ -66,6 +70,7 @@ class VideoRecvFrame(VideoFrame, ReadOnlyBuffer):
 
 class VideoSendFrame(VideoFrame, WriteableBuffer):
     # __pyx_vtable__: ClassVar[PyCapsule] = ...
+    stage_timer: StageTimer
     @property
     def attached_to_sender(self) -> bool: ...
     @property
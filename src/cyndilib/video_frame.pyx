@@ -296,15 +296,23 @@ cdef class VideoRecvFrame(VideoFrame):
     They can be read using the :meth:`fill_p_data` method or using the
     :ref:`buffer protocol <frame-buffer-protocol>`.
 
+    Attributes:
+        stage_timer (StageTimer): Timing for the ``process``, ``lock_wait``
+            and ``read`` stages
+
     """
     def __cinit__(self, *args, **kwargs):
         self.video_bfrs = video_frame_bfr_create(self.video_bfrs)
         self.read_bfr = video_frame_bfr_create(self.video_bfrs)
         self.write_bfr = video_frame_bfr_create(self.read_bfr)
+        self.stage_timer = StageTimer(('process', 'lock_wait', 'read'))
+        self.trace_source_id = 0
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.max_buffers = kwargs.get('max_buffers', 4)
+        self.trace_slots.resize(self.max_buffers)
+        self.slot_timestamps.resize(self.max_buffers)
         self.read_lock = RLock()
         self.write_lock = RLock()
         self.read_ready = Condition(self.read_lock)
@@ -312,6 +320,9 @@ cdef class VideoRecvFrame(VideoFrame):
         self.all_frame_data = np.zeros((self.max_buffers, 0), dtype=np.uint8)
         self.current_frame_data = np.zeros(0, dtype=np.uint8)
         self.view_count = 0
+        self.num_reserved = 0
+        self.stale_frame_data = []
+        self.has_stale_frame_data = False
 
     def __dealloc__(self):
         cdef video_bfr_p bfr = self.video_bfrs
@@ -325,7 +336,9 @@ cdef class VideoRecvFrame(VideoFrame):
         cdef size_t bfr_len, size_in_bytes
         cdef bint is_empty
         cdef cnp.ndarray[cnp.uint8_t, ndim=1] frame_data
+        cdef int64_t start_ns = self.stage_timer._start()
         self.read_lock._acquire(True, -1)
+        self.stage_timer._stop(RecvFrameStage.frame_lock_wait, start_ns)
         try:
             bfr_len = self.read_indices.size()
             is_empty = bfr_len == 0
@@ -368,6 +381,21 @@ cdef class VideoRecvFrame(VideoFrame):
     def get_view_count(self):
         return self.view_count
 
+    cdef void _trace_slot(
+        self,
+        TraceEventType event_type,
+        size_t bfr_idx,
+        int64_t start_ns,
+    ) noexcept nogil:
+        cdef TraceFrameInfo_s* info
+        if bfr_idx >= self.trace_slots.size():
+            return
+        info = &self.trace_slots[bfr_idx]
+        trace_event(
+            event_type, self.trace_source_id, info.frame_id, info.timestamp,
+            start_ns, bfr_idx,
+        )
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     cdef int _check_read_array_size(self) except -1:
@@ -388,12 +416,15 @@ cdef class VideoRecvFrame(VideoFrame):
         cdef cnp.uint8_t[:,:] all_frame_data = self.all_frame_data
         cdef cnp.uint8_t[:] arr = self.current_frame_data
         cdef size_t bfr_idx = self.read_indices.front()
+        cdef int64_t trace_start
         with nogil:
+            trace_start = trace_begin()
             if advance:
                 self.read_indices.pop_front()
                 self.read_indices_set.erase(bfr_idx)
 
             arr[...] = all_frame_data[bfr_idx,...]
+            self._trace_slot(TraceEventType.trace_read, bfr_idx, trace_start)
         return 0
 
     def get_buffer_depth(self) -> int:
@@ -404,7 +435,7 @@ cdef class VideoRecvFrame(VideoFrame):
     def buffer_full(self) -> bool:
         """Returns True if the buffers are all in use
         """
-        return self.read_indices.size() >= self.max_buffers
+        return self.read_indices_set.size() >= self.max_buffers
 
     def skip_frames(self, bint eager):
         """Discard buffered frame(s)
@@ -432,6 +463,7 @@ cdef class VideoRecvFrame(VideoFrame):
                 idx = self.read_indices.front()
                 self.read_indices.pop_front()
                 self.read_indices_set.erase(idx)
+                self._trace_slot(TraceEventType.trace_evict, idx, 0)
                 num_skipped += 1
                 if not eager:
                     break
@@ -454,23 +486,31 @@ cdef class VideoRecvFrame(VideoFrame):
         cdef cnp.uint8_t[:,:] all_frame_data = self.all_frame_data
         cdef cnp.uint8_t[:] read_view = self.current_frame_data
         cdef bint valid = False
+        cdef StageTimer stage_timer = self.stage_timer
+        cdef int64_t start_ns = stage_timer._start()
+        cdef int64_t trace_start
         self.read_lock._acquire(True, -1)
+        stage_timer._stop(RecvFrameStage.frame_lock_wait, start_ns)
         try:
             vc = self.view_count
             self.view_count += 1
             try:
                 with nogil:
+                    start_ns = stage_timer._start()
                     bfr_len = self.read_indices.size()
                     if vc == 0:
                         if bfr_len > 0:
+                            trace_start = trace_begin()
                             bfr_idx = self.read_indices.front()
                             self.read_indices.pop_front()
                             self.read_indices_set.erase(bfr_idx)
                             dest[:] = all_frame_data[bfr_idx,:]
                             valid = True
+                            self._trace_slot(TraceEventType.trace_read, bfr_idx, trace_start)
                     else:
                         dest[:] = read_view
                         valid = True
+                    stage_timer._stop(RecvFrameStage.frame_read, start_ns)
             finally:
                 self.view_count -= 1
             return valid
@@ -496,37 +536,131 @@ cdef class VideoRecvFrame(VideoFrame):
                 raise_withgil(PyExc_ValueError, 'could not get write index')
         return result
 
+    cdef size_t _get_read_size(self) noexcept nogil:
+        # Size of each buffered frame, or zero if the format changed and the
+        # buffers are about to be resized (the read lock should be held)
+        cdef size_t size = self._get_buffer_size()
+        if size == 0 or <size_t>self.all_frame_data.shape[1] != size:
+            return 0
+        return size
+
+    cdef bint _reserve_latest(
+        self,
+        size_t* bfr_idx,
+        uint8_t** data,
+        size_t* size,
+        size_t* num_dropped,
+    ) except -1 nogil:
+        # Take the most recent frame out of the read queue (discarding any
+        # older ones) and keep its buffer from being written to until
+        # `_release_reserved` is called. This lets the caller use the data
+        # without holding the read lock.
+        #
+        # Returns False if nothing is buffered
+        cdef size_t idx
+        num_dropped[0] = 0
+        self.read_lock._acquire(True, -1)
+        try:
+            if self.read_indices.size() == 0:
+                return False
+            size[0] = self._get_read_size()
+            if size[0] == 0:
+                return False
+            while True:
+                idx = self.read_indices.front()
+                self.read_indices.pop_front()
+                if self.read_indices.size() == 0:
+                    break
+                self.read_indices_set.erase(idx)
+                self._trace_slot(TraceEventType.trace_evict, idx, 0)
+                num_dropped[0] += 1
+            self.num_reserved += 1
+            bfr_idx[0] = idx
+            data[0] = <uint8_t*>self.all_frame_data.data + idx * size[0]
+            return True
+        finally:
+            self.read_lock._release()
+
+    cdef int _release_reserved(self, size_t bfr_idx) except -1 nogil:
+        self.read_lock._acquire(True, -1)
+        try:
+            self.read_indices_set.erase(bfr_idx)
+            self.num_reserved -= 1
+            if self.num_reserved == 0 and self.has_stale_frame_data:
+                with gil:
+                    self.stale_frame_data.clear()
+                self.has_stale_frame_data = False
+        finally:
+            self.read_lock._release()
+        return 0
+
+    cdef size_t _reserve_front(self) noexcept nogil:
+        # Take the frame at the front of the read queue and reserve it as in
+        # `_reserve_latest` (the read lock must be held and the queue must
+        # not be empty)
+        cdef size_t idx = self.read_indices.front()
+        self.read_indices.pop_front()
+        self.num_reserved += 1
+        return idx
+
+    cdef bint _restore_reserved(self, size_t bfr_idx) except -1 nogil:
+        # Put a reserved frame back at the front of the read queue. If the
+        # buffers were resized while it was reserved, it is released instead.
+        #
+        # Returns True if the frame was put back
+        self.read_lock._acquire(True, -1)
+        try:
+            if self.has_stale_frame_data:
+                self._release_reserved(bfr_idx)
+                return False
+            self.read_indices.push_front(bfr_idx)
+            self.num_reserved -= 1
+            return True
+        finally:
+            self.read_lock._release()
+
     cdef bint can_receive(self) except -1 nogil:
-        return self.read_indices.size() < self.max_buffers
+        return self.read_indices_set.size() < self.max_buffers
 
     cdef int _check_write_array_size(self) except -1:
         cdef cnp.uint8_t[:,:] arr = self.all_frame_data
         cdef size_t ncols = self._get_buffer_size()
+        cdef size_t idx
 
         if arr.shape[1] == ncols:
             return 0
         self.read_lock._acquire(True, -1)
         try:
+            if self.num_reserved > 0:
+                # Reserved buffers remain valid until they're released
+                self.stale_frame_data.append(self.all_frame_data)
+                self.has_stale_frame_data = True
             self.all_frame_data = np.zeros((self.max_buffers, ncols), dtype=np.uint8)
+            for idx in self.read_indices:
+                self.read_indices_set.erase(idx)
             self.read_indices.clear()
-            self.read_indices_set.clear()
             if self.view_count == 0:
                 self.current_frame_data = np.zeros(ncols, dtype=np.uint8)
         finally:
             self.read_lock._release()
+        trace_event(TraceEventType.trace_resize, self.trace_source_id, 0, 0, 0, ncols)
         return 0
 
     cdef int _prepare_incoming(self, NDIlib_recv_instance_t recv_ptr) except -1:
         cdef size_t bfr_idx
         self._recalc_pack_info(use_ptr_stride=True)
         self._check_write_array_size()
-        if self.read_indices.size() == self.max_buffers:
+        if self.read_indices_set.size() >= self.max_buffers:
             self.read_lock._acquire(True, -1)
             try:
-                if self.read_indices.size() == self.max_buffers:
+                if (
+                    self.read_indices_set.size() >= self.max_buffers and
+                    self.read_indices.size() > 0
+                ):
                     bfr_idx = self.read_indices.front()
                     self.read_indices.pop_front()
                     self.read_indices_set.erase(bfr_idx)
+                    self._trace_slot(TraceEventType.trace_evict, bfr_idx, 0)
             finally:
                 self.read_lock._release()
         return 0
@@ -540,8 +674,12 @@ cdef class VideoRecvFrame(VideoFrame):
         cdef size_t buffer_index = self._get_next_write_index()
         cdef cnp.uint8_t[:,:] all_frame_data = self.all_frame_data
         cdef cnp.uint8_t[:] write_view = all_frame_data[buffer_index]
+        cdef int64_t start_ns, trace_start
+        cdef TraceFrameInfo_s* trace_info
 
         with nogil:
+            start_ns = self.stage_timer._start()
+            trace_start = trace_begin()
             fr.numerator = p.frame_rate_N
             fr.denominator = p.frame_rate_D
 
@@ -555,6 +693,7 @@ cdef class VideoRecvFrame(VideoFrame):
             write_bfr.aspect = p.picture_aspect_ratio
             write_bfr.total_size = size_in_bytes
             uint8_ptr_to_memview_1d(p.p_data, write_view)
+            self.slot_timestamps[buffer_index] = p.timestamp
             self.read_bfr.total_size = self.write_bfr.total_size
             self.read_indices.push_back(buffer_index)
             self.read_indices_set.insert(buffer_index)
@@ -563,6 +702,12 @@ cdef class VideoRecvFrame(VideoFrame):
 
             if recv_ptr is not NULL:
                 NDIlib_recv_free_video_v2(recv_ptr, self.ptr)
+            self.stage_timer._stop(RecvFrameStage.frame_process, start_ns)
+            if trace_start != 0 and buffer_index < self.trace_slots.size():
+                trace_info = &self.trace_slots[buffer_index]
+                trace_info.frame_id = trace_next_frame_id()
+                trace_info.timestamp = write_bfr.timestamp
+                self._trace_slot(TraceEventType.trace_capture, buffer_index, trace_start)
         return 0
 
 cdef class VideoFrameSync(VideoFrame):
@@ -577,6 +722,23 @@ cdef class VideoFrameSync(VideoFrame):
 
     Data can be read using the :meth:`get_array` method or by using the
     :ref:`buffer protocol <frame-buffer-protocol>`.
+
+    Normally the data cannot be replaced while a buffer view is held. If
+    *double_buffered* is True, each captured frame is copied into one of
+    two buffers owned by this object (and the |NDI| frame is released
+    right away). Views always use the most recent buffer, so a capture can
+    happen while a view of the previous frame is held.
+
+    Arguments:
+        double_buffered (bool, optional): Enables double-buffered mode.
+
+            .. versionadded:: 0.0.10
+
+    Attributes:
+        double_buffered (bool): Whether double-buffered mode is enabled
+
+            .. versionadded:: 0.0.10
+
     """
     def __cinit__(self, *args, **kwargs):
         self.shape[0] = 0
@@ -584,10 +746,28 @@ cdef class VideoFrameSync(VideoFrame):
         self.view_count = 0
         self.framesync_instance.fs_ptr = NULL
         self.framesync_instance.free_data = NULL
+        self.double_buffered = False
+        self.db_front = 0
+        self.db_lock = Lock()
+        cdef size_t i
+        for i in range(2):
+            self.db_buffers[i] = NULL
+            self.db_capacity[i] = 0
+            self.db_shapes[i] = 0
+            self.db_view_counts[i] = 0
+
+    def __init__(self, *args, bint double_buffered=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.double_buffered = double_buffered
 
     def __dealloc__(self):
         self.framesync_instance.fs_ptr = NULL
         self.framesync_instance.free_data = NULL
+        cdef size_t i
+        for i in range(2):
+            if self.db_buffers[i] is not NULL:
+                mem_free(self.db_buffers[i])
+                self.db_buffers[i] = NULL
 
     cdef void _free_framesync_pointers(self) noexcept nogil:
         self.framesync_instance.free_data = NULL
@@ -612,6 +792,7 @@ cdef class VideoFrameSync(VideoFrame):
 
     def __getbuffer__(self, Py_buffer *buffer, int flags):
         cdef NDIlib_video_frame_v2_t* p = self.ptr
+        cdef size_t idx
 
         buffer.buf = <char *>p.p_data
         buffer.format = 'B'
@@ -625,15 +806,34 @@ cdef class VideoFrameSync(VideoFrame):
         buffer.strides = <Py_ssize_t*>self.strides
         buffer.suboffsets = NULL
 
+        if self.double_buffered:
+            # Each view keeps using its own buffer (and shape) after the
+            # next capture
+            self.db_lock._acquire(True, -1)
+            try:
+                idx = self.db_front
+                buffer.buf = <char *>self.db_buffers[idx]
+                buffer.len = self.db_shapes[idx]
+                buffer.shape = <Py_ssize_t*>&(self.db_shapes[idx])
+                buffer.internal = <void*>idx
+                self.db_view_counts[idx] += 1
+            finally:
+                self.db_lock._release()
+
         self.view_count += 1
 
     def __releasebuffer__(self, Py_buffer *buffer):
         self.view_count -= 1
+        if self.double_buffered:
+            self._release_front(<size_t>buffer.internal)
+            return
         if self.view_count == 0:
             self._free_framesync_data()
             self.shape[0] = 0
 
     cdef int _process_incoming(self) except -1 nogil:
+        if self.double_buffered:
+            return self._process_double_buffered()
         if self.view_count > 0:
             raise_withgil(PyExc_ValueError, 'cannot write with view active')
 
@@ -644,6 +844,85 @@ cdef class VideoFrameSync(VideoFrame):
         self.strides[0] = sizeof(uint8_t)
         return 0
 
+    cdef int _process_double_buffered(self) except -1 nogil:
+        cdef NDIlib_video_frame_v2_t* p = self.ptr
+        cdef size_t idx, size_in_bytes = 0
+
+        # Views of the front buffer may be acquired from other threads
+        self.db_lock._acquire(True, -1)
+        try:
+            idx = 1 - self.db_front
+            if self.db_view_counts[idx] > 0:
+                if self.db_view_counts[self.db_front] > 0:
+                    self._free_framesync_data()
+                    raise_withgil(PyExc_ValueError, 'cannot write with views active on both buffers')
+                idx = self.db_front
+
+            self._recalc_pack_info(use_ptr_stride=True)
+            if p.p_data is not NULL:
+                size_in_bytes = self._get_buffer_size()
+            if size_in_bytes > self.db_capacity[idx]:
+                if self.db_buffers[idx] is not NULL:
+                    mem_free(self.db_buffers[idx])
+                self.db_capacity[idx] = 0
+                self.db_buffers[idx] = <uint8_t*>mem_alloc(size_in_bytes)
+                if self.db_buffers[idx] is NULL:
+                    self._free_framesync_data()
+                    raise_mem_err()
+                self.db_capacity[idx] = size_in_bytes
+            if size_in_bytes > 0:
+                memcpy(self.db_buffers[idx], p.p_data, size_in_bytes)
+
+            # The data is ours now, so the NDI frame can be released
+            self._free_framesync_data()
+            p.p_data = NULL
+            self.db_shapes[idx] = size_in_bytes
+            self.db_front = idx
+            self.shape[0] = size_in_bytes
+            self.strides[0] = sizeof(uint8_t)
+        finally:
+            self.db_lock._release()
+        return 0
+
+    cdef bint _acquire_front(
+        self,
+        size_t* idx,
+        uint8_t** data,
+        size_t* size,
+    ) except -1 nogil:
+        # Get the most recently captured data and (in double-buffered mode)
+        # keep the next capture from writing to it until `_release_front`
+        # is called with the returned *idx*.
+        #
+        # Returns False (with nothing acquired) if there is no data
+        cdef NDIlib_video_frame_v2_t* p = self.ptr
+        if not self.double_buffered:
+            idx[0] = 0
+            data[0] = p.p_data
+            size[0] = 0 if p.p_data is NULL else self._get_buffer_size()
+            return size[0] > 0
+        self.db_lock._acquire(True, -1)
+        try:
+            idx[0] = self.db_front
+            data[0] = self.db_buffers[idx[0]]
+            size[0] = self.db_shapes[idx[0]]
+            if size[0] == 0 or data[0] is NULL:
+                return False
+            self.db_view_counts[idx[0]] += 1
+            return True
+        finally:
+            self.db_lock._release()
+
+    cdef int _release_front(self, size_t idx) except -1 nogil:
+        if not self.double_buffered:
+            return 0
+        self.db_lock._acquire(True, -1)
+        try:
+            self.db_view_counts[idx] -= 1
+        finally:
+            self.db_lock._release()
+        return 0
+
 
 cdef class VideoSendFrame(VideoFrame):
     """Video frame for use with :class:`.sender.Sender`
@@ -654,11 +933,16 @@ cdef class VideoSendFrame(VideoFrame):
         its methods. They are instead called from the :class:`sender.Sender`
         write methods.
 
+    Attributes:
+        stage_timer (StageTimer): Timing for the ``in_flight`` stage (from when
+            a buffer is written until the sender releases it)
+
     """
     def __cinit__(self, *args, **kwargs):
         frame_status_init(&(self.send_status))
         self.send_status.data.ndim = 1
         self.buffer_write_item = NULL
+        self.stage_timer = StageTimer(('in_flight',))
 
     def __dealloc__(self):
         self.buffer_write_item = NULL
@@ -745,6 +1029,8 @@ cdef class VideoSendFrame(VideoFrame):
         if cur_item is not NULL and cur_item.data.idx == item.data.idx:
             self.buffer_write_item = NULL
         self.send_status.data.read_index = item.data.idx
+        item.data.ready_ns = self.stage_timer._start()
+        item.data.frame_id = trace_next_frame_id() if trace_is_enabled() else 0
         frame_status_set_send_ready(&(self.send_status))
 
     def write_data(self, cnp.uint8_t[:] data):
@@ -814,6 +1100,8 @@ cdef class VideoSendFrame(VideoFrame):
         return &(self.send_status.items[idx])
 
     cdef void _on_sender_write(self, VideoSendFrame_item_s* s_ptr) noexcept nogil:
+        self.stage_timer._stop(SendFrameStage.send_frame_in_flight, s_ptr.data.ready_ns)
+        s_ptr.data.ready_ns = 0
         frame_status_set_send_complete(&(self.send_status), s_ptr.data.idx)
 
     cdef int _set_sender_status(self, bint attached) except -1 nogil:
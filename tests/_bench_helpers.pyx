@@ -7,149 +7,424 @@
 # distutils: define_macros=CYTHON_TRACE_NOGIL=1
 
 cimport cython
+from libcpp.vector cimport vector
 
 from cyndilib.wrapper cimport *
 cimport numpy as cnp
 
+from cyndilib.clock cimport monotonic_ns
 from cyndilib.send_frame_status cimport *
 from cyndilib.video_frame cimport VideoSendFrame, VideoFrameSync
 from cyndilib.audio_frame cimport AudioSendFrame, AudioFrameSync
+from cyndilib.receiver cimport Receiver, ReceiveFrameType
+from cyndilib.sender cimport Sender
+from cyndilib.compositor cimport Compositor
+from cyndilib.rate_converter cimport FrameRateConverter
+from cyndilib.switcher cimport Switcher
+from cyndilib.audio_mixer cimport AudioMixer
 
+import numpy as np
 
-cdef class BenchSender:
-    cdef readonly VideoSendFrame video_frame
-    cdef readonly AudioSendFrame audio_frame
-    cdef bint has_video_frame, has_audio_frame
-    cdef VideoSendFrame_item_s* last_async_sender
-    def __cinit__(self, *args, **kwargs):
-        self.video_frame = None
-        self.audio_frame = None
-        self.has_video_frame = False
-        self.has_audio_frame = False
-        self.last_async_sender = NULL
+from cyndilib.video_frame import VideoRecvFrame
+from cyndilib.audio_frame import AudioRecvFrame
+
+
+cdef class BenchSender(Sender):
+    """A :class:`~cyndilib.sender.Sender` that runs without an |NDI| instance
 
-    def __enter__(self):
+    Everything is done as in :class:`~cyndilib.sender.Sender` except for the
+    calls into the |NDI| library, which are skipped. It is opened and closed
+    (or used as a :term:`context manager`) as usual.
+    """
+    def __init__(self, str ndi_name='Bench', **kwargs):
+        super().__init__(ndi_name, **kwargs)
+
+    cdef int _open(self) except -1:
+        cdef frame_rate_t* fr
+        if self._running:
+            return 0
+        self._running = True
+        self.audio_stream_started = False
         if self.has_video_frame:
             self.video_frame._set_sender_status(True)
         if self.has_audio_frame:
             self.audio_frame._set_sender_status(True)
-        return self
+        if self.has_video_frame and self.pace_video:
+            fr = self.video_frame._get_frame_rate()
+            self.video_clock._set_frame_rate(fr.numerator, fr.denominator)
+            self.video_clock._reset()
+        return 0
 
-    def __exit__(self, *args):
+    cdef int _close(self) except -1:
+        if not self._running:
+            return 0
+        self._running = False
         self._clear_async_video_status()
         if self.has_video_frame:
+            self.video_frame._destroy()
             self.video_frame._set_sender_status(False)
         if self.has_audio_frame:
+            self.audio_frame._destroy()
             self.audio_frame._set_sender_status(False)
+        return 0
+
+    cdef bint _check_running(self) except -1 nogil:
+        return self._running
+
+    cdef bint _check_running_noexcept(self) noexcept nogil:
+        return self._running
+
+    cdef void _ndi_send_video(self, NDIlib_video_frame_v2_t* p) noexcept nogil:
+        pass
+
+    cdef void _ndi_send_video_async(self, NDIlib_video_frame_v2_t* p) noexcept nogil:
+        pass
+
+    cdef void _ndi_send_audio(self, NDIlib_audio_frame_v3_t* p) noexcept nogil:
+        pass
+
+    cdef void _ndi_send_metadata(self, NDIlib_metadata_frame_t* p) noexcept nogil:
+        pass
+
+
+cdef struct SentFrame_s:
+    uint32_t media_type
+    size_t size
+    size_t count
+    float first_value
+    float last_value
+    int64_t sent_ns
+    int64_t timecode
+
 
-    def set_video_frame(self, VideoSendFrame vf):
-        self.video_frame = vf
-        self.has_video_frame = vf is not None
+cdef class RecordingSender(BenchSender):
+    """A :class:`BenchSender` that stores the frames sent through it
 
-    def set_audio_frame(self, AudioSendFrame af):
-        self.audio_frame = af
-        self.has_audio_frame = af is not None
+    It is opened when created (with the given frames, if any). Frames are
+    stored as they would be passed to the |NDI| library:
 
-    def write_video_and_audio(
+    - Video as ``(1, xres, yres, first_byte, first_byte, sent_ns, timecode)``
+    - Audio as ``(2, num_samples, num_channels, first_sample, last_sample, sent_ns, timecode)``
+      (using the first channel). The full sample data is kept as well
+      (see :meth:`get_sent_audio`)
+    - Metadata as ``(3, length, 0, first_byte, first_byte, sent_ns, timecode)``
+
+    If :meth:`set_video_callback` or :meth:`set_audio_callback` is used, the
+    callback is called during each video or audio send (before its data is
+    stored).
+    """
+    cdef vector[SentFrame_s] sent
+    cdef vector[float] audio_data
+    cdef vector[size_t] audio_shapes
+    cdef object video_callback, audio_callback
+    cdef bint has_video_callback, has_audio_callback
+
+    def __init__(
         self,
-        cnp.uint8_t[:] video_data,
-        cnp.float32_t[:,:] audio_data,
+        VideoSendFrame video_frame=None,
+        AudioSendFrame audio_frame=None,
+        **kwargs
     ):
-        if not self.has_video_frame or not self.has_audio_frame:
-            raise_exception('video_frame or audio_frame is None')
-        cdef VideoSendFrame_item_s* vid_item
-        cdef AudioSendFrame_item_s* aud_item
-        cdef NDIlib_video_frame_v2_t* vid_ptr = self.video_frame.ptr
-        cdef NDIlib_audio_frame_v3_t aud_send_frame
-        cdef bint vid_result = True, aud_result = True
-
-        vid_item = self.video_frame._prepare_buffer_write()
-        aud_item = self.audio_frame._prepare_buffer_write()
-        cdef Py_ssize_t* outer_shape = self.audio_frame.send_status.data.shape
-        cdef cnp.uint8_t[:] vid_memview = self.video_frame
-        cdef cnp.float32_t[:,:] aud_memview = self.audio_frame
-
-        vid_result = vid_item is not NULL
-        aud_result = aud_item is not NULL
-        if not vid_result or not aud_result:
-            raise_exception('send_status is NULL')
-
-
-        with nogil:
-            self.audio_frame._set_shape_from_memview(aud_item, audio_data)
-            aud_memview[...] = audio_data
-            self.audio_frame._set_buffer_write_complete(aud_item)
-            vid_memview[...] = video_data
-            self.video_frame._set_buffer_write_complete(vid_item)
-
-            audio_frame_copy(aud_item.frame_ptr, &aud_send_frame)
-            aud_send_frame.p_data = <uint8_t*>aud_item.frame_ptr.p_data
-            # NDIlib_send_send_audio_v3(self.ptr, &aud_send_frame)
-            self._clear_async_video_status()
-            self.audio_frame._on_sender_write(aud_item)
-
-            vid_ptr.p_data = vid_item.frame_ptr.p_data
-            # NDIlib_send_send_video_async_v2(self.ptr, vid_ptr)
-            self._set_async_video_sender(vid_item)
-
-        # return vid_result and aud_result
-
-    def write_video(self, cnp.uint8_t[:] data):
-        if not self.has_video_frame:
-            raise_exception('video_frame is None')
-        cdef NDIlib_video_frame_v2_t* vid_ptr = self.video_frame.ptr
-        cdef VideoSendFrame_item_s* item = self.video_frame._prepare_buffer_write()
-        cdef cnp.uint8_t[:] vid_memview = self.video_frame
-
-        with nogil:
-            vid_memview[...] = data
-            self.video_frame._set_buffer_write_complete(item)
-            item.frame_ptr.p_metadata = vid_ptr.p_metadata
-            # NDIlib_send_send_video_v2(self.ptr, item.frame_ptr)
-            self._clear_async_video_status()
-            self.video_frame._on_sender_write(item)
-        # return True
-
-    def write_video_async(self, cnp.uint8_t[:] data):
-        if not self.has_video_frame:
-            raise_exception('video_frame is None')
-        cdef NDIlib_video_frame_v2_t* vid_ptr = self.video_frame.ptr
-        cdef VideoSendFrame_item_s* item = self.video_frame._prepare_buffer_write()
-        cdef cnp.uint8_t[:] vid_memview = self.video_frame
-
-        with nogil:
-            vid_memview[...] = data
-            self.video_frame._set_buffer_write_complete(item)
-            item.frame_ptr.p_metadata = vid_ptr.p_metadata
-            # NDIlib_send_send_video_async_v2(self.ptr, item.frame_ptr)
-            self._set_async_video_sender(item)
-        # return True
-
-    def write_audio(self, cnp.float32_t[:,:] data):
-        if not self.has_audio_frame:
-            raise_exception('audio_frame is None')
-        cdef AudioSendFrame_item_s* item = self.audio_frame._prepare_buffer_write()
-        cdef cnp.float32_t[:,:] aud_memview = self.audio_frame
-        cdef NDIlib_audio_frame_v3_t send_frame
-
-        with nogil:
-            audio_frame_copy(item.frame_ptr, &send_frame)
-            self.audio_frame._set_shape_from_memview(item, data)
-            aud_memview[...] = data
-            self.audio_frame._set_buffer_write_complete(item)
-            send_frame.p_data = <uint8_t*>item.frame_ptr.p_data
-            # NDIlib_send_send_audio_v3(self.ptr, &send_frame)
-            self._clear_async_video_status()
-            self.audio_frame._on_sender_write(item)
-        # return True
-
-    cdef void _set_async_video_sender(self, VideoSendFrame_item_s* item) noexcept nogil:
-        self._clear_async_video_status()
-        self.last_async_sender = item
-
-    cdef void _clear_async_video_status(self) noexcept nogil:
-        cdef VideoSendFrame_item_s* item = self.last_async_sender
-        if item is NULL:
-            return
-        self.last_async_sender = NULL
-        self.video_frame._on_sender_write(item)
+        super().__init__(**kwargs)
+        self.has_video_callback = False
+        self.has_audio_callback = False
+        self.set_video_frame(video_frame)
+        self.set_audio_frame(audio_frame)
+        self._open()
+
+    def set_video_callback(self, cb):
+        self.video_callback = cb
+        self.has_video_callback = cb is not None
+
+    def set_audio_callback(self, cb):
+        self.audio_callback = cb
+        self.has_audio_callback = cb is not None
+
+    cdef void _ndi_send_video(self, NDIlib_video_frame_v2_t* p) noexcept nogil:
+        self._record_video(p)
+
+    cdef void _ndi_send_video_async(self, NDIlib_video_frame_v2_t* p) noexcept nogil:
+        # NULL only waits for the previous async frame
+        if p is not NULL:
+            self._record_video(p)
+
+    cdef void _record_video(self, NDIlib_video_frame_v2_t* p) noexcept nogil:
+        cdef SentFrame_s item
+        if self.has_video_callback:
+            with gil:
+                self.video_callback()
+        item.media_type = 1
+        item.size = p.xres
+        item.count = p.yres
+        item.first_value = p.p_data[0]
+        item.last_value = p.p_data[0]
+        item.sent_ns = monotonic_ns()
+        item.timecode = p.timecode
+        self.sent.push_back(item)
+
+    cdef void _ndi_send_audio(self, NDIlib_audio_frame_v3_t* p) noexcept nogil:
+        cdef SentFrame_s item
+        cdef const float* data = <float*>p.p_data
+        cdef size_t stride = p.channel_stride_in_bytes // sizeof(float)
+        cdef size_t c, j
+        if self.has_audio_callback:
+            with gil:
+                self.audio_callback()
+        item.media_type = 2
+        item.size = p.no_samples
+        item.count = p.no_channels
+        item.first_value = data[0]
+        item.last_value = data[p.no_samples - 1]
+        item.sent_ns = monotonic_ns()
+        item.timecode = p.timecode
+        self.sent.push_back(item)
+        for c in range(<size_t>p.no_channels):
+            for j in range(<size_t>p.no_samples):
+                self.audio_data.push_back(data[c * stride + j])
+        self.audio_shapes.push_back(p.no_channels)
+        self.audio_shapes.push_back(p.no_samples)
+
+    cdef void _ndi_send_metadata(self, NDIlib_metadata_frame_t* p) noexcept nogil:
+        cdef SentFrame_s item
+        item.media_type = 3
+        item.size = p.length
+        item.count = 0
+        item.first_value = <uint8_t>p.p_data[0]
+        item.last_value = item.first_value
+        item.sent_ns = monotonic_ns()
+        item.timecode = p.timecode
+        self.sent.push_back(item)
+
+    def get_sent(self, bint clear=True):
+        """Get a list of the frames sent (see above)
+        """
+        result = [
+            (
+                item.media_type, item.size, item.count, item.first_value,
+                item.last_value, item.sent_ns, item.timecode,
+            )
+            for item in self.sent
+        ]
+        if clear:
+            self.sent.clear()
+        return result
+
+    def get_sent_values(self, bint clear=True):
+        """Get the first byte of each video frame sent
+        """
+        return [item[3] for item in self.get_sent(clear) if item[0] == 1]
+
+    def get_sent_audio(self, bint clear=True):
+        """Get the sample data of each audio frame sent as a list of arrays
+        with shape ``(num_channels, num_samples)``
+        """
+        cdef size_t i, offset = 0, num_channels, num_samples
+        data = np.array(self.audio_data, dtype=np.float32)
+        result = []
+        for i in range(self.audio_shapes.size() // 2):
+            num_channels = self.audio_shapes[i * 2]
+            num_samples = self.audio_shapes[i * 2 + 1]
+            result.append(
+                data[offset:offset + num_channels * num_samples].reshape(
+                    (num_channels, num_samples)
+                )
+            )
+            offset += num_channels * num_samples
+        if clear:
+            self.audio_data.clear()
+            self.audio_shapes.clear()
+        return result
+
+
+def get_video_frame_size(FourCC fourcc, size_t xres, size_t yres):
+    """Get the buffer size (in bytes) of a video frame with the given format
+    """
+    cdef FourCCPackInfo* pack_info = get_fourcc_pack_info(fourcc, xres, yres)
+    cdef size_t total_size = pack_info.total_size
+    fourcc_pack_info_destroy(pack_info)
+    return total_size
+
+
+cdef class BenchReceiver(Receiver):
+    """A :class:`~cyndilib.receiver.Receiver` that produces synthetic frames
+    in place of ``NDIlib_recv_capture_v3``
+
+    :meth:`Receiver.__init__` is skipped so no |NDI| instance is created
+    (the receiver pointer stays ``NULL`` and nothing is passed to the
+    library's free functions). Each capture fills the requested frame
+    struct from the source buffers set with :meth:`set_video_source`
+    and :meth:`set_audio_source`, alternating between video and audio when
+    both are requested.
+    """
+    cdef NDIlib_video_frame_v2_t video_src
+    cdef NDIlib_audio_frame_v3_t audio_src
+    cdef cnp.uint8_t[:] video_data
+    cdef cnp.float32_t[:,:] audio_data
+    cdef bint has_video_src, has_audio_src, last_was_video
+    cdef readonly size_t num_video_captured, num_audio_captured
+    cdef readonly size_t video_frame_size, audio_frame_size
+    cdef int64_t video_timestamp_step
+
+    def __init__(self, *args, **kwargs):
+        self.has_video_frame = False
+        self.has_audio_frame = False
+        self.has_metadata_frame = False
+        self.has_video_src = False
+        self.has_audio_src = False
+        self.last_was_video = False
+        self.num_video_captured = 0
+        self.num_audio_captured = 0
+        self.video_frame_size = 0
+        self.audio_frame_size = 0
+        self.video_timestamp_step = 1
+
+    def set_video_source(
+        self,
+        cnp.uint8_t[:] data,
+        size_t xres,
+        size_t yres,
+        FourCC fourcc,
+        int frame_rate_N=30000,
+        int frame_rate_D=1001,
+        int64_t timestamp_step=1,
+    ):
+        """Set the data and format used for captured video frames
+
+        Each captured frame's timestamp is the number of frames captured
+        multiplied by *timestamp_step*
+
+        Returns the size (in bytes) of each frame
+        """
+        cdef FourCCPackInfo* pack_info = get_fourcc_pack_info(fourcc, xres, yres)
+        cdef size_t total_size = pack_info.total_size
+        cdef int line_stride = pack_info.line_strides[0]
+        fourcc_pack_info_destroy(pack_info)
+        if <size_t>data.shape[0] < total_size:
+            raise_exception('video data too small for format')
+
+        self.video_data = data
+        self.video_src.xres = xres
+        self.video_src.yres = yres
+        self.video_src.FourCC = fourcc_type_cast(fourcc)
+        self.video_src.frame_rate_N = frame_rate_N
+        self.video_src.frame_rate_D = frame_rate_D
+        self.video_src.picture_aspect_ratio = 0
+        self.video_src.frame_format_type = NDIlib_frame_format_type_progressive
+        self.video_src.timecode = 0
+        self.video_src.p_data = &data[0]
+        self.video_src.line_stride_in_bytes = line_stride
+        self.video_src.p_metadata = NULL
+        self.video_src.timestamp = 0
+        self.video_frame_size = total_size
+        self.video_timestamp_step = timestamp_step
+        self.has_video_src = True
+        return total_size
+
+    def set_audio_source(self, cnp.float32_t[:,::1] data, int sample_rate=48000):
+        """Set the (planar) sample data used for captured audio frames
+
+        Returns the size (in bytes) of each frame
+        """
+        cdef size_t nchannels = data.shape[0], nsamples = data.shape[1]
+        self.audio_data = data
+        self.audio_src.sample_rate = sample_rate
+        self.audio_src.no_channels = nchannels
+        self.audio_src.no_samples = nsamples
+        self.audio_src.timecode = 0
+        self.audio_src.FourCC = NDIlib_FourCC_audio_type_FLTP
+        self.audio_src.p_data = <uint8_t*>&data[0,0]
+        self.audio_src.channel_stride_in_bytes = sizeof(float) * nsamples
+        self.audio_src.p_metadata = NULL
+        self.audio_src.timestamp = 0
+        self.audio_frame_size = sizeof(float) * nsamples * nchannels
+        self.has_audio_src = True
+        return self.audio_frame_size
+
+    cdef ReceiveFrameType _do_receive(
+        self,
+        NDIlib_video_frame_v2_t* video_frame,
+        NDIlib_audio_frame_v3_t* audio_frame,
+        NDIlib_metadata_frame_t* metadata_frame,
+        uint32_t timeout_ms
+    ) noexcept nogil:
+        cdef bint want_video = video_frame is not NULL and self.has_video_src
+        cdef bint want_audio = audio_frame is not NULL and self.has_audio_src
+        if want_video and want_audio:
+            want_video = not self.last_was_video
+            want_audio = not want_video
+        if want_video:
+            self.num_video_captured += 1
+            self.video_src.timecode = self.num_video_captured
+            self.video_src.timestamp = self.num_video_captured * self.video_timestamp_step
+            video_frame[0] = self.video_src
+            self.last_was_video = True
+            return ReceiveFrameType.recv_video
+        elif want_audio:
+            self.num_audio_captured += 1
+            self.audio_src.timecode = self.num_audio_captured
+            self.audio_src.timestamp = self.num_audio_captured
+            audio_frame[0] = self.audio_src
+            self.last_was_video = False
+            return ReceiveFrameType.recv_audio
+        return ReceiveFrameType.nothing
+
+
+def make_receiver(
+    object video_value=None,
+    object audio_value=None,
+    size_t xres=64,
+    size_t yres=36,
+    FourCC fourcc=FourCC.UYVY,
+    size_t num_channels=2,
+    size_t num_samples=400,
+    int sample_rate=48000,
+    size_t max_buffers=4,
+):
+    """Create a :class:`BenchReceiver` with a video and an audio frame
+
+    If *video_value* is given, captured video frames have the given format
+    and every byte set to it. If *audio_value* is given, captured audio
+    frames have every sample set to it.
+    """
+    rx = BenchReceiver()
+    rx.set_video_frame(VideoRecvFrame(max_buffers=max_buffers))
+    rx.set_audio_frame(AudioRecvFrame())
+    if video_value is not None:
+        size = get_video_frame_size(fourcc, xres, yres)
+        rx.set_video_source(np.full(size, video_value, dtype=np.uint8), xres, yres, fourcc)
+    if audio_value is not None:
+        rx.set_audio_source(
+            np.full((num_channels, num_samples), audio_value, dtype=np.float32),
+            sample_rate,
+        )
+    return rx
+
+
+def feed(BenchReceiver rx, size_t num_video=0, size_t num_audio=0):
+    """Receive the given number of video and audio frames into the frames
+    of a :class:`BenchReceiver`
+    """
+    cdef size_t i
+    for i in range(num_video):
+        assert rx.receive(ReceiveFrameType.recv_video, 0) == ReceiveFrameType.recv_video
+    for i in range(num_audio):
+        assert rx.receive(ReceiveFrameType.recv_audio, 0) == ReceiveFrameType.recv_audio
+
+
+ctypedef fused Stage:
+    Compositor
+    FrameRateConverter
+    Switcher
+    AudioMixer
+
+
+def run_ticks(Stage stage, size_t num_ticks):
+    """Run the given number of output clock ticks of a stage immediately
+    (without its thread)
+
+    Use with a :class:`RecordingSender` to store what would have been sent.
+    """
+    cdef size_t i
+    with nogil:
+        for i in range(num_ticks):
+            stage._tick()
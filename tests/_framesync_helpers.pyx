@@ -9,11 +9,22 @@
 
 cimport cython
 cimport numpy as cnp
+from libc.string cimport memset
 
 from cyndilib.wrapper cimport *
 from cyndilib.framesync_helper cimport FrameSyncVideoInstance_s, FrameSyncAudioInstance_s
 from cyndilib.video_frame cimport VideoFrameSync
 from cyndilib.audio_frame cimport AudioFrameSync
+from libcpp.vector cimport vector
+from cyndilib.framesync cimport (
+    FrameSyncWorker, FrameSyncGroup, FrameSyncGroupEntry_s,
+    video_frame_copy_into, audio_frame_copy_into,
+    AudioPullSource, AudioPull_s, audio_pull,
+)
+from cyndilib.pacing cimport (
+    PacingClock_s, pacing_clock_init, pacing_clock_set_rate, pacing_clock_wait,
+)
+from cyndilib.clock cimport sleep
 
 
 
@@ -108,6 +119,35 @@ cdef void track_video_frame_sync_free(
 
 
 
+def copy_video_into(uint8_t[::1] arr, int width, int height, uint8_t[::1] dest):
+    """Copy a UYVY frame with the data in *arr* into *dest* using
+    :func:`cyndilib.framesync.video_frame_copy_into`
+    """
+    cdef NDIlib_video_frame_v2_t frame
+    memset(&frame, 0, sizeof(NDIlib_video_frame_v2_t))
+    frame.xres = width
+    frame.yres = height
+    frame.FourCC = NDIlib_FourCC_video_type_UYVY
+    frame.line_stride_in_bytes = width * 2
+    frame.p_data = &arr[0]
+    return video_frame_copy_into(&frame, dest)
+
+
+def copy_audio_into(float[:, ::1] samples, float[:, ::1] dest, double scale=1):
+    """Copy *samples* into *dest* using
+    :func:`cyndilib.framesync.audio_frame_copy_into`
+    """
+    cdef NDIlib_audio_frame_v3_t frame
+    memset(&frame, 0, sizeof(NDIlib_audio_frame_v3_t))
+    frame.sample_rate = 48000
+    frame.no_channels = samples.shape[0]
+    frame.no_samples = samples.shape[1]
+    frame.channel_stride_in_bytes = samples.shape[1] * sizeof(float)
+    frame.FourCC = NDIlib_FourCC_audio_type_FLTP
+    frame.p_data = <uint8_t*>&samples[0, 0]
+    return audio_frame_copy_into(&frame, dest, scale)
+
+
 cdef class BaseFrameSyncHelper:
     cdef FrameSyncFreeTracker tracker
     def __cinit__(self, *args, **kwargs):
@@ -245,3 +285,200 @@ cdef class VideoFrameSyncHelper(BaseFrameSyncHelper):
         if self.video_frame.ptr.p_data is NULL:
             return
         self.video_frame._free_framesync_data()
+
+    def acquire_front(self):
+        """Acquire the most recent frame data as a consumer thread would
+
+        Returns a tuple of ``(index, data)`` (with the data copied to
+        :class:`bytes`) or ``None`` if nothing has been captured
+        """
+        cdef size_t idx, size
+        cdef uint8_t* data
+        if not self.video_frame._acquire_front(&idx, &data, &size):
+            return None
+        return idx, (<char*>data)[:size]
+
+    def release_front(self, size_t idx):
+        self.video_frame._release_front(idx)
+
+
+
+cdef class PacedWorkerHelper(FrameSyncWorker):
+    """A :class:`~cyndilib.framesync.FrameSyncWorker` without a
+    :class:`~cyndilib.framesync.FrameSync` whose captures take
+    :attr:`capture_time` seconds
+    """
+    cdef public double capture_time
+    cdef public bint connected
+    cdef frame_rate_t source_rate
+
+    def __init__(self, source_rate=(100, 1), double capture_time=0):
+        super().__init__(None)
+        self.source_rate.numerator, self.source_rate.denominator = source_rate
+        self.capture_time = capture_time
+        self.connected = True
+
+    def run_loop(self):
+        self.run()
+
+    def stop_loop(self):
+        self.stop()
+
+    def set_callback(self, cb):
+        self.callback.set_callback(cb)
+
+    @property
+    def current_rate(self):
+        return (self.frame_rate.numerator, self.frame_rate.denominator)
+
+    cdef bint has_frame(self) except -1:
+        return True
+
+    cdef bint is_connected(self) except -1 nogil:
+        return self.connected
+
+    cdef bint can_capture(self) noexcept nogil:
+        return True
+
+    cdef bint do_capture(self) except -1 nogil:
+        if self.capture_time > 0:
+            sleep(self.capture_time)
+        return True
+
+    cdef int get_source_rate(self, frame_rate_t* fr) except -1 nogil:
+        fr.numerator = self.source_rate.numerator
+        fr.denominator = self.source_rate.denominator
+        return 0
+
+
+cdef class FrameSyncGroupHelper(FrameSyncGroup):
+    """A :class:`~cyndilib.framesync.FrameSyncGroup` whose members are
+    frames without a :class:`~cyndilib.framesync.FrameSync`
+
+    Captures stamp the video frames with the tick timestamp and record the
+    number of audio samples requested.
+    """
+    cdef vector[size_t] sample_counts
+
+    def add_frames(self, VideoFrameSync video_frame=None, AudioFrameSync audio_frame=None):
+        member = object()
+        self._add_entry(member, NULL, video_frame, audio_frame)
+        return member
+
+    def get_sample_counts(self):
+        return [n for n in self.sample_counts]
+
+    cdef int _capture_entry(self, FrameSyncGroupEntry_s* entry) except -1 nogil:
+        if entry.video_ptr is not NULL:
+            entry.video_ptr.timestamp = self.timestamp
+        if entry.audio_ptr is not NULL:
+            entry.audio_ptr.timestamp = self.timestamp
+            entry.audio_ptr.no_samples = entry.num_samples
+            self.sample_counts.push_back(entry.num_samples)
+        return 0
+
+
+# Stand-in for the NDI frame sync audio queue used by FakeAudioPullSource.
+# Queued samples have increasing values (multiplied by the channel number)
+cdef struct FakeAudioQueue_s:
+    int64_t depth
+    int64_t next_value
+    int64_t num_captures
+
+
+cdef int fake_queue_depth(NDIlib_framesync_instance_t fs_ptr) noexcept nogil:
+    return (<FakeAudioQueue_s*>fs_ptr).depth
+
+
+cdef void fake_queue_capture(
+    NDIlib_framesync_instance_t fs_ptr,
+    NDIlib_audio_frame_v3_t* audio_ptr,
+    int sample_rate,
+    int no_channels,
+    int no_samples,
+) noexcept nogil:
+    cdef FakeAudioQueue_s* queue = <FakeAudioQueue_s*>fs_ptr
+    cdef int64_t available = min(queue.depth, <int64_t>no_samples)
+    cdef float* data = <float*>mem_alloc(sizeof(float) * no_channels * no_samples)
+    cdef size_t i, j
+    for i in range(no_channels):
+        for j in range(no_samples):
+            if <int64_t>j < available:
+                data[i * no_samples + j] = (queue.next_value + j + 1) * (i + 1)
+            else:
+                data[i * no_samples + j] = 0
+    queue.next_value += available
+    queue.depth -= available
+    queue.num_captures += 1
+    audio_ptr.sample_rate = sample_rate
+    audio_ptr.no_channels = no_channels
+    audio_ptr.no_samples = no_samples
+    audio_ptr.channel_stride_in_bytes = sizeof(float) * no_samples
+    audio_ptr.p_data = <uint8_t*>data
+
+
+cdef void fake_queue_free(
+    NDIlib_framesync_instance_t fs_ptr,
+    NDIlib_audio_frame_v3_t* audio_ptr,
+) noexcept nogil:
+    mem_free(audio_ptr.p_data)
+    audio_ptr.p_data = NULL
+
+
+cdef class FakeAudioPullSource(AudioPullSource):
+    """An :class:`~cyndilib.framesync.AudioPullSource` reading from a fake
+    audio queue instead of a :class:`~cyndilib.framesync.FrameSync`
+    """
+    cdef FakeAudioQueue_s queue
+
+    def __init__(self, int sample_rate=48000, int64_t max_queue_samples=0):
+        self.queue.depth = 0
+        self.queue.next_value = 0
+        self.queue.num_captures = 0
+        self.state.fs_ptr = <NDIlib_framesync_instance_t>&self.queue
+        self.state.queue_depth = fake_queue_depth
+        self.state.capture = fake_queue_capture
+        self.state.free_audio = fake_queue_free
+        self.sample_rate = sample_rate
+        self.max_queue_samples = max_queue_samples
+
+    @property
+    def depth(self):
+        return self.queue.depth
+
+    @property
+    def num_captures(self):
+        return self.queue.num_captures
+
+    def add_samples(self, int64_t num_samples):
+        self.queue.depth += num_samples
+
+    def run_clock(
+        self,
+        size_t period,
+        size_t num_periods,
+        size_t num_channels,
+        int64_t produce_per_period,
+        bint paced=False,
+    ):
+        """Pull *period* samples *num_periods* times (like an audio device
+        callback) without the GIL, adding *produce_per_period* samples to the
+        queue before each pull
+
+        If *paced* is True, the pulls happen in real time at the sample rate
+        """
+        cdef AudioPull_s* state = self._get_state()
+        cdef PacingClock_s clock
+        cdef float* buffer = <float*>mem_alloc(sizeof(float) * num_channels * period)
+        cdef size_t i
+        pacing_clock_init(&clock)
+        pacing_clock_set_rate(&clock, state.sample_rate, period)
+        try:
+            with nogil:
+                for i in range(num_periods):
+                    if paced:
+                        pacing_clock_wait(&clock)
+                    self.queue.depth += produce_per_period
+                    audio_pull(state, buffer, num_channels, period, period)
+        finally:
+            mem_free(buffer)
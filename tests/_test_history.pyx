@@ -0,0 +1,64 @@
+# cython: language_level=3
+# distutils: language = c++
+# distutils: include_dirs=DISTUTILS_INCLUDE_DIRS
+# distutils: extra_compile_args=DISTUTILS_EXTRA_COMPILE_ARGS
+
+from libc.stdint cimport *
+cimport numpy as cnp
+
+from cyndilib.wrapper cimport *
+from cyndilib.history cimport HistoryBuffer
+
+
+def get_undefined_timestamp():
+    return NDIlib_recv_timestamp_undefined
+
+
+def add_video(
+    HistoryBuffer history,
+    cnp.uint8_t[:] data,
+    int xres,
+    int yres,
+    FourCC fourcc,
+    int64_t timestamp,
+    int64_t timecode=0,
+    int frame_rate_N=30,
+    int frame_rate_D=1,
+):
+    """Add a video frame to the history as if it were received
+    """
+    cdef NDIlib_video_frame_v2_t p
+    p.xres = xres
+    p.yres = yres
+    p.FourCC = fourcc_type_cast(fourcc)
+    p.frame_rate_N = frame_rate_N
+    p.frame_rate_D = frame_rate_D
+    p.picture_aspect_ratio = 0
+    p.frame_format_type = NDIlib_frame_format_type_progressive
+    p.timecode = timecode
+    p.p_data = &data[0]
+    p.line_stride_in_bytes = 0
+    p.p_metadata = NULL
+    p.timestamp = timestamp
+    history._add_video(&p)
+
+
+def add_audio(
+    HistoryBuffer history,
+    cnp.float32_t[:,::1] data,
+    int64_t timestamp,
+    int sample_rate=48000,
+):
+    """Add a (planar) audio frame to the history as if it were received
+    """
+    cdef NDIlib_audio_frame_v3_t p
+    p.sample_rate = sample_rate
+    p.no_channels = data.shape[0]
+    p.no_samples = data.shape[1]
+    p.timecode = timestamp
+    p.FourCC = NDIlib_FourCC_audio_type_FLTP
+    p.p_data = <uint8_t*>&data[0,0]
+    p.channel_stride_in_bytes = sizeof(float) * data.shape[1]
+    p.p_metadata = NULL
+    p.timestamp = timestamp
+    history._add_audio(&p)
@@ -0,0 +1,49 @@
+# cython: language_level=3
+# distutils: language = c++
+# distutils: include_dirs=DISTUTILS_INCLUDE_DIRS
+# distutils: extra_compile_args=DISTUTILS_EXTRA_COMPILE_ARGS
+
+from cyndilib.locks cimport Lock, Condition, Event
+
+
+def event_wait_nogil(Event evt, double timeout):
+    """Wait on *evt* with the GIL released
+    """
+    cdef bint result
+    with nogil:
+        result = evt._wait(True, timeout)
+    return result
+
+
+def condition_wait_nogil(Condition cond, double timeout):
+    """Acquire *cond* and wait on it with the GIL released
+    """
+    cdef bint result
+    with nogil:
+        cond._acquire(True, -1)
+        try:
+            result = cond._wait(True, timeout)
+        finally:
+            cond._release()
+    return result
+
+
+def condition_notify_nogil(Condition cond):
+    """Acquire *cond* and notify all waiters with the GIL released
+    """
+    with nogil:
+        cond._acquire(True, -1)
+        try:
+            cond._notify_all()
+        finally:
+            cond._release()
+
+
+def lock_contend_nogil(Lock lock, size_t count):
+    """Acquire and release *lock* *count* times with the GIL released
+    """
+    cdef size_t i
+    with nogil:
+        for i in range(count):
+            lock._acquire(True, -1)
+            lock._release()
@@ -0,0 +1,26 @@
+# cython: language_level=3
+# distutils: language = c++
+# distutils: include_dirs=DISTUTILS_INCLUDE_DIRS
+# distutils: extra_compile_args=DISTUTILS_EXTRA_COMPILE_ARGS
+
+from libc.stdint cimport *
+
+from cyndilib.wrapper cimport *
+from cyndilib.metadata_frame cimport MetadataRecvFrame
+
+
+def fake_receive(MetadataRecvFrame mf, bytes data, int64_t timecode=0):
+    """Simulate an incoming message without a receiver instance
+    """
+    if not mf.can_receive():
+        return False
+    mf._prepare_incoming(NULL)
+    mf.ptr.p_data = data
+    mf.ptr.length = len(data) + 1
+    mf.ptr.timecode = timecode
+    try:
+        mf._process_incoming(NULL)
+    finally:
+        mf.ptr.p_data = NULL
+        mf.ptr.length = 0
+    return True
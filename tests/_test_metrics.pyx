@@ -0,0 +1,42 @@
+# cython: language_level=3
+# distutils: language = c++
+# distutils: include_dirs=DISTUTILS_INCLUDE_DIRS
+# distutils: extra_compile_args=DISTUTILS_EXTRA_COMPILE_ARGS
+
+from libc.stdint cimport *
+
+from cyndilib.metrics cimport (
+    MetricsKind, MetricsRow_s, metrics_register, metrics_unregister,
+)
+
+
+cdef int _fill_dummy_metrics(object obj, MetricsRow_s* row) except -1:
+    cdef DummySource src = obj
+    row.video_frames = src.video_frames
+    row.video_dropped = src.video_dropped
+    row.connections = src.connections
+    row.connected = src.connections > 0
+    row.sources = src.sources
+    return 0
+
+
+cdef class DummySource:
+    """Registers itself like a :class:`~cyndilib.receiver.Receiver` (or
+    :class:`~cyndilib.finder.Finder`) without needing the |NDI| library
+    """
+    cdef public str source_name
+    cdef public int64_t video_frames, video_dropped, connections, sources
+
+    def __init__(self, str source_name='', bint finder=False):
+        self.source_name = source_name
+        self.video_frames = 0
+        self.video_dropped = 0
+        self.connections = 0
+        self.sources = 0
+        if finder:
+            metrics_register(self, MetricsKind.metrics_finder, _fill_dummy_metrics)
+        else:
+            metrics_register(self, MetricsKind.metrics_receiver, _fill_dummy_metrics)
+
+    def __dealloc__(self):
+        metrics_unregister(self)
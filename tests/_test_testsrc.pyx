@@ -0,0 +1,57 @@
+# cython: language_level=3
+# distutils: language = c++
+# distutils: include_dirs=DISTUTILS_INCLUDE_DIRS
+# distutils: extra_compile_args=DISTUTILS_EXTRA_COMPILE_ARGS
+
+from libc.stdint cimport *
+from libc.string cimport memcpy
+cimport numpy as cnp
+
+import numpy as np
+
+from cyndilib.wrapper cimport *
+from cyndilib.send_frame_status cimport VideoSendFrame_item_s, AudioSendFrame_item_s
+from cyndilib.video_frame cimport VideoSendFrame
+from cyndilib.audio_frame cimport AudioSendFrame
+from cyndilib.testsrc cimport LoadGenerator
+
+
+cdef class BenchLoadGenerator(LoadGenerator):
+    """A :class:`~cyndilib.testsrc.LoadGenerator` that can be ticked
+    without its threads
+    """
+    def run_ticks(self, size_t num_ticks, int64_t start_index=0):
+        """Run the given number of ticks (of all workers) immediately
+        """
+        cdef size_t i, worker
+        with nogil:
+            for i in range(num_ticks):
+                for worker in range(self.num_threads):
+                    self._tick(worker, start_index + i)
+
+
+def read_video_frame(VideoSendFrame vf):
+    """Copy the data of the next frame ready to send (without sending it)
+    """
+    cdef VideoSendFrame_item_s* item = vf._get_send_frame()
+    cdef size_t size = vf._get_buffer_size()
+    result = np.empty(size, dtype=np.uint8)
+    cdef int64_t timecode = item.frame_ptr.timecode
+    memcpy(cnp.PyArray_DATA(result), item.frame_ptr.p_data, size)
+    vf._on_sender_write(item)
+    return result, timecode
+
+
+def read_audio_frame(AudioSendFrame af):
+    """Copy the data of the next frame ready to send (without sending it)
+    """
+    cdef AudioSendFrame_item_s* item = af._get_send_frame()
+    cdef size_t num_samples = item.frame_ptr.no_samples
+    cdef int64_t timecode = item.frame_ptr.timecode
+    result = np.empty((af._get_num_channels(), num_samples), dtype=np.float32)
+    memcpy(
+        cnp.PyArray_DATA(result), item.frame_ptr.p_data,
+        result.shape[0] * num_samples * sizeof(float),
+    )
+    af._on_sender_write(item)
+    return result, timecode
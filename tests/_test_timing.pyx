@@ -0,0 +1,28 @@
+# cython: language_level=3
+# distutils: language = c++
+# distutils: include_dirs=DISTUTILS_INCLUDE_DIRS
+# distutils: extra_compile_args=DISTUTILS_EXTRA_COMPILE_ARGS
+
+from libc.stdint cimport *
+
+from cyndilib.timing cimport StageTimer, stage_timing_add, stage_timing_bucket_index
+
+
+def add_sample(StageTimer timer, size_t stage, int64_t elapsed_ns):
+    """Record a sample directly (bypassing the clock)
+    """
+    stage_timing_add(&timer.stages[stage], elapsed_ns)
+
+
+def time_stage(StageTimer timer, size_t stage):
+    """Run a start/stop pair on the given stage
+    """
+    cdef int64_t start_ns
+    with nogil:
+        start_ns = timer._start()
+        timer._stop(stage, start_ns)
+    return start_ns
+
+
+def get_bucket_index(int64_t elapsed_ns):
+    return stage_timing_bucket_index(elapsed_ns)
@@ -0,0 +1,158 @@
+import time
+
+import numpy as np
+import pytest
+
+from cyndilib.audio_mixer import AudioMixer, AudioMixerInput
+from cyndilib.audio_frame import AudioSendFrame
+from _framesync_helpers import FakeAudioPullSource  # type: ignore[missing-import]
+from _bench_helpers import (  # type: ignore[missing-import]
+    RecordingSender, make_receiver, feed, run_ticks,
+)
+
+BLOCK_SIZE = 100
+
+
+def expected_samples(start, num_samples, num_channels=2):
+    values = np.arange(start + 1, start + num_samples + 1, dtype=np.float32)
+    return np.stack([values * (i + 1) for i in range(num_channels)])
+
+
+def make_sender(num_channels=2, sample_rate=48000):
+    af = AudioSendFrame()
+    af.num_channels = num_channels
+    af.sample_rate = sample_rate
+    return RecordingSender(audio_frame=af)
+
+
+def get_sent(mixer):
+    # The blocks sent as an array of (num_blocks, num_channels, block_size)
+    sent = mixer.sender.get_sent_audio()
+    return np.array(sent).reshape((len(sent), mixer.num_channels, mixer.block_size))
+
+
+def test_mix():
+    sources = [FakeAudioPullSource(), FakeAudioPullSource()]
+    mixer = AudioMixer(make_sender(), sources, block_size=BLOCK_SIZE, ramp_time=0)
+    assert len(mixer) == 2
+    assert mixer.sources == tuple(sources)
+    assert (mixer.num_channels, mixer.sample_rate) == (2, 48000)
+    assert all(isinstance(inp, AudioMixerInput) for inp in mixer.inputs)
+    assert np.array_equal(mixer.inputs[0].routing, np.eye(2))
+
+    for src in sources:
+        src.add_samples(1000)
+    run_ticks(mixer, 1)
+    sent = get_sent(mixer)
+    assert sent.shape == (1, 2, BLOCK_SIZE)
+    assert np.array_equal(sent[0], expected_samples(0, BLOCK_SIZE) * 2)
+
+    mixer.inputs[0].gain = .5
+    mixer.inputs[1].muted = True
+    run_ticks(mixer, 1)
+    assert np.allclose(get_sent(mixer)[0], expected_samples(100, BLOCK_SIZE) * .5)
+
+    # Swap the channels
+    mixer.inputs[0].gain = 1
+    mixer.inputs[0].routing = [[0, 1], [1, 0]]
+    run_ticks(mixer, 1)
+    assert np.array_equal(get_sent(mixer)[0], expected_samples(200, BLOCK_SIZE)[::-1])
+    assert mixer.num_blocks == mixer.num_audio_sent == 3
+    assert sources[1].get_stats()['pulls'] == 3
+
+    with pytest.raises(ValueError):
+        mixer.inputs[0].gain = -1
+    with pytest.raises(ValueError):
+        mixer.inputs[0].routing = np.ones((2, 3))
+    with pytest.raises(ValueError):
+        AudioMixer(None, [])
+    with pytest.raises(TypeError):
+        AudioMixer(None, [make_receiver(None, 1)])
+    with pytest.raises(ValueError):
+        AudioMixer(make_sender(sample_rate=44100), sources, sample_rate=48000)
+    with pytest.raises(ValueError):
+        AudioMixer(make_sender(), sources, block_size=2000)
+
+
+def test_ramp():
+    rx = make_receiver(None, 1)
+    mixer = AudioMixer(
+        make_sender(), [rx.audio_frame], block_size=BLOCK_SIZE, ramp_time=200 / 48000,
+    )
+    feed(rx, num_audio=2)
+    mixer.inputs[0].gain = 0
+    run_ticks(mixer, 3)
+    sent = get_sent(mixer)
+    ramp = 1 - np.arange(1, 201) / 200
+    assert np.allclose(sent[:2, 0].reshape(-1), ramp, atol=1e-6)
+    assert np.array_equal(sent[:2, 0], sent[:2, 1])
+    assert not np.any(sent[2])
+
+
+def test_recv_frame():
+    rx = make_receiver(None, .25, num_channels=1)
+    # The number of channels is taken from the frame
+    feed(rx, num_audio=1)
+    mixer = AudioMixer(make_sender(), [rx.audio_frame], block_size=300, ramp_time=0)
+    inp = mixer.inputs[0]
+    assert inp.num_channels == 1
+    # A mono input goes to all outputs
+    assert np.array_equal(inp.routing, [[1], [1]])
+
+    run_ticks(mixer, 2)
+    sent = get_sent(mixer)
+    assert np.all(sent[0] == .25)
+    # The rest of the frame is followed by silence
+    assert np.all(sent[1][:, :100] == .25)
+    assert not np.any(sent[1][:, 100:])
+    assert inp.num_underruns == 1
+    assert inp.samples_padded == 200
+    assert rx.audio_frame.get_buffer_depth() == 0
+
+    meters = mixer.get_meters()
+    assert np.allclose(meters['peak'], [.25, .25])
+    assert np.allclose(meters['rms'], [.25 * np.sqrt(1 / 3)] * 2)
+    feed(rx, num_audio=1)
+    run_ticks(mixer, 1)
+    meters = mixer.get_meters(db=True)
+    assert np.allclose(meters['peak'], 20 * np.log10(.25))
+    assert np.allclose(meters['rms'], 20 * np.log10(.25))
+
+    run_ticks(mixer, 2)
+    assert np.all(mixer.get_meters(db=True)['peak'] == -np.inf)
+
+
+def test_sample_rate():
+    # Pull sources are resampled to the mixer's rate
+    source = FakeAudioPullSource(sample_rate=44100)
+    mixer = AudioMixer(make_sender(), [source], block_size=BLOCK_SIZE)
+    assert source.sample_rate == 48000
+    assert mixer.inputs[0].sample_rate == 48000
+
+    rx = make_receiver(None, 1, sample_rate=44100)
+    feed(rx, num_audio=1)
+    with pytest.raises(ValueError):
+        AudioMixer(None, [rx.audio_frame], block_size=BLOCK_SIZE)
+
+    # Frames at another rate received later are discarded
+    rx = make_receiver(None, 1, sample_rate=44100)
+    mixer = AudioMixer(make_sender(), [rx.audio_frame], block_size=BLOCK_SIZE)
+    feed(rx, num_audio=1)
+    run_ticks(mixer, 1)
+    assert not np.any(get_sent(mixer))
+    assert mixer.inputs[0].num_underruns == 1
+    assert rx.audio_frame.get_buffer_depth() == 0
+
+
+def test_thread():
+    source = FakeAudioPullSource()
+    source.add_samples(48000)
+    mixer = AudioMixer(make_sender(), [source], block_size=480)
+    with mixer:
+        assert mixer.is_running
+        time.sleep(.25)
+    assert not mixer.is_running
+    assert 15 <= mixer.num_blocks <= 35
+    sent = get_sent(mixer)
+    assert len(sent) == mixer.num_blocks
+    assert np.array_equal(sent[-1], expected_samples(480 * (len(sent) - 1), 480))
@@ -0,0 +1,104 @@
+import time
+
+import numpy as np
+import pytest
+
+from _framesync_helpers import FakeAudioPullSource  # type: ignore[missing-import]
+
+
+def expected_samples(start, num_samples, num_channels=2):
+    values = np.arange(start + 1, start + num_samples + 1, dtype=np.float32)
+    return np.stack([values * (i + 1) for i in range(num_channels)])
+
+
+def test_pull():
+    source = FakeAudioPullSource()
+    assert source.sample_rate == 48000
+    assert source.max_queue_samples == 0
+    with pytest.raises(ValueError):
+        source.sample_rate = 0
+    with pytest.raises(ValueError):
+        source.max_queue_samples = -1
+
+    dest = np.full((2, 800), -1, dtype=np.float32)
+    source.add_samples(1000)
+    assert source.pull(dest) == 800
+    assert np.array_equal(dest, expected_samples(0, 800))
+    stats = source.get_stats()
+    assert stats['pulls'] == 1
+    assert stats['samples_pulled'] == 800
+    assert stats['padded'] == 0
+    assert stats['queue_depth'] == 1000
+
+    # The rest is filled with silence
+    assert source.pull(dest) == 800
+    assert np.array_equal(dest[:, :200], expected_samples(800, 200))
+    assert not np.any(dest[:, 200:])
+    stats = source.get_stats()
+    assert stats['pulls'] == 2
+    assert stats['padded'] == 1
+    assert stats['samples_padded'] == 600
+    assert stats['dropped'] == 0
+
+    # Fewer channels than the source
+    source.add_samples(100)
+    dest = np.full((1, 100), -1, dtype=np.float32)
+    assert source.pull(dest) == 100
+    assert np.array_equal(dest, expected_samples(1000, 100, 1))
+
+    source.reset_stats()
+    assert source.get_stats() == {
+        'pulls': 0, 'samples_pulled': 0, 'padded': 0, 'samples_padded': 0,
+        'dropped': 0, 'samples_dropped': 0, 'queue_depth': 0,
+    }
+    assert source.pull(np.zeros((2, 0), dtype=np.float32)) == 0
+    assert source.num_captures == 3
+
+
+def test_max_queue():
+    source = FakeAudioPullSource(max_queue_samples=400)
+    source.add_samples(2000)
+    dest = np.zeros((2, 800), dtype=np.float32)
+    assert source.pull(dest) == 800
+
+    # The oldest 800 samples were dropped, leaving 400 queued
+    assert np.array_equal(dest, expected_samples(800, 800))
+    assert source.depth == 400
+    stats = source.get_stats()
+    assert stats['dropped'] == 1
+    assert stats['samples_dropped'] == 800
+    assert stats['padded'] == 0
+
+
+def test_device_clock():
+    period, num_periods = 480, 200
+
+    # Matching rates never pad once the queue is primed
+    source = FakeAudioPullSource()
+    source.add_samples(period)
+    source.run_clock(period, num_periods, 2, period)
+    stats = source.get_stats()
+    assert stats['pulls'] == num_periods
+    assert stats['samples_pulled'] == period * num_periods
+    assert stats['padded'] == 0
+    assert source.depth == period
+
+    # A slower source is padded and a faster one is dropped
+    source = FakeAudioPullSource()
+    source.run_clock(period, num_periods, 2, period - 10)
+    assert source.get_stats()['padded'] == num_periods
+    assert source.get_stats()['samples_padded'] == 10 * num_periods
+
+    source = FakeAudioPullSource(max_queue_samples=period)
+    source.run_clock(period, num_periods, 2, period + 10)
+    stats = source.get_stats()
+    assert stats['dropped'] > 0
+    assert stats['padded'] == 0
+    assert source.depth <= period
+
+    # Pulls in real time at the device period (10ms)
+    source = FakeAudioPullSource()
+    start = time.monotonic()
+    source.run_clock(period, 20, 2, period, paced=True)
+    assert time.monotonic() - start == pytest.approx(.19, abs=.05)
+    assert source.get_stats()['pulls'] == 20
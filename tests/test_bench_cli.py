@@ -0,0 +1,66 @@
+from fractions import Fraction
+
+import pytest
+
+from cyndilib.wrapper.ndi_structs import FourCC
+from cyndilib.bench import (
+    BenchConfig, build_parser, summarize_latencies, performance_delta,
+    LATENCY_PERCENTILES,
+)
+
+
+def test_config_from_args():
+    args = build_parser().parse_args([])
+    config = BenchConfig.from_args(args)
+    assert config == BenchConfig()
+
+    args = build_parser().parse_args([
+        '-n', '4', '-p', '2', '-r', '3840x2160', '-f', '60000/1001',
+        '--fourcc', 'BGRA', '-d', '1.5',
+    ])
+    config = BenchConfig.from_args(args)
+    assert config.num_streams == 4
+    assert config.num_processes == 2
+    assert (config.xres, config.yres) == (3840, 2160)
+    assert config.frame_rate == Fraction(60000, 1001)
+    assert config.fourcc == FourCC.BGRA
+    assert config.duration == 1.5
+
+    d = config.to_json()
+    assert d['frame_rate'] == [60000, 1001]
+    assert d['fourcc'] == 'BGRA'
+
+
+def test_summarize_latencies():
+    empty = summarize_latencies([])
+    assert empty['count'] == 0
+    assert all(v is None for k, v in empty.items() if k != 'count')
+
+    latencies = [i / 1000 for i in range(1, 101)]
+    result = summarize_latencies(latencies)
+    assert result['count'] == 100
+    assert result['min'] == pytest.approx(1)
+    assert result['max'] == pytest.approx(100)
+    assert result['mean'] == pytest.approx(50.5)
+    for p in LATENCY_PERCENTILES:
+        assert result[f'p{p}'] == pytest.approx(1 + 99 * p / 100)
+
+
+def test_performance_delta():
+    start = {
+        'video': {'frames_total': 100, 'frames_dropped': 40, 'dropped_percent': 40},
+        'audio': {'frames_total': 0, 'frames_dropped': 0, 'dropped_percent': 0},
+    }
+    end = {
+        'video': {'frames_total': 300, 'frames_dropped': 50, 'dropped_percent': 50 / 300 * 100},
+        'audio': {'frames_total': 0, 'frames_dropped': 0, 'dropped_percent': 0},
+        'metadata': {'frames_total': 4, 'frames_dropped': 1, 'dropped_percent': 25},
+    }
+    result = performance_delta(start, end)
+    # Only the frames after the start are counted
+    assert result['video'] == {
+        'frames_total': 200, 'frames_dropped': 10, 'dropped_percent': 5,
+    }
+    assert result['audio']['dropped_percent'] == 0
+    assert result['metadata'] == end['metadata']
+    assert performance_delta({}, end) == end
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Callable
 from fractions import Fraction
+import time
 
 import numpy as np
 import pytest
@@ -8,12 +9,20 @@ from cyndilib import AudioReference
 from cyndilib.video_frame import VideoSendFrame, VideoFrameSync
 from cyndilib.audio_frame import AudioSendFrame, AudioFrameSync
 from cyndilib.wrapper import FourCC
-from _bench_helpers import BenchSender      # type: ignore[missing-import]
+from cyndilib.receiver import ReceiveFrameType
+from cyndilib.video_frame import VideoRecvFrame
+from cyndilib.audio_frame import AudioRecvFrame
+from _bench_helpers import (    # type: ignore[missing-import]
+    BenchSender, BenchReceiver, get_video_frame_size,
+)
 from _framesync_helpers import (  # type: ignore[missing-import]
     VideoFrameSyncHelper,
     AudioFrameSyncHelper,
 )
-from conftest import VideoParams, VideoInitParams, AudioInitParams, AudioParams
+from conftest import (
+    VideoParams, VideoInitParams, AudioInitParams, AudioParams,
+    get_available_mem, ONE_MB,
+)
 
 
 @pytest.fixture(params=list(AudioReference), ids=lambda ar: ar.name)
@@ -97,6 +106,34 @@ def test_audio_send_reference_convert_benchmark(
     af.destroy()
 
 
+def test_audio_stream_send_benchmark(
+    benchmark,
+    fake_audio_data_bench: AudioParams,
+    audio_reference: AudioReference
+):
+    num_channels = fake_audio_data_bench.num_channels
+    s_perseg = fake_audio_data_bench.s_perseg
+    samples = fake_audio_data_bench.samples_2d
+    num_samples = samples.shape[1]
+
+    af = AudioSendFrame()
+    af.reference_level = audio_reference
+    af.sample_rate = fake_audio_data_bench.sample_rate
+    af.num_channels = num_channels
+    af.set_max_num_samples(s_perseg)
+    sender = BenchSender()
+    sender.set_audio_frame(af)
+
+    def run_audio_test():
+        consumed = sender.write_audio_stream(samples, s_perseg)
+        assert consumed == num_samples - (num_samples % s_perseg)
+
+    with sender:
+        benchmark(run_audio_test)
+
+    af.destroy()
+
+
 def test_video_send_benchmark(benchmark, fake_video_frames_bench: VideoParams):
     width, height, fr, num_frames, fake_frames = fake_video_frames_bench
 
@@ -202,3 +239,139 @@ def test_audio_framesync_benchmark(benchmark, fake_audio_data_bench: AudioParams
             assert fs_helper.num_outstanding == 0
 
     benchmark(run_audio_test)
+
+
+RECV_RESOLUTIONS = {
+    'SD': (720, 480),
+    'HD': (1920, 1080),
+    'UHD': (3840, 2160),
+    '8K': (7680, 4320),
+}
+NUM_RECV_FRAMES = 16
+
+
+def record_recv_rates(
+    record_property,
+    func: Callable[[], None],
+    num_frames: int,
+    frame_size: int
+) -> None:
+    """Time a single call of *func* and record the frames per second and
+    bytes per second as test properties
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    record_property('frames_per_second', num_frames / elapsed)
+    record_property('bytes_per_second', num_frames * frame_size / elapsed)
+
+
+@pytest.mark.parametrize('max_buffers', [2, 8])
+@pytest.mark.parametrize(
+    'resolution', list(RECV_RESOLUTIONS.values()), ids=list(RECV_RESOLUTIONS.keys()),
+)
+@pytest.mark.parametrize('fourcc', list(FourCC), ids=lambda fc: fc.name)
+def test_video_recv_benchmark(
+    benchmark,
+    record_property,
+    fourcc: FourCC,
+    resolution: tuple[int, int],
+    max_buffers: int
+):
+    width, height = resolution
+    frame_size = get_video_frame_size(fourcc, width, height)
+    mem_req = frame_size * (max_buffers + 3) + 200 * ONE_MB
+    if get_available_mem() < mem_req:
+        pytest.skip('Not enough memory available')
+
+    src_data = np.full(frame_size, 0x80, dtype=np.uint8)
+    dest = np.empty(frame_size, dtype=np.uint8)
+    receiver = BenchReceiver()
+    receiver.set_video_source(src_data, width, height, fourcc)
+    vf = VideoRecvFrame(max_buffers=max_buffers)
+    receiver.set_video_frame(vf)
+    num_batches = max(NUM_RECV_FRAMES // max_buffers, 1)
+
+    def run_recv_test():
+        for _ in range(num_batches):
+            for _ in range(max_buffers):
+                ft = receiver.receive(ReceiveFrameType.recv_video, 0)
+                assert ft == ReceiveFrameType.recv_video
+            assert vf.get_buffer_depth() == max_buffers
+            for _ in range(max_buffers):
+                assert vf.fill_p_data(dest)
+
+    run_recv_test()
+    assert vf.get_fourcc() == fourcc
+    assert vf.get_buffer_size() == frame_size
+    record_recv_rates(
+        record_property, run_recv_test, num_batches * max_buffers, frame_size,
+    )
+    benchmark(run_recv_test)
+
+
+@pytest.mark.parametrize('max_buffers', [2, 8])
+@pytest.mark.parametrize('num_channels', [2, 8, 32])
+def test_audio_recv_benchmark(
+    benchmark,
+    record_property,
+    num_channels: int,
+    max_buffers: int
+):
+    s_perseg = 1602
+    samples = np.random.uniform(-1, 1, (num_channels, s_perseg)).astype(np.float32)
+    receiver = BenchReceiver()
+    frame_size = receiver.set_audio_source(samples, 48000)
+    af = AudioRecvFrame(max_buffers=max_buffers)
+    receiver.set_audio_frame(af)
+    num_batches = max(NUM_RECV_FRAMES // max_buffers, 1)
+
+    def run_recv_test():
+        for _ in range(num_batches):
+            for _ in range(max_buffers):
+                ft = receiver.receive(ReceiveFrameType.recv_audio, 0)
+                assert ft == ReceiveFrameType.recv_audio
+            data, timestamps = af.get_all_read_data()
+            assert data.shape == (num_channels, s_perseg * max_buffers)
+
+    run_recv_test()
+    record_recv_rates(
+        record_property, run_recv_test, num_batches * max_buffers, frame_size,
+    )
+    benchmark(run_recv_test)
+
+
+@pytest.mark.parametrize('fourcc', [FourCC.UYVY, FourCC.BGRA], ids=lambda fc: fc.name)
+def test_video_and_audio_recv_benchmark(
+    benchmark,
+    record_property,
+    fourcc: FourCC
+):
+    width, height = RECV_RESOLUTIONS['HD']
+    frame_size = get_video_frame_size(fourcc, width, height)
+    src_data = np.full(frame_size, 0x80, dtype=np.uint8)
+    dest = np.empty(frame_size, dtype=np.uint8)
+    samples = np.zeros((2, 1602), dtype=np.float32)
+
+    receiver = BenchReceiver()
+    receiver.set_video_source(src_data, width, height, fourcc)
+    audio_frame_size = receiver.set_audio_source(samples, 48000)
+    vf = VideoRecvFrame(max_buffers=4)
+    af = AudioRecvFrame(max_buffers=4)
+    receiver.set_video_frame(vf)
+    receiver.set_audio_frame(af)
+    recv_type = ReceiveFrameType.recv_video | ReceiveFrameType.recv_audio
+
+    def run_recv_test():
+        for _ in range(NUM_RECV_FRAMES):
+            assert receiver.receive(recv_type, 0) == ReceiveFrameType.recv_video
+            assert receiver.receive(recv_type, 0) == ReceiveFrameType.recv_audio
+            assert vf.fill_p_data(dest)
+            assert af.get_read_data() is not None
+
+    run_recv_test()
+    record_recv_rates(
+        record_property, run_recv_test, NUM_RECV_FRAMES * 2,
+        (frame_size + audio_frame_size) // 2,
+    )
+    benchmark(run_recv_test)
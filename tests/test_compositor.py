@@ -0,0 +1,184 @@
+import threading
+import time
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from cyndilib.compositor import Compositor, ScaleFilter, CompositorTile, scale_frame
+from cyndilib.video_frame import VideoFrameSync
+from cyndilib.wrapper.ndi_structs import FourCC
+from _framesync_helpers import VideoFrameSyncHelper  # type: ignore[missing-import]
+from _bench_helpers import (  # type: ignore[missing-import]
+    RecordingSender, make_receiver, feed, run_ticks,
+)
+
+WIDTH, HEIGHT = 128, 72
+UYVY_BLACK = (128, 16)
+
+
+def get_tile(compositor, tile):
+    frame = compositor.get_frame().reshape(compositor.yres, compositor.xres * 2)
+    return frame[tile.y:tile.y + tile.height, tile.x * 2:(tile.x + tile.width) * 2]
+
+
+@pytest.mark.parametrize('scale_filter', [ScaleFilter.scale_box, ScaleFilter.scale_bilinear])
+def test_scale_frame(scale_filter):
+    src = np.array([0, 100, 200, 255], dtype=np.uint8).repeat(4)
+    dest = np.zeros(8, dtype=np.uint8)
+    scale_frame(src, 4, 1, dest, 2, 1, FourCC.RGBA, scale_filter)
+    assert np.array_equal(dest, [50] * 4 + [228] * 4)
+
+    src = np.array([0, 100], dtype=np.uint8).repeat(4)
+    dest = np.zeros(16, dtype=np.uint8)
+    scale_frame(src, 2, 1, dest, 4, 1, FourCC.BGRX, scale_filter)
+    if scale_filter == ScaleFilter.scale_box:
+        expected = [0, 0, 100, 100]
+    else:
+        expected = [0, 25, 75, 100]
+    assert np.array_equal(dest.reshape(4, 4)[:, 0], expected)
+
+    # Luma and chroma are scaled separately
+    src = np.tile(np.array([1, 2, 3, 4], dtype=np.uint8), 4 * 4)
+    dest = np.zeros(2 * 2 * 2, dtype=np.uint8)
+    scale_frame(src, 8, 2, dest, 2, 2, FourCC.UYVY, scale_filter)
+    assert np.array_equal(dest, [1, 3, 3, 3] * 2)
+
+    with pytest.raises(ValueError):
+        scale_frame(src, 8, 2, dest, 2, 2, FourCC.NV12, scale_filter)
+    with pytest.raises(ValueError):
+        scale_frame(src, 8, 2, dest, 4, 2, FourCC.UYVY, scale_filter)
+
+
+def test_compose():
+    receivers = [
+        make_receiver(10, xres=32, yres=18),
+        make_receiver(20, xres=64, yres=36),
+        make_receiver(30, xres=256, yres=144),
+        make_receiver(40, xres=64, yres=36, fourcc=FourCC.BGRA),
+    ]
+    frames = [rx.video_frame for rx in receivers]
+    compositor = Compositor(
+        RecordingSender(), frames, xres=WIDTH, yres=HEIGHT, fourcc=FourCC.UYVY,
+    )
+    assert len(compositor) == 4
+    assert compositor.inputs == tuple(frames)
+    assert (compositor.columns, compositor.rows) == (2, 2)
+    assert compositor.frame_rate == Fraction(30000, 1001)
+    tiles = compositor.tiles
+    assert all(isinstance(tile, CompositorTile) for tile in tiles)
+    assert [(t.x, t.y, t.width, t.height) for t in tiles] == [
+        (0, 0, 64, 36), (64, 0, 64, 36), (0, 36, 64, 36), (64, 36, 64, 36),
+    ]
+
+    for rx in receivers:
+        feed(rx, 2)
+    run_ticks(compositor, 1)
+    assert [s[1:4] for s in compositor.sender.get_sent()] == [(WIDTH, HEIGHT, 10)]
+    for tile, value in zip(tiles[:3], [10, 20, 30]):
+        assert np.all(get_tile(compositor, tile) == value)
+        assert tile.num_updates == 1
+        assert tile.source.get_buffer_depth() == 0
+    # Frames in another format are not drawn
+    assert tiles[3].num_mismatched == 1
+    assert np.all(get_tile(compositor, tiles[3]).reshape(-1, 2) == UYVY_BLACK)
+
+    # Nothing changed, so every tile is copied from the previous frame
+    run_ticks(compositor, 2)
+    assert compositor.num_tiles_skipped == 9
+    assert compositor.num_tiles_drawn == 3
+    for tile, value in zip(tiles[:3], [10, 20, 30]):
+        assert np.all(get_tile(compositor, tile) == value)
+
+    receivers[1].set_video_source(np.full(64 * 36 * 2, 25, dtype=np.uint8), 64, 36, FourCC.UYVY)
+    feed(receivers[1], 1)
+    run_ticks(compositor, 1)
+    assert tiles[1].num_updates == 2
+    assert np.all(get_tile(compositor, tiles[1]) == 25)
+    run_ticks(compositor, 1)
+    assert np.all(get_tile(compositor, tiles[1]) == 25)
+    assert np.all(get_tile(compositor, tiles[0]) == 10)
+    assert len(compositor.sender.get_sent()) == 4
+
+    with pytest.raises(ValueError):
+        Compositor(None, [])
+    with pytest.raises(ValueError):
+        Compositor(None, frames, columns=1, rows=2)
+    with pytest.raises(ValueError):
+        Compositor(None, frames, fourcc=FourCC.NV12)
+    with pytest.raises(TypeError):
+        Compositor(None, [receivers[0]])
+
+
+def test_frame_sync():
+    with pytest.raises(ValueError):
+        Compositor(None, [VideoFrameSync()])
+    vf = VideoFrameSync(double_buffered=True)
+    vf.set_fourcc(FourCC.RGBA)
+    fs_helper = VideoFrameSyncHelper()
+    fs_helper.set_video_frame(vf)
+    compositor = Compositor(
+        None, [vf], xres=32, yres=18, fourcc=FourCC.RGBX, scale_filter=ScaleFilter.scale_box,
+    )
+    tile = compositor.tiles[0]
+    assert tile.source is vf
+    assert (tile.width, tile.height) == (32, 18)
+
+    # Nothing captured yet
+    run_ticks(compositor, 1)
+    assert tile.num_updates == 0
+    assert np.all(compositor.get_frame().reshape(-1, 4) == (0, 0, 0, 255))
+
+    fs_helper.fill_data(np.full(64 * 36 * 4, 7, dtype=np.uint8), 64, 36, 1)
+    run_ticks(compositor, 1)
+    assert tile.num_updates == 1
+    assert np.all(compositor.get_frame() == 7)
+
+    # The same frame is repeated by the frame sync
+    fs_helper.fill_data(np.full(64 * 36 * 4, 7, dtype=np.uint8), 64, 36, 1)
+    run_ticks(compositor, 1)
+    assert tile.num_updates == 1
+    assert tile.num_skipped == 2
+
+    fs_helper.fill_data(np.full(64 * 36 * 4, 9, dtype=np.uint8), 64, 36, 2)
+    run_ticks(compositor, 1)
+    assert tile.num_updates == 2
+    assert np.all(compositor.get_frame() == 9)
+
+
+def test_thread():
+    receivers = [make_receiver(i + 1, xres=64, yres=36) for i in range(6)]
+    frames = [rx.video_frame for rx in receivers]
+    compositor = Compositor(
+        RecordingSender(), frames, xres=WIDTH, yres=HEIGHT, frame_rate=Fraction(100),
+        num_threads=3,
+    )
+    assert (compositor.columns, compositor.rows) == (3, 2)
+    running = threading.Event()
+    running.set()
+
+    def feed_loop():
+        while running.is_set():
+            for rx in receivers:
+                feed(rx, 1)
+            time.sleep(.005)
+
+    feeder = threading.Thread(target=feed_loop)
+    feeder.start()
+    try:
+        with compositor:
+            assert compositor.is_running
+            time.sleep(.3)
+    finally:
+        running.clear()
+        feeder.join()
+    assert not compositor.is_running
+
+    sent = compositor.sender.get_sent()
+    assert 20 <= len(sent) <= 40
+    assert compositor.num_video_sent == len(sent)
+    intervals = np.diff([s[5] for s in sent]) / 1e9
+    assert intervals.mean() == pytest.approx(.01, rel=.2)
+    for i, tile in enumerate(compositor.tiles):
+        assert tile.num_updates > 0
+        assert np.all(get_tile(compositor, tile) == i + 1)
@@ -0,0 +1,188 @@
+import threading
+import time
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from cyndilib.receiver import ReceiveFrameType
+from cyndilib.video_frame import VideoFrameSync
+from cyndilib.audio_frame import AudioFrameSync
+from _framesync_helpers import (  # type: ignore[missing-import]
+    PacedWorkerHelper, FrameSyncGroupHelper, copy_video_into, copy_audio_into,
+)
+
+
+class WorkerThread(threading.Thread):
+    def __init__(self, worker):
+        super().__init__()
+        self.worker = worker
+
+    def run(self):
+        self.worker.run_loop()
+
+    def stop(self):
+        self.worker.stop_loop()
+        self.join()
+
+
+def run_worker(worker, duration):
+    thread = WorkerThread(worker)
+    thread.start()
+    try:
+        time.sleep(duration)
+    finally:
+        thread.stop()
+
+
+def test_source_rate():
+    worker = PacedWorkerHelper(source_rate=(100, 1))
+    assert worker.output_rate is None
+    callback_threads = []
+    worker.set_callback(lambda: callback_threads.append(threading.get_ident()))
+
+    run_worker(worker, .5)
+    assert worker.current_rate == (100, 1)
+    assert worker.pacing_clock.frame_rate == 100
+    # Captures are paced at the source rate
+    assert 35 <= worker.num_captures <= 55
+    assert len(callback_threads) == worker.num_captures
+    assert threading.get_ident() not in callback_threads
+    assert worker.num_overruns <= 2
+
+
+def test_output_rate():
+    worker = PacedWorkerHelper(source_rate=(100, 1))
+    worker.output_rate = Fraction(50)
+    assert worker.output_rate == 50
+    with pytest.raises(ValueError):
+        worker.output_rate = 0
+
+    run_worker(worker, .5)
+    assert worker.current_rate == (50, 1)
+    assert 18 <= worker.num_captures <= 30
+
+    worker.output_rate = None
+    assert worker.output_rate is None
+
+
+def test_overruns():
+    # Captures take twice the frame interval
+    worker = PacedWorkerHelper(source_rate=(100, 1), capture_time=.02)
+    run_worker(worker, .5)
+    assert worker.num_captures > 0
+    assert worker.num_overruns >= worker.num_captures - 1
+    assert worker.num_late > 0
+    assert worker.num_skipped > 0
+
+
+def test_disconnected():
+    worker = PacedWorkerHelper(source_rate=(100, 1))
+    worker.connected = False
+    run_worker(worker, .2)
+    assert worker.num_captures == 0
+    assert not worker.pacing_clock.started
+
+
+def test_group_video():
+    group = FrameSyncGroupHelper(output_rate=100)
+    assert group.capture_video and not group.capture_audio
+    vf1, vf2 = VideoFrameSync(), VideoFrameSync()
+    member1 = group.add_frames(vf1)
+    member2 = group.add_frames(vf2)
+    assert len(group) == 2
+    assert group.frame_syncs == (member1, member2)
+
+    ticks = []
+    def on_frames(frames, timestamp):
+        # Every frame was captured on the same tick
+        ticks.append((
+            frames, timestamp,
+            [frame.get_timestamp_posix() for frame in frames],
+        ))
+
+    group.set_callback(on_frames)
+    with group:
+        assert group.is_running
+        time.sleep(.3)
+        group.remove(member1)
+        time.sleep(.1)
+    assert not group.is_running
+    assert group.frame_syncs == (member2,)
+
+    assert len(ticks) > 20
+    assert group.num_captures == len(ticks)
+    tick_timestamps = [ts for _, ts, _ in ticks]
+    for frames, ts, frame_timestamps in ticks:
+        assert frames in [(vf1, vf2), (vf2,)]
+        assert frame_timestamps == pytest.approx([ts / 1e7] * len(frames), abs=1e-6)
+    assert ticks[0][0] == (vf1, vf2)
+    assert ticks[-1][0] == (vf2,)
+
+    # Ticks are exactly one interval (in 100ns units) apart unless skipped
+    diffs = np.diff(tick_timestamps)
+    assert np.all(diffs > 0)
+    assert np.all(diffs % 100000 == 0)
+
+    with pytest.raises(ValueError):
+        group.remove(member1)
+    with pytest.raises(TypeError):
+        group.add(None)
+
+
+def test_group_audio():
+    ft = ReceiveFrameType.recv_video | ReceiveFrameType.recv_audio
+    group = FrameSyncGroupHelper(ft=ft, output_rate=Fraction(30000, 1001))
+    assert group.capture_video and group.capture_audio
+    vf, af = VideoFrameSync(), AudioFrameSync()
+    af.sample_rate = 48000
+    group.add_frames(vf, af)
+
+    results = []
+    group.set_callback(lambda frames, ts: results.append(frames))
+    with group:
+        time.sleep(.4)
+    assert results[0] == ((vf, af),)
+
+    # 8008 samples for every 5 frames at 29.97 fps
+    counts = group.get_sample_counts()
+    assert len(counts) >= 5
+    assert set(counts) <= {1601, 1602}
+    assert sum(counts[:5]) == 8008
+
+
+def test_group_frame_type():
+    with pytest.raises(ValueError):
+        FrameSyncGroupHelper(ft=ReceiveFrameType.recv_metadata)
+    group = FrameSyncGroupHelper(ft=ReceiveFrameType.recv_audio)
+    assert group.capture_audio and not group.capture_video
+    # Nothing is captured without members
+    with group:
+        time.sleep(.1)
+    assert group.num_captures == 0
+
+
+def test_copy_into():
+    width, height = 64, 36
+    src = np.arange(width * height * 2, dtype=np.uint8)
+    dest = np.zeros(src.size + 10, dtype=np.uint8)
+    assert copy_video_into(src, width, height, dest) == src.size
+    assert np.array_equal(dest[:src.size], src)
+    with pytest.raises(ValueError):
+        copy_video_into(src, width, height, np.zeros(src.size - 1, dtype=np.uint8))
+    with pytest.raises(ValueError):
+        copy_video_into(src, width, height, np.zeros(src.size, dtype=np.uint8)[::-1])
+
+    samples = np.arange(2 * 400, dtype=np.float32).reshape((2, 400))
+    dest = np.zeros((2, 400), dtype=np.float32)
+    assert copy_audio_into(samples, dest) == 400
+    assert np.array_equal(dest, samples)
+
+    # Only what fits in dest is copied
+    dest = np.zeros((1, 200), dtype=np.float32)
+    assert copy_audio_into(samples, dest, 2) == 200
+    assert np.array_equal(dest[0], samples[0, :200] * 2)
+    dest = np.zeros((4, 500), dtype=np.float32)
+    assert copy_audio_into(samples, dest) == 400
+    assert np.array_equal(dest[:2, :400], samples)
+    assert not np.any(dest[2:]) and not np.any(dest[:, 400:])
@@ -0,0 +1,201 @@
+import time
+
+import numpy as np
+import pytest
+
+from cyndilib.history import HistoryBuffer, HistoryVideoFrame, HistoryAudioFrame
+from cyndilib.receiver import ReceiveFrameType
+from cyndilib.video_frame import VideoRecvFrame, VideoSendFrame
+from cyndilib.audio_frame import AudioRecvFrame
+from cyndilib.sender import Sender
+from cyndilib.wrapper.ndi_structs import FourCC
+from _test_history import (  # type: ignore[missing-import]
+    add_video, add_audio, get_undefined_timestamp,
+)
+from _bench_helpers import (  # type: ignore[missing-import]
+    BenchReceiver, get_video_frame_size,
+)
+
+WIDTH, HEIGHT, FOURCC = 64, 36, FourCC.UYVY
+FRAME_SIZE = get_video_frame_size(FOURCC, WIDTH, HEIGHT)
+FRAME_TICKS = 333333    # One frame at 30 fps in 100ns units
+
+
+def build_frame(value):
+    return np.full(FRAME_SIZE, value % 256, dtype=np.uint8)
+
+
+def test_invalid_args():
+    with pytest.raises(ValueError):
+        HistoryBuffer(duration=-1)
+    with pytest.raises(ValueError):
+        HistoryBuffer(duration=0)
+    with pytest.raises(ValueError):
+        HistoryBuffer(duration=0, max_video_bytes=FRAME_SIZE)
+    HistoryBuffer(duration=0, max_video_bytes=FRAME_SIZE, max_audio_bytes=1024)
+
+
+def test_video_lookup():
+    history = HistoryBuffer(duration=10)
+    assert history.frame_at(0) is None
+    assert history.first_timestamp is None
+    timestamps = [(i + 1) * FRAME_TICKS for i in range(5)]
+    for i, ts in enumerate(timestamps):
+        add_video(history, build_frame(i), WIDTH, HEIGHT, FOURCC, ts, timecode=i)
+    assert history.num_video_frames == 5
+    assert history.first_timestamp == timestamps[0]
+    assert history.last_timestamp == timestamps[-1]
+
+    assert history.frame_at(timestamps[0] - 1) is None
+    for i, ts in enumerate(timestamps):
+        for t in [ts, ts + FRAME_TICKS // 2]:
+            frame = history.frame_at(t)
+            assert isinstance(frame, HistoryVideoFrame)
+            assert frame.timestamp == ts
+            assert frame.timecode == i
+            assert frame.xres == WIDTH
+            assert frame.yres == HEIGHT
+            assert frame.fourcc == FOURCC
+            assert frame.frame_rate == 30
+            assert np.all(frame.data == i)
+
+    # Lookups don't consume frames and returned data is a copy
+    frame.data[:] = 255
+    assert history.num_video_frames == 5
+    assert np.all(history.frame_at(timestamps[-1]).data == 4)
+
+    frames = history.range(timestamps[1], timestamps[4])
+    assert [f.timestamp for f in frames] == timestamps[1:4]
+    assert history.range(0, timestamps[0]) == []
+
+
+def test_ring_eviction():
+    # Room for three and a half frames
+    history = HistoryBuffer(duration=0, max_video_bytes=FRAME_SIZE * 7 // 2, max_audio_bytes=1)
+    for i in range(10):
+        add_video(history, build_frame(i), WIDTH, HEIGHT, FOURCC, (i + 1) * FRAME_TICKS)
+        assert history.video_ring.capacity == FRAME_SIZE * 7 // 2
+        assert history.num_video_frames == min(i + 1, 3)
+        assert history.video_ring.bytes_used <= history.video_ring.capacity
+        for j in range(max(0, i - 2), i + 1):
+            frame = history.frame_at((j + 1) * FRAME_TICKS)
+            assert frame.timestamp == (j + 1) * FRAME_TICKS
+            assert np.all(frame.data == j)
+    assert history.video_ring.num_dropped == 0
+
+    # Frames that can never fit are dropped
+    small = HistoryBuffer(duration=0, max_video_bytes=FRAME_SIZE - 1, max_audio_bytes=1)
+    add_video(small, build_frame(0), WIDTH, HEIGHT, FOURCC, FRAME_TICKS)
+    assert small.num_video_frames == 0
+    assert small.video_ring.num_dropped == 1
+
+
+def test_duration_eviction():
+    history = HistoryBuffer(duration=1)
+    for i in range(60):
+        add_video(history, build_frame(i), WIDTH, HEIGHT, FOURCC, i * FRAME_TICKS)
+    last_ts = 59 * FRAME_TICKS
+    first_ts = history.first_timestamp
+    assert history.last_timestamp == last_ts
+    assert first_ts >= last_ts - 10_000_000
+    assert first_ts - FRAME_TICKS < last_ts - 10_000_000
+    assert history.num_video_frames == (last_ts - first_ts) // FRAME_TICKS + 1
+
+
+def test_timestamp_reset():
+    history = HistoryBuffer(duration=10)
+    for ts in [100, 200, 300]:
+        add_video(history, build_frame(ts), WIDTH, HEIGHT, FOURCC, ts)
+    add_video(history, build_frame(0), WIDTH, HEIGHT, FOURCC, 50)
+    assert history.num_video_frames == 1
+    assert history.first_timestamp == 50
+
+    # Frames without a timestamp are indexed by timecode
+    history.clear()
+    add_video(history, build_frame(1), WIDTH, HEIGHT, FOURCC, get_undefined_timestamp(), timecode=1234)
+    assert history.last_timestamp == 1234
+
+
+def test_audio():
+    history = HistoryBuffer(duration=10)
+    num_samples = 1600
+    for i in range(5):
+        samples = np.full((2, num_samples), i, dtype=np.float32)
+        samples[1] *= -1
+        add_audio(history, samples, i * num_samples * 10_000_000 // 48000)
+        add_video(history, build_frame(i), WIDTH, HEIGHT, FOURCC, i * FRAME_TICKS)
+    assert history.num_audio_frames == 5
+
+    frame = history.audio_at(2 * FRAME_TICKS)
+    assert isinstance(frame, HistoryAudioFrame)
+    assert frame.sample_rate == 48000
+    assert frame.num_channels == 2
+    assert frame.num_samples == num_samples
+    assert frame.data.shape == (2, num_samples)
+    assert np.all(frame.data[0] == 2)
+    assert np.all(frame.data[1] == -2)
+
+    frames = history.range(0, 5 * FRAME_TICKS)
+    assert len(frames) == 10
+    assert [f.timestamp for f in frames] == sorted(f.timestamp for f in frames)
+    assert isinstance(frames[0], HistoryVideoFrame)
+    assert isinstance(frames[1], HistoryAudioFrame)
+    assert all(isinstance(f, HistoryAudioFrame) for f in history.range(0, 5 * FRAME_TICKS, video=False))
+
+
+def test_receiver_history():
+    src_data = np.arange(FRAME_SIZE, dtype=np.uint8)
+    receiver = BenchReceiver()
+    receiver.set_video_source(src_data, WIDTH, HEIGHT, FOURCC)
+    receiver.set_audio_source(np.ones((2, 800), dtype=np.float32))
+    vf = VideoRecvFrame(max_buffers=4)
+    af = AudioRecvFrame(max_buffers=4)
+    receiver.set_video_frame(vf)
+    receiver.set_audio_frame(af)
+    history = HistoryBuffer(duration=10)
+    receiver.set_history(history)
+    assert receiver.history is history
+
+    for _ in range(4):
+        receiver.receive(ReceiveFrameType.recv_all, 0)
+    assert history.num_video_frames == 2
+    assert history.num_audio_frames == 2
+    assert vf.get_buffer_depth() == 2
+    frame = history.frame_at(history.last_timestamp)
+    assert np.array_equal(frame.data, src_data)
+
+    # Reading from the frame objects leaves the history intact
+    dest = np.empty_like(src_data)
+    vf.fill_p_data(dest)
+    vf.fill_p_data(dest)
+    assert vf.get_buffer_depth() == 0
+    assert history.num_video_frames == 2
+
+    receiver.set_history(None)
+    receiver.receive(ReceiveFrameType.recv_video, 0)
+    assert history.num_video_frames == 2
+
+
+def test_play_out(request):
+    name = request.node.nodeid.split('::')[-1]
+    history = HistoryBuffer(duration=10)
+    num_frames = 5
+    for i in range(num_frames):
+        add_video(history, build_frame(i), WIDTH, HEIGHT, FOURCC, (i + 1) * FRAME_TICKS)
+
+    sender = Sender(name, clock_video=False)
+    vf = VideoSendFrame()
+    vf.set_fourcc(FOURCC)
+    vf.set_frame_rate(30)
+    vf.set_resolution(WIDTH, HEIGHT)
+    sender.set_video_frame(vf)
+    speed = 0.5
+    with sender:
+        start = time.perf_counter()
+        count = history.play_out(sender, 2 * FRAME_TICKS, speed=speed)
+        elapsed = time.perf_counter() - start
+    assert count == num_frames - 1
+    expected = (num_frames - 2) * FRAME_TICKS / 1e7 / speed
+    assert elapsed >= expected * .9
+    with pytest.raises(ValueError):
+        history.play_out(sender, 0, speed=0)
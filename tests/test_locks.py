@@ -60,3 +60,215 @@ def test_conditions():
         nt.join()
         for wt in wait_threads:
             wt.join()
+
+
+def test_lock():
+    lock = locks.Lock()
+    assert not lock.locked
+    assert lock.acquire()
+    assert lock.locked
+    # Non-reentrant, so the second attempt fails without blocking
+    assert not lock.acquire(False)
+    start = time.monotonic()
+    assert not lock.acquire(timeout=.05)
+    assert time.monotonic() - start >= .04
+    lock.release()
+    assert not lock.locked
+    with pytest.raises(RuntimeError):
+        lock.release()
+
+    # May be released by a thread other than the one that acquired it
+    lock.acquire()
+    t = threading.Thread(target=lock.release)
+    t.start()
+    t.join()
+    assert not lock.locked
+
+
+def test_rlock():
+    lock = locks.RLock()
+    with lock:
+        with lock:
+            assert lock._is_owned()
+        assert lock.locked
+
+        result = []
+        def other():
+            result.append(lock.acquire(timeout=.01))
+            try:
+                lock.release()
+            except RuntimeError:
+                result.append('error')
+        t = threading.Thread(target=other)
+        t.start()
+        t.join()
+        assert result == [False, 'error']
+    assert not lock.locked
+    assert not lock._is_owned()
+
+
+def test_condition_timeout_and_notify_n():
+    condition = locks.Condition()
+    with pytest.raises(RuntimeError):
+        condition.wait(.01)
+    with pytest.raises(RuntimeError):
+        condition.notify()
+
+    with condition:
+        assert condition.wait(.01) is False
+        assert condition.rlock._is_owned()
+
+    wait_threads = [WaitThread(condition, timeout=.5) for i in range(4)]
+    for wt in wait_threads:
+        wt.start()
+    time.sleep(.1)
+    with condition:
+        condition.notify(2)
+    for wt in wait_threads:
+        wt.join()
+        assert wt.exception is None
+    assert sorted(wt.result for wt in wait_threads) == [False, False, True, True]
+
+
+def test_condition_wait_for():
+    condition = locks.Condition()
+    items = []
+    def producer():
+        for i in range(5):
+            time.sleep(.01)
+            with condition:
+                items.append(i)
+                condition.notify_all()
+    t = threading.Thread(target=producer)
+    t.start()
+    with condition:
+        assert condition.wait_for(lambda: len(items) == 5, timeout=2)
+        assert not condition.wait_for(lambda: len(items) > 5, timeout=.05)
+    t.join()
+
+
+def test_event():
+    evt = locks.Event()
+    assert not evt.is_set()
+    assert evt.wait(.01) is False
+    t = threading.Timer(.05, evt.set)
+    t.start()
+    assert evt.wait(2) is True
+    assert evt.wait() is True
+    t.join()
+    evt.clear()
+    assert not evt.is_set()
+
+
+def test_nogil_wait():
+    from _test_locks import ( # type: ignore[missing-import]
+        event_wait_nogil, condition_wait_nogil, condition_notify_nogil,
+    )
+    evt = locks.Event()
+    assert event_wait_nogil(evt, .01) is False
+    t = threading.Timer(.05, evt.set)
+    t.start()
+    assert event_wait_nogil(evt, 2) is True
+    t.join()
+
+    condition = locks.Condition()
+    assert condition_wait_nogil(condition, .01) is False
+    t = threading.Timer(.05, condition_notify_nogil, args=(condition,))
+    t.start()
+    assert condition_wait_nogil(condition, 2) is True
+    t.join()
+
+
+LOCK_IMPLS = {'threading': threading, 'cyndilib': locks}
+NUM_CONTENDERS = 4
+NUM_ITERATIONS = 1000
+
+@pytest.fixture(params=list(LOCK_IMPLS.keys()))
+def lock_impl(request):
+    return LOCK_IMPLS[request.param]
+
+
+def _run_contenders(target, *args):
+    threads = [threading.Thread(target=target, args=args) for _ in range(NUM_CONTENDERS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_lock_contention_benchmark(benchmark, lock_impl):
+    lock = lock_impl.Lock()
+    counter = [0]
+
+    def worker():
+        for _ in range(NUM_ITERATIONS):
+            with lock:
+                counter[0] += 1
+
+    def run():
+        counter[0] = 0
+        _run_contenders(worker)
+        assert counter[0] == NUM_CONTENDERS * NUM_ITERATIONS
+
+    benchmark(run)
+
+
+def test_rlock_contention_benchmark(benchmark, lock_impl):
+    lock = lock_impl.RLock()
+
+    def worker():
+        for _ in range(NUM_ITERATIONS):
+            with lock:
+                with lock:
+                    pass
+
+    benchmark(_run_contenders, worker)
+
+
+def test_condition_pingpong_benchmark(benchmark, lock_impl):
+    condition = lock_impl.Condition(lock_impl.RLock())
+    state = {'turn': 0}
+
+    def player(which):
+        for _ in range(NUM_ITERATIONS // 4):
+            with condition:
+                condition.wait_for(lambda: state['turn'] == which)
+                state['turn'] = 1 - which
+                condition.notify_all()
+
+    def run():
+        state['turn'] = 0
+        threads = [threading.Thread(target=player, args=(i,)) for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    benchmark(run)
+
+
+def test_event_pingpong_benchmark(benchmark, lock_impl):
+    ping, pong = lock_impl.Event(), lock_impl.Event()
+
+    def responder():
+        for _ in range(NUM_ITERATIONS // 4):
+            ping.wait()
+            ping.clear()
+            pong.set()
+
+    def run():
+        t = threading.Thread(target=responder)
+        t.start()
+        for _ in range(NUM_ITERATIONS // 4):
+            ping.set()
+            pong.wait()
+            pong.clear()
+        t.join()
+
+    benchmark(run)
+
+
+def test_lock_contention_nogil_benchmark(benchmark):
+    from _test_locks import lock_contend_nogil # type: ignore[missing-import]
+    lock = locks.Lock()
+    benchmark(_run_contenders, lock_contend_nogil, lock, NUM_ITERATIONS)
@@ -0,0 +1,192 @@
+import pytest
+
+from cyndilib.metadata_frame import (
+    MetadataElement, MetadataSendFrame, parse_xml, parse_xml_element,
+)
+
+
+def test_parse_xml_simple():
+    tag, attrs = parse_xml('<ndi_tally_echo on_program="true" on_preview="false"/>')
+    assert tag == 'ndi_tally_echo'
+    assert attrs == {'on_program': 'true', 'on_preview': 'false'}
+
+    # Characters outside of the old regex character set
+    tag, attrs = parse_xml(
+        '<ndi_product long_name="NDILib Receive Example" manufacturer="CoolCo, inc." '
+        "version='1.000.000' session_name=\"My Midday Show - 2\"/>"
+    )
+    assert tag == 'ndi_product'
+    assert attrs['manufacturer'] == 'CoolCo, inc.'
+    assert attrs['version'] == '1.000.000'
+    assert attrs['session_name'] == 'My Midday Show - 2'
+
+
+@pytest.mark.parametrize('xml', [
+    '', 'not xml', '<a', '<a b="c">', '<a><b></a>', '<a b=c/>', '<a b="c/>',
+])
+def test_parse_xml_invalid(xml):
+    assert parse_xml(xml) == (None, None)
+    with pytest.raises(ValueError):
+        parse_xml_element(xml)
+
+
+def test_parse_nested():
+    xml = (
+        '<?xml version="1.0"?>\n<!-- comment -->\n'
+        '<caption lang="en">\n'
+        '  <line n="1">Hello &amp; welcome</line>\n'
+        '  <line n="2"><![CDATA[<b>bold</b>]]></line>\n'
+        '  <style color="&#x23;fff"/>\n'
+        '</caption>'
+    )
+    el = parse_xml_element(xml)
+    assert el.tag == 'caption'
+    assert el.get('lang') == 'en'
+    assert el.text == ''
+    assert len(el) == 3
+    lines = el.findall('line')
+    assert [line.get('n') for line in lines] == ['1', '2']
+    assert lines[0].text == 'Hello & welcome'
+    assert lines[1].text == '<b>bold</b>'
+    assert el.find('style').get('color') == '#fff'
+    assert el.find('missing') is None
+
+    el2 = parse_xml_element(el.to_xml())
+    assert el2.to_xml() == el.to_xml()
+
+
+def test_interned_names():
+    a = parse_xml_element(b'<some_tag some_attr="1"/>')
+    b = parse_xml_element(b'<some_tag some_attr="2"/>')
+    assert a.tag is b.tag
+    key_a, = a.attrs.keys()
+    key_b, = b.attrs.keys()
+    assert key_a is key_b
+
+
+def test_element_to_xml():
+    el = MetadataElement('a', {'x': '1 < 2'}, 'text & more', [MetadataElement('b')])
+    assert el.to_xml() == '<a x="1 &lt; 2">text &amp; more<b/></a>'
+
+
+def test_send_frame_serialize():
+    mf = MetadataSendFrame('ndi_tally_echo', {'on_program': 'true'})
+    assert str(mf) == '<ndi_tally_echo on_program="true"/>'
+
+    mf['on_preview'] = 'false'
+    assert str(mf) == '<ndi_tally_echo on_program="true" on_preview="false"/>'
+
+    mf.update({'label': 'a "quoted" <value> & more'})
+    xml = str(mf)
+    tag, attrs = parse_xml(xml)
+    assert tag == 'ndi_tally_echo'
+    assert attrs['label'] == 'a "quoted" <value> & more'
+
+    mf.set_tag('other')
+    assert str(mf).startswith('<other ')
+
+    # Direct changes to attrs are picked up as well
+    mf.attrs.clear()
+    mf.attrs['on_program'] = 'false'
+    assert str(mf) == '<other on_program="false"/>'
+    mf.attrs['on_program'] = 'true'
+    assert str(mf) == '<other on_program="true"/>'
+
+    mf.clear()
+    assert str(mf) == ''
+
+
+def test_recv_ring():
+    from cyndilib.metadata_frame import MetadataRecvFrame, MetadataItem
+    from _test_metadata_frame import fake_receive # type: ignore[missing-import]
+
+    mf = MetadataRecvFrame(max_buffers=4)
+    assert mf.max_buffers == 4
+    assert len(mf) == 0
+    assert mf.read() is None
+    assert mf.drain() == []
+
+    for i in range(3):
+        assert fake_receive(mf, f'<msg index="{i}"/>'.encode(), i * 100)
+    assert mf.get_buffer_depth() == 3
+    assert not mf.buffer_full()
+
+    # Legacy attributes reflect the most recent message
+    assert mf.tag == 'msg'
+    assert mf['index'] == '2'
+
+    item = mf.read()
+    assert isinstance(item, MetadataItem)
+    assert item.data == b'<msg index="0"/>'
+    assert item.timecode == 0
+    assert item.tag == 'msg'
+    assert item.attrs == {'index': '0'}
+
+    items = mf.drain()
+    assert [it.attrs['index'] for it in items] == ['1', '2']
+    assert [it.timecode for it in items] == [100, 200]
+    assert len(mf) == 0
+    assert mf.overflow_count == 0
+
+    # Lazily parsed items tolerate invalid data
+    fake_receive(mf, b'not xml', 5)
+    item = mf.read()
+    assert item.xml == 'not xml'
+    assert item.element is None
+    assert item.tag is None
+    assert mf.tag is None
+    assert mf.attrs == {}
+
+    # The last message is only parsed once (by the frame or its item)
+    fake_receive(mf, b'<last value="1"><child/></last>', 6)
+    element = mf.element
+    assert element.tag == 'last'
+    item = mf.read()
+    assert item.element is element
+    assert mf.attrs is element.attrs
+    assert mf['value'] == '1'
+
+
+def test_recv_ring_overflow():
+    from cyndilib.metadata_frame import MetadataRecvFrame
+    from _test_metadata_frame import fake_receive # type: ignore[missing-import]
+
+    mf = MetadataRecvFrame(max_buffers=4)
+    for i in range(10):
+        assert fake_receive(mf, f'<msg index="{i}"/>'.encode(), i)
+    assert mf.buffer_full()
+    assert mf.overflow_count == 6
+    assert [it.timecode for it in mf] == [6, 7, 8, 9]
+    assert len(mf) == 0
+
+    mf = MetadataRecvFrame(max_buffers=2, overwrite=False)
+    assert fake_receive(mf, b'<a/>')
+    assert fake_receive(mf, b'<b/>')
+    assert not fake_receive(mf, b'<c/>')
+    assert mf.overflow_count == 0
+    assert [it.tag for it in mf.drain()] == ['a', 'b']
+    assert fake_receive(mf, b'<c/>')
+
+    with pytest.raises(ValueError):
+        MetadataRecvFrame(max_buffers=0)
+
+
+def test_recv_ring_read_timeout():
+    import threading
+    import time
+    from cyndilib.metadata_frame import MetadataRecvFrame
+    from _test_metadata_frame import fake_receive # type: ignore[missing-import]
+
+    mf = MetadataRecvFrame()
+    start = time.monotonic()
+    assert mf.read(timeout=.05) is None
+    assert time.monotonic() - start >= .04
+
+    t = threading.Timer(.05, fake_receive, args=(mf, b'<late/>', 1))
+    t.start()
+    try:
+        item = mf.read(timeout=2)
+    finally:
+        t.join()
+    assert item is not None
+    assert item.tag == 'late'
@@ -0,0 +1,77 @@
+import gc
+import urllib.request
+
+import numpy as np
+
+from cyndilib import metrics
+from cyndilib.metrics import MetricsKind, METRICS_DTYPE
+from _test_metrics import DummySource  # type: ignore[missing-import]
+
+
+def test_registry():
+    start_ids = set(metrics.get_snapshot()['id'])
+    sources = [DummySource(f'src {i}') for i in range(4)]
+    finder = DummySource(finder=True)
+    for i, src in enumerate(sources):
+        src.video_frames = i * 10
+        src.video_dropped = i
+        src.connections = i % 2
+    finder.sources = 3
+
+    snap = metrics.get_snapshot()
+    assert snap.dtype == METRICS_DTYPE
+    snap = snap[~np.isin(snap['id'], list(start_ids))]
+    assert len(snap) == 5
+    assert len(set(snap['id'])) == 5
+    labels = metrics.get_labels()
+    receivers = snap[snap['kind'] == MetricsKind.metrics_receiver]
+    assert [labels[i] for i in receivers['id']] == [f'src {i}' for i in range(4)]
+    assert receivers['video_frames'].tolist() == [0, 10, 20, 30]
+    assert receivers['video_dropped'].sum() == 6
+    assert receivers['connected'].tolist() == [False, True, False, True]
+    assert receivers['audio_frames'].sum() == 0
+    finders = snap[snap['kind'] == MetricsKind.metrics_finder]
+    assert finders['sources'].tolist() == [3]
+    assert labels[finders['id'][0]] == ''
+
+    # Objects are removed when deallocated
+    removed_id = receivers['id'][1]
+    del sources[1]
+    gc.collect()
+    snap = metrics.get_snapshot()
+    assert removed_id not in snap['id']
+    assert removed_id not in metrics.get_labels()
+    assert np.isin(receivers['id'][[0, 2, 3]], snap['id']).all()
+
+
+def test_prometheus_text():
+    src = DummySource('host "a" (stream)')
+    src.video_frames = 42
+    src.connections = 2
+    row_id = int(metrics.get_snapshot()['id'][-1])
+    text = metrics.get_prometheus_text()
+    labels = f'kind="receiver",id="{row_id}",name="host \\"a\\" (stream)"'
+    lines = text.splitlines()
+    assert '# TYPE cyndilib_frames_total counter' in lines
+    assert '# TYPE cyndilib_buffer_depth gauge' in lines
+    assert f'cyndilib_frames_total{{{labels},media="video"}} 42' in lines
+    assert f'cyndilib_connections{{{labels}}} 2' in lines
+    assert f'cyndilib_connected{{{labels}}} 1' in lines
+    # Finder-only metrics are not reported for receivers
+    assert not any(line.startswith(f'cyndilib_sources{{{labels}') for line in lines)
+
+
+def test_http_server():
+    src = DummySource('http test')
+    src.video_frames = 7
+    server = metrics.start_http_server(0)
+    try:
+        host, port = server.server_address[:2]
+        with urllib.request.urlopen(f'http://{host}:{port}/metrics', timeout=5) as resp:
+            assert resp.status == 200
+            assert resp.headers['Content-Type'].startswith('text/plain')
+            body = resp.read().decode('utf-8')
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert 'name="http test",media="video"} 7' in body
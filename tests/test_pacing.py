@@ -0,0 +1,82 @@
+from fractions import Fraction
+import pickle
+import time
+
+import pytest
+
+from cyndilib.pacing import PacingClock
+
+
+FRAME_RATES = [Fraction(24000, 1001), Fraction(25), Fraction(30000, 1001), Fraction(60)]
+
+
+@pytest.mark.parametrize('frame_rate', FRAME_RATES)
+def test_ndi_timestamps_no_drift(frame_rate: Fraction):
+    clock = PacingClock(frame_rate)
+    # One hour worth of frames should land exactly on the rational position
+    num_frames = int(frame_rate * 3600)
+    for i in [0, 1, 1000, num_frames, num_frames * 24]:
+        expected = i * frame_rate.denominator * 10_000_000 // frame_rate.numerator
+        offset = clock.get_ndi_timestamp_for(i) - clock.get_ndi_timestamp_for(0)
+        assert offset == expected
+
+
+@pytest.mark.flaky(max_runs=3)
+def test_wait_intervals():
+    frame_rate = Fraction(60000, 1001)
+    clock = PacingClock(frame_rate)
+    assert not clock.started
+    assert clock.wait() == 0
+    assert clock.started
+    start = time.monotonic()
+    num_frames = 30
+    for _ in range(num_frames):
+        clock.wait()
+    elapsed = time.monotonic() - start
+    expected = num_frames / float(frame_rate)
+    assert elapsed == pytest.approx(expected, abs=.01)
+    assert clock.frame_index == num_frames + 1
+
+    ts0 = clock.get_ndi_timestamp_for(0)
+    assert clock.get_ndi_timestamp() - ts0 == (
+        num_frames * frame_rate.denominator * 10_000_000 // frame_rate.numerator
+    )
+
+
+@pytest.mark.flaky(max_runs=3)
+def test_skip_late_frames():
+    clock = PacingClock(Fraction(100), max_late_frames=2)
+    clock.wait()
+    time.sleep(.1)
+    late = clock.wait()
+    assert late > .05
+    assert clock.late_count == 1
+    assert clock.skip_count >= 5
+
+    clock.reset()
+    assert not clock.started
+    assert clock.frame_index == 0
+
+
+def test_frame_rate_change():
+    clock = PacingClock(Fraction(30))
+    clock.wait()
+    clock.wait()
+    deadline = clock.get_next_deadline()
+    clock.frame_rate = Fraction(60)
+    assert clock.frame_rate == 60
+    assert clock.frame_index == 0
+    assert clock.get_next_deadline() == pytest.approx(deadline)
+
+    with pytest.raises(ValueError):
+        clock.frame_rate = 0
+
+
+def test_pickle():
+    clock = PacingClock(Fraction(60000, 1001), spin_time=.001, max_late_frames=0)
+    clock.wait()
+    copy = pickle.loads(pickle.dumps(clock))
+    assert copy.frame_rate == Fraction(60000, 1001)
+    assert copy.spin_time == pytest.approx(.001)
+    assert copy.__reduce__()[1][2] == 0
+    assert not copy.started
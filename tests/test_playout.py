@@ -0,0 +1,118 @@
+import time
+
+import numpy as np
+import pytest
+
+from cyndilib.recorder import Recorder, RecordingReader, RecordMediaType
+from cyndilib.playout import FilePlayoutSender
+from cyndilib.wrapper.ndi_structs import FourCC
+from _test_recorder import (  # type: ignore[missing-import]
+    add_video, add_audio, add_metadata,
+)
+from _bench_helpers import (  # type: ignore[missing-import]
+    RecordingSender, get_video_frame_size,
+)
+
+WIDTH, HEIGHT, FOURCC = 64, 36, FourCC.UYVY
+FRAME_SIZE = get_video_frame_size(FOURCC, WIDTH, HEIGHT)
+FRAME_TICKS = 333333
+
+
+@pytest.fixture
+def recording(tmp_path):
+    filename = tmp_path / 'test.cyndirec'
+    samples = np.zeros((2, 1600), dtype=np.float32)
+    with Recorder(filename) as recorder:
+        for i in range(30):
+            ts = i * FRAME_TICKS
+            add_video(recorder, np.full(FRAME_SIZE, i, dtype=np.uint8), WIDTH, HEIGHT, FOURCC, ts)
+            add_audio(recorder, samples, ts)
+            add_metadata(recorder, f'<frame index="{i}"/>', ts)
+    return filename
+
+
+def get_video_sent(sent):
+    return [s for s in sent if s[0] == RecordMediaType.record_video]
+
+
+def test_timing(recording):
+    playout = FilePlayoutSender(RecordingSender(), recording)
+    assert not playout.is_running
+    assert playout.timestamp is None
+    with playout:
+        assert playout.wait(timeout=5)
+    assert playout.num_video_sent == 30
+    assert playout.num_audio_sent == 30
+    assert playout.num_metadata_sent == 30
+    assert playout.timestamp == 29 * FRAME_TICKS
+
+    sent = playout.sender.get_sent()
+    assert [s[0] for s in sent] == [1, 2, 3] * 30
+    video = get_video_sent(sent)
+    assert [s[1:3] for s in video] == [(WIDTH, HEIGHT)] * 30
+    assert [s[3] for s in video] == list(range(30))
+    intervals = np.diff([s[5] for s in video]) / 1e9
+    assert intervals.mean() == pytest.approx(FRAME_TICKS / 1e7, rel=.1)
+    assert intervals.min() > FRAME_TICKS / 1e7 * .5
+
+
+def test_rate(recording):
+    with RecordingReader(recording) as reader:
+        playout = FilePlayoutSender(RecordingSender(), reader, rate=2, metadata=False)
+        assert playout.reader is reader
+        with playout:
+            assert playout.wait(timeout=5)
+    assert playout.num_video_sent == 30
+    assert playout.num_audio_sent == 0
+    assert playout.num_metadata_sent == 0
+    video = get_video_sent(playout.sender.get_sent())
+    elapsed = (video[-1][5] - video[0][5]) / 1e9
+    assert elapsed == pytest.approx(29 * FRAME_TICKS / 1e7 / 2, rel=.2)
+
+    with pytest.raises(ValueError):
+        playout.set_rate(0)
+    with pytest.raises(ValueError):
+        FilePlayoutSender(RecordingSender(), recording, rate=-1)
+
+
+def test_loop(recording):
+    playout = FilePlayoutSender(RecordingSender(), recording, loop=True, rate=10, audio=False)
+    with playout:
+        start = time.monotonic()
+        while playout.num_loops < 2 and time.monotonic() - start < 5:
+            time.sleep(.01)
+        assert playout.is_running
+    assert not playout.is_running
+    assert playout.num_loops >= 2
+    video = get_video_sent(playout.sender.get_sent())
+    assert [s[3] for s in video[:60]] == list(range(30)) * 2
+
+
+def test_seek_and_resume(recording):
+    playout = FilePlayoutSender(RecordingSender(), recording, audio=False, metadata=False)
+    playout.start()
+    time.sleep(.1)
+    playout.seek(20 * FRAME_TICKS + 1)
+    assert playout.wait(timeout=5)
+    indices = [s[3] for s in get_video_sent(playout.sender.get_sent())]
+    assert indices[-10:] == list(range(20, 30))
+    assert len(indices) < 30
+    assert indices[:-10] == list(range(len(indices) - 10))
+
+    # Stopping keeps the position
+    playout = FilePlayoutSender(RecordingSender(), recording, audio=False, metadata=False)
+    playout.start()
+    time.sleep(.1)
+    playout.stop()
+    assert not playout.is_running
+    num_sent = playout.num_video_sent
+    assert 0 < num_sent < 30
+    playout.start()
+    assert playout.wait(timeout=5)
+    indices = [s[3] for s in get_video_sent(playout.sender.get_sent())]
+    assert indices == list(range(30))
+
+    # Starting again at the end starts over
+    playout.start()
+    assert playout.wait(timeout=5)
+    assert playout.num_video_sent == 60
@@ -0,0 +1,194 @@
+import os
+import signal
+import time
+
+import numpy as np
+import pytest
+
+from cyndilib.process_pool import ReceiverProcessPool, PooledReceiver, STRATEGIES
+from cyndilib.receiver import ReceiveFrameType
+from cyndilib.wrapper.ndi_structs import FourCC
+from _bench_helpers import (  # type: ignore[missing-import]
+    BenchReceiver, get_video_frame_size,
+)
+
+WIDTH, HEIGHT, FOURCC = 64, 36, FourCC.UYVY
+FRAME_SIZE = get_video_frame_size(FOURCC, WIDTH, HEIGHT)
+
+
+def source_value(source_name):
+    return sum(source_name.encode()) % 256
+
+
+class PoolBenchReceiver(BenchReceiver):
+    """A :class:`BenchReceiver` producing frames about every 2ms (or none
+    without a source name), with statistics taken from its capture counts
+    """
+    def __init__(self, source_name):
+        super().__init__()
+        self.name = source_name
+        self.set_video_source(
+            np.full(FRAME_SIZE, source_value(source_name), dtype=np.uint8),
+            WIDTH, HEIGHT, FOURCC,
+        )
+        self.set_audio_source(np.ones((2, 400), dtype=np.float32))
+
+    def receive(self, recv_type, timeout_ms):
+        if not self.name:
+            time.sleep(timeout_ms / 1000)
+            return ReceiveFrameType.nothing
+        time.sleep(.002)
+        return super().receive(recv_type, timeout_ms)
+
+    def is_connected(self):
+        return bool(self.name)
+
+    def get_num_connections(self):
+        return int(bool(self.name))
+
+    def get_performance_data(self):
+        counts = {
+            'video': self.num_video_captured,
+            'audio': self.num_audio_captured,
+            'metadata': 0,
+        }
+        return {
+            key: {'frames_total': count, 'frames_dropped': 0, 'dropped_percent': 0}
+            for key, count in counts.items()
+        }
+
+
+def make_receiver(source_name, color_format, bandwidth):
+    return PoolBenchReceiver(source_name)
+
+
+def wait_for(func, timeout=10):
+    end_time = time.monotonic() + timeout
+    while time.monotonic() < end_time:
+        if func():
+            return True
+        time.sleep(.01)
+    return False
+
+
+def receive_video(rx, timeout_ms=5000):
+    ft = rx.receive(ReceiveFrameType.recv_video, timeout_ms)
+    assert ft == ReceiveFrameType.recv_video
+    return rx.video_frame
+
+
+def build_pool(**kwargs):
+    kwargs.setdefault('num_workers', 2)
+    return ReceiverProcessPool(
+        slot_size=FRAME_SIZE,
+        receiver_factory=make_receiver,
+        stats_interval=.05,
+        monitor_interval=.05,
+        **kwargs
+    )
+
+
+def test_receive_and_stats():
+    with build_pool() as pool:
+        assert pool.is_running
+        rx_a = pool.create_receiver('src-a')
+        rx_b = pool.create_receiver('src-b')
+        rx_c = pool.create_receiver('src-c')
+        assert isinstance(rx_a, PooledReceiver)
+        assert [rx.worker for rx in pool.receivers] == [0, 1, 0]
+
+        for rx in pool.receivers:
+            frame = receive_video(rx)
+            assert frame.data.shape == (FRAME_SIZE,)
+            assert np.all(frame.data == source_value(rx.source_name))
+        ts = rx_a.video_frame.timestamp
+        assert receive_video(rx_a).timestamp > ts
+
+        ft = rx_b.receive(ReceiveFrameType.recv_audio, 5000)
+        assert ft == ReceiveFrameType.recv_audio
+        assert rx_b.audio_frame.data.shape == (2, 400)
+        assert np.all(rx_b.audio_frame.data == 1)
+
+        assert wait_for(lambda: all(
+            rx.get_performance_data()['video']['frames_total'] > 0 for rx in pool.receivers
+        ))
+        assert rx_a.is_connected()
+        assert rx_a.get_num_connections() == 1
+        assert rx_a.stats['frames_per_second'] > 0
+        assert rx_a.stats['num_published'] > 0
+
+        loads = pool.get_worker_loads()
+        assert [w['num_receivers'] for w in loads] == [2, 1]
+        assert all(w['alive'] for w in loads)
+        assert loads[0]['pid'] != loads[1]['pid'] != os.getpid()
+        assert rx_a.stats['pid'] == loads[0]['pid']
+
+        # The receiver is recreated for the new source
+        rx_a.set_source('src-d')
+        assert rx_a.source_name == 'src-d'
+        value = source_value('src-d')
+        assert wait_for(lambda: np.all(receive_video(rx_a).data == value))
+
+        rx_c.close()
+        assert pool.receivers == [rx_a, rx_b]
+        assert [w['num_receivers'] for w in pool.get_worker_loads()] == [1, 1]
+        assert rx_c.receive(ReceiveFrameType.recv_video, 0) == ReceiveFrameType.nothing
+
+        # Nothing received before the timeout
+        rx_d = pool.create_receiver('')
+        assert rx_d.receive(ReceiveFrameType.recv_video, 50) == ReceiveFrameType.nothing
+    assert not pool.is_running
+
+
+def test_strategies():
+    with pytest.raises(ValueError):
+        build_pool(strategy='unknown')
+    assert 'least_sources' in STRATEGIES
+
+    with build_pool(strategy='round_robin', max_receivers=5) as pool:
+        for i in range(3):
+            pool.create_receiver(f'src-{i}')
+        assert [rx.worker for rx in pool.receivers] == [0, 1, 0]
+
+        assert pool.create_receiver('src-3', worker=0).worker == 0
+        with pytest.raises(IndexError):
+            pool.create_receiver('src-4', worker=2)
+
+        pool.strategy = lambda p: p.num_workers - 1
+        assert pool.create_receiver('src-4').worker == 1
+        with pytest.raises(RuntimeError):
+            pool.create_receiver('src-5')
+
+        # Busier workers are avoided
+        pool.receivers[-1].close()
+        assert wait_for(lambda: all(
+            rx.stats['frames_per_second'] > 0 for rx in pool.receivers
+        ))
+        pool.strategy = 'least_load'
+        assert pool.create_receiver('src-5').worker == 1
+
+
+def test_worker_restart():
+    with build_pool() as pool:
+        rx0 = pool.create_receiver('src-a')
+        rx1 = pool.create_receiver('src-b')
+        receive_video(rx0)
+        receive_video(rx1)
+        pids = [w['pid'] for w in pool.get_worker_loads()]
+
+        os.kill(pids[0], signal.SIGTERM)
+        assert wait_for(lambda: pool.get_worker_loads()[0]['num_restarts'] == 1)
+        loads = pool.get_worker_loads()
+        assert loads[0]['pid'] != pids[0]
+        assert loads[1]['pid'] == pids[1]
+        assert loads[1]['num_restarts'] == 0
+
+        # The receiver was recreated in the new worker
+        assert rx0.stats['generation'] == 2
+        assert rx0.stats['pid'] == loads[0]['pid']
+        assert np.all(receive_video(rx0).data == source_value('src-a'))
+
+        # The other worker was unaffected
+        assert rx1.stats['generation'] == 1
+        ts = rx1.video_frame.timestamp
+        assert receive_video(rx1).timestamp > ts
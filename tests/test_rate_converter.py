@@ -0,0 +1,238 @@
+import threading
+import time
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from cyndilib.rate_converter import FrameRateConverter, ConvertMode, blend
+from cyndilib.video_frame import VideoFrameSync
+from cyndilib.wrapper.ndi_structs import FourCC
+from _framesync_helpers import VideoFrameSyncHelper  # type: ignore[missing-import]
+from _bench_helpers import (  # type: ignore[missing-import]
+    RecordingSender, get_video_frame_size, make_receiver, feed, run_ticks,
+)
+
+WIDTH, HEIGHT, FOURCC = 64, 36, FourCC.UYVY
+FRAME_SIZE = get_video_frame_size(FOURCC, WIDTH, HEIGHT)
+
+
+def feed_values(rx, values, rate):
+    # Timestamps (in 100ns units) follow the frame rate
+    for value in values:
+        rx.set_video_source(
+            np.full(FRAME_SIZE, value, dtype=np.uint8), WIDTH, HEIGHT, FOURCC,
+            rate, 1, 10_000_000 // rate,
+        )
+        feed(rx, 1)
+
+
+def test_blend():
+    a = np.full(8, 20, dtype=np.uint8)
+    b = np.full(8, 30, dtype=np.uint8)
+    dest = np.zeros(8, dtype=np.uint8)
+    blend(a, b, dest, .5)
+    assert np.all(dest == 25)
+    blend(a, b, dest, 0)
+    assert np.all(dest == 20)
+    blend(a, b, dest, 1)
+    assert np.all(dest == 30)
+
+    # 16-bit formats are blended by sample
+    a = np.full(4, 0x00ff, dtype=np.uint16).view(np.uint8)
+    b = np.full(4, 0x0201, dtype=np.uint16).view(np.uint8)
+    dest = np.zeros(8, dtype=np.uint8)
+    blend(a, b, dest, .5, FourCC.P216)
+    assert np.all(dest.view(np.uint16) == 0x0180)
+
+    with pytest.raises(ValueError):
+        blend(a, b, np.zeros(4, dtype=np.uint8), .5)
+    with pytest.raises(ValueError):
+        blend(a, b, dest, 2)
+
+
+def test_nearest():
+    rx = make_receiver(max_buffers=8)
+    converter = FrameRateConverter(RecordingSender(), rx.video_frame, frame_rate=Fraction(50))
+    assert converter.mode == ConvertMode.convert_nearest
+    assert converter.source is rx.video_frame
+    assert converter.frame_rate == Fraction(50)
+
+    # Nothing received yet
+    run_ticks(converter, 1)
+    assert converter.num_missed == 1
+
+    # 25 -> 50 repeats each frame (the output runs one frame behind)
+    feed_values(rx, [10, 20, 30], 25)
+    run_ticks(converter, 3)
+    feed_values(rx, [40], 25)
+    run_ticks(converter, 2)
+    assert converter.sender.get_sent_values() == [20, 20, 30, 30, 40]
+    assert converter.num_video_sent == 5
+    assert converter.num_repeated == 2
+    assert converter.num_dropped == 1
+    assert converter.num_resyncs == 0
+    # The last frame sent is kept in case it needs to be repeated
+    assert rx.video_frame.get_buffer_depth() == 1
+
+
+def test_downconvert():
+    rx = make_receiver(max_buffers=8)
+    converter = FrameRateConverter(RecordingSender(), rx.video_frame, frame_rate=Fraction(25))
+    feed_values(rx, [1, 2, 3, 4, 5], 50)
+    run_ticks(converter, 1)
+    feed_values(rx, [6, 7], 50)
+    run_ticks(converter, 1)
+    feed_values(rx, [8, 9], 50)
+    run_ticks(converter, 1)
+    assert converter.sender.get_sent_values() == [4, 6, 8]
+    assert converter.num_dropped == 5
+    assert converter.num_repeated == 0
+
+    # The source stalls
+    run_ticks(converter, 1)
+    assert converter.sender.get_sent_values() == [9]
+    assert converter.num_resyncs == 0
+    run_ticks(converter, 1)
+    assert converter.sender.get_sent_values() == [9]
+    assert converter.num_resyncs == 1
+    assert converter.num_repeated == 1
+
+
+def test_blend_mode():
+    rx = make_receiver(max_buffers=8)
+    converter = FrameRateConverter(
+        RecordingSender(), rx.video_frame, frame_rate=Fraction(50),
+        mode=ConvertMode.convert_blend,
+    )
+    feed_values(rx, [10, 20, 30], 25)
+    run_ticks(converter, 3)
+    feed_values(rx, [40], 25)
+    run_ticks(converter, 2)
+    assert converter.sender.get_sent_values() == [20, 25, 30, 35, 40]
+    assert converter.num_blended == 2
+    assert converter.num_video_sent == 5
+
+
+def test_drop_repeat():
+    rx = make_receiver(max_buffers=8)
+    converter = FrameRateConverter(
+        RecordingSender(), rx.video_frame, frame_rate=Fraction(50),
+        mode=ConvertMode.convert_drop_repeat,
+    )
+    feed_values(rx, [10, 20, 30], 25)
+    run_ticks(converter, 2)
+    feed_values(rx, [40], 25)
+    run_ticks(converter, 1)
+    assert converter.sender.get_sent_values() == [30, 30, 40]
+    assert converter.num_dropped == 2
+    assert converter.num_repeated == 1
+
+
+def test_max_buffers():
+    # The frame held for repeating would leave no buffer for the receiver
+    with pytest.raises(ValueError):
+        FrameRateConverter(None, make_receiver(max_buffers=1).video_frame)
+    with pytest.raises(ValueError):
+        FrameRateConverter(
+            None, make_receiver(max_buffers=2).video_frame, mode=ConvertMode.convert_blend,
+        )
+    FrameRateConverter(None, make_receiver(max_buffers=3).video_frame, mode=ConvertMode.convert_blend)
+
+    rx = make_receiver(max_buffers=2)
+    converter = FrameRateConverter(
+        RecordingSender(), rx.video_frame, frame_rate=Fraction(25),
+        mode=ConvertMode.convert_drop_repeat,
+    )
+    for value in [10, 20, 30]:
+        feed_values(rx, [value], 25)
+        run_ticks(converter, 1)
+    assert converter.sender.get_sent_values() == [10, 20, 30]
+
+
+def test_receive_while_sending():
+    rx = make_receiver(max_buffers=3)
+    vf = rx.video_frame
+    converter = FrameRateConverter(
+        RecordingSender(), vf, frame_rate=Fraction(25), mode=ConvertMode.convert_drop_repeat,
+    )
+    feed_values(rx, [10], 25)
+    states = []
+
+    def on_send():
+        # The receiver isn't blocked while the frame is being sent and
+        # can't overwrite it
+        locked = vf.read_lock.locked
+        feed_values(rx, [20, 30], 25)
+        states.append((locked, vf.buffer_full()))
+
+    converter.sender.set_video_callback(on_send)
+    run_ticks(converter, 1)
+    assert states == [(False, True)]
+    assert converter.sender.get_sent_values() == [10]
+    # The frame sent is kept for repeating
+    assert vf.get_buffer_depth() == 3
+
+    converter.sender.set_video_callback(None)
+    run_ticks(converter, 1)
+    assert converter.sender.get_sent_values() == [30]
+    assert converter.num_dropped == 1
+    assert vf.get_buffer_depth() == 1
+
+
+def test_frame_sync():
+    with pytest.raises(ValueError):
+        FrameRateConverter(None, VideoFrameSync())
+    with pytest.raises(TypeError):
+        FrameRateConverter(None, make_receiver(max_buffers=8))
+    vf = VideoFrameSync(double_buffered=True)
+    with pytest.raises(ValueError):
+        FrameRateConverter(None, vf, mode=ConvertMode.convert_blend)
+
+    vf.set_fourcc(FourCC.RGBA)
+    fs_helper = VideoFrameSyncHelper()
+    fs_helper.set_video_frame(vf)
+    converter = FrameRateConverter(RecordingSender(), vf)
+    assert converter.source is vf
+    run_ticks(converter, 1)
+    assert converter.num_missed == 1
+
+    fs_helper.fill_data(np.full(32 * 18 * 4, 7, dtype=np.uint8), 32, 18, 1)
+    run_ticks(converter, 2)
+    fs_helper.fill_data(np.full(32 * 18 * 4, 9, dtype=np.uint8), 32, 18, 2)
+    run_ticks(converter, 1)
+    assert [s[1:4] for s in converter.sender.get_sent()] == [
+        (32, 18, 7), (32, 18, 7), (32, 18, 9),
+    ]
+    assert converter.num_repeated == 1
+
+
+def test_thread():
+    rx = make_receiver(max_buffers=8)
+    converter = FrameRateConverter(RecordingSender(), rx.video_frame, frame_rate=Fraction(50))
+    running = threading.Event()
+    running.set()
+
+    def feed_loop():
+        value = 0
+        while running.is_set():
+            value = (value + 1) % 256
+            feed_values(rx, [value], 100)
+            time.sleep(.01)
+
+    feeder = threading.Thread(target=feed_loop)
+    feeder.start()
+    try:
+        with converter:
+            assert converter.is_running
+            time.sleep(.3)
+    finally:
+        running.clear()
+        feeder.join()
+    assert not converter.is_running
+
+    sent = converter.sender.get_sent()
+    assert 10 <= len(sent) <= 20
+    assert converter.num_video_sent == len(sent)
+    intervals = np.diff([s[5] for s in sent]) / 1e9
+    assert intervals.mean() == pytest.approx(.02, rel=.2)
@@ -0,0 +1,177 @@
+import numpy as np
+import pytest
+
+from cyndilib import receiver_pool
+from cyndilib.receiver_pool import ReceiverPool, PoolEntry, default_receiver_factory
+from cyndilib.receiver import ReceiveFrameType
+from cyndilib.wrapper.ndi_recv import RecvColorFormat, RecvBandwidth
+from cyndilib.wrapper.ndi_structs import FourCC
+from _bench_helpers import (  # type: ignore[missing-import]
+    BenchReceiver, get_video_frame_size,
+)
+
+FOURCC = FourCC.UYVY
+SIZES = {
+    RecvBandwidth.lowest: (16, 9),
+    RecvBandwidth.highest: (64, 36),
+}
+CONNECT_DELAY = 3
+
+
+class SwitchBenchReceiver(BenchReceiver):
+    """A :class:`BenchReceiver` producing small frames at low bandwidth and
+    delivering nothing for the first few calls at high bandwidth (to
+    simulate the connection time)
+    """
+    def __init__(self, source_name, bandwidth):
+        super().__init__()
+        self.name = source_name
+        self.bandwidth = bandwidth
+        self.num_calls = 0
+        self.disconnected = False
+        width, height = SIZES[bandwidth]
+        size = get_video_frame_size(FOURCC, width, height)
+        self.set_video_source(np.zeros(size, dtype=np.uint8), width, height, FOURCC)
+
+    def receive(self, recv_type, timeout_ms):
+        self.num_calls += 1
+        if self.bandwidth == RecvBandwidth.highest and self.num_calls <= CONNECT_DELAY:
+            return ReceiveFrameType.nothing
+        return super().receive(recv_type, timeout_ms)
+
+    def disconnect(self):
+        self.disconnected = True
+
+
+created = []
+
+
+def make_receiver(source, color_format, bandwidth):
+    rx = SwitchBenchReceiver(source, bandwidth)
+    created.append(rx)
+    return rx
+
+
+@pytest.fixture
+def pool():
+    created.clear()
+    pool = ReceiverPool(max_connections=5, receiver_factory=make_receiver)
+    yield pool
+    pool.close()
+
+
+def receive_width(entry):
+    ft = entry.receive(ReceiveFrameType.recv_video, 0)
+    assert ft == ReceiveFrameType.recv_video
+    return entry.video_frame.get_resolution()[0]
+
+
+def test_switch(pool):
+    with pytest.raises(ValueError):
+        ReceiverPool(max_connections=3, max_promoted=2)
+    for name in ['a', 'b', 'c']:
+        entry = pool.add_standby(name)
+        assert isinstance(entry, PoolEntry)
+        assert not entry.is_promoted
+        assert entry.standby.bandwidth == RecvBandwidth.lowest
+    assert len(pool) == 3
+    assert pool.num_connections == 3
+    assert 'b' in pool
+
+    entry = pool.promote('b')
+    assert entry is pool.get('b')
+    assert entry.is_promoted and not entry.is_ready
+    assert entry.program.bandwidth == RecvBandwidth.highest
+    assert pool.num_connections == 4
+
+    # Standby frames are delivered until the program receiver connects
+    for _ in range(CONNECT_DELAY):
+        assert receive_width(entry) == 16
+        assert entry.receiver is entry.standby
+    assert receive_width(entry) == 64
+    assert entry.is_ready
+    assert entry.receiver is entry.program
+    assert receive_width(entry) == 64
+
+    # Promoting another source demotes the previous one
+    program = entry.program
+    other = pool.promote('c')
+    assert pool.promoted == [other]
+    assert not entry.is_promoted and program.disconnected
+    assert receive_width(entry) == 16
+    assert pool.num_connections == 4
+
+    pool.demote('c')
+    assert pool.promoted == []
+    pool.remove('a')
+    assert 'a' not in pool
+    assert created[0].disconnected
+    with pytest.raises(ValueError):
+        pool.add_standby('')
+
+
+def test_budget(pool):
+    for name in ['a', 'b', 'c', 'd']:
+        pool.add_standby(name)
+    pool.add_standby('a')
+    assert list(pool.entries) == ['b', 'c', 'd', 'a']
+
+    # The least recently used source is removed
+    pool.add_standby('e')
+    pool.add_standby('f')
+    assert list(pool.entries) == ['c', 'd', 'a', 'e', 'f']
+    assert pool.num_connections == 5
+
+    pool.promote('d')
+    assert list(pool.entries) == ['a', 'e', 'f', 'd']
+    assert pool.num_connections == 5
+    assert [e.source_name for e in pool] == ['a', 'e', 'f', 'd']
+
+    pool.close()
+    assert len(pool) == 0
+    assert all(rx.disconnected for rx in created)
+
+
+def test_unknown_source():
+    class EmptyFinder:
+        def get_source(self, name):
+            return None
+
+    created.clear()
+    pool = ReceiverPool(
+        max_connections=2, receiver_factory=make_receiver, finder=EmptyFinder(),
+    )
+    try:
+        entry = pool.add_standby('a')
+        assert pool.get('a') is entry
+        assert entry.source == 'a'
+        assert entry.source_name == 'a'
+        assert created[-1].name == 'a'
+
+        # The entry can be removed to stay within the budget
+        pool.add_standby('b')
+        pool.add_standby('c')
+        assert list(pool.entries) == ['b', 'c']
+        assert created[0].disconnected
+    finally:
+        pool.close()
+
+
+def test_default_factory_source_name(monkeypatch):
+    calls = []
+
+    class FakeReceiver:
+        def __init__(self, **kwargs):
+            calls.append(kwargs)
+
+        def set_source(self, source):
+            calls.append(source)
+
+    # A plain name must be passed to the Receiver so it connects
+    monkeypatch.setattr(receiver_pool, 'Receiver', FakeReceiver)
+    rx = default_receiver_factory('CAM 1', RecvColorFormat.UYVY_BGRA, RecvBandwidth.lowest)
+    assert isinstance(rx, FakeReceiver)
+    assert calls == [dict(
+        source_name='CAM 1', color_format=RecvColorFormat.UYVY_BGRA,
+        bandwidth=RecvBandwidth.lowest,
+    )]
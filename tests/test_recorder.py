@@ -0,0 +1,213 @@
+import shutil
+import time
+
+import numpy as np
+import pytest
+
+from cyndilib.recorder import (
+    Recorder, RecordingReader, RecordMediaType, RECORD_INDEX_DTYPE, BLOCK_SIZE,
+)
+from cyndilib.receiver import ReceiveFrameType
+from cyndilib.video_frame import VideoRecvFrame
+from cyndilib.audio_frame import AudioRecvFrame
+from cyndilib.wrapper.ndi_structs import FourCC, FrameFormat
+from _test_recorder import (  # type: ignore[missing-import]
+    add_video, add_audio, add_metadata,
+)
+from _bench_helpers import (  # type: ignore[missing-import]
+    BenchReceiver, get_video_frame_size,
+)
+
+WIDTH, HEIGHT, FOURCC = 64, 36, FourCC.UYVY
+FRAME_SIZE = get_video_frame_size(FOURCC, WIDTH, HEIGHT)
+FRAME_TICKS = 333333
+
+
+def build_frame(value):
+    return np.full(FRAME_SIZE, value % 256, dtype=np.uint8)
+
+
+def test_record_and_read(tmp_path):
+    filename = tmp_path / 'test.cyndirec'
+    num_frames = 10
+    samples = np.arange(2 * 1600, dtype=np.float32).reshape((2, 1600))
+    with Recorder(filename) as recorder:
+        assert recorder.is_open
+        for i in range(num_frames):
+            ts = (i + 1) * FRAME_TICKS
+            add_video(recorder, build_frame(i), WIDTH, HEIGHT, FOURCC, ts, timecode=i)
+            add_audio(recorder, samples + i, ts)
+            add_metadata(recorder, f'<frame index="{i}"/>', ts)
+        assert recorder.num_recorded == num_frames * 3
+    assert not recorder.is_open
+    assert recorder.num_dropped == 0
+    assert recorder.bytes_written % BLOCK_SIZE == 0
+
+    with RecordingReader(filename) as reader:
+        assert reader.size == recorder.bytes_written
+        assert len(reader) == num_frames * 3
+        assert reader.index.dtype == RECORD_INDEX_DTYPE
+        assert np.array_equal(
+            reader.index['media_type'],
+            np.tile([1, 2, 3], num_frames),
+        )
+        video_pos = reader.get_positions(RecordMediaType.record_video)
+        audio_pos = reader.get_positions(RecordMediaType.record_audio)
+        meta_pos = reader.get_positions(RecordMediaType.record_metadata)
+        assert len(video_pos) == len(audio_pos) == len(meta_pos) == num_frames
+
+        for i in range(num_frames):
+            entry = reader.index[video_pos[i]]
+            assert entry['timestamp'] == (i + 1) * FRAME_TICKS
+            assert entry['timecode'] == i
+            assert entry['size'] == FRAME_SIZE
+            assert entry['offset'] % 64 == 0
+            assert FourCC(entry['fourcc']) == FOURCC
+            assert entry['xres'] == WIDTH
+            assert entry['yres'] == HEIGHT
+            assert FrameFormat(entry['frame_format']) == FrameFormat.progressive
+            assert entry['frame_rate_N'] == 30
+            assert entry['frame_rate_D'] == 1
+            data = reader.read(video_pos[i])
+            assert data.dtype == np.uint8
+            assert not data.flags.writeable
+            assert np.all(data == i)
+
+            entry = reader.index[audio_pos[i]]
+            assert entry['sample_rate'] == 48000
+            assert entry['num_channels'] == 2
+            assert entry['num_samples'] == 1600
+            assert np.array_equal(reader.read(audio_pos[i]), samples + i)
+
+            assert reader.read(meta_pos[i]) == f'<frame index="{i}"/>'
+
+        assert reader.find(RecordMediaType.record_video, FRAME_TICKS - 1) == -1
+        assert reader.find(RecordMediaType.record_video, 3 * FRAME_TICKS) == video_pos[2]
+        assert reader.find(RecordMediaType.record_audio, 3 * FRAME_TICKS + 1) == audio_pos[2]
+        with pytest.raises(IndexError):
+            reader.read(len(reader))
+
+    # Views remain valid after the reader is closed
+    assert np.all(data == num_frames - 1)
+    with pytest.raises(ValueError):
+        reader.read(0)
+
+
+def test_chunks(tmp_path):
+    filename = tmp_path / 'test.cyndirec'
+    num_frames = 50
+
+    # Two frames per chunk
+    recorder = Recorder(filename, chunk_size=FRAME_SIZE * 2, num_chunks=2, max_entries=2)
+    recorder.open()
+    for i in range(num_frames):
+        add_video(recorder, build_frame(i), WIDTH, HEIGHT, FOURCC, i * FRAME_TICKS)
+        # Don't let the writer fall behind
+        if i % 2 == 1:
+            assert recorder.flush(timeout=5)
+    recorder.close()
+    assert recorder.num_dropped == 0
+
+    # Frames larger than the chunk size are stored in a single chunk
+    large_file = tmp_path / 'large.cyndirec'
+    with Recorder(large_file, chunk_size=FRAME_SIZE // 4) as large_recorder:
+        for i in range(4):
+            add_video(large_recorder, build_frame(i), WIDTH, HEIGHT, FOURCC, i * FRAME_TICKS)
+
+    for fn in [filename, large_file]:
+        with RecordingReader(fn) as reader:
+            n = num_frames if fn == filename else 4
+            assert len(reader) == n
+            assert np.array_equal(reader.index['timestamp'], np.arange(n) * FRAME_TICKS)
+            for i in range(n):
+                assert np.all(reader.read(i) == i % 256)
+
+    # Only complete chunks are read from a truncated file
+    truncated = tmp_path / 'truncated.cyndirec'
+    shutil.copy(filename, truncated)
+    with open(truncated, 'r+b') as f:
+        f.truncate(recorder.bytes_written - 1)
+    with RecordingReader(truncated) as reader:
+        assert len(reader) == num_frames - 2
+        assert np.all(reader.read(-1) == num_frames - 3)
+
+
+def test_flush(tmp_path):
+    filename = tmp_path / 'test.cyndirec'
+    with Recorder(filename, flush_interval=0) as recorder:
+        add_video(recorder, build_frame(1), WIDTH, HEIGHT, FOURCC, FRAME_TICKS)
+        assert recorder.flush(timeout=5)
+        with RecordingReader(filename) as reader:
+            assert len(reader) == 1
+            assert np.all(reader.read(0) == 1)
+
+        # The writer also flushes on its own after the flush interval
+        recorder2 = Recorder(tmp_path / 'test2.cyndirec', flush_interval=.05)
+        with recorder2:
+            add_video(recorder2, build_frame(2), WIDTH, HEIGHT, FOURCC, FRAME_TICKS)
+            for _ in range(100):
+                if recorder2.bytes_written > BLOCK_SIZE:
+                    break
+                time.sleep(.01)
+            assert recorder2.bytes_written > BLOCK_SIZE
+
+    # Frames are ignored while closed
+    add_video(recorder, build_frame(1), WIDTH, HEIGHT, FOURCC, FRAME_TICKS)
+    assert recorder.num_recorded == 1
+
+
+def test_invalid_files(tmp_path):
+    with pytest.raises(ValueError):
+        Recorder(tmp_path / 'test.cyndirec', chunk_size=0)
+    with pytest.raises(OSError):
+        Recorder(tmp_path / 'missing' / 'test.cyndirec').open()
+
+    empty = tmp_path / 'empty.cyndirec'
+    empty.write_bytes(b'')
+    with pytest.raises(ValueError):
+        RecordingReader(empty)
+    other = tmp_path / 'other.cyndirec'
+    other.write_bytes(b'\0' * BLOCK_SIZE)
+    with pytest.raises(ValueError):
+        RecordingReader(other)
+
+    # A recording without any frames
+    filename = tmp_path / 'test.cyndirec'
+    with Recorder(filename):
+        pass
+    with RecordingReader(filename) as reader:
+        assert len(reader) == 0
+        assert reader.find(RecordMediaType.record_video, 0) == -1
+
+
+def test_receiver_recorder(tmp_path):
+    filename = tmp_path / 'test.cyndirec'
+    src_data = np.arange(FRAME_SIZE, dtype=np.uint8)
+    src_samples = np.ones((2, 800), dtype=np.float32)
+    receiver = BenchReceiver()
+    receiver.set_video_source(src_data, WIDTH, HEIGHT, FOURCC)
+    receiver.set_audio_source(src_samples)
+    vf = VideoRecvFrame(max_buffers=4)
+    af = AudioRecvFrame(max_buffers=4)
+    receiver.set_video_frame(vf)
+    receiver.set_audio_frame(af)
+    recorder = Recorder(filename)
+    receiver.set_recorder(recorder)
+    assert receiver.recorder is recorder
+
+    with recorder:
+        for _ in range(4):
+            receiver.receive(ReceiveFrameType.recv_all, 0)
+        receiver.set_recorder(None)
+        receiver.receive(ReceiveFrameType.recv_all, 0)
+    assert recorder.num_recorded == 4
+
+    with RecordingReader(filename) as reader:
+        video_pos = reader.get_positions(RecordMediaType.record_video)
+        audio_pos = reader.get_positions(RecordMediaType.record_audio)
+        assert len(video_pos) == len(audio_pos) == 2
+        assert np.array_equal(reader.index['timestamp'][video_pos], [1, 2])
+        for i in video_pos:
+            assert np.array_equal(reader.read(i), src_data)
+        for i in audio_pos:
+            assert np.array_equal(reader.read(i), src_samples)
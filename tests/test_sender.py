@@ -100,6 +100,36 @@ def setup_sender(
 
     return sender
 
+def test_write_audio_stream(request, fake_av_frames: tuple[VideoParams, AudioParams]):
+    _, audio_data = fake_av_frames
+    name = request.node.nodeid.split('::')[-1]
+    sender = Sender(name, clock_audio=False)
+    frame_size = audio_data.s_perseg
+    af = AudioSendFrame()
+    af.sample_rate = audio_data.sample_rate
+    af.num_channels = audio_data.num_channels
+    af.set_max_num_samples(frame_size)
+    sender.set_audio_frame(af)
+
+    samples = audio_data.samples_2d
+    num_samples = samples.shape[1]
+    tail = frame_size // 2
+    data = np.concatenate([samples, samples[:,:tail]], axis=1)
+
+    with sender:
+        with pytest.raises(ValueError):
+            sender.write_audio_stream(data, frame_size + 1)
+        consumed = sender.write_audio_stream(data, frame_size, timecode=0)
+        assert consumed == num_samples
+        consumed = sender.write_audio_stream(data[:,consumed:], frame_size, flush=True)
+        assert consumed == tail
+        # Nothing consumed unless a full frame is available
+        assert sender.write_audio_stream(data[:,:tail], frame_size) == 0
+
+    # The sender is closed, so nothing should be sent
+    assert sender.write_audio_stream(data, frame_size) == 0
+
+
 def test_send_video_and_audio_cy(request, fake_av_frames: tuple[VideoParams, AudioParams]):
     video_data, audio_data = fake_av_frames
 
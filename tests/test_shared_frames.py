@@ -0,0 +1,241 @@
+import json
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from cyndilib.shared_frames import (
+    SharedFramePublisher, SharedFrameSubscriber, SharedFrame,
+)
+from cyndilib.recorder import RecordMediaType, RECORD_INDEX_DTYPE
+from cyndilib.receiver import ReceiveFrameType
+from cyndilib.video_frame import VideoRecvFrame
+from cyndilib.audio_frame import AudioRecvFrame
+from cyndilib.wrapper.ndi_structs import FourCC
+from _test_shared_frames import (  # type: ignore[missing-import]
+    add_video, add_audio, add_metadata,
+)
+from _bench_helpers import (  # type: ignore[missing-import]
+    BenchReceiver, get_video_frame_size,
+)
+
+WIDTH, HEIGHT, FOURCC = 64, 36, FourCC.UYVY
+FRAME_SIZE = get_video_frame_size(FOURCC, WIDTH, HEIGHT)
+FRAME_TICKS = 333333
+
+
+def build_frame(value):
+    return np.full(FRAME_SIZE, value % 256, dtype=np.uint8)
+
+
+def test_publish_and_read():
+    samples = np.arange(2 * 400, dtype=np.float32).reshape((2, 400))
+    with SharedFramePublisher(FRAME_SIZE, num_slots=8) as publisher:
+        # Frames published before subscribing are not read
+        add_video(publisher, build_frame(99), WIDTH, HEIGHT, FOURCC, 0)
+        with SharedFrameSubscriber(publisher.name) as subscriber:
+            assert publisher.num_subscribers == 1
+            assert subscriber.num_slots == 8
+            assert subscriber.slot_size == FRAME_SIZE
+            assert subscriber.read(timeout=0) is None
+
+            add_video(publisher, build_frame(1), WIDTH, HEIGHT, FOURCC, FRAME_TICKS, timecode=5)
+            add_audio(publisher, samples, 2 * FRAME_TICKS)
+            add_metadata(publisher, '<test value="1"/>', 3 * FRAME_TICKS)
+            assert publisher.num_published == 4
+            assert subscriber.num_pending == 3
+
+            frame = subscriber.read(timeout=1)
+            assert isinstance(frame, SharedFrame)
+            assert frame.sequence == 1
+            assert frame.media_type == RecordMediaType.record_video
+            assert frame.timestamp == FRAME_TICKS
+            assert frame.timecode == 5
+            assert frame.info.dtype == RECORD_INDEX_DTYPE
+            assert frame.info['xres'] == WIDTH
+            assert frame.info['yres'] == HEIGHT
+            assert FourCC(frame.info['fourcc']) == FOURCC
+            assert frame.info['size'] == FRAME_SIZE
+            assert frame.data.dtype == np.uint8
+            assert not frame.data.flags.writeable
+            assert np.all(frame.data == 1)
+            assert frame.is_valid()
+
+            frame = subscriber.read(timeout=1)
+            assert frame.media_type == RecordMediaType.record_audio
+            assert frame.info['sample_rate'] == 48000
+            assert np.array_equal(frame.data, samples)
+
+            frame = subscriber.read(timeout=1)
+            assert frame.media_type == RecordMediaType.record_metadata
+            assert frame.data == '<test value="1"/>'
+
+            assert subscriber.read(timeout=.01) is None
+            assert subscriber.num_read == 3
+            assert subscriber.num_lagged == 0
+        assert publisher.num_subscribers == 0
+
+        # Frames larger than the slots are dropped
+        add_video(publisher, build_frame(1), WIDTH, HEIGHT * 2, FOURCC, 0)
+        assert publisher.num_dropped == 1
+
+    with pytest.raises(FileNotFoundError):
+        SharedFrameSubscriber(publisher.name)
+
+
+def test_lag_and_overwrite():
+    num_slots = 4
+    with SharedFramePublisher(FRAME_SIZE, num_slots=num_slots) as publisher:
+        subscriber = SharedFrameSubscriber(publisher.name)
+        add_video(publisher, build_frame(0), WIDTH, HEIGHT, FOURCC, 0)
+        first = subscriber.read(timeout=1)
+        assert first.is_valid()
+
+        # Overwrite the slot holding the first frame and fall behind
+        for i in range(1, num_slots * 2 + 2):
+            add_video(publisher, build_frame(i), WIDTH, HEIGHT, FOURCC, i * FRAME_TICKS)
+        assert publisher.num_dropped == 0
+        assert not first.is_valid()
+        assert np.all(first.data != 0)
+
+        # Only the last num_slots frames can still be read
+        frame = subscriber.read(timeout=1)
+        assert frame.sequence == num_slots + 2
+        assert subscriber.num_lagged == num_slots + 1
+        assert np.all(frame.data == num_slots + 2)
+
+        # Skip to the most recent frame
+        frame = subscriber.read(timeout=1, latest=True)
+        assert frame.sequence == num_slots * 2 + 1
+        assert subscriber.num_lagged == num_slots * 2 - 1
+        assert subscriber.read(timeout=0) is None
+        subscriber.close()
+
+
+def test_no_overwrite():
+    num_slots = 4
+    with SharedFramePublisher(FRAME_SIZE, num_slots=num_slots, overwrite=False) as publisher:
+        # Nothing is dropped without subscribers
+        for i in range(num_slots * 2):
+            add_video(publisher, build_frame(i), WIDTH, HEIGHT, FOURCC, i)
+        assert publisher.num_dropped == 0
+
+        subscriber = SharedFrameSubscriber(publisher.name)
+        for i in range(num_slots + 2):
+            add_video(publisher, build_frame(i), WIDTH, HEIGHT, FOURCC, i)
+        assert publisher.num_dropped == 2
+        for i in range(num_slots):
+            frame = subscriber.read(timeout=1)
+            assert np.all(frame.data == i)
+            assert frame.is_valid()
+        assert subscriber.num_lagged == 0
+
+        # There is room again once the subscriber has caught up
+        add_video(publisher, build_frame(50), WIDTH, HEIGHT, FOURCC, 50)
+        assert publisher.num_dropped == 2
+        assert np.all(subscriber.read(timeout=1).data == 50)
+        subscriber.close()
+
+
+def test_no_overwrite_two_subscribers():
+    num_slots = 4
+    with SharedFramePublisher(FRAME_SIZE, num_slots=num_slots, overwrite=False) as publisher:
+        sub_a = SharedFrameSubscriber(publisher.name)
+        for i in range(num_slots):
+            add_video(publisher, build_frame(i), WIDTH, HEIGHT, FOURCC, i)
+
+        # Attaching another subscriber must not move the read position of A
+        sub_b = SharedFrameSubscriber(publisher.name)
+        assert sub_a.num_pending == num_slots
+        assert sub_b.num_pending == 0
+        for i in range(num_slots, num_slots * 2):
+            add_video(publisher, build_frame(i), WIDTH, HEIGHT, FOURCC, i)
+        assert publisher.num_dropped == num_slots
+
+        for i in range(num_slots):
+            frame = sub_a.read(timeout=1)
+            assert np.all(frame.data == i)
+        assert sub_a.num_lagged == 0
+        assert sub_b.read(timeout=0) is None
+        sub_a.close()
+        sub_b.close()
+
+
+def test_max_subscribers():
+    with SharedFramePublisher(FRAME_SIZE, max_subscribers=2) as publisher:
+        sub1 = SharedFrameSubscriber(publisher.name)
+        sub2 = SharedFrameSubscriber(publisher.name)
+        with pytest.raises(RuntimeError):
+            SharedFrameSubscriber(publisher.name)
+        sub1.close()
+        sub3 = SharedFrameSubscriber(publisher.name)
+        assert publisher.num_subscribers == 2
+        sub2.close()
+        sub3.close()
+
+
+SUBPROCESS_SCRIPT = textwrap.dedent('''
+    import sys, json
+    import numpy as np
+    from cyndilib.shared_frames import SharedFrameSubscriber
+
+    subscriber = SharedFrameSubscriber(sys.argv[1])
+    print('ready', flush=True)
+    results = []
+    while len(results) < int(sys.argv[2]):
+        frame = subscriber.read(timeout=10)
+        if frame is None:
+            break
+        results.append([frame.timestamp, int(frame.data[0]), bool(np.all(frame.data == frame.data[0]))])
+    subscriber.close()
+    print(json.dumps(results), flush=True)
+''')
+
+
+def test_other_process():
+    num_frames = 20
+    with SharedFramePublisher(FRAME_SIZE, num_slots=num_frames, overwrite=False) as publisher:
+        proc = subprocess.Popen(
+            [sys.executable, '-c', SUBPROCESS_SCRIPT, publisher.name, str(num_frames)],
+            stdout=subprocess.PIPE, text=True,
+        )
+        try:
+            assert proc.stdout.readline().strip() == 'ready'
+            for i in range(num_frames):
+                add_video(publisher, build_frame(i), WIDTH, HEIGHT, FOURCC, i * FRAME_TICKS)
+            results = json.loads(proc.stdout.readline())
+        finally:
+            proc.wait(timeout=10)
+        assert proc.returncode == 0
+        assert publisher.num_dropped == 0
+        assert results == [[i * FRAME_TICKS, i, True] for i in range(num_frames)]
+
+
+def test_receiver_publisher():
+    src_data = np.arange(FRAME_SIZE, dtype=np.uint8)
+    src_samples = np.ones((2, 800), dtype=np.float32)
+    receiver = BenchReceiver()
+    receiver.set_video_source(src_data, WIDTH, HEIGHT, FOURCC)
+    receiver.set_audio_source(src_samples)
+    receiver.set_video_frame(VideoRecvFrame(max_buffers=4))
+    receiver.set_audio_frame(AudioRecvFrame(max_buffers=4))
+
+    with SharedFramePublisher(FRAME_SIZE, audio=False) as publisher:
+        receiver.set_publisher(publisher)
+        assert receiver.publisher is publisher
+        subscriber = SharedFrameSubscriber(publisher.name)
+        for _ in range(4):
+            receiver.receive(ReceiveFrameType.recv_all, 0)
+        receiver.set_publisher(None)
+        receiver.receive(ReceiveFrameType.recv_all, 0)
+        assert publisher.num_published == 2
+
+        for ts in [1, 2]:
+            frame = subscriber.read(timeout=1)
+            assert frame.media_type == RecordMediaType.record_video
+            assert frame.timestamp == ts
+            assert np.array_equal(frame.data, src_data)
+        assert subscriber.read(timeout=0) is None
+        subscriber.close()
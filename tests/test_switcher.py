@@ -0,0 +1,196 @@
+import threading
+import time
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from cyndilib.switcher import Switcher
+from cyndilib.wrapper.ndi_structs import FourCC
+from _bench_helpers import (  # type: ignore[missing-import]
+    RecordingSender, get_video_frame_size, make_receiver, feed, run_ticks,
+)
+
+WIDTH, HEIGHT, FOURCC = 64, 36, FourCC.UYVY
+FRAME_SIZE = get_video_frame_size(FOURCC, WIDTH, HEIGHT)
+NUM_SAMPLES = 400
+
+
+def split_sent(switcher):
+    sent = switcher.sender.get_sent()
+    video = [s for s in sent if s[0] == 1]
+    audio = [s for s in sent if s[0] == 2]
+    return video, audio
+
+
+def test_switch():
+    receivers = [make_receiver(1, 1), make_receiver(2, 2, xres=32)]
+    switcher = Switcher(RecordingSender(), receivers, frame_rate=Fraction(50))
+    assert len(switcher) == 2
+    assert switcher.frame_rate == 50
+    assert switcher.selected == -1
+    assert switcher.receivers == tuple(receivers)
+    assert [inp.index for inp in switcher.inputs] == [0, 1]
+
+    for rx in receivers:
+        feed(rx, 3, 2)
+    run_ticks(switcher, 1)
+    assert switcher.selected == 0
+    video, audio = split_sent(switcher)
+    # The most recent frame is sent and the older ones are dropped
+    assert [v[:5] for v in video] == [(1, WIDTH, HEIGHT, 1, 1)]
+    assert switcher.num_video_dropped == 2
+    # Only the most recent audio frame is sent after a switch
+    assert [(a[1], a[3], a[4]) for a in audio] == [(NUM_SAMPLES, 1, 1)]
+
+    # Nothing new to send
+    run_ticks(switcher, 1)
+    assert switcher.sender.get_sent() == []
+    assert switcher.num_video_missed == 1
+
+    # The switch happens on the next tick
+    switcher.select(1)
+    assert switcher.pending_input == 1
+    feed(receivers[0], 1, 1)
+    assert switcher.selected == 0
+    run_ticks(switcher, 1)
+    assert switcher.selected == 1
+    assert switcher.num_switches == 1
+    video, audio = split_sent(switcher)
+    assert [(v[1], v[3]) for v in video] == [(32, 2)]
+    assert [(a[1], a[3], a[4]) for a in audio] == [(NUM_SAMPLES, 2, 2)]
+
+    feed(receivers[1], 1, 3)
+    run_ticks(switcher, 1)
+    video, audio = split_sent(switcher)
+    assert len(video) == 1 and len(audio) == 3
+    assert switcher.num_video_sent == 3
+    assert switcher.num_audio_sent == 5
+
+    with pytest.raises(IndexError):
+        switcher.select(2)
+    with pytest.raises(ValueError):
+        Switcher(None, [])
+    with pytest.raises(ValueError):
+        Switcher(None, receivers, crossfade=-1)
+
+
+def test_receive_while_sending():
+    rx = make_receiver(1, 1)
+    switcher = Switcher(RecordingSender(), [rx], audio=False)
+    vf = rx.video_frame
+    feed(rx, 4, 0)
+    assert vf.buffer_full()
+    states = []
+
+    def on_send():
+        # The receiver isn't blocked while the frame is being sent and
+        # can't overwrite it
+        locked = vf.read_lock.locked
+        rx.set_video_source(np.full(FRAME_SIZE, 2, dtype=np.uint8), WIDTH, HEIGHT, FOURCC)
+        feed(rx, 3, 0)
+        states.append((locked, vf.buffer_full()))
+
+    switcher.sender.set_video_callback(on_send)
+    run_ticks(switcher, 1)
+    assert states == [(False, True)]
+    video = split_sent(switcher)[0]
+    assert [(v[1], v[3]) for v in video] == [(WIDTH, 1)]
+    assert switcher.num_video_dropped == 3
+
+    switcher.sender.set_video_callback(None)
+    assert vf.get_buffer_depth() == 3
+    assert not vf.buffer_full()
+    run_ticks(switcher, 1)
+    video = split_sent(switcher)[0]
+    assert [(v[1], v[3]) for v in video] == [(WIDTH, 2)]
+    assert switcher.num_video_dropped == 5
+
+
+def test_receive_audio_while_sending():
+    rx = make_receiver(1, 1)
+    switcher = Switcher(RecordingSender(), [rx], video=False)
+    af = rx.audio_frame
+    run_ticks(switcher, 1)
+    feed(rx, 0, 2)
+    states = []
+
+    def on_send():
+        # The receiver isn't blocked while each frame is being sent
+        states.append(af.read_lock.locked)
+        if len(states) == 1:
+            feed(rx, 0, 1)
+
+    switcher.sender.set_audio_callback(on_send)
+    run_ticks(switcher, 1)
+    assert states == [False, False, False]
+    assert len(split_sent(switcher)[1]) == 3
+    assert af.get_buffer_depth() == 0
+
+
+def test_crossfade():
+    # 10ms at 48kHz is 480 samples
+    receivers = [make_receiver(1, 1.), make_receiver(2, 0.)]
+    switcher = Switcher(RecordingSender(), receivers, crossfade=.01, video=False)
+    feed(receivers[0], 0, 1)
+    run_ticks(switcher, 1)
+    assert [a[3:5] for a in split_sent(switcher)[1]] == [(1, 1)]
+
+    switcher.select(1)
+    feed(receivers[0], 0, 2)
+    feed(receivers[1], 0, 3)
+    run_ticks(switcher, 1)
+    video, audio = split_sent(switcher)
+    assert video == []
+    assert len(audio) == 1
+
+    # The previous input fades out over the first 480 samples
+    _, num_samples, _, first, last = audio[0][:5]
+    assert num_samples == NUM_SAMPLES
+    assert first == pytest.approx(1)
+    assert last == pytest.approx(1 - 399 / 480)
+
+    feed(receivers[1], 0, 2)
+    run_ticks(switcher, 1)
+    audio = split_sent(switcher)[1]
+    assert [a[3:5] for a in audio] == [(pytest.approx(1 - 400 / 480), 0), (0, 0)]
+    # 80 samples of the previous input's 2 buffered frames were used
+    assert receivers[0].audio_frame.get_buffer_depth() == 1
+
+
+def test_thread():
+    receivers = [make_receiver(1, 1), make_receiver(2, 2)]
+    switcher = Switcher(
+        RecordingSender(), receivers, frame_rate=Fraction(100), audio=False,
+    )
+    running = threading.Event()
+    running.set()
+
+    def feed_loop():
+        while running.is_set():
+            for rx in receivers:
+                feed(rx, 1, 0)
+            time.sleep(.005)
+
+    feeder = threading.Thread(target=feed_loop)
+    feeder.start()
+    try:
+        with switcher:
+            assert switcher.is_running
+            time.sleep(.25)
+            switcher.select(1)
+            time.sleep(.25)
+    finally:
+        running.clear()
+        feeder.join()
+    assert not switcher.is_running
+
+    video = split_sent(switcher)[0]
+    assert 35 <= len(video) <= 55
+    values = [v[3] for v in video]
+    assert values[0] == 1 and values[-1] == 2
+    # A single clean cut
+    assert values == sorted(values)
+    assert switcher.num_switches == 1
+    intervals = np.diff([v[5] for v in video]) / 1e9
+    assert intervals.mean() == pytest.approx(.01, rel=.2)
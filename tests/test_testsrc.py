@@ -0,0 +1,318 @@
+import time
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from cyndilib.testsrc import (
+    VideoTestSource, AudioTestSource, VideoPattern, AudioWaveform,
+)
+from cyndilib.video_frame import VideoSendFrame
+from cyndilib.audio_frame import AudioSendFrame
+from cyndilib.wrapper.ndi_structs import FourCC
+from _test_testsrc import (  # type: ignore[missing-import]
+    BenchLoadGenerator, read_video_frame, read_audio_frame,
+)
+from _bench_helpers import (  # type: ignore[missing-import]
+    BenchSender, RecordingSender, get_video_frame_size,
+)
+
+WIDTH, HEIGHT = 192, 108
+
+BAR_COLORS = [
+    (191, 191, 191), (191, 191, 0), (0, 191, 191), (0, 191, 0),
+    (191, 0, 191), (191, 0, 0), (0, 0, 191),
+]
+
+
+def to_ycbcr(r, g, b):
+    # Limited range BT.709
+    r, g, b = r / 255, g / 255, b / 255
+    luma = .2126 * r + .7152 * g + .0722 * b
+    return (
+        16 + 219 * luma,
+        128 + 224 * (b - luma) / 1.8556,
+        128 + 224 * (r - luma) / 1.5748,
+    )
+
+
+def read_pixel(data, fourcc, xres, yres, x, y):
+    """Get the ``(r, g, b, a)`` or ``(y, u, v, a)`` values of a pixel
+    (16-bit formats are scaled to 8 bits)
+    """
+    data = np.asarray(data)
+    wide = data.view(np.uint16)
+    if fourcc in (FourCC.BGRA, FourCC.BGRX, FourCC.RGBA, FourCC.RGBX):
+        b, g, r, a = data[y * xres * 4 + x * 4:][:4]
+        if fourcc in (FourCC.RGBA, FourCC.RGBX):
+            r, b = b, r
+        return r, g, b, a
+    if fourcc in (FourCC.UYVY, FourCC.UYVA):
+        row = data[y * xres * 2:]
+        a = 255
+        if fourcc == FourCC.UYVA:
+            a = data[xres * yres * 2 + y * xres + x]
+        return row[x * 2 + 1], row[(x >> 1) * 4], row[(x >> 1) * 4 + 2], a
+    if fourcc in (FourCC.P216, FourCC.PA16):
+        uv = wide[xres * yres + y * xres + (x & ~1):]
+        a = 255 << 8
+        if fourcc == FourCC.PA16:
+            a = wide[xres * yres * 2 + y * xres + x]
+        return tuple(v / 256 for v in (wide[y * xres + x], uv[0], uv[1], a))
+    if fourcc == FourCC.NV12:
+        uv = data[xres * yres + (y >> 1) * xres + (x & ~1):]
+        return data[y * xres + x], uv[0], uv[1], 255
+    chroma_size = (xres >> 1) * (yres >> 1)
+    chroma_index = xres * yres + (y >> 1) * (xres >> 1) + (x >> 1)
+    u, v = data[chroma_index], data[chroma_index + chroma_size]
+    if fourcc == FourCC.YV12:
+        u, v = v, u
+    return data[y * xres + x], u, v, 255
+
+
+@pytest.mark.parametrize('fourcc', list(FourCC), ids=lambda fc: fc.name)
+def test_patterns(fourcc):
+    src = VideoTestSource(WIDTH, HEIGHT, fourcc, moving_box=False, burn_in=False)
+    assert src.frame_size == get_video_frame_size(fourcc, WIDTH, HEIGHT)
+    data = src.render()
+    assert data.shape == (src.frame_size,)
+    is_rgb = fourcc in (FourCC.BGRA, FourCC.BGRX, FourCC.RGBA, FourCC.RGBX)
+    bar_width = WIDTH // 7
+    for i in (0, 1, 5, 6):
+        r, g, b = BAR_COLORS[i]
+        x = i * bar_width + bar_width // 2
+        pixel = read_pixel(data, fourcc, WIDTH, HEIGHT, x, HEIGHT - 1)
+        if is_rgb:
+            assert pixel == (r, g, b, 255)
+        else:
+            assert pixel[:3] == pytest.approx(to_ycbcr(r, g, b), abs=1)
+            assert pixel[3] == pytest.approx(255, abs=1)
+
+    src = VideoTestSource(
+        WIDTH, HEIGHT, fourcc, pattern=VideoPattern.pattern_ramp,
+        moving_box=False, burn_in=False,
+    )
+    data = src.render()
+    for x in (0, WIDTH // 2, WIDTH - 1):
+        value = x * 255 // (WIDTH - 1)
+        pixel = read_pixel(data, fourcc, WIDTH, HEIGHT, x, HEIGHT // 2)
+        if is_rgb:
+            assert pixel[:3] == (value, value, value)
+        else:
+            assert pixel[0] == pytest.approx(to_ycbcr(value, value, value)[0], abs=1)
+
+
+def test_moving_parts():
+    with pytest.raises(ValueError):
+        VideoTestSource(WIDTH + 1, HEIGHT)
+    src = VideoTestSource(WIDTH, HEIGHT, FourCC.RGBA, Fraction(25))
+    assert src.frame_rate == Fraction(25)
+    assert src.pattern == VideoPattern.pattern_bars
+    background = VideoTestSource(
+        WIDTH, HEIGHT, FourCC.RGBA, moving_box=False, burn_in=False,
+    ).render().reshape(HEIGHT, WIDTH, 4)
+
+    frame0 = src.render().reshape(HEIGHT, WIDTH, 4)
+    assert np.array_equal(src.render(frame_index=0).reshape(HEIGHT, WIDTH, 4), frame0)
+    assert src.frame_index == 0
+    frame1 = src.render(frame_index=1).reshape(HEIGHT, WIDTH, 4)
+    assert not np.array_equal(frame0, frame1)
+
+    # The box starts in the top left corner and moves diagonally
+    assert np.all(frame0[-HEIGHT // 8:, -WIDTH // 8:] == background[-HEIGHT // 8:, -WIDTH // 8:])
+    box = src.render(frame_index=40).reshape(HEIGHT, WIDTH, 4)
+    assert np.all(box[44:52, 44:52] == 255)
+
+    # The burn-in only changes the top left corner
+    changed = np.argwhere(np.any(frame0 != background, axis=2))
+    assert changed[:, 1].max() < WIDTH // 2
+    # The timecode (second line) is 00:00:01:00 and 00:00:02:00
+    frame25 = src.render(frame_index=25).reshape(HEIGHT, WIDTH, 4)
+    frame50 = src.render(frame_index=50).reshape(HEIGHT, WIDTH, 4)
+    assert not np.array_equal(frame25[10:17, :40], frame50[10:17, :40])
+    frame75 = src.render(frame_index=75).reshape(HEIGHT, WIDTH, 4)
+    assert np.array_equal(frame25[10:17, :20], frame75[10:17, :20])
+
+    dest = np.zeros(src.frame_size, dtype=np.uint8)
+    src.render(dest, 1)
+    assert np.array_equal(dest.reshape(HEIGHT, WIDTH, 4), frame1)
+    with pytest.raises(ValueError):
+        src.render(np.zeros(16, dtype=np.uint8))
+
+
+def test_audio():
+    with pytest.raises(ValueError):
+        AudioTestSource(num_channels=0)
+    with pytest.raises(ValueError):
+        AudioTestSource(frequency=0)
+
+    src = AudioTestSource(num_channels=2, sample_rate=48000, frequency=1000, amplitude=.5)
+    dest = np.zeros((2, 480), dtype=np.float32)
+    src.render(dest)
+    t = np.arange(480) / 48000
+    expected = .5 * np.sin(2 * np.pi * 1000 * t)
+    assert np.allclose(dest[0], expected, atol=1e-5)
+    assert np.array_equal(dest[0], dest[1])
+
+    # Continuous across frames
+    dest2 = np.zeros((2, 480), dtype=np.float32)
+    src.render(dest2, 480)
+    expected = .5 * np.sin(2 * np.pi * 1000 * (t + .01))
+    assert np.allclose(dest2[0], expected, atol=1e-5)
+    with pytest.raises(ValueError):
+        src.render(np.zeros((3, 480), dtype=np.float32))
+
+    src = AudioTestSource(
+        num_channels=1, waveform=AudioWaveform.waveform_sweep, amplitude=1,
+        sweep_start=100, sweep_end=1000, sweep_time=1,
+    )
+    dest = np.zeros((1, 48000), dtype=np.float32)
+    src.render(dest)
+    assert np.abs(dest).max() == pytest.approx(1, abs=1e-3)
+    # Count zero crossings (two per cycle) near the start and end of the sweep
+    crossings = np.diff(np.signbit(dest[0]).astype(int)) != 0
+    assert crossings[:4800].sum() / 2 < crossings[-4800:].sum() / 2 / 5
+    # Starts over after sweep_time
+    dest2 = np.zeros((1, 100), dtype=np.float32)
+    src.render(dest2, 48000)
+    assert np.allclose(dest2, dest[:, :100])
+
+    src = AudioTestSource(waveform=AudioWaveform.waveform_silence)
+    dest = np.ones((2, 100), dtype=np.float32)
+    src.render(dest)
+    assert np.all(dest == 0)
+
+
+def test_write_frame():
+    src = VideoTestSource(WIDTH, HEIGHT, FourCC.UYVY, Fraction(50))
+    audio_src = AudioTestSource(num_channels=2, sample_rate=48000)
+    vf, af = VideoSendFrame(), AudioSendFrame()
+    af.set_max_num_samples(1600)
+    sender = BenchSender()
+    sender.set_video_frame(vf)
+    sender.set_audio_frame(af)
+
+    src.setup_frame(vf)
+    audio_src.setup_frame(af)
+    assert vf.get_resolution() == (WIDTH, HEIGHT)
+    assert vf.get_fourcc() == FourCC.UYVY
+    assert vf.get_frame_rate() == Fraction(50)
+
+    # Buffers aren't allocated until the sender is open
+    with pytest.raises(ValueError):
+        src.write_frame(vf)
+    with sender:
+        for i in range(3):
+            assert src.write_frame(vf) == i
+            data, timecode = read_video_frame(vf)
+            assert np.array_equal(data, src.render(frame_index=i))
+            assert timecode == i * 200_000
+        assert src.frame_index == 3
+
+        expected = np.zeros((2, 1920), dtype=np.float32)
+        audio_src.render(expected, 0)
+        multiplier = af.reference_converter.multiplier
+        for i in range(2):
+            assert audio_src.write_frame(af, 960) == i * 960
+            data, timecode = read_audio_frame(af)
+            assert timecode == i * 200_000
+            assert np.allclose(data / multiplier, expected[:, i * 960:][:, :960], atol=1e-6)
+        assert audio_src.sample_index == 1920
+        with pytest.raises(ValueError):
+            audio_src.write_frame(af, 1601)
+
+        with pytest.raises(ValueError):
+            VideoTestSource(WIDTH * 2, HEIGHT).write_frame(vf)
+
+
+def make_senders(video_src, audio_src, count):
+    senders = []
+    for _ in range(count):
+        vf, af = VideoSendFrame(), AudioSendFrame()
+        video_src.setup_frame(vf)
+        audio_src.setup_frame(af)
+        af.set_max_num_samples(1602)
+        senders.append(RecordingSender(video_frame=vf, audio_frame=af))
+    return senders
+
+
+def split_sent(sender):
+    sent = sender.get_sent()
+    video = [s for s in sent if s[0] == 1]
+    audio = [s for s in sent if s[0] == 2]
+    return video, audio
+
+
+def test_load_generator():
+    video_src = VideoTestSource(WIDTH, HEIGHT, FourCC.UYVY, Fraction(30000, 1001))
+    audio_src = AudioTestSource()
+    senders = make_senders(video_src, audio_src, 3)
+
+    with pytest.raises(ValueError):
+        BenchLoadGenerator(senders)
+    with pytest.raises(ValueError):
+        BenchLoadGenerator(senders, VideoTestSource(WIDTH * 2, HEIGHT), audio_src)
+    with pytest.raises(ValueError):
+        BenchLoadGenerator([RecordingSender(audio_frame=AudioSendFrame())], video_src)
+    small = AudioSendFrame()
+    audio_src.setup_frame(small)
+    small.set_max_num_samples(800)
+    with pytest.raises(ValueError):
+        BenchLoadGenerator([RecordingSender(audio_frame=small)], None, audio_src)
+
+    generator = BenchLoadGenerator(senders, video_src, audio_src, num_threads=2)
+    assert generator.frame_rate == Fraction(30000, 1001)
+    assert len(generator) == 3
+    assert generator.senders == tuple(senders)
+    assert [output.worker for output in generator.outputs] == [0, 1, 0]
+    try:
+        generator.run_ticks(5)
+    finally:
+        for sender in senders:
+            sender.close()
+
+    assert generator.num_video_sent == generator.num_audio_sent == 15
+    assert generator.num_skipped == 0
+    first_values = None
+    for sender in senders:
+        video, audio = split_sent(sender)
+        assert len(video) == len(audio) == 5
+        assert [s[1:3] for s in video] == [(WIDTH, HEIGHT)] * 5
+        timecodes = [s[6] for s in video]
+        assert timecodes == [n * 10_000_000 * 1001 // 30000 for n in range(5)]
+        # 1601.6 samples per frame, alternating between 1601 and 1602
+        num_samples = [s[1] for s in audio]
+        assert sum(num_samples) == 8008
+        assert set(num_samples) == {1601, 1602}
+        # Audio timecodes are those of the first sample
+        sample_indices = np.cumsum([0] + num_samples[:-1])
+        assert [s[6] for s in audio] == [int(n) * 10_000_000 // 48000 for n in sample_indices]
+        assert all(s[2] == 2 for s in audio)
+        # All senders show the same frame
+        if first_values is None:
+            first_values = [s[3] for s in video]
+        assert [s[3] for s in video] == first_values
+
+
+def test_load_generator_thread():
+    video_src = VideoTestSource(WIDTH, HEIGHT, FourCC.NV12, Fraction(100))
+    audio_src = AudioTestSource()
+    senders = make_senders(video_src, audio_src, 4)
+    generator = BenchLoadGenerator(senders, video_src, audio_src, num_threads=2)
+    assert generator.frame_rate == Fraction(100)
+    try:
+        with generator:
+            assert generator.is_running
+            time.sleep(.3)
+    finally:
+        for sender in senders:
+            sender.close()
+    assert not generator.is_running
+
+    num_video = 0
+    for sender in senders:
+        video, audio = split_sent(sender)
+        assert 20 <= len(video) <= 40
+        assert len(audio) == len(video)
+        num_video += len(video)
+    assert generator.num_video_sent == num_video
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from cyndilib.timing import StageTimer, get_bucket_edges
+from cyndilib.receiver import ReceiveFrameType
+from cyndilib.video_frame import VideoRecvFrame
+from cyndilib.audio_frame import AudioSendFrame
+from cyndilib.wrapper.ndi_structs import FourCC
+from _test_timing import (  # type: ignore[missing-import]
+    add_sample, time_stage, get_bucket_index,
+)
+from _bench_helpers import (  # type: ignore[missing-import]
+    BenchReceiver, BenchSender, get_video_frame_size,
+)
+
+
+def test_bucket_edges():
+    edges = get_bucket_edges()
+    assert edges[-1] is None
+    assert edges[0] == 1000
+    for i, edge in enumerate(edges[:-1]):
+        assert get_bucket_index(edge - 1) == i
+        assert get_bucket_index(edge) == i + 1
+    assert get_bucket_index(0) == 0
+    assert get_bucket_index(3600 * 10**9) == len(edges) - 1
+
+
+def test_stage_timer():
+    timer = StageTimer(('a', 'b'))
+    assert not timer.enabled
+    with pytest.raises(ValueError):
+        StageTimer([str(i) for i in range(9)])
+
+    # Disabled timers don't record
+    assert time_stage(timer, 0) == 0
+    snap = timer.snapshot()
+    assert list(snap.keys()) == ['a', 'b']
+    assert snap['a']['count'] == 0
+
+    timer.enabled = True
+    for _ in range(10):
+        time_stage(timer, 0)
+    snap = timer.snapshot()
+    assert snap['a']['count'] == 10
+    assert sum(snap['a']['histogram']) == 10
+    assert snap['b']['count'] == 0
+
+    for ns in [500, 1500, 2500]:
+        add_sample(timer, 1, ns)
+    b = timer.snapshot()['b']
+    assert b['count'] == 3
+    assert b['total_ns'] == 4500
+    assert b['mean_ns'] == 1500
+    assert b['min_ns'] == 500
+    assert b['max_ns'] == 2500
+    assert b['histogram'][:3] == [1, 1, 1]
+
+    # Disabling keeps the recorded values
+    timer.enabled = False
+    assert timer.snapshot()['b']['count'] == 3
+    timer.reset()
+    assert timer.snapshot()['b']['count'] == 0
+
+
+def test_receiver_stage_timings():
+    width, height, fourcc = 320, 180, FourCC.UYVY
+    src_data = np.zeros(get_video_frame_size(fourcc, width, height), dtype=np.uint8)
+    dest = np.empty_like(src_data)
+    receiver = BenchReceiver()
+    receiver.set_video_source(src_data, width, height, fourcc)
+    vf = VideoRecvFrame(max_buffers=4)
+    receiver.set_video_frame(vf)
+
+    ft = receiver.receive(ReceiveFrameType.recv_video, 0)
+    assert ft == ReceiveFrameType.recv_video
+    vf.fill_p_data(dest)
+    timings = receiver.get_stage_timings()
+    assert timings['audio_frame'] is None
+    assert all(v['count'] == 0 for v in timings['receiver'].values())
+    assert all(v['count'] == 0 for v in timings['video_frame'].values())
+
+    receiver.set_stage_timing_enabled(True)
+    assert receiver.stage_timer.enabled
+    assert vf.stage_timer.enabled
+    num_frames = 5
+    for _ in range(num_frames):
+        ft = receiver.receive(ReceiveFrameType.recv_video, 0)
+        assert ft == ReceiveFrameType.recv_video
+        vf.fill_p_data(dest)
+
+    timings = receiver.get_stage_timings()
+    assert timings['receiver']['capture']['count'] == num_frames
+    assert timings['receiver']['process']['count'] == num_frames
+    assert timings['receiver']['callback']['count'] == 0
+    for key in ['process', 'lock_wait', 'read']:
+        assert timings['video_frame'][key]['count'] == num_frames
+
+
+def test_audio_stream_in_flight():
+    af = AudioSendFrame()
+    af.sample_rate = 48000
+    af.num_channels = 2
+    af.set_max_num_samples(480)
+    af.stage_timer.enabled = True
+    sender = BenchSender()
+    sender.set_audio_frame(af)
+    data = np.zeros((2, 480 * 3), dtype=np.float32)
+    with sender:
+        assert sender.write_audio_stream(data, 480) == 480 * 3
+    assert af.stage_timer.snapshot()['in_flight']['count'] == 3
@@ -0,0 +1,159 @@
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from cyndilib import tracing
+from cyndilib.receiver import ReceiveFrameType
+from cyndilib.video_frame import VideoRecvFrame
+from cyndilib.audio_frame import AudioSendFrame
+from cyndilib.wrapper.ndi_structs import FourCC
+from _bench_helpers import (  # type: ignore[missing-import]
+    BenchReceiver, BenchSender, get_video_frame_size,
+)
+
+
+@pytest.fixture
+def trace_enabled():
+    tracing.clear_trace()
+    tracing.enable_tracing()
+    yield
+    tracing.disable_tracing()
+    tracing.clear_trace()
+
+
+def build_receiver(max_buffers=4):
+    width, height, fourcc = 320, 180, FourCC.UYVY
+    src_data = np.zeros(get_video_frame_size(fourcc, width, height), dtype=np.uint8)
+    receiver = BenchReceiver()
+    receiver.set_video_source(src_data, width, height, fourcc)
+    vf = VideoRecvFrame(max_buffers=max_buffers)
+    receiver.set_video_frame(vf)
+    return receiver, vf, np.empty_like(src_data)
+
+
+def test_disabled():
+    tracing.clear_trace()
+    assert not tracing.is_tracing_enabled()
+    receiver, vf, dest = build_receiver()
+    receiver.receive(ReceiveFrameType.recv_video, 0)
+    vf.fill_p_data(dest)
+    assert tracing.get_trace_events() == []
+    with pytest.raises(ValueError):
+        tracing.enable_tracing(ring_size=0)
+    assert not tracing.is_tracing_enabled()
+
+
+def test_capture_and_read(trace_enabled):
+    receiver, vf, dest = build_receiver()
+    for _ in range(3):
+        ft = receiver.receive(ReceiveFrameType.recv_video, 0)
+        assert ft == ReceiveFrameType.recv_video
+    vf.fill_p_data(dest)
+
+    events = tracing.get_trace_events()
+    ts = [ev['ts_ns'] for ev in events]
+    assert ts == sorted(ts)
+    captures = [ev for ev in events if ev['name'] == 'capture']
+    reads = [ev for ev in events if ev['name'] == 'read']
+    assert len(captures) == 3
+    assert len(reads) == 1
+    frame_ids = [ev['frame_id'] for ev in captures]
+    assert len(set(frame_ids)) == 3
+    assert all(ev['dur_ns'] is not None for ev in captures)
+    assert all(ev['thread_id'] == threading.get_ident() for ev in events)
+
+    # The read is matched to the capture of the same buffer
+    read = reads[0]
+    capture = [ev for ev in captures if ev['frame_id'] == read['frame_id']]
+    assert len(capture) == 1
+    assert capture[0]['value'] == read['value']
+    assert capture[0]['ndi_timestamp'] == read['ndi_timestamp']
+
+    tracing.clear_trace()
+    assert tracing.get_trace_events() == []
+
+
+def test_threads(trace_enabled):
+    receiver, vf, dest = build_receiver()
+
+    def run():
+        receiver.receive(ReceiveFrameType.recv_video, 0)
+
+    t = threading.Thread(target=run, name='trace-test-thread')
+    t.start()
+    t.join()
+    receiver.receive(ReceiveFrameType.recv_video, 0)
+
+    events = [ev for ev in tracing.get_trace_events() if ev['name'] == 'capture']
+    thread_ids = {ev['thread_id'] for ev in events}
+    assert thread_ids == {t.ident, threading.get_ident()}
+
+
+def test_ring_wrap():
+    tracing.clear_trace()
+    tracing.enable_tracing(ring_size=8)
+    try:
+        receiver, vf, dest = build_receiver()
+
+        # Use a new thread so its ring is created with the new size
+        def run():
+            for _ in range(20):
+                receiver.receive(ReceiveFrameType.recv_video, 0)
+                vf.fill_p_data(dest)
+
+        t = threading.Thread(target=run)
+        t.start()
+        t.join()
+        events = [ev for ev in tracing.get_trace_events() if ev['thread_id'] == t.ident]
+        assert len(events) == 8
+    finally:
+        tracing.disable_tracing()
+        tracing.enable_tracing(ring_size=16384)
+        tracing.disable_tracing()
+        tracing.clear_trace()
+
+
+def test_audio_stream_send(trace_enabled):
+    af = AudioSendFrame()
+    af.sample_rate = 48000
+    af.num_channels = 2
+    af.set_max_num_samples(480)
+    sender = BenchSender()
+    sender.set_audio_frame(af)
+    data = np.zeros((2, 480 * 3), dtype=np.float32)
+    with sender:
+        assert sender.write_audio_stream(data, 480) == 480 * 3
+
+    sends = [ev for ev in tracing.get_trace_events() if ev['name'] == 'send']
+    assert len(sends) == 3
+    frame_ids = [ev['frame_id'] for ev in sends]
+    assert 0 not in frame_ids
+    assert len(set(frame_ids)) == 3
+
+
+def test_chrome_trace(trace_enabled, tmp_path):
+    receiver, vf, dest = build_receiver()
+    receiver.receive(ReceiveFrameType.recv_video, 0)
+    vf.fill_p_data(dest)
+
+    trace = tracing.get_chrome_trace()
+    trace_events = trace['traceEvents']
+    meta = [ev for ev in trace_events if ev['ph'] == 'M']
+    assert any(
+        ev['name'] == 'thread_name' and ev['args']['name'] == threading.current_thread().name
+        for ev in meta
+    )
+    spans = [ev for ev in trace_events if ev['ph'] == 'X']
+    instants = [ev for ev in trace_events if ev['ph'] == 'i']
+    assert {ev['name'] for ev in spans} >= {'capture'}
+    assert {ev['name'] for ev in instants} >= {'resize'}
+    for ev in spans + instants:
+        assert {'pid', 'tid', 'ts', 'args'} <= set(ev.keys())
+
+    filename = tmp_path / 'trace.json'
+    tracing.write_chrome_trace(filename)
+    with open(filename) as f:
+        loaded = json.load(f)
+    assert len(loaded['traceEvents']) == len(trace_events)
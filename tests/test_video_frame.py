@@ -137,3 +137,80 @@ def test_frame_sync(fake_video_frames: VideoParams):
         assert vf.get_timestamp_posix() == pytest.approx(timestamps[i], abs=1e-7)
 
     assert np.array_equal(results, fake_frames)
+
+
+def test_frame_sync_double_buffered(fake_video_frames: VideoParams):
+    width, height, fr, num_frames, fake_frames = fake_video_frames
+
+    vf = VideoFrameSync(double_buffered=True)
+    assert vf.double_buffered
+    assert not VideoFrameSync().double_buffered
+    vf.set_frame_rate(fr)
+    vf.set_fourcc(FourCC.RGBA)
+
+    fs_helper = VideoFrameSyncHelper()
+    fs_helper.set_video_frame(vf)
+
+    # The NDI frame is released as soon as it is copied
+    fs_helper.fill_data(fake_frames[0], width, height, 0)
+    assert fs_helper.num_outstanding == 0
+    view0 = np.asarray(vf)
+    assert np.array_equal(view0, fake_frames[0])
+
+    # Capture while the previous frame is held
+    fs_helper.fill_data(fake_frames[1], width, height, 0)
+    view1 = np.asarray(vf)
+    assert np.array_equal(view0, fake_frames[0])
+    assert np.array_equal(view1, fake_frames[1])
+    assert np.array_equal(vf.get_array(), fake_frames[1])
+
+    # Both buffers are in use
+    with pytest.raises(ValueError):
+        fs_helper.fill_data(fake_frames[2], width, height, 0)
+    assert fs_helper.num_outstanding == 0
+
+    # The buffer of the released view is used next
+    del view0
+    fs_helper.fill_data(fake_frames[2], width, height, 0)
+    assert np.array_equal(view1, fake_frames[1])
+    assert np.array_equal(vf.get_array(), fake_frames[2])
+    del view1
+
+    for i in range(3, num_frames):
+        fs_helper.fill_data(fake_frames[i], width, height, 0)
+        assert np.array_equal(vf.get_array(), fake_frames[i])
+    assert fs_helper.num_outstanding == 0
+
+
+def test_frame_sync_acquire_front(fake_video_frames: VideoParams):
+    width, height, fr, num_frames, fake_frames = fake_video_frames
+
+    vf = VideoFrameSync(double_buffered=True)
+    vf.set_frame_rate(fr)
+    vf.set_fourcc(FourCC.RGBA)
+    fs_helper = VideoFrameSyncHelper()
+    fs_helper.set_video_frame(vf)
+    assert fs_helper.acquire_front() is None
+
+    fs_helper.fill_data(fake_frames[0], width, height, 0)
+    idx0, data = fs_helper.acquire_front()
+    assert data == fake_frames[0].tobytes()
+
+    # Captures go to the other buffer while the front one is acquired
+    for i in range(1, 3):
+        fs_helper.fill_data(fake_frames[i], width, height, 0)
+        idx1, data = fs_helper.acquire_front()
+        assert idx1 != idx0
+        assert data == fake_frames[i].tobytes()
+        if i == 1:
+            fs_helper.release_front(idx1)
+    with pytest.raises(ValueError):
+        fs_helper.fill_data(fake_frames[3], width, height, 0)
+
+    fs_helper.release_front(idx0)
+    fs_helper.fill_data(fake_frames[3], width, height, 0)
+    assert np.array_equal(vf.get_array(), fake_frames[3])
+    fs_helper.release_front(idx1)
+    fs_helper.fill_data(fake_frames[4], width, height, 0)
+    assert np.array_equal(vf.get_array(), fake_frames[4])
+    assert fs_helper.num_outstanding == 0